@@ -2,14 +2,263 @@
 classes including wrangler descriptions and parameters.
 
 """
+import contextlib
+import functools
 import inspect
-from abc import ABC, abstractmethod
+import threading
+import time
+import timeit
+import tracemalloc
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Iterator, List, NamedTuple, Optional
 
+import pandas as pd
+
+from pywrangler import events
 from pywrangler.util import _pprint
 from pywrangler.util.helper import get_param_names
 
+PhaseTiming = NamedTuple("PhaseTiming", [("phase", str),
+                                         ("wall_time", float),
+                                         ("cpu_time", float),
+                                         ("allocated_bytes", Optional[int]),
+                                         ("calls", int)])
+
+# ids of wranglers per thread whose transformation is currently executed
+_ACTIVE = threading.local()
+
+
+class _PhaseRecording:
+    """Global state of phase recording modified via `record_phases`.
+
+    """
+
+    depth = 0
+
+
+class _NullPhase:
+    """Reusable context manager doing nothing if phase recording is disabled.
+
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Context manager measuring wall time, CPU time and allocated bytes of a
+    single phase and adding the measurement to the wrangler's phase timings.
+    Allocated bytes refer to the net increase of memory traced by
+    `tracemalloc` and are only available while tracing.
+
+    """
+
+    def __init__(self, timings: 'PhaseTimings', name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.tracing = tracemalloc.is_tracing()
+        if self.tracing:
+            self.memory = tracemalloc.get_traced_memory()[0]
+
+        self.cpu = time.process_time()
+        self.wall = timeit.default_timer()
+
+        return self
+
+    def __exit__(self, *exc):
+        wall_time = timeit.default_timer() - self.wall
+        cpu_time = time.process_time() - self.cpu
+
+        if self.tracing and tracemalloc.is_tracing():
+            allocated = tracemalloc.get_traced_memory()[0] - self.memory
+        else:
+            allocated = None
+
+        self.timings.add(PhaseTiming(self.name, wall_time, cpu_time,
+                                     allocated, 1))
+
+        return False
+
+
+class PhaseTimings:
+    """Contains the wall time, CPU time and allocated bytes of each phase of a
+    wrangler's most recent `transform` call in order of first occurrence.
+    Repeated phases are accumulated.
+
+    Attributes
+    ----------
+    phases: OrderedDict
+        Phase names as keys and `PhaseTiming` as values.
+
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict()
+
+    def add(self, timing: PhaseTiming):
+        """Add given timing and accumulate it with previous timings of the
+        same phase.
+
+        """
+
+        previous = self.phases.get(timing.phase)
+        if previous is not None:
+            if previous.allocated_bytes is None or \
+                    timing.allocated_bytes is None:
+                allocated = None
+            else:
+                allocated = previous.allocated_bytes + timing.allocated_bytes
+
+            timing = PhaseTiming(timing.phase,
+                                 previous.wall_time + timing.wall_time,
+                                 previous.cpu_time + timing.cpu_time,
+                                 allocated,
+                                 previous.calls + timing.calls)
+
+        self.phases[timing.phase] = timing
+
+    @property
+    def wall_time(self) -> float:
+        """Return total wall time of all phases in seconds.
+
+        """
+
+        return sum([timing.wall_time for timing in self])
+
+    @property
+    def cpu_time(self) -> float:
+        """Return total CPU time of all phases in seconds.
+
+        """
+
+        return sum([timing.cpu_time for timing in self])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return all phase timings as a dataframe with one row per phase.
+
+        """
+
+        return pd.DataFrame([timing._asdict() for timing in self],
+                            columns=PhaseTiming._fields)
+
+    def __getitem__(self, phase: str) -> PhaseTiming:
+        return self.phases[phase]
+
+    def __iter__(self) -> Iterator[PhaseTiming]:
+        return iter(self.phases.values())
+
+    def __len__(self):
+        return len(self.phases)
+
+    def __repr__(self):
+        phases = ", ".join(["{}={:.6f}s".format(timing.phase,
+                                                timing.wall_time)
+                            for timing in self])
+        return "PhaseTimings({})".format(phases)
+
+
+@contextlib.contextmanager
+def record_phases(track_memory: bool = False) -> Iterator[None]:
+    """Enable recording of phase timings of all wranglers globally within
+    the context. After each `transform` call, phase timings are available
+    via the wrangler's `phase_timings`. Contexts may be nested.
+
+    Parameters
+    ----------
+    track_memory: bool, optional
+        If True, starts tracing memory allocations via `tracemalloc` within
+        the context to measure allocated bytes per phase. Tracing slows down
+        execution considerably. If tracing is already active, allocated
+        bytes are measured regardless.
+
+    """
+
+    started = track_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    _PhaseRecording.depth += 1
+
+    try:
+        yield
+    finally:
+        _PhaseRecording.depth -= 1
+
+        if started:
+            tracemalloc.stop()
+
+
+def _instrument_transform(transform: Callable) -> Callable:
+    """Wrap given `transform` method to emit wrangler start and end events
+    including duration and number of rows for pandas results and to reset
+    phase timings if phase recording is enabled. Nested calls of the same
+    wrangler instance (e.g. via `super`) are instrumented only once. Without
+    any registered sinks and disabled phase recording, the original method is
+    called directly.
+
+    """
+
+    @functools.wraps(transform)
+    def wrapped(self, *args, **kwargs):
+        if not (events._SINKS or _PhaseRecording.depth):
+            return transform(self, *args, **kwargs)
+
+        active = _ACTIVE.__dict__.setdefault("ids", set())
+        if id(self) in active:
+            return transform(self, *args, **kwargs)
+
+        if _PhaseRecording.depth:
+            self._phase_timings = PhaseTimings()
+
+        fields = {"wrangler": self.__class__.__name__,
+                  "engine": self.computation_engine}
+
+        events.emit(events.WRANGLER_START, **fields)
+
+        active.add(id(self))
+        start = timeit.default_timer()
+        try:
+            result = transform(self, *args, **kwargs)
+        finally:
+            active.discard(id(self))
+
+        if events.is_enabled():
+            duration = timeit.default_timer() - start
+
+            # row counts are only cheap for eagerly evaluated engines
+            if fields["engine"] == "pandas":
+                fields["rows"] = len(result)
+
+            events.emit(events.WRANGLER_END, duration=duration, **fields)
+
+        return result
+
+    return wrapped
 
-class BaseWrangler(ABC):
+
+class WranglerMeta(ABCMeta):
+    """Metaclass of all wranglers which instruments `transform` methods of
+    all wrangler classes (see `_instrument_transform`).
+
+    """
+
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+
+        if "transform" in namespace:
+            cls.transform = _instrument_transform(namespace["transform"])
+
+
+class BaseWrangler(metaclass=WranglerMeta):
     """Defines the basic interface common to all data wranglers.
 
     In analogy to sklearn transformers (see link below), all wranglers have to
@@ -37,12 +286,48 @@ class BaseWrangler(ABC):
     The wrangler's employed computation engine is given via
     `computation_engine`.
 
+    Each call of `transform` emits events to registered sinks (see
+    `pywrangler.events`). Implementations may structure `transform` into
+    phases via `_phase` whose timings are recorded within `record_phases`
+    and exposed via `phase_timings`.
+
     See also
     --------
     https://scikit-learn.org/stable/developers/contributing.html
 
     """
 
+    @property
+    def phase_timings(self) -> Optional[PhaseTimings]:
+        """Return phase timings of the most recent `transform` call which was
+        executed while phase recording was enabled via `record_phases`.
+        Returns None if not available.
+
+        """
+
+        return getattr(self, "_phase_timings", None)
+
+    def _phase(self, name: str):
+        """Return context manager measuring the phase with given name of the
+        current `transform` call. Costs a single check if phase recording is
+        disabled.
+
+        Parameters
+        ----------
+        name: str
+            Name of the phase, e.g. `validate` or `sort`.
+
+        """
+
+        if not _PhaseRecording.depth:
+            return _NULL_PHASE
+
+        timings = self.phase_timings
+        if timings is None:
+            timings = self._phase_timings = PhaseTimings()
+
+        return _Phase(timings, name)
+
     @property
     @abstractmethod
     def preserves_sample_size(self) -> bool:
@@ -53,6 +338,16 @@ class BaseWrangler(ABC):
     def computation_engine(self) -> str:
         raise NotImplementedError
 
+    @property
+    def input_columns(self) -> Optional[List[str]]:
+        """Declare all columns read by the wrangler's transformation. Allows
+        pipelines to drop columns which are not required anymore. Returns
+        None if unknown which refers to all columns.
+
+        """
+
+        return None
+
     def get_params(self) -> dict:
         """Retrieve all wrangler parameters set within the __init__ method.
 
@@ -2,11 +2,29 @@
 
 """
 
+import ctypes
 import gc
+import math
 import numbers
+import os
+import pickle
 import sys
+import threading
+import time
 import timeit
-from typing import Callable, Iterable, List, Union
+import tracemalloc
+from collections import OrderedDict, defaultdict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union
+)
 
 import numpy as np
 
@@ -18,6 +36,81 @@ from pywrangler.util._pprint import (
     pretty_time_duration
 )
 from pywrangler.util.helper import get_param_names
+from pywrangler.util.stats import (
+    ConfidenceInterval,
+    bootstrap,
+    mann_whitney_u_test
+)
+
+AllocationSite = NamedTuple("AllocationSite", [("module", str),
+                                               ("line", int),
+                                               ("size", int),
+                                               ("count", int)])
+
+CallStats = NamedTuple("CallStats", [("function", str),
+                                     ("calls", float),
+                                     ("own_time", float),
+                                     ("cumulative_time", float)])
+
+Comparison = NamedTuple("Comparison", [("difference", float),
+                                       ("ratio", float),
+                                       ("p_value", float),
+                                       ("significant", bool)])
+
+ScalingModel = NamedTuple("ScalingModel", [("name", str),
+                                           ("intercept", float),
+                                           ("slope", float),
+                                           ("r_squared", float)])
+
+ScalingPrediction = NamedTuple("ScalingPrediction", [("rows", int),
+                                                     ("time", float),
+                                                     ("memory", float)])
+
+# modes of measuring memory usage
+MEMORY_MODES = ("sampling", "fork")
+
+# bytes per unit of `ru_maxrss` which is reported in KiB except for macOS
+RUSAGE_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# modes of call profiling
+CALL_MODES = ("deterministic", "sampling")
+
+# directory of the pywrangler package used to attribute allocations
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# complexity models mapping the number of rows to the model's feature
+SCALING_MODELS = OrderedDict([
+    ("linear", lambda n: np.asarray(n, dtype=float)),
+    ("nlogn", lambda n: np.asarray(n, dtype=float) *
+     np.log2(np.maximum(np.asarray(n, dtype=float), 2))),
+    ("quadratic", lambda n: np.asarray(n, dtype=float) ** 2)
+])
+
+
+def get_ratio(value: float, baseline: float) -> float:
+    """Return ratio of `value` relative to `baseline`. A zero baseline
+    yields a signed infinite ratio or NaN if `value` is zero as well.
+
+    Parameters
+    ----------
+    value: float
+        Value to be compared.
+    baseline: float
+        Reference value.
+
+    Returns
+    -------
+    ratio: float
+
+    """
+
+    if baseline == 0:
+        if value == 0:
+            return np.nan
+
+        return math.copysign(np.inf, value)
+
+    return float(value / baseline)
 
 
 def allocate_memory(size: float) -> np.ndarray:
@@ -48,6 +141,187 @@ def allocate_memory(size: float) -> np.ndarray:
     return memory_holder
 
 
+def _reset_peak_rss():
+    """Reset the peak resident set size of the current process to its
+    current resident set size on linux. Otherwise, do nothing.
+
+    Beforehand, free heap memory is returned to the operating system via
+    glibc's `malloc_trim` because freed memory which is still resident may
+    be reused by subsequent allocations without increasing the resident set
+    size.
+
+    """
+
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def trace_peak_memory(func: Callable, *args, **kwargs) -> int:
+    """Return peak memory in bytes allocated by python and numpy objects
+    while calling given function via `tracemalloc`. Memory allocated before
+    the call is excluded.
+
+    If `tracemalloc` is already tracing, its peak can only be reset on
+    python >= 3.9. On earlier versions, the peak is approximated by the
+    maximum traced memory observed on python function calls and returns
+    (see `_PeakTracker`). If another profile function is already set, only
+    the difference of traced memory after and before the call is returned
+    which is a lower bound of the peak.
+
+    Parameters
+    ----------
+    func: callable
+        Function to be called.
+    args: iterable, optional
+        Optional positional arguments passed to `func`.
+    kwargs: mapping, optional
+        Optional keyword arguments passed to `func`.
+
+    Returns
+    -------
+    peak: int
+
+    """
+
+    gc.collect()
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    else:
+        return _trace_peak_memory_delta(func, *args, **kwargs)
+
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    return max(0, peak - baseline)
+
+
+class _PeakTracker:
+    """Profile function for `sys.setprofile` keeping track of the maximum
+    traced memory observed on each function call and return.
+
+    """
+
+    def __init__(self):
+        self.peak = tracemalloc.get_traced_memory()[0]
+
+    def __call__(self, frame, event, arg):
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[0])
+
+
+def _trace_peak_memory_delta(func: Callable, *args, **kwargs) -> int:
+    """Approximate peak memory of calling `func` while `tracemalloc` is
+    already tracing and its peak cannot be reset.
+
+    """
+
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    tracker = None
+    if sys.getprofile() is None:
+        tracker = _PeakTracker()
+        sys.setprofile(tracker)
+
+    try:
+        func(*args, **kwargs)
+    finally:
+        if tracker is not None:
+            sys.setprofile(None)
+
+    peak = tracemalloc.get_traced_memory()[0]
+    if tracker is not None:
+        peak = max(peak, tracker.peak)
+
+    return max(0, peak - baseline)
+
+
+def fit_scaling_model(name: str, rows: Iterable[int],
+                      values: Iterable[float]) -> ScalingModel:
+    """Fit complexity model with given name via least squares with an
+    intercept representing fixed costs.
+
+    Parameters
+    ----------
+    name: str
+        Name of the complexity model (see `SCALING_MODELS`).
+    rows: iterable
+        Number of rows of each measurement.
+    values: iterable
+        Measured values, e.g. execution time or peak memory.
+
+    Returns
+    -------
+    model: ScalingModel
+        Contains intercept, slope and the coefficient of determination.
+
+    """
+
+    if name not in SCALING_MODELS:
+        raise ValueError("Scaling model '{}' is not supported. Allowed "
+                         "models are: {}".format(name, list(SCALING_MODELS)))
+
+    feature = SCALING_MODELS[name](list(rows))
+    values = np.asarray(values, dtype=float)
+
+    design = np.column_stack([np.ones(len(feature)), feature])
+    (intercept, slope), _, _, _ = np.linalg.lstsq(design, values, rcond=None)
+
+    residuals = values - (intercept + slope * feature)
+    total = np.sum((values - values.mean()) ** 2)
+    if total > 0:
+        r_squared = 1 - np.sum(residuals ** 2) / total
+    else:
+        r_squared = 1.
+
+    return ScalingModel(name, float(intercept), float(slope),
+                        float(r_squared))
+
+
+def estimate_exponent(rows: Iterable[int], values: Iterable[float]) -> float:
+    """Estimate the exponent `k` of `values ~ rows ** k` via least squares
+    in log-log space. Only the larger half of sizes is used to reduce the
+    impact of fixed costs.
+
+    Parameters
+    ----------
+    rows: iterable
+        Number of rows of each measurement.
+    values: iterable
+        Measured values, e.g. execution time or peak memory.
+
+    Returns
+    -------
+    exponent: float
+
+    """
+
+    rows = np.asarray(list(rows), dtype=float)
+    values = np.maximum(np.asarray(list(values), dtype=float),
+                        np.finfo(float).tiny)
+
+    larger = np.argsort(rows)[len(rows) // 2:]
+
+    slope, _ = np.polyfit(np.log(rows[larger]), np.log(values[larger]), 1)
+
+    return float(slope)
+
+
 class BaseProfiler:
     """Base class defining the interface for all profilers.
 
@@ -70,6 +344,10 @@ class BaseProfiler:
         The standard deviation of measurements.
     runs: int
         The number of measurements.
+    p5, p95, p99: float
+        The 5th, 95th and 99th percentile of measurements.
+    outliers: list
+        Measurements outside of Tukey's fences.
 
     Methods
     -------
@@ -80,6 +358,12 @@ class BaseProfiler:
         deviation and the number of measurements.
     profile_report
         Calls profile and report in sequence.
+    confidence_interval
+        Bootstrapped confidence interval of the median.
+    compare
+        Test if the difference to another profiler is significant.
+    report_comparison
+        Print comparison with another profiler.
 
     """
 
@@ -139,6 +423,43 @@ class BaseProfiler:
 
         return len(self.measurements)
 
+    @property
+    def p5(self) -> float:
+        """Returns the 5th percentile of measurements.
+
+        """
+
+        return self.percentile(5)
+
+    @property
+    def p95(self) -> float:
+        """Returns the 95th percentile of measurements.
+
+        """
+
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        """Returns the 99th percentile of measurements.
+
+        """
+
+        return self.percentile(99)
+
+    @property
+    def outliers(self) -> List[float]:
+        """Returns measurements outside of Tukey's fences which are 1.5
+        interquartile ranges below the first and above the third quartile.
+
+        """
+
+        q1, q3 = np.percentile(self.measurements, [25, 75])
+        iqr = q3 - q1
+        lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+        return [x for x in self.measurements if x < lower or x > upper]
+
     @property
     def less_is_better(self) -> bool:
         """Defines ranking of measurements.
@@ -147,6 +468,92 @@ class BaseProfiler:
 
         raise NotImplementedError
 
+    def percentile(self, q: float) -> float:
+        """Returns the q-th percentile of measurements.
+
+        Parameters
+        ----------
+        q: float
+            Percentile between 0 and 100.
+
+        """
+
+        return float(np.percentile(self.measurements, q))
+
+    def confidence_interval(self, confidence: float = 0.95,
+                            resamples: int = 1000,
+                            seed: int = 0) -> ConfidenceInterval:
+        """Returns the bootstrapped confidence interval of the median of
+        measurements.
+
+        Parameters
+        ----------
+        confidence: float, optional
+            Confidence level of the interval.
+        resamples: int, optional
+            Number of bootstrap resamples.
+        seed: int, optional
+            Seed of the random number generator.
+
+        Returns
+        -------
+        interval: ConfidenceInterval
+
+        """
+
+        return bootstrap(self.measurements, np.median, confidence,
+                         resamples, seed)
+
+    def compare(self, other: 'BaseProfiler',
+                alpha: float = 0.05) -> Comparison:
+        """Compare measurements with measurements of another profiler via the
+        Mann-Whitney U test. Being rank based, the test matches the reported
+        difference and ratio of medians and is robust against outliers.
+
+        Parameters
+        ----------
+        other: BaseProfiler
+            Profiler to compare with.
+        alpha: float, optional
+            Significance level.
+
+        Returns
+        -------
+        comparison: Comparison
+            Difference and ratio of medians (self relative to other), the
+            p-value and whether the difference is significant. The ratio is
+            infinite or NaN if the median of other is zero (see `get_ratio`).
+
+        """
+
+        test = mann_whitney_u_test(self.measurements, other.measurements)
+
+        return Comparison(float(self.median - other.median),
+                          get_ratio(self.median, other.median),
+                          test.p_value,
+                          bool(test.p_value < alpha))
+
+    def report_comparison(self, other: 'BaseProfiler', alpha: float = 0.05):
+        """Print comparison with another profiler stating if the difference
+        of measurements is statistically significant.
+
+        """
+
+        comparison = self.compare(other, alpha)
+
+        tpl = "{median} vs. {other} ({ratio:.2f}x, p={p_value:.3f}): {result}"
+
+        if comparison.significant:
+            result = "significant"
+        else:
+            result = "not significant"
+
+        print(tpl.format(median=self._pretty_formatter(self.median),
+                         other=self._pretty_formatter(other.median),
+                         ratio=comparison.ratio,
+                         p_value=comparison.p_value,
+                         result=result))
+
     def profile(self, *args, **kwargs):
         """Contains the actual profiling implementation and has to set
         `self._measurements`. Always returns self.
@@ -254,6 +661,17 @@ class MemoryProfiler(BaseProfiler):
     In addition, compute the mean increase in baseline memory usage between
     repetitions which might indicate memory leakage.
 
+    Two modes are supported. `sampling` polls memory usage in a separate
+    process at fixed intervals which may miss short peaks between samples.
+    `fork` runs each repetition in a forked child process and reads the
+    peak resident set size reported by the kernel via `os.wait4` once the
+    child exits. Hence, peaks are exact, there is no sampling overhead and
+    repetitions are independent without allocator state leaking between
+    runs. On linux, the child's peak resident set size is reset before
+    calling `func` and serves as baseline. Forking is only available on unix
+    and is unsafe for processes running other threads, e.g. a JVM gateway
+    for pyspark.
+
     Parameters
     ----------
     func: callable
@@ -262,7 +680,9 @@ class MemoryProfiler(BaseProfiler):
         Number of repetitions.
     interval: float, optional
         Defines interval duration between consecutive memory usage
-        measurements in seconds.
+        measurements in seconds. Only used in `sampling` mode.
+    mode: str, optional
+        Either `sampling` or `fork`.
 
     Attributes
     ----------
@@ -300,10 +720,18 @@ class MemoryProfiler(BaseProfiler):
     """
 
     def __init__(self, func: Callable, repetitions: int = 5,
-                 interval: float = 0.01):
+                 interval: float = 0.01, mode: str = "sampling"):
         self.func = func
         self.repetitions = repetitions
         self.interval = interval
+        self.mode = mode
+
+        if mode not in MEMORY_MODES:
+            raise ValueError("Parameter `mode` is invalid with: {}. Allowed "
+                             "arguments are: {}".format(mode, MEMORY_MODES))
+
+        if mode == "fork" and not hasattr(os, "fork"):
+            raise ValueError("Mode `fork` is not supported on this platform.")
 
     def profile(self, *args, **kwargs):
         """Executes the actual memory profiling.
@@ -317,6 +745,9 @@ class MemoryProfiler(BaseProfiler):
 
         """
 
+        if self.mode == "fork":
+            return self._profile_fork(args, kwargs)
+
         from memory_profiler import memory_usage
 
         counter = 0
@@ -388,6 +819,110 @@ class MemoryProfiler(BaseProfiler):
         changes = np.diff(self.baselines)
         return float(np.median(changes))
 
+    @property
+    def outputs(self) -> List[Any]:
+        """Returns the output sizes computed via `_measure_output` within
+        each forked child process. Only available in `fork` mode.
+
+        """
+
+        self._check_is_profiled(['_outputs'])
+
+        return self._outputs
+
+    def _profile_fork(self, args, kwargs):
+        """Run each repetition in a forked child process and derive memory
+        increase from the peak resident set size reported by the kernel.
+
+        """
+
+        baselines = []
+        max_usages = []
+        outputs = []
+
+        for _ in range(self.repetitions):
+            baseline, max_usage, output = self._run_forked(args, kwargs)
+
+            baselines.append(baseline)
+            max_usages.append(max_usage)
+            outputs.append(output)
+
+        self._max_usages = max_usages
+        self._baselines = baselines
+        self._outputs = outputs
+        self._measurements = np.subtract(max_usages, baselines).tolist()
+
+        return self
+
+    def _run_forked(self, args, kwargs):
+        """Call `func` in a forked child process and return baseline and
+        peak resident set size in bytes and the size of the output.
+
+        The child sends its baseline and output size through a pipe while
+        the parent obtains the child's peak resident set size via
+        `os.wait4`.
+
+        """
+
+        import resource
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            # child process must never return into the caller's code
+            exit_code = 1
+            try:
+                os.close(read_fd)
+                try:
+                    gc.collect()
+                    _reset_peak_rss()
+                    usage = resource.getrusage(resource.RUSAGE_SELF)
+                    baseline = usage.ru_maxrss * RUSAGE_UNIT
+
+                    result = self.func(*args, **kwargs)
+                    message = (None, baseline, self._measure_output(result))
+
+                except BaseException as e:
+                    message = (repr(e), None, None)
+
+                with os.fdopen(write_fd, "wb") as pipe:
+                    pickle.dump(message, pipe)
+
+                exit_code = 0
+
+            finally:
+                os._exit(exit_code)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as pipe:
+            data = pipe.read()
+
+        _, status, usage = os.wait4(pid, 0)
+
+        if not data or status != 0:
+            raise RuntimeError("Forked child process terminated abnormally "
+                               "with status '{}'.".format(status))
+
+        error, baseline, output = pickle.loads(data)
+        if error is not None:
+            raise RuntimeError("Profiled function raised in forked child "
+                               "process: {}".format(error))
+
+        return baseline, usage.ru_maxrss * RUSAGE_UNIT, output
+
+    def _measure_output(self, result: Any) -> Any:
+        """Return size of the result of `func` computed within the forked
+        child process. Subclasses may override this to avoid an additional
+        call of `func` for sizing the output.
+
+        """
+
+        return None
+
     @staticmethod
     def _pretty_formatter(value: float) -> str:
         """String formatter for human readable output of given input `value`.
@@ -429,6 +964,10 @@ class TimeProfiler(BaseProfiler):
     """Approximate the time required to execute a function call.
 
     By default, the number of repetitions is estimated if not set explicitly.
+    Warmup runs are executed before measuring to exclude one-off costs like
+    imports and caches. Wall time and process CPU time are measured for each
+    repetition. A CPU time much lower than the wall time indicates waiting,
+    e.g. for I/O or other processes.
 
     Parameters
     ----------
@@ -437,11 +976,18 @@ class TimeProfiler(BaseProfiler):
     repetitions: None, int, optional
         Number of repetitions. If `None`, `timeit.Timer.autorange` will
         determine a sensible default.
+    warmup: int, optional
+        Number of runs before measuring.
+    disable_gc: bool, optional
+        If True, the garbage collector is disabled during each measurement
+        like `timeit` does by default.
 
     Attributes
     ----------
     measurements: list
-        The actual profiling measurements in seconds.
+        The actual profiling measurements (wall time) in seconds.
+    cpu_measurements: list
+        The process CPU time of each measurement in seconds.
     best: float
         The best measurement in seconds.
     median: float
@@ -452,26 +998,42 @@ class TimeProfiler(BaseProfiler):
         The standard deviation of measurements in seconds.
     runs: int
         The number of measurements.
+    cpu_median: float
+        The median CPU time of measurements in seconds.
+    p5, p95, p99: float
+        The 5th, 95th and 99th percentile of measurements in seconds.
+    outliers: list
+        Measurements outside of Tukey's fences.
 
     Methods
     -------
     profile
         Contains the actual profiling implementation.
     report
-        Print simple report consisting of best, median, worst, standard
-        deviation and the number of measurements.
+        Print report consisting of best, median, worst, standard deviation,
+        the number of measurements, percentiles, CPU time, the confidence
+        interval of the median and outliers.
     profile_report
         Calls profile and report in sequence.
+    confidence_interval
+        Bootstrapped confidence interval of the median.
+    compare
+        Test if the difference to another profiler is significant.
+    report_comparison
+        Print comparison with another profiler.
 
     Notes
     -----
-    The implementation is based on standard library's `timeit` module.
+    Timing is based on `timeit.default_timer` and `time.process_time`.
 
     """
 
-    def __init__(self, func: Callable, repetitions: Union[None, int] = None):
+    def __init__(self, func: Callable, repetitions: Union[None, int] = None,
+                 warmup: int = 0, disable_gc: bool = True):
         self.func = func
         self.repetitions = repetitions
+        self.warmup = warmup
+        self.disable_gc = disable_gc
 
     def profile(self, *args, **kwargs):
         """Executes the actual time profiling.
@@ -486,24 +1048,51 @@ class TimeProfiler(BaseProfiler):
         """
 
         def wrapper():
-            """Helper function without arguments which is passed to `repeat`
-            which only calls given function with provided args and kwargs.
+            """Helper function without arguments which only calls given
+            function with provided args and kwargs.
 
             """
 
             self.func(*args, **kwargs)
 
-        timer = timeit.Timer(stmt=wrapper)
+        for _ in range(self.warmup):
+            wrapper()
 
         if self.repetitions is None:
-            repeat, _ = timer.autorange(None)
+            repeat, _ = timeit.Timer(stmt=wrapper).autorange(None)
         else:
             repeat = self.repetitions
 
-        self._measurements = timer.repeat(number=1, repeat=repeat)
+        walls = []
+        cpus = []
+        for _ in range(repeat):
+            wall, cpu = self._measure(wrapper)
+            walls.append(wall)
+            cpus.append(cpu)
+
+        self._measurements = walls
+        self._cpu_measurements = cpus
 
         return self
 
+    @property
+    def cpu_measurements(self) -> List[float]:
+        """Return process CPU time of each measurement.
+
+        """
+
+        self._check_is_profiled(["_cpu_measurements"])
+
+        return self._cpu_measurements
+
+    @property
+    def cpu_median(self) -> float:
+        """Returns the median CPU time of measurements.
+
+        """
+
+        return float(np.median(self.cpu_measurements))
+
     @property
     def less_is_better(self) -> bool:
         """Less time required is better.
@@ -512,8 +1101,1099 @@ class TimeProfiler(BaseProfiler):
 
         return True
 
+    def report(self):
+        """Print report consisting of best, median, worst, standard
+        deviation, the number of measurements, percentiles, CPU time, the
+        confidence interval of the median and outliers.
+
+        """
+
+        super().report()
+
+        fmt = self._pretty_formatter
+        interval = self.confidence_interval()
+
+        print("p5 {} | p95 {} | p99 {}".format(fmt(self.p5), fmt(self.p95),
+                                               fmt(self.p99)))
+        print("CPU time (median): {}".format(fmt(self.cpu_median)))
+        print("95% CI of median: [{}, {}]"
+              .format(fmt(interval.lower), fmt(interval.upper)))
+        print("Outliers: {}".format(len(self.outliers)))
+
+    def _measure(self, func: Callable):
+        """Return wall time and process CPU time of calling `func`.
+
+        """
+
+        gc_enabled = gc.isenabled()
+        if self.disable_gc:
+            gc.disable()
+
+        try:
+            cpu_start = time.process_time()
+            wall_start = timeit.default_timer()
+            func()
+            wall = timeit.default_timer() - wall_start
+            cpu = time.process_time() - cpu_start
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return wall, cpu
+
     @staticmethod
-    def _pretty_formatter(self, value: float) -> str:
+    def _pretty_formatter(value: float) -> str:
+        """String formatter for human readable output of given input `value`.
+
+        Parameters
+        ----------
+        value: float
+            Numeric value to be formatted.
+
+        Returns
+        -------
+        pretty_string: str
+            Human readable representation of `value`.
+
+        """
+
+        return pretty_time_duration(value)
+
+
+class ScalingProfiler(BaseProfiler):
+    """Profile execution time and peak memory of a function over a geometric
+    series of input sizes and fit complexity models (linear, n log n and
+    quadratic) with an intercept for fixed costs. The best fitting models
+    allow to predict time and memory for arbitrary input sizes via
+    `predict`. Superlinear behaviour is flagged via the exponent of the
+    power law fitted on the larger half of sizes.
+
+    Input data for each size is created via the `generate` callable passed to
+    `profile` which receives the number of rows and returns the positional
+    arguments for `func` as a tuple or a single argument.
+
+    Parameters
+    ----------
+    func: callable
+        Callable object to be profiled.
+    sizes: iterable, optional
+        Number of rows of each input. If not given, a geometric series is
+        derived from `start`, `factor` and `steps`.
+    start: int, optional
+        Number of rows of the smallest input.
+    factor: float, optional
+        Growth factor of the geometric series.
+    steps: int, optional
+        Number of sizes of the geometric series.
+    repetitions: None, int, optional
+        Number of timing repetitions per size following a single warmup
+        call. If `None`, `timeit.Timer.autorange` will determine a sensible
+        default.
+    track_memory: bool, optional
+        If True, peak memory is traced via `tracemalloc` in a separate call
+        per size.
+    threshold: float, optional
+        Behaviour is flagged superlinear if the estimated exponent of time
+        or memory exceeds 1 by more than `threshold`.
+
+    Attributes
+    ----------
+    measurements: list
+        Median execution time in seconds for each size.
+    sizes: list
+        Number of rows for each size.
+    memory: list
+        Peak memory in bytes for each size.
+    time_models: dict
+        Fitted time models by name.
+    memory_models: dict
+        Fitted memory models by name.
+    time_model: ScalingModel
+        Best fitting time model.
+    memory_model: ScalingModel
+        Best fitting memory model.
+    time_exponent: float
+        Estimated exponent of execution time.
+    memory_exponent: float
+        Estimated exponent of peak memory.
+    is_superlinear: bool
+        True if time or memory grow superlinearly.
+
+    Methods
+    -------
+    profile
+        Contains the actual profiling implementation.
+    predict
+        Predict time and memory for given number of rows.
+    report
+        Print measurements, best fitting models and superlinear behaviour.
+    profile_report
+        Calls profile and report in sequence.
+
+    """
+
+    def __init__(self, func: Callable,
+                 sizes: Union[None, Iterable[int]] = None,
+                 start: int = 1000,
+                 factor: float = 2,
+                 steps: int = 5,
+                 repetitions: Union[None, int] = 3,
+                 track_memory: bool = True,
+                 threshold: float = 0.25):
+
+        self.func = func
+        self.sizes = sizes
+        self.start = start
+        self.factor = factor
+        self.steps = steps
+        self.repetitions = repetitions
+        self.track_memory = track_memory
+        self.threshold = threshold
+
+        if len(self._get_sizes()) < 3:
+            raise ValueError("At least 3 distinct sizes are required to fit "
+                             "scaling models.")
+
+    def profile(self, generate: Callable[[int], Any]):
+        """Profile time and memory for each size and fit complexity models.
+
+        Parameters
+        ----------
+        generate: callable
+            Receives the number of rows and returns the positional arguments
+            for `func` as a tuple or a single argument.
+
+        """
+
+        sizes = self._get_sizes()
+        times = []
+        memory = []
+
+        for size in sizes:
+            args = generate(size)
+            if not isinstance(args, tuple):
+                args = (args,)
+
+            profiler = TimeProfiler(self.func, self.repetitions, warmup=1)
+            times.append(float(profiler.profile(*args).median))
+
+            if self.track_memory:
+                memory.append(trace_peak_memory(self.func, *args))
+
+            del args
+
+        self._fit(sizes, times, memory if self.track_memory else None)
+
+        return self
+
+    @property
+    def less_is_better(self) -> bool:
+        """Less time required is better.
+
+        """
+
+        return True
+
+    @property
+    def memory(self) -> List[int]:
+        """Return peak memory in bytes for each size.
+
+        """
+
+        self._check_is_profiled(["_memory"])
+        return self._memory
+
+    @property
+    def time_models(self) -> Dict[str, ScalingModel]:
+        """Return fitted time models by name.
+
+        """
+
+        self._check_is_profiled(["_time_models"])
+        return self._time_models
+
+    @property
+    def memory_models(self) -> Dict[str, ScalingModel]:
+        """Return fitted memory models by name.
+
+        """
+
+        self._check_is_profiled(["_memory_models"])
+        return self._memory_models
+
+    @property
+    def time_model(self) -> ScalingModel:
+        """Return time model with the highest coefficient of determination.
+
+        """
+
+        return self._get_best_model(self.time_models)
+
+    @property
+    def memory_model(self) -> ScalingModel:
+        """Return memory model with the highest coefficient of
+        determination.
+
+        """
+
+        return self._get_best_model(self.memory_models)
+
+    @property
+    def time_exponent(self) -> float:
+        """Return estimated exponent of execution time.
+
+        """
+
+        return estimate_exponent(self._get_profiled_sizes(),
+                                 self.measurements)
+
+    @property
+    def memory_exponent(self) -> float:
+        """Return estimated exponent of peak memory.
+
+        """
+
+        return estimate_exponent(self._get_profiled_sizes(), self.memory)
+
+    @property
+    def is_superlinear(self) -> bool:
+        """Return True if time or memory grow superlinearly.
+
+        """
+
+        exponents = [self.time_exponent]
+        if self.track_memory:
+            exponents.append(self.memory_exponent)
+
+        return any([exponent > 1 + self.threshold for exponent in exponents])
+
+    def predict(self, n_rows: int) -> ScalingPrediction:
+        """Predict execution time and peak memory for given number of rows
+        via the best fitting models.
+
+        Parameters
+        ----------
+        n_rows: int
+            Number of rows to predict for.
+
+        Returns
+        -------
+        prediction: ScalingPrediction
+            Contains time in seconds and memory in bytes. Memory is None if
+            not tracked.
+
+        """
+
+        time = self._predict(self.time_model, n_rows)
+
+        if self.track_memory:
+            memory = self._predict(self.memory_model, n_rows)
+        else:
+            memory = None
+
+        return ScalingPrediction(n_rows, time, memory)
+
+    def report(self):
+        """Print measurements, best fitting models and superlinear
+        behaviour.
+
+        """
+
+        for idx, size in enumerate(self._get_profiled_sizes()):
+            line = "{:>12d} rows: {}".format(
+                size, pretty_time_duration(self.measurements[idx]))
+            if self.track_memory:
+                line += ", {}".format(pretty_file_size(self.memory[idx]))
+            print(line)
+
+        tpl = "{} model: {} (R² {:.3f}, exponent {:.2f})"
+        print(tpl.format("Time", self.time_model.name,
+                         self.time_model.r_squared, self.time_exponent))
+
+        if self.track_memory:
+            print(tpl.format("Memory", self.memory_model.name,
+                             self.memory_model.r_squared,
+                             self.memory_exponent))
+
+        print("Superlinear: {}".format(self.is_superlinear))
+
+    def _get_sizes(self) -> List[int]:
+        """Return sorted distinct sizes of the given sizes or the geometric
+        series.
+
+        """
+
+        if self.sizes is not None:
+            sizes = self.sizes
+        else:
+            sizes = [self.start * self.factor ** step
+                     for step in range(self.steps)]
+
+        return sorted({int(round(size)) for size in sizes})
+
+    def _get_profiled_sizes(self) -> List[int]:
+        """Return profiled numbers of rows. Raises if not profiled yet.
+
+        """
+
+        self._check_is_profiled(["_sizes"])
+        return self._sizes
+
+    def _fit(self, sizes: List[int], times: List[float],
+             memory: Optional[List[int]]):
+        """Store measurements of all sizes and fit complexity models.
+
+        Parameters
+        ----------
+        sizes: list
+            Number of rows for each size.
+        times: list
+            Execution time in seconds for each size.
+        memory: list, None
+            Peak memory in bytes for each size. None if memory is not
+            tracked.
+
+        """
+
+        self._sizes = sizes
+        self._measurements = times
+        self._memory = memory
+
+        self._time_models = self._fit_models(times)
+        if memory is not None:
+            self._memory_models = self._fit_models(memory)
+        else:
+            self._memory_models = None
+
+    def _fit_models(self, values: List[float]) -> Dict[str, ScalingModel]:
+        """Fit all complexity models of `SCALING_MODELS` to given values of
+        the profiled sizes.
+
+        Parameters
+        ----------
+        values: list
+            Measured value for each profiled size.
+
+        Returns
+        -------
+        models: dict
+            Fitted `ScalingModel` by model name.
+
+        """
+
+        return OrderedDict([(name, fit_scaling_model(name, self._sizes,
+                                                     values))
+                            for name in SCALING_MODELS])
+
+    @staticmethod
+    def _get_best_model(models: Dict[str, ScalingModel]) -> ScalingModel:
+        """Return model with the highest coefficient of determination.
+        Models decreasing with size are only considered if all models
+        decrease because they yield negative extrapolations.
+
+        """
+
+        candidates = [model for model in models.values() if model.slope >= 0]
+        candidates = candidates or list(models.values())
+
+        return max(candidates, key=lambda model: model.r_squared)
+
+    @staticmethod
+    def _predict(model: ScalingModel, n_rows: int) -> float:
+        """Return value predicted by given model for given number of rows.
+
+        """
+
+        feature = SCALING_MODELS[model.name](n_rows)
+        return float(model.intercept + model.slope * feature)
+
+    @staticmethod
+    def _pretty_formatter(value: float) -> str:
+        """String formatter for human readable output of given input `value`.
+
+        Parameters
+        ----------
+        value: float
+            Numeric value to be formatted.
+
+        Returns
+        -------
+        pretty_string: str
+            Human readable representation of `value`.
+
+        """
+
+        return pretty_time_duration(value)
+
+
+class _AllocationTracker:
+    """Profile function for `sys.setprofile` observing traced memory on each
+    function call and return. Increases of traced memory are summed up to
+    approximate the total number of allocated bytes. A snapshot is taken
+    whenever traced memory exceeds the previous maximum by `resolution`
+    bytes to attribute allocations close to the peak.
+
+    """
+
+    def __init__(self, resolution: int):
+        self.resolution = resolution
+        self.last = tracemalloc.get_traced_memory()[0]
+        self.threshold = self.last + resolution
+        self.total = 0
+        self.snapshot = None
+
+    def __call__(self, frame, event, arg):
+        current = tracemalloc.get_traced_memory()[0]
+
+        if current > self.last:
+            self.total += current - self.last
+
+        if current >= self.threshold:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.threshold = current + self.resolution
+
+        self.last = current
+
+
+class AllocationProfiler(BaseProfiler):
+    """Profile memory allocations of a function call via `tracemalloc`.
+
+    In contrast to `MemoryProfiler` which samples the process memory at
+    fixed intervals, all allocations of python objects and numpy arrays are
+    traced. Hence, short allocation spikes are not missed. Three metrics are
+    reported for each call:
+
+    - Peak traced memory in excess of memory allocated before the call.
+    - Total allocated bytes approximated by summing up all increases of
+      traced memory observed on python function calls and returns. Memory
+      freed within a single call of a C function is not counted. Hence, the
+      total is a lower bound.
+    - The top allocation sites which hold memory close to the peak grouped by
+      the innermost pywrangler module and line of their traceback. If the
+      traceback does not contain any pywrangler frame, the innermost frame is
+      used.
+
+    Tracing allocations slows down execution considerably.
+
+    Parameters
+    ----------
+    func: callable
+        Callable object to be profiled.
+    repetitions: int, optional
+        Number of repetitions.
+    top: int, optional
+        Number of allocation sites to report.
+    frames: int, optional
+        Number of frames stored per allocation to find pywrangler frames.
+    resolution: int, optional
+        Bytes by which traced memory needs to exceed the previous maximum to
+        take a new snapshot for attributing allocations close to the peak.
+
+    Attributes
+    ----------
+    measurements: list
+        Peak traced memory in bytes for each repetition.
+    best: float
+        The best measurement in bytes.
+    median: float
+        The median of measurements in bytes.
+    worst: float
+        The worst measurement in bytes.
+    std: float
+        The standard deviation of measurements in bytes.
+    runs: int
+        The number of measurements.
+    totals: list
+        Total allocated bytes for each repetition.
+    total: float
+        Median of total allocated bytes.
+    sites: list
+        Top allocation sites of the last repetition.
+
+    Methods
+    -------
+    profile
+        Contains the actual profiling implementation.
+    report
+        Print report consisting of peak memory statistics, total allocated
+        bytes and top allocation sites.
+    profile_report
+        Calls profile and report in sequence.
+
+    """
+
+    def __init__(self, func: Callable, repetitions: int = 1, top: int = 10,
+                 frames: int = 25, resolution: int = 2 ** 20):
+        self.func = func
+        self.repetitions = repetitions
+        self.top = top
+        self.frames = frames
+        self.resolution = resolution
+
+    def profile(self, *args, **kwargs):
+        """Executes the actual allocation profiling.
+
+        Parameters
+        ----------
+        args: iterable, optional
+            Optional positional arguments passed to `func`.
+        kwargs: mapping, optional
+            Optional keyword arguments passed to `func`.
+
+        """
+
+        if tracemalloc.is_tracing():
+            raise RuntimeError("Allocations cannot be profiled while "
+                               "`tracemalloc` is already tracing.")
+
+        peaks = []
+        totals = []
+
+        for _ in range(self.repetitions):
+            peak, total, sites = self._trace(args, kwargs)
+            peaks.append(peak)
+            totals.append(total)
+
+        self._measurements = peaks
+        self._totals = totals
+        self._sites = sites
+
+        return self
+
+    @property
+    def less_is_better(self) -> bool:
+        """Less memory allocation is better.
+
+        """
+
+        return True
+
+    @property
+    def totals(self) -> List[int]:
+        """Returns total allocated bytes for each repetition.
+
+        """
+
+        self._check_is_profiled(["_totals"])
+        return self._totals
+
+    @property
+    def total(self) -> float:
+        """Returns median of total allocated bytes.
+
+        """
+
+        return float(np.median(self.totals))
+
+    @property
+    def sites(self) -> List[AllocationSite]:
+        """Returns top allocation sites of the last repetition ordered by
+        size.
+
+        """
+
+        self._check_is_profiled(["_sites"])
+        return self._sites
+
+    def report(self):
+        """Print report consisting of peak memory statistics, total
+        allocated bytes and top allocation sites.
+
+        """
+
+        super().report()
+
+        print("Total allocated: {}".format(
+            self._pretty_formatter(self.total)))
+
+        for site in self.sites:
+            print("{:>12} {:>6}x {}:{}".format(
+                self._pretty_formatter(site.size), site.count, site.module,
+                site.line))
+
+    def _trace(self, args, kwargs):
+        """Trace allocations of a single call and return peak, total and top
+        allocation sites.
+
+        """
+
+        gc.collect()
+        tracemalloc.start(self.frames)
+
+        try:
+            baseline = tracemalloc.take_snapshot()
+            tracker = _AllocationTracker(self.resolution)
+            start = tracemalloc.get_traced_memory()[0]
+
+            sys.setprofile(tracker)
+            try:
+                self.func(*args, **kwargs)
+            finally:
+                sys.setprofile(None)
+
+            peak = tracemalloc.get_traced_memory()[1] - start
+
+            snapshot = tracker.snapshot or tracemalloc.take_snapshot()
+            sites = self._get_sites(snapshot, baseline)
+
+        finally:
+            tracemalloc.stop()
+
+        return max(0, peak), tracker.total, sites
+
+    def _get_sites(self, snapshot: tracemalloc.Snapshot,
+                   baseline: tracemalloc.Snapshot) -> List[AllocationSite]:
+        """Group allocations of given snapshot which did not exist in
+        baseline by innermost pywrangler module and line.
+
+        """
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        snapshot = snapshot.filter_traces(filters)
+        baseline = baseline.filter_traces(filters)
+
+        sizes = OrderedDict()
+        counts = OrderedDict()
+
+        for diff in snapshot.compare_to(baseline, "traceback"):
+            if diff.size_diff <= 0:
+                continue
+
+            key = self._get_site_key(diff.traceback)
+            sizes[key] = sizes.get(key, 0) + diff.size_diff
+            counts[key] = counts.get(key, 0) + max(diff.count_diff, 0)
+
+        sites = [AllocationSite(module, line, size, counts[(module, line)])
+                 for (module, line), size in sizes.items()]
+        sites.sort(key=lambda site: site.size, reverse=True)
+
+        return sites[:self.top]
+
+    @staticmethod
+    def _get_site_key(traceback: tracemalloc.Traceback) -> Tuple[str, int]:
+        """Return module and line of the innermost pywrangler frame except
+        for this module. Fall back to the innermost frame.
+
+        """
+
+        own_file = os.path.abspath(__file__)
+
+        # frames are sorted from the most recent to the oldest before 3.7
+        frames = list(traceback)
+        if sys.version_info < (3, 7):
+            frames.reverse()
+
+        for frame in reversed(frames):
+            filename = os.path.abspath(frame.filename)
+            if filename.startswith(PACKAGE_DIR) and filename != own_file:
+                relative = os.path.relpath(filename, os.path.dirname(
+                    PACKAGE_DIR))
+                module = os.path.splitext(relative)[0].replace(os.sep, ".")
+                return module, frame.lineno
+
+        frame = frames[-1]
+        return frame.filename, frame.lineno
+
+    @staticmethod
+    def _pretty_formatter(value: float) -> str:
+        """String formatter for human readable output of given input `value`.
+
+        Parameters
+        ----------
+        value: float
+            Numeric value to be formatted.
+
+        Returns
+        -------
+        pretty_string: str
+            Human readable representation of `value`.
+
+        """
+
+        return pretty_file_size(value)
+
+
+def _get_label(frame) -> str:
+    """Return label of a python frame as `module:function`.
+
+    """
+
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", code.co_filename)
+
+    return "{}:{}".format(module, code.co_name)
+
+
+def _get_c_label(func) -> str:
+    """Return label of a builtin function as `module:qualified name`.
+
+    """
+
+    module = getattr(func, "__module__", None) or "builtins"
+    name = getattr(func, "__qualname__", None) or repr(func)
+
+    return "{}:{}".format(module, name)
+
+
+class _StackTracer:
+    """Profile function for `sys.setprofile` attributing the wall time
+    between consecutive events to the current call stack including builtin
+    functions. The time spent within the tracer itself is excluded.
+
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.times = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.last = timeit.default_timer()
+
+    def __call__(self, frame, event, arg):
+        now = timeit.default_timer()
+
+        if self.stack:
+            self.times[tuple(self.stack)] += now - self.last
+
+        if event == "call":
+            self._push(_get_label(frame))
+        elif event == "c_call":
+            if arg is not sys.setprofile:
+                self._push(_get_c_label(arg))
+        elif self.stack:
+            # return, c_return and c_exception
+            self.stack.pop()
+
+        self.last = timeit.default_timer()
+
+    def _push(self, label: str):
+        self.stack.append(label)
+        self.calls[label] += 1
+
+
+class _StackSampler(threading.Thread):
+    """Sample the python call stack of a thread at fixed intervals. Each
+    sample is weighted by the wall time elapsed since the previous sample.
+    Only frames called from `root` are recorded.
+
+    """
+
+    def __init__(self, thread_id: int, root, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.times = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last = timeit.default_timer()
+
+        while not self._stop_event.wait(self.interval):
+            now = timeit.default_timer()
+            stack = self._get_stack()
+
+            if stack:
+                self.times[stack] += now - last
+                self.calls[stack[-1]] += 1
+
+            last = now
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def _get_stack(self):
+        """Return current call stack of the sampled thread below the root
+        frame ordered from outermost to innermost frame.
+
+        """
+
+        frame = sys._current_frames().get(self.thread_id)
+
+        labels = []
+        while frame is not None and frame is not self.root:
+            labels.append(_get_label(frame))
+            frame = frame.f_back
+
+        if frame is None:
+            return ()
+
+        return tuple(reversed(labels))
+
+
+class CallProfiler(BaseProfiler):
+    """Profile which functions dominate the execution time of a function
+    call and export call stacks for flame graphs.
+
+    Two modes are supported. `deterministic` traces every python and builtin
+    function call via `sys.setprofile` which yields exact call counts but
+    slows down execution. `sampling` records the python call stack at fixed
+    intervals from a separate thread with low overhead. Builtin functions
+    are not visible in sampled stacks and their time is attributed to the
+    calling python function.
+
+    Functions are labeled as `module:function`. The own time of a function
+    excludes the time of its callees while the cumulative time includes it.
+    Times and calls are averaged across repetitions.
+
+    Parameters
+    ----------
+    func: callable
+        Callable object to be profiled.
+    repetitions: int, optional
+        Number of repetitions.
+    mode: str, optional
+        Either `deterministic` or `sampling`.
+    interval: float, optional
+        Sampling interval in seconds. Only used in `sampling` mode.
+    top: int, optional
+        Number of functions to report.
+
+    Attributes
+    ----------
+    measurements: list
+        Wall time of each repetition in seconds.
+    stacks: dict
+        Average time in seconds by call stack.
+    functions: list
+        Statistics of each function ordered by cumulative time.
+
+    Methods
+    -------
+    profile
+        Contains the actual profiling implementation.
+    report
+        Print report consisting of timing statistics and the top functions
+        by cumulative and own time.
+    profile_report
+        Calls profile and report in sequence.
+    to_collapsed
+        Return call stacks in the collapsed stack format of flame graph
+        tools.
+
+    """
+
+    def __init__(self, func: Callable, repetitions: int = 1,
+                 mode: str = "deterministic", interval: float = 0.001,
+                 top: int = 10):
+        self.func = func
+        self.repetitions = repetitions
+        self.mode = mode
+        self.interval = interval
+        self.top = top
+
+        if mode not in CALL_MODES:
+            raise ValueError("Parameter `mode` is invalid with: {}. Allowed "
+                             "arguments are: {}".format(mode, CALL_MODES))
+
+    def profile(self, *args, **kwargs):
+        """Executes the actual call profiling.
+
+        Parameters
+        ----------
+        args: iterable, optional
+            Optional positional arguments passed to `func`.
+        kwargs: mapping, optional
+            Optional keyword arguments passed to `func`.
+
+        """
+
+        measurements = []
+        stacks = defaultdict(float)
+        calls = defaultdict(float)
+
+        for _ in range(self.repetitions):
+            if self.mode == "deterministic":
+                collector, elapsed = self._trace(args, kwargs)
+            else:
+                collector, elapsed = self._sample(args, kwargs)
+
+            measurements.append(elapsed)
+
+            for stack, seconds in collector.times.items():
+                stacks[stack] += seconds / self.repetitions
+
+            for label, count in collector.calls.items():
+                calls[label] += count / self.repetitions
+
+        self._measurements = measurements
+        self._stacks = OrderedDict(sorted(stacks.items()))
+        self._calls = calls
+
+        return self
+
+    @property
+    def less_is_better(self) -> bool:
+        """Less time required is better.
+
+        """
+
+        return True
+
+    @property
+    def stacks(self) -> Dict[Tuple[str, ...], float]:
+        """Returns average time in seconds by call stack ordered from
+        outermost to innermost function.
+
+        """
+
+        self._check_is_profiled(["_stacks"])
+        return self._stacks
+
+    @property
+    def functions(self) -> List[CallStats]:
+        """Returns statistics of each function ordered by cumulative time.
+        Calls refer to the average number of calls per repetition in
+        `deterministic` mode and to the average number of samples with the
+        function being innermost in `sampling` mode.
+
+        """
+
+        own = defaultdict(float)
+        cumulative = defaultdict(float)
+
+        for stack, seconds in self.stacks.items():
+            own[stack[-1]] += seconds
+
+            # count recursive functions only once per stack
+            for label in set(stack):
+                cumulative[label] += seconds
+
+        functions = [CallStats(label, self._calls.get(label, 0),
+                               own[label], seconds)
+                     for label, seconds in cumulative.items()]
+
+        return sorted(functions, key=lambda x: x.cumulative_time,
+                      reverse=True)
+
+    def get_top(self, n: Optional[int] = None,
+                sort: str = "cumulative") -> List[CallStats]:
+        """Return top functions by cumulative or own time.
+
+        Parameters
+        ----------
+        n: int, optional
+            Number of functions. By default, `top` is used.
+        sort: str, optional
+            Either `cumulative` or `own`.
+
+        Returns
+        -------
+        functions: list
+
+        """
+
+        if sort not in ("cumulative", "own"):
+            raise ValueError("Parameter `sort` needs to be either "
+                             "'cumulative' or 'own'. '{}' was given."
+                             .format(sort))
+
+        n = self.top if n is None else n
+        key = "{}_time".format(sort)
+
+        functions = sorted(self.functions, key=lambda x: getattr(x, key),
+                           reverse=True)
+
+        return functions[:n]
+
+    def to_collapsed(self, path: Optional[str] = None,
+                     unit: float = 1e-6) -> str:
+        """Return call stacks in the collapsed stack format which flame
+        graph tools render, e.g. `flamegraph.pl` or speedscope. Each line
+        contains the semicolon separated stack from outermost to innermost
+        function followed by its own time in multiples of `unit`.
+
+        Parameters
+        ----------
+        path: str, optional
+            Path of the output file.
+        unit: float, optional
+            Unit of time in seconds. Defaults to microseconds.
+
+        Returns
+        -------
+        collapsed: str
+
+        """
+
+        lines = []
+        for stack, seconds in self.stacks.items():
+            value = int(round(seconds / unit))
+            if value > 0:
+                labels = [label.replace(";", ":") for label in stack]
+                lines.append("{} {}".format(";".join(labels), value))
+
+        collapsed = "\n".join(lines) + "\n" if lines else ""
+
+        if path:
+            with open(path, "w") as file:
+                file.write(collapsed)
+
+        return collapsed
+
+    def report(self):
+        """Print report consisting of timing statistics and the top functions
+        by cumulative and own time.
+
+        """
+
+        super().report()
+
+        tpl = "{:>12} {:>12} {:>8}  {}"
+
+        for sort in ("cumulative", "own"):
+            print("\nTop functions by {} time:".format(sort))
+            print(tpl.format("cumulative", "own", "calls", "function"))
+
+            for stats in self.get_top(sort=sort):
+                print(tpl.format(
+                    self._pretty_formatter(stats.cumulative_time),
+                    self._pretty_formatter(stats.own_time),
+                    "{:.6g}".format(stats.calls),
+                    stats.function))
+
+    def _trace(self, args, kwargs):
+        """Run `func` once with deterministic tracing.
+
+        """
+
+        tracer = _StackTracer()
+        start = timeit.default_timer()
+
+        sys.setprofile(tracer)
+        try:
+            self.func(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+
+        return tracer, timeit.default_timer() - start
+
+    def _sample(self, args, kwargs):
+        """Run `func` once while sampling its call stacks.
+
+        """
+
+        sampler = _StackSampler(threading.get_ident(), sys._getframe(),
+                                self.interval)
+
+        # the sampler only runs when the profiled thread releases the GIL
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, self.interval))
+
+        start = timeit.default_timer()
+
+        sampler.start()
+        try:
+            self.func(*args, **kwargs)
+        finally:
+            sampler.stop()
+            sys.setswitchinterval(switch_interval)
+
+        return sampler, timeit.default_timer() - start
+
+    @staticmethod
+    def _pretty_formatter(value: float) -> str:
         """String formatter for human readable output of given input `value`.
 
         Parameters
@@ -0,0 +1,475 @@
+"""This module contains a local, file based history of benchmark results
+which allows to detect regressions and improvements across runs and
+versions.
+
+Each run is appended as a single JSON line to the history file containing
+a run id, a timestamp, environment metadata (package and engine versions,
+CPU count and git revision if available), the dataset specification and
+the raw measurements of all benchmarks. Two runs are compared benchmark by
+benchmark via the Mann-Whitney U test on their measurements which matches
+the reported ratio of medians.
+
+Results of the benchmark suite are recorded via the command line, e.g.:
+
+    pywrangler-benchmark --sizes 10000 --history history.jsonl
+
+Runs are listed and compared via:
+
+    pywrangler-benchmark-compare history.jsonl
+    pywrangler-benchmark-compare history.jsonl 0.1.0 latest
+
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+import tabulate
+
+import pywrangler
+from pywrangler.benchmark import (
+    PACKAGE_DIR,
+    AllocationProfiler,
+    BaseProfiler,
+    MemoryProfiler,
+    get_ratio
+)
+from pywrangler.util._pprint import pretty_file_size, pretty_time_duration
+from pywrangler.util.stats import get_min_u_p_value, mann_whitney_u_test
+
+HistoryRun = NamedTuple("HistoryRun", [("run", str),
+                                       ("timestamp", str),
+                                       ("environment", Dict[str, Any]),
+                                       ("dataset", Dict[str, Any]),
+                                       ("results", Dict[str, Dict])])
+
+RegressionResult = NamedTuple("RegressionResult", [("name", str),
+                                                   ("baseline", float),
+                                                   ("candidate", float),
+                                                   ("ratio", float),
+                                                   ("p_value", float),
+                                                   ("status", str)])
+
+# distributions whose versions are recorded if installed
+DISTRIBUTIONS = ("numpy", "pandas", "dask", "pyspark")
+
+# units of measurements mapped to their formatter
+UNITS = {"seconds": pretty_time_duration,
+         "bytes": pretty_file_size}
+
+STATUS_REGRESSION = "regression"
+STATUS_IMPROVEMENT = "improvement"
+STATUS_UNCHANGED = "unchanged"
+STATUS_INSUFFICIENT = "insufficient samples"
+
+
+def get_git_revision() -> Optional[str]:
+    """Return the git revision of the pywrangler source tree if available.
+    Returns None if pywrangler is installed outside of its own repository,
+    e.g. into the virtual environment of another git repository.
+
+    """
+
+    def run_git(*args):
+        process = subprocess.run(["git"] + list(args),
+                                 cwd=PACKAGE_DIR,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL,
+                                 check=True)
+        return process.stdout.decode().strip()
+
+    try:
+        # an enclosing repository does not track installed packages
+        run_git("ls-files", "--error-unmatch", "__init__.py")
+        return run_git("rev-parse", "HEAD") or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_environment() -> Dict[str, Any]:
+    """Return versions of python, platform and relevant libraries along with
+    the CPU count and the git revision if available.
+
+    """
+
+    from pkg_resources import DistributionNotFound, get_distribution
+
+    environment = OrderedDict([("python", platform.python_version()),
+                               ("platform", platform.platform()),
+                               ("cpu_count", multiprocessing.cpu_count()),
+                               ("pywrangler", pywrangler.__version__)])
+
+    for distribution in DISTRIBUTIONS:
+        try:
+            environment[distribution] = get_distribution(distribution).version
+        except DistributionNotFound:
+            pass
+
+    revision = get_git_revision()
+    if revision:
+        environment["git_revision"] = revision
+
+    return environment
+
+
+def get_unit(profiler: BaseProfiler) -> str:
+    """Return unit of the measurements of given profiler. Results of
+    `pywrangler.benchmark_runner` provide their unit explicitly.
+
+    """
+
+    unit = getattr(profiler, "unit", None)
+    if unit in UNITS:
+        return unit
+
+    if isinstance(profiler, (MemoryProfiler, AllocationProfiler)):
+        return "bytes"
+
+    return "seconds"
+
+
+class ResultHistory:
+    """Append benchmark results to a JSON lines file and compare runs.
+
+    Parameters
+    ----------
+    path: str
+        Path of the JSON lines history file. It is created on first record.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def record(self, results: Mapping[str, BaseProfiler],
+               dataset: Optional[Mapping[str, Any]] = None,
+               run: Optional[str] = None) -> str:
+        """Append results of given profilers as a new run.
+
+        Parameters
+        ----------
+        results: mapping
+            Profiled profilers or results of `SubprocessRunner` by
+            benchmark name.
+        dataset: mapping, optional
+            Specification of the benchmark data.
+        run: str, optional
+            Id of the run. By default, a random id is generated.
+
+        Returns
+        -------
+        run: str
+            Id of the recorded run.
+
+        """
+
+        entries = OrderedDict()
+        for name, profiler in results.items():
+            entries[name] = self._to_entry(profiler.measurements,
+                                           profiler.less_is_better,
+                                           get_unit(profiler))
+
+        return self._append(entries, dataset, run)
+
+    def record_suite(self, suite, run: Optional[str] = None) -> str:
+        """Append results of a run benchmark suite as a new run. Each
+        combination of implementation and parameters is a benchmark.
+
+        Parameters
+        ----------
+        suite: pywrangler.benchmark_suite.IntervalIdentifierBenchmarkSuite
+            Benchmark suite which has been run.
+        run: str, optional
+            Id of the run. By default, a random id is generated.
+
+        Returns
+        -------
+        run: str
+            Id of the recorded run.
+
+        """
+
+        entries = OrderedDict()
+        for result in suite.results:
+            name = "{}[{},{},{},groups={},rows={}]".format(
+                result.implementation,
+                "first" if result.marker_start_use_first else "last",
+                "first" if result.marker_end_use_first else "last",
+                result.result_type,
+                result.groups,
+                result.rows)
+
+            entries[name] = self._to_entry(result.measurements, True,
+                                           "seconds")
+
+        return self._append(entries, suite.parameters, run)
+
+    def runs(self) -> List[HistoryRun]:
+        """Return all recorded runs in order of recording.
+
+        """
+
+        if not os.path.exists(self.path):
+            return []
+
+        with open(self.path) as file:
+            lines = [line for line in file if line.strip()]
+
+        return [HistoryRun(**json.loads(line, object_pairs_hook=OrderedDict))
+                for line in lines]
+
+    def get_run(self, selector: str) -> HistoryRun:
+        """Return the latest run matching given selector.
+
+        Parameters
+        ----------
+        selector: str
+            Either `latest`, a run id, a pywrangler version or a prefix of a
+            git revision.
+
+        Returns
+        -------
+        run: HistoryRun
+
+        """
+
+        runs = self.runs()
+
+        if selector == "latest" and runs:
+            return runs[-1]
+
+        for run in reversed(runs):
+            environment = run.environment
+            revision = environment.get("git_revision") or ""
+
+            if selector in (run.run, environment.get("pywrangler")) or \
+                    (len(selector) >= 4 and revision.startswith(selector)):
+                return run
+
+        raise ValueError("No run matches '{}' in history '{}'."
+                         .format(selector, self.path))
+
+    def compare(self, baseline: str, candidate: str = "latest",
+                alpha: float = 0.05,
+                threshold: float = 0.05) -> List[RegressionResult]:
+        """Compare all benchmarks contained in both runs via the
+        Mann-Whitney U test.
+
+        Parameters
+        ----------
+        baseline: str
+            Selector of the baseline run (see `get_run`).
+        candidate: str, optional
+            Selector of the candidate run (see `get_run`).
+        alpha: float, optional
+            Significance level.
+        threshold: float, optional
+            Minimum relative change of medians to be reported as regression
+            or improvement in addition to being significant.
+
+        Returns
+        -------
+        comparisons: list
+            Contains a `RegressionResult` for each common benchmark. The
+            ratio refers to candidate relative to baseline. For a zero
+            baseline median, the ratio is infinite or NaN and the status is
+            decided by the test alone. If the numbers of measurements are too
+            small for any p-value to fall below `alpha`, the status is
+            `insufficient samples` instead of `unchanged`.
+
+        """
+
+        baseline = self.get_run(baseline)
+        candidate = self.get_run(candidate)
+
+        comparisons = []
+
+        for name, entry in candidate.results.items():
+            if name not in baseline.results:
+                continue
+
+            before = baseline.results[name]["measurements"]
+            after = entry["measurements"]
+
+            median_before = float(np.median(before))
+            median_after = float(np.median(after))
+            ratio = get_ratio(median_after, median_before)
+            p_value = mann_whitney_u_test(after, before).p_value
+
+            # relative threshold is undefined for a zero baseline
+            relevant = median_before == 0 or abs(ratio - 1) > threshold
+
+            if get_min_u_p_value(len(after), len(before)) >= alpha:
+                status = STATUS_INSUFFICIENT
+            elif not (p_value < alpha and relevant):
+                status = STATUS_UNCHANGED
+            elif (median_after > median_before) == entry["less_is_better"]:
+                status = STATUS_REGRESSION
+            else:
+                status = STATUS_IMPROVEMENT
+
+            comparisons.append(RegressionResult(name, median_before,
+                                                median_after, ratio, p_value,
+                                                status))
+
+        return comparisons
+
+    def summary(self) -> str:
+        """Return table of all recorded runs.
+
+        """
+
+        headers = ["run", "timestamp", "pywrangler", "git", "benchmarks"]
+
+        rows = [[run.run,
+                 run.timestamp,
+                 run.environment.get("pywrangler"),
+                 (run.environment.get("git_revision") or "")[:8],
+                 len(run.results)]
+                for run in self.runs()]
+
+        return tabulate.tabulate(rows, headers=headers)
+
+    def summary_comparison(self, baseline: str, candidate: str = "latest",
+                           alpha: float = 0.05,
+                           threshold: float = 0.05) -> str:
+        """Return table of regressions and improvements between two runs.
+        Unchanged benchmarks are omitted.
+
+        """
+
+        units = self.get_run(candidate).results
+        comparisons = self.compare(baseline, candidate, alpha, threshold)
+
+        headers = ["benchmark", "baseline", "candidate", "ratio", "p-value",
+                   "status"]
+
+        rows = []
+        for comparison in comparisons:
+            if comparison.status == STATUS_UNCHANGED:
+                continue
+
+            formatter = UNITS[units[comparison.name]["unit"]]
+            rows.append([comparison.name,
+                         formatter(comparison.baseline),
+                         formatter(comparison.candidate),
+                         "{:.2f}".format(comparison.ratio),
+                         "{:.3f}".format(comparison.p_value),
+                         comparison.status])
+
+        unchanged = len(comparisons) - len(rows)
+        table = tabulate.tabulate(rows, headers=headers)
+
+        return "{}\n\n{} of {} benchmarks unchanged.".format(
+            table, unchanged, len(comparisons))
+
+    @staticmethod
+    def _to_entry(measurements: List[float], less_is_better: bool,
+                  unit: str) -> Dict[str, Any]:
+        """Return serializable entry of a single benchmark.
+
+        """
+
+        return OrderedDict([("measurements", [float(x) for x in measurements]),
+                            ("less_is_better", bool(less_is_better)),
+                            ("unit", unit)])
+
+    def _append(self, results: Dict[str, Dict],
+                dataset: Optional[Mapping[str, Any]],
+                run: Optional[str]) -> str:
+        """Append a single run as JSON line and return its id.
+
+        """
+
+        run = run or uuid.uuid4().hex[:12]
+        timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+
+        record = HistoryRun(run, timestamp, get_environment(),
+                            dict(dataset or {}), results)
+
+        with open(self.path, "a") as file:
+            file.write(json.dumps(record._asdict(), default=str) + "\n")
+
+        return run
+
+
+def parse_args(args: List[str]) -> argparse.Namespace:
+    """Parse command line parameters.
+
+    Parameters
+    ----------
+    args: list
+        Command line parameters as list of strings.
+
+    Returns
+    -------
+    namespace: argparse.Namespace
+
+    """
+
+    parser = argparse.ArgumentParser(
+        description="List recorded benchmark runs or compare two runs.")
+
+    parser.add_argument("history", help="Path of JSON lines history file.")
+    parser.add_argument("baseline", nargs="?",
+                        help="Run id, pywrangler version or git revision of "
+                             "the baseline. If omitted, runs are listed.")
+    parser.add_argument("candidate", nargs="?", default="latest",
+                        help="Run id, pywrangler version or git revision of "
+                             "the candidate.")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="Significance level.")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="Minimum relative change of medians.")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with non zero status on regressions.")
+
+    return parser.parse_args(args)
+
+
+def main(args: List[str]):
+    """List runs or print regressions and improvements between two runs.
+
+    Parameters
+    ----------
+    args: list
+        Command line parameters as list of strings.
+
+    """
+
+    args = parse_args(args)
+    history = ResultHistory(args.history)
+
+    if args.baseline is None:
+        print(history.summary())
+        return
+
+    print(history.summary_comparison(args.baseline, args.candidate,
+                                     args.alpha, args.threshold))
+
+    if args.fail_on_regression:
+        comparisons = history.compare(args.baseline, args.candidate,
+                                      args.alpha, args.threshold)
+        if any([x.status == STATUS_REGRESSION for x in comparisons]):
+            sys.exit("Benchmarks regressed.")
+
+
+def run():
+    """Entry point for console scripts.
+
+    """
+
+    main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,391 @@
+"""This module contains a benchmark runner executing each benchmark case of
+a pandas wrangler in a fresh python subprocess.
+
+Profilers of `pywrangler.benchmark` run in the caller's process. Hence,
+import state, caches, allocator fragmentation and previous runs may skew
+results. The runner isolates each case instead:
+
+- Each case is executed by a fresh interpreter via
+  `python -m pywrangler.benchmark_runner`.
+- The subprocess is optionally pinned to given CPUs via
+  `os.sched_setaffinity`.
+- Thread pools of BLAS libraries, OpenMP and Arrow are limited via
+  environment variables before any library is imported.
+- Benchmark data is generated once by the parent process and cached as a
+  pickle file which each subprocess loads before profiling.
+
+Heavy libraries like pandas are imported lazily such that subprocesses are
+pinned before any thread pool is started. Results are passed back to the
+parent as JSON and returned as `RunnerResult` instances which can be
+recorded in a result history (see `pywrangler.benchmark_history`).
+
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+from pywrangler.exceptions import NotProfiledError
+
+BenchmarkCase = NamedTuple("BenchmarkCase", [("name", str),
+                                             ("wrangler", str),
+                                             ("kwargs", Dict[str, Any]),
+                                             ("dataset", Union[str, Dict]),
+                                             ("profiler", str),
+                                             ("repetitions", int)])
+
+RunnerResult = NamedTuple("RunnerResult", [("name", str),
+                                           ("profiler", str),
+                                           ("measurements", List[float]),
+                                           ("median", float),
+                                           ("less_is_better", bool),
+                                           ("unit", str),
+                                           ("environment", Dict[str, Any])])
+
+# profilers by name mapped to their class and unit of measurements
+PROFILERS = OrderedDict([
+    ("time", ("PandasTimeProfiler", "seconds")),
+    ("memory", ("PandasMemoryProfiler", "bytes")),
+    ("allocation", ("PandasAllocationProfiler", "bytes"))
+])
+
+# environment variables limiting thread pools of BLAS libraries, OpenMP
+# (which also sizes Arrow's CPU pool), numexpr and Arrow's IO pool
+THREAD_VARIABLES = ("OMP_NUM_THREADS",
+                    "OPENBLAS_NUM_THREADS",
+                    "MKL_NUM_THREADS",
+                    "VECLIB_MAXIMUM_THREADS",
+                    "NUMEXPR_NUM_THREADS",
+                    "ARROW_IO_THREADS")
+
+
+def get_case(name: str, wrangler: str, dataset: Union[str, Dict[str, Any]],
+             kwargs: Optional[Dict[str, Any]] = None,
+             profiler: str = "time", repetitions: int = 5) -> BenchmarkCase:
+    """Create a benchmark case.
+
+    Parameters
+    ----------
+    name: str
+        Name of the benchmark case.
+    wrangler: str
+        Import path of the wrangler class, e.g.
+        `pywrangler.pandas.wranglers.interval_identifier.VectorizedCumSum`.
+    dataset: str, dict
+        Either the path of a pickled pandas dataframe or parameters of
+        `PandasMarkerGenerator`.
+    kwargs: dict, optional
+        Parameters of the wrangler. If the dataset is generated, they update
+        the generator's matching wrangler parameters.
+    profiler: str, optional
+        One of `time`, `memory` or `allocation`.
+    repetitions: int, optional
+        Number of repetitions of the profiler.
+
+    Returns
+    -------
+    case: BenchmarkCase
+
+    """
+
+    if profiler not in PROFILERS:
+        raise ValueError("Profiler '{}' is not supported. Allowed profilers "
+                         "are: {}".format(profiler, list(PROFILERS)))
+
+    return BenchmarkCase(name, wrangler, dict(kwargs or {}), dataset,
+                         profiler, repetitions)
+
+
+def get_dataset_path(dataset: Dict[str, Any], cache_dir: str) -> str:
+    """Return path of the cached pickle file of given generator parameters.
+    The data is generated and cached if the file does not exist yet.
+
+    Parameters
+    ----------
+    dataset: dict
+        Parameters of `PandasMarkerGenerator`.
+    cache_dir: str
+        Directory of cached datasets.
+
+    Returns
+    -------
+    path: str
+
+    """
+
+    from pywrangler.pandas.generator import PandasMarkerGenerator
+
+    spec = json.dumps(dataset, sort_keys=True)
+    key = hashlib.sha1(spec.encode()).hexdigest()[:16]
+    path = os.path.join(cache_dir, "markers_{}.pkl".format(key))
+
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        df = PandasMarkerGenerator(**dataset).generate()
+
+        # write atomically to prevent loading partially written files
+        temporary = "{}.{}.tmp".format(path, os.getpid())
+        df.to_pickle(temporary)
+        os.replace(temporary, path)
+
+    return path
+
+
+class SubprocessRunner:
+    """Run benchmark cases of pandas wranglers each in a fresh subprocess
+    with optional CPU affinity and limited thread pools.
+
+    Parameters
+    ----------
+    cpus: iterable, optional
+        CPUs to pin subprocesses to via `os.sched_setaffinity`. By default,
+        subprocesses are not pinned.
+    threads: int, optional
+        Number of threads of BLAS, OpenMP and Arrow thread pools. If None,
+        thread related environment variables are not modified.
+    cache_dir: str, optional
+        Directory of cached datasets. By default, a directory in the
+        system's temporary directory is used.
+    timeout: float, optional
+        Timeout of each subprocess in seconds.
+    python: str, optional
+        Python executable of subprocesses. By default, the current one.
+
+    Attributes
+    ----------
+    results: list
+        Contains a `RunnerResult` for each case of the last run.
+
+    """
+
+    def __init__(self, cpus: Optional[Sequence[int]] = None,
+                 threads: Optional[int] = 1,
+                 cache_dir: Optional[str] = None,
+                 timeout: Optional[float] = None,
+                 python: str = sys.executable):
+
+        if cpus is not None:
+            if not hasattr(os, "sched_setaffinity"):
+                raise ValueError("CPU affinity is not supported on this "
+                                 "platform.")
+
+            available = os.sched_getaffinity(0)
+            cpus = sorted(set(cpus))
+            if not cpus or not set(cpus).issubset(available):
+                raise ValueError("Parameter `cpus` needs to be a non empty "
+                                 "subset of available CPUs {}. '{}' was "
+                                 "given.".format(sorted(available), cpus))
+
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(),
+                                     "pywrangler-benchmark")
+
+        self.cpus = cpus
+        self.threads = threads
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.python = python
+
+    @property
+    def results(self) -> List[RunnerResult]:
+        """Return results of the last run.
+
+        """
+
+        if getattr(self, "_results", None) is None:
+            raise NotProfiledError("This {}'s instance is not run yet. Call "
+                                   "'run' before using this method."
+                                   .format(self.__class__.__name__))
+
+        return self._results
+
+    def run(self, cases: Sequence[BenchmarkCase]) -> 'SubprocessRunner':
+        """Run all cases sequentially. Always returns self.
+
+        Parameters
+        ----------
+        cases: iterable
+            Benchmark cases (see `get_case`).
+
+        """
+
+        self._results = [self.run_case(case) for case in cases]
+
+        return self
+
+    def run_case(self, case: BenchmarkCase) -> RunnerResult:
+        """Run a single case in a fresh subprocess.
+
+        Parameters
+        ----------
+        case: BenchmarkCase
+            Benchmark case (see `get_case`).
+
+        Returns
+        -------
+        result: RunnerResult
+
+        """
+
+        if isinstance(case.dataset, str):
+            path = case.dataset
+            kwargs = case.kwargs
+        else:
+            from pywrangler.pandas.generator import PandasMarkerGenerator
+
+            path = get_dataset_path(case.dataset, self.cache_dir)
+            kwargs = PandasMarkerGenerator(**case.dataset).wrangler_kwargs
+            kwargs.update(case.kwargs)
+
+        task = OrderedDict([("wrangler", case.wrangler),
+                            ("kwargs", kwargs),
+                            ("dataset", path),
+                            ("profiler", case.profiler),
+                            ("repetitions", case.repetitions),
+                            ("cpus", self.cpus)])
+
+        with tempfile.TemporaryDirectory() as directory:
+            task_path = os.path.join(directory, "task.json")
+            result_path = os.path.join(directory, "result.json")
+
+            with open(task_path, "w") as file:
+                json.dump(task, file)
+
+            command = [self.python, "-m", "pywrangler.benchmark_runner",
+                       task_path, result_path]
+
+            process = subprocess.run(command,
+                                     env=self._get_environment(),
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.PIPE,
+                                     timeout=self.timeout)
+
+            if process.returncode != 0:
+                raise RuntimeError("Benchmark case '{}' failed with:\n{}"
+                                   .format(case.name,
+                                           process.stderr.decode()))
+
+            with open(result_path) as file:
+                result = json.load(file)
+
+        return RunnerResult(name=case.name, profiler=case.profiler, **result)
+
+    def to_frame(self):
+        """Return results of the last run as a pandas dataframe.
+
+        """
+
+        import pandas as pd
+
+        columns = [x for x in RunnerResult._fields if x != "environment"]
+        records = [[getattr(result, column) for column in columns]
+                   for result in self.results]
+
+        return pd.DataFrame(records, columns=columns)
+
+    def _get_environment(self) -> Dict[str, str]:
+        """Return environment variables of subprocesses with limited thread
+        pools and the pywrangler package on the python path.
+
+        """
+
+        environment = dict(os.environ)
+
+        if self.threads is not None:
+            for variable in THREAD_VARIABLES:
+                environment[variable] = str(self.threads)
+
+        # ensure the same pywrangler package is importable in subprocesses
+        package_parent = os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__)))
+        python_path = environment.get("PYTHONPATH")
+        environment["PYTHONPATH"] = os.pathsep.join(
+            [package_parent] + ([python_path] if python_path else []))
+
+        return environment
+
+
+def execute(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute a single benchmark task within the subprocess and return
+    its result.
+
+    Parameters
+    ----------
+    task: dict
+        Contains import path and parameters of the wrangler, dataset path,
+        profiler name and repetitions.
+
+    Returns
+    -------
+    result: dict
+        Contains measurements, median, ranking, unit and environment.
+
+    """
+
+    import pandas as pd
+
+    from pywrangler.pandas import benchmark
+
+    module_name, class_name = task["wrangler"].rsplit(".", 1)
+    wrangler_class = getattr(importlib.import_module(module_name), class_name)
+    wrangler = wrangler_class(**task["kwargs"])
+
+    df = pd.read_pickle(task["dataset"])
+
+    profiler_name, unit = PROFILERS[task["profiler"]]
+    profiler_class = getattr(benchmark, profiler_name)
+    profiler = profiler_class(wrangler, task["repetitions"]).profile(df)
+
+    cpus = None
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+
+    threads = {variable: os.environ.get(variable)
+               for variable in THREAD_VARIABLES}
+
+    return OrderedDict([
+        ("measurements", [float(x) for x in profiler.measurements]),
+        ("median", float(profiler.median)),
+        ("less_is_better", profiler.less_is_better),
+        ("unit", unit),
+        ("environment", OrderedDict([("pid", os.getpid()),
+                                     ("cpus", cpus),
+                                     ("threads", threads)]))
+    ])
+
+
+def main(args: List[str]):
+    """Entry point of subprocesses reading the task from the JSON file
+    given as first argument and writing the result to the JSON file given
+    as second argument.
+
+    Parameters
+    ----------
+    args: list
+        Command line parameters as list of strings.
+
+    """
+
+    task_path, result_path = args
+
+    with open(task_path) as file:
+        task = json.load(file)
+
+    # pin before importing libraries which may start thread pools
+    if task["cpus"] is not None:
+        os.sched_setaffinity(0, task["cpus"])
+
+    result = execute(task)
+
+    with open(result_path, "w") as file:
+        json.dump(result, file)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
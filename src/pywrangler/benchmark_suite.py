@@ -0,0 +1,599 @@
+"""This module contains a benchmark suite comparing all implementations of
+the interval identifier wrangler across engines and parameter combinations.
+
+The suite sweeps the matrix of implementations, marker use combinations,
+result types, group counts and data sizes. For each combination, it profiles
+execution time, checks that all implementations agree on the result and
+reports results as JSON or as a summary table.
+
+The suite is available via the command line, e.g.:
+
+    pywrangler-benchmark --sizes 1000 10000 --groups 1 10 --output res.json
+
+Results are appended to a result history via `--history` (see
+`pywrangler.benchmark_history`).
+
+"""
+
+import argparse
+import importlib
+import itertools
+import json
+import sys
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import tabulate
+
+from pywrangler.benchmark_history import ResultHistory, get_environment
+from pywrangler.exceptions import NotProfiledError
+from pywrangler.generator import MARKER_VALUES
+from pywrangler.pandas.generator import PandasMarkerGenerator
+from pywrangler.util._pprint import pretty_time_duration
+
+BenchmarkResult = NamedTuple("BenchmarkResult",
+                             [("engine", str),
+                              ("implementation", str),
+                              ("marker_start_use_first", bool),
+                              ("marker_end_use_first", bool),
+                              ("result_type", str),
+                              ("groups", int),
+                              ("rows", int),
+                              ("median", float),
+                              ("best", float),
+                              ("std", float),
+                              ("runs", int),
+                              ("ratio", float),
+                              ("agrees", bool),
+                              ("measurements", List[float])])
+
+# implementations as `engine.class name` mapped to their module
+IMPLEMENTATIONS = OrderedDict([
+    ("pandas.NaiveIterator",
+     "pywrangler.pandas.wranglers.interval_identifier"),
+    ("pandas.VectorizedCumSum",
+     "pywrangler.pandas.wranglers.interval_identifier"),
+    ("pyspark.VectorizedCumSum",
+     "pywrangler.pyspark.wranglers.interval_identifier"),
+    ("pyspark.VectorizedCumSumAdjusted",
+     "pywrangler.pyspark.wranglers.interval_identifier")
+])
+
+ENGINES = ("pandas", "pyspark")
+RESULT_TYPES = ("raw", "valid", "enumerated")
+MARKER_USES = tuple(itertools.product((False, True), repeat=2))
+
+# column names and marker values of generated benchmark data
+COLUMN_GROUP = PandasMarkerGenerator.groupby_column
+COLUMN_ORDER = PandasMarkerGenerator.order_column
+COLUMN_MARKER = PandasMarkerGenerator.marker_column
+COLUMN_TARGET = "iids"
+
+MARKER_NOISE, MARKER_START, MARKER_END = MARKER_VALUES["int"]
+
+# probability of duplicated start and end markers of generated intervals
+DUPLICATE_RATE = 0.2
+
+
+def get_implementations(engines: Sequence[str] = ENGINES) -> List[str]:
+    """Return names of all implementations of given engines.
+
+    Parameters
+    ----------
+    engines: sequence, optional
+        Engines to be included.
+
+    Returns
+    -------
+    implementations: list
+
+    """
+
+    for engine in engines:
+        if engine not in ENGINES:
+            raise ValueError("Engine '{}' is not supported. Allowed engines "
+                             "are: {}".format(engine, ENGINES))
+
+    return [name for name in IMPLEMENTATIONS
+            if name.split(".")[0] in engines]
+
+
+def generate_data(rows: int, groups: int, seed: int = 0) -> pd.DataFrame:
+    """Generate synthetic marker data with given number of rows and groups
+    via `PandasMarkerGenerator`. Start and end markers are duplicated to
+    distinguish marker use combinations.
+
+    Parameters
+    ----------
+    rows: int
+        Number of rows.
+    groups: int
+        Number of groups.
+    seed: int, optional
+        Seed of the random numbers.
+
+    Returns
+    -------
+    df: pd.DataFrame
+        Contains order, group and marker columns with the order as index.
+
+    """
+
+    generator = PandasMarkerGenerator(rows, groups,
+                                      duplicate_rate=DUPLICATE_RATE,
+                                      seed=seed)
+
+    return generator.generate()
+
+
+def normalize_result(df: pd.DataFrame, iids: pd.Series,
+                     result_type: str) -> pd.Series:
+    """Normalize interval ids to allow comparing results of different
+    implementations. Raw and valid interval ids only need to distinguish
+    intervals regardless of their values. Hence, they are renumerated by
+    consecutive intervals within each group while invalid intervals of
+    valid interval ids remain 0. Enumerated interval ids are compared as they
+    are.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Benchmark data the interval ids were computed for.
+    iids: pd.Series
+        Interval ids with order as index.
+    result_type: str
+        Result type of the interval ids.
+
+    Returns
+    -------
+    normalized: pd.Series
+        Interval ids ordered by index.
+
+    """
+
+    iids = iids.sort_index().astype(int)
+
+    if result_type == "enumerated":
+        return iids
+
+    ordered = df.assign(iids=iids) \
+        .sort_values([COLUMN_GROUP, COLUMN_ORDER])
+
+    boundaries = ordered[COLUMN_GROUP].ne(ordered[COLUMN_GROUP].shift()) | \
+        ordered["iids"].ne(ordered["iids"].shift())
+
+    normalized = boundaries.cumsum().sort_index().rename(iids.name)
+
+    if result_type == "valid":
+        normalized = normalized.where(iids.ne(0), 0)
+
+    return normalized
+
+
+class IntervalIdentifierBenchmarkSuite:
+    """Benchmark all implementations of the interval identifier wrangler
+    across marker use combinations, result types, group counts and data
+    sizes.
+
+    For each combination of marker use, result type, group count and data
+    size, the execution time of each implementation is profiled via the
+    engine's time profiler. Results of all implementations are compared to
+    the result of the first implementation which serves as reference.
+
+    Parameters
+    ----------
+    sizes: sequence, optional
+        Number of rows of benchmark data.
+    groups: sequence, optional
+        Number of groups of benchmark data.
+    implementations: sequence, optional
+        Names of implementations to benchmark (see `IMPLEMENTATIONS`). By
+        default, all pandas implementations are benchmarked.
+    result_types: sequence, optional
+        Result types to benchmark.
+    marker_uses: sequence, optional
+        Tuples of `marker_start_use_first` and `marker_end_use_first` to
+        benchmark.
+    repetitions: int, optional
+        Number of repetitions of each profile.
+    seed: int, optional
+        Seed for generating benchmark data.
+    spark: pyspark.sql.SparkSession, optional
+        Spark session for pyspark implementations. If not given, the active
+        session is used or a new one is created.
+    materialization: str, optional
+        Materialization strategy of pyspark results (see
+        `pywrangler.pyspark.benchmark.materialize`).
+
+    Attributes
+    ----------
+    results: list
+        Contains a `BenchmarkResult` for each implementation and combination.
+
+    """
+
+    def __init__(self, sizes: Sequence[int] = (1000, 10000),
+                 groups: Sequence[int] = (1, 10),
+                 implementations: Optional[Sequence[str]] = None,
+                 result_types: Sequence[str] = RESULT_TYPES,
+                 marker_uses: Sequence[Tuple[bool, bool]] = MARKER_USES,
+                 repetitions: int = 5,
+                 seed: int = 0,
+                 spark=None,
+                 materialization: str = "hash"):
+
+        if implementations is None:
+            implementations = get_implementations(["pandas"])
+
+        for implementation in implementations:
+            if implementation not in IMPLEMENTATIONS:
+                raise ValueError("Implementation '{}' is not supported. "
+                                 "Allowed implementations are: {}"
+                                 .format(implementation,
+                                         list(IMPLEMENTATIONS)))
+
+        self.sizes = sizes
+        self.groups = groups
+        self.implementations = implementations
+        self.result_types = result_types
+        self.marker_uses = marker_uses
+        self.repetitions = repetitions
+        self.seed = seed
+        self.spark = spark
+        self.materialization = materialization
+
+    @property
+    def results(self) -> List[BenchmarkResult]:
+        """Return results of all benchmarks.
+
+        """
+
+        if getattr(self, "_results", None) is None:
+            raise NotProfiledError("This {}'s instance is not run yet. Call "
+                                   "'run' before using this method."
+                                   .format(self.__class__.__name__))
+
+        return self._results
+
+    def run(self) -> 'IntervalIdentifierBenchmarkSuite':
+        """Run all benchmarks. Always returns self.
+
+        """
+
+        results = []
+
+        for size, groups in itertools.product(self.sizes, self.groups):
+            df = generate_data(size, groups, self.seed)
+            inputs = self._get_inputs(df)
+
+            try:
+                for marker_use, result_type in itertools.product(
+                        self.marker_uses, self.result_types):
+                    results.extend(self._run_combination(df, inputs, groups,
+                                                         marker_use,
+                                                         result_type))
+            finally:
+                if "pyspark" in inputs:
+                    inputs["pyspark"].unpersist()
+
+        self._results = results
+
+        return self
+
+    @property
+    def parameters(self) -> Dict[str, object]:
+        """Return parameters of the suite including the specification of the
+        generated benchmark data.
+
+        """
+
+        return OrderedDict([
+            ("sizes", list(self.sizes)),
+            ("groups", list(self.groups)),
+            ("implementations", list(self.implementations)),
+            ("result_types", list(self.result_types)),
+            ("marker_uses", [list(x) for x in self.marker_uses]),
+            ("repetitions", self.repetitions),
+            ("seed", self.seed),
+            ("duplicate_rate", DUPLICATE_RATE),
+            ("materialization", self.materialization)])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return results of all benchmarks as a dataframe.
+
+        """
+
+        return pd.DataFrame([result._asdict() for result in self.results],
+                            columns=BenchmarkResult._fields)
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Return results of all benchmarks and the environment as JSON and
+        optionally write it to given path.
+
+        Parameters
+        ----------
+        path: str, optional
+            Path of JSON file.
+
+        Returns
+        -------
+        json: str
+
+        """
+
+        output = OrderedDict([
+            ("environment", get_environment()),
+            ("parameters", self.parameters),
+            ("results", [result._asdict() for result in self.results])
+        ])
+
+        dumped = json.dumps(output, indent=2, default=_to_builtin)
+
+        if path:
+            with open(path, "w") as file:
+                file.write(dumped)
+
+        return dumped
+
+    def summary(self) -> str:
+        """Return summary table of all benchmarks. The ratio refers to the
+        fastest implementation of the same combination.
+
+        """
+
+        headers = ["implementation", "start", "end", "result", "groups",
+                   "rows", "median", "std", "ratio", "agrees"]
+
+        rows = [[result.implementation,
+                 "first" if result.marker_start_use_first else "last",
+                 "first" if result.marker_end_use_first else "last",
+                 result.result_type,
+                 result.groups,
+                 result.rows,
+                 pretty_time_duration(result.median),
+                 pretty_time_duration(result.std),
+                 "{:.2f}".format(result.ratio),
+                 result.agrees]
+                for result in self.results]
+
+        return tabulate.tabulate(rows, headers=headers)
+
+    def report(self):
+        """Print summary table of all benchmarks.
+
+        """
+
+        print(self.summary())
+
+    def _get_inputs(self, df: pd.DataFrame) -> Dict[str, object]:
+        """Return benchmark data for each required engine. Spark dataframes
+        are cached.
+
+        """
+
+        engines = {name.split(".")[0] for name in self.implementations}
+
+        inputs = {}
+        if "pandas" in engines:
+            inputs["pandas"] = df
+
+        if "pyspark" in engines:
+            if self.spark is None:
+                from pyspark.sql import SparkSession
+                self.spark = SparkSession.builder.getOrCreate()
+
+            df_spark = self.spark.createDataFrame(df).cache()
+            df_spark.count()
+            inputs["pyspark"] = df_spark
+
+        return inputs
+
+    def _run_combination(self, df: pd.DataFrame, inputs: Dict[str, object],
+                         groups: int, marker_use: Tuple[bool, bool],
+                         result_type: str) -> List[BenchmarkResult]:
+        """Profile all implementations for given combination and compare
+        their results to the reference implementation.
+
+        """
+
+        kwargs = dict(marker_column=COLUMN_MARKER,
+                      marker_start=MARKER_START,
+                      marker_end=MARKER_END,
+                      marker_start_use_first=marker_use[0],
+                      marker_end_use_first=marker_use[1],
+                      orderby_columns=COLUMN_ORDER,
+                      groupby_columns=COLUMN_GROUP,
+                      result_type=result_type,
+                      target_column_name=COLUMN_TARGET)
+
+        reference = None
+        profiles = []
+
+        for implementation in self.implementations:
+            engine = implementation.split(".")[0]
+            wrangler = get_wrangler(implementation, **kwargs)
+
+            iids = self._compute(wrangler, engine, inputs[engine])
+            normalized = normalize_result(df, iids, result_type)
+
+            if reference is None:
+                reference = normalized
+
+            agrees = bool(np.array_equal(normalized.values, reference.values))
+
+            profiler = self._profile(wrangler, engine, inputs[engine])
+            profiles.append((implementation, profiler, agrees))
+
+        fastest = min([profiler.median for _, profiler, _ in profiles])
+
+        return [BenchmarkResult(implementation.split(".")[0],
+                                implementation,
+                                marker_use[0],
+                                marker_use[1],
+                                result_type,
+                                groups,
+                                len(df),
+                                float(profiler.median),
+                                float(profiler.best),
+                                float(profiler.std),
+                                profiler.runs,
+                                float(profiler.median / fastest),
+                                agrees,
+                                [float(x) for x in profiler.measurements])
+                for implementation, profiler, agrees in profiles]
+
+    @staticmethod
+    def _compute(wrangler, engine: str, df) -> pd.Series:
+        """Return interval ids of given wrangler with order as index.
+
+        """
+
+        df_result = wrangler.transform(df)
+
+        if engine == "pyspark":
+            df_result = df_result.select(COLUMN_ORDER, COLUMN_TARGET) \
+                .toPandas() \
+                .set_index(COLUMN_ORDER)
+
+        return df_result[COLUMN_TARGET]
+
+    def _profile(self, wrangler, engine: str, df):
+        """Return time profiler of given wrangler after profiling.
+
+        """
+
+        if engine == "pyspark":
+            from pywrangler.pyspark.benchmark import PySparkTimeProfiler
+            profiler = PySparkTimeProfiler(
+                wrangler, self.repetitions,
+                materialization=self.materialization)
+        else:
+            from pywrangler.pandas.benchmark import PandasTimeProfiler
+            profiler = PandasTimeProfiler(wrangler, self.repetitions)
+
+        return profiler.profile(df)
+
+
+def get_wrangler(implementation: str, **kwargs):
+    """Instantiate wrangler of given implementation with given parameters.
+
+    Parameters
+    ----------
+    implementation: str
+        Name of the implementation as `engine.class name`.
+    kwargs: dict
+        Parameters passed to the wrangler.
+
+    """
+
+    module = importlib.import_module(IMPLEMENTATIONS[implementation])
+    wrangler_class = getattr(module, implementation.split(".")[1])
+
+    return wrangler_class(**kwargs)
+
+
+def _to_builtin(value):
+    """Convert numpy scalars to python builtins for JSON serialization.
+
+    """
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    return str(value)
+
+
+def parse_args(args: List[str]) -> argparse.Namespace:
+    """Parse command line parameters.
+
+    Parameters
+    ----------
+    args: list
+        Command line parameters as list of strings.
+
+    Returns
+    -------
+    namespace: argparse.Namespace
+
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark all interval identifier implementations.")
+
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="Number of rows of benchmark data.")
+    parser.add_argument("--groups", type=int, nargs="+", default=[1, 10],
+                        help="Number of groups of benchmark data.")
+    parser.add_argument("--engines", nargs="+", default=["pandas"],
+                        choices=ENGINES, help="Engines to benchmark.")
+    parser.add_argument("--implementations", nargs="+",
+                        choices=list(IMPLEMENTATIONS),
+                        help="Implementations to benchmark. Overrides "
+                             "`--engines`.")
+    parser.add_argument("--result-types", nargs="+", default=RESULT_TYPES,
+                        choices=RESULT_TYPES, help="Result types.")
+    parser.add_argument("--repetitions", type=int, default=5,
+                        help="Number of repetitions of each profile.")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed for generating benchmark data.")
+    parser.add_argument("--materialization", default="hash",
+                        help="Materialization strategy of pyspark results.")
+    parser.add_argument("--output", help="Path of JSON output file.")
+    parser.add_argument("--history",
+                        help="Path of JSON lines history file to append "
+                             "results to. Runs are compared via "
+                             "`pywrangler-benchmark-compare`.")
+
+    return parser.parse_args(args)
+
+
+def main(args: List[str]):
+    """Run benchmark suite with given command line parameters, print the
+    summary table and write JSON output.
+
+    Parameters
+    ----------
+    args: list
+        Command line parameters as list of strings.
+
+    """
+
+    args = parse_args(args)
+
+    implementations = args.implementations or \
+        get_implementations(args.engines)
+
+    suite = IntervalIdentifierBenchmarkSuite(
+        sizes=args.sizes,
+        groups=args.groups,
+        implementations=implementations,
+        result_types=args.result_types,
+        repetitions=args.repetitions,
+        seed=args.seed,
+        materialization=args.materialization)
+
+    suite.run().report()
+
+    if args.output:
+        suite.to_json(args.output)
+
+    if args.history:
+        run_id = ResultHistory(args.history).record_suite(suite)
+        print("Recorded run '{}' in '{}'.".format(run_id, args.history))
+
+    if not all([result.agrees for result in suite.results]):
+        sys.exit("Implementations do not agree on all results.")
+
+
+def run():
+    """Entry point for console scripts.
+
+    """
+
+    main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    run()
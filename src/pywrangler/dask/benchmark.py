@@ -96,6 +96,10 @@ class DaskTimeProfiler(TimeProfiler, DaskBaseProfiler):
         Dask collections may be cached before timing execution to ensure
         timing measurements only capture wrangler's `fit_transform`. By
         default, it is disabled.
+    warmup: int, optional
+        Number of runs before measuring.
+    disable_gc: bool, optional
+        If True, the garbage collector is disabled during each measurement.
 
     Attributes
     ----------
@@ -126,12 +130,14 @@ class DaskTimeProfiler(TimeProfiler, DaskBaseProfiler):
 
     def __init__(self, wrangler: DaskWrangler,
                  repetitions: Union[None, int] = None,
-                 cache_input: bool = False):
+                 cache_input: bool = False,
+                 warmup: int = 0,
+                 disable_gc: bool = True):
         self.wrangler = wrangler
         self.cache_input = cache_input
 
         func = self._wrap_fit_transform()
-        super().__init__(func, repetitions)
+        super().__init__(func, repetitions, warmup, disable_gc)
 
     def profile(self, *dfs, **kwargs):
         """Profiles timing given input dataframes `dfs` which are passed to
@@ -0,0 +1,78 @@
+"""This module contains the synthetic marker data generator for dask.
+
+"""
+
+from typing import Optional
+
+import numpy as np
+from dask import delayed
+from dask.dataframe import DataFrame, from_delayed
+
+from pywrangler.pandas.generator import PandasMarkerGenerator
+
+
+class DaskMarkerGenerator(PandasMarkerGenerator):
+    """Generate synthetic marker data as dask dataframe. Each partition is
+    generated independently by the pandas generator for its range of rows
+    when the dataframe is computed. The global row index is used as index
+    with known divisions.
+
+    Parameters
+    ----------
+    rows: int
+        Number of rows.
+    groups: int, optional
+        Number of groups.
+    group_skew: float, optional
+        Skew of group sizes. 0 yields groups of equal expected size while
+        larger values concentrate rows in groups with low ids.
+    interval_length: tuple, optional
+        Minimum and maximum number of rows of intervals including start and
+        end markers.
+    interval_distribution: str, optional
+        Distribution of interval lengths. Either `uniform` or `geometric`.
+    noise_ratio: float, optional
+        Approximate ratio of noise rows outside of intervals.
+    duplicate_rate: float, optional
+        Probability of duplicated start and end markers per interval.
+    marker_dtype: str, optional
+        Data type of the marker column. One of `int`, `str` or `category`.
+    seed: int, optional
+        Seed of the random numbers.
+
+    """
+
+    def generate(self, npartitions: Optional[int] = None) -> DataFrame:
+        """Generate all rows lazily.
+
+        Parameters
+        ----------
+        npartitions: int, optional
+            Number of partitions. By default, one partition per one million
+            rows is used.
+
+        Returns
+        -------
+        df: dask.dataframe.DataFrame
+            Contains order, group and marker columns.
+
+        """
+
+        if npartitions is None:
+            npartitions = max(1, self.rows // 10 ** 6)
+
+        if npartitions < 1 or npartitions > max(1, self.rows):
+            raise ValueError("Parameter `npartitions` needs to be between 1 "
+                             "and the number of rows. '{}' was given."
+                             .format(npartitions))
+
+        bounds = np.linspace(0, self.rows, npartitions + 1).astype(int)
+        bounds = bounds.tolist()
+
+        partitions = [delayed(self.generate_range)(start, stop)
+                      for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        divisions = bounds[:-1] + [max(0, self.rows - 1)]
+        meta = self.generate_range(0, 0)
+
+        return from_delayed(partitions, meta=meta, divisions=divisions)
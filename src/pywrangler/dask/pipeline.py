@@ -0,0 +1,274 @@
+"""This module adds extended pipeline functionality for dask.
+
+"""
+
+from typing import List, NamedTuple, Optional
+
+import pandas as pd
+from dask.dataframe import DataFrame
+
+from pywrangler.dask.base import DaskWrangler
+from pywrangler.pipeline import (
+    TYPE_IDENTIFIER,
+    TYPE_STAGE,
+    BasePipeline,
+    BasePipelineProfiler,
+    Stage
+)
+from pywrangler.util.sanitizer import ensure_iterable
+
+StageProfile = NamedTuple("StageProfile", [("idx", str),
+                                           ("name", str),
+                                           ("total_time", float),
+                                           ("rows", int),
+                                           ("cols", int),
+                                           ("cached", bool),
+                                           ("uid", str),
+                                           ("partitions", int),
+                                           ("tasks", int)])
+
+StageDescription = NamedTuple("StageDescription", [("idx", str),
+                                                   ("name", str),
+                                                   ("doc", str),
+                                                   ("cols", int),
+                                                   ("cached", bool),
+                                                   ("uid", str),
+                                                   ("partitions", int),
+                                                   ("tasks", int),
+                                                   ("estimated_size", int),
+                                                   ("estimated_rows", int)])
+
+
+class PipelineCacher:
+    """Composite for `DaskPipeline` that handles stage caching on pipeline
+    level. Stage results with caching enabled are persisted via `persist()`
+    while transforming. Subsequent stages are built on top of the persisted
+    result.
+
+    """
+
+    def __init__(self, pipeline: 'DaskPipeline'):
+        """Pipeline cacher keeps track of stages for which caching is enabled
+        via `self._store`.
+
+        Parameters
+        ----------
+        pipeline: DaskPipeline
+            Parent pipeline object to be composite of.
+
+        """
+
+        self.pipeline = pipeline
+        self._store = set()
+
+    def enable(self, stages: List[TYPE_IDENTIFIER]) -> None:
+        """Enable pipeline caching for given stages. Stage can be identified
+        via index, identifier or stage itself.
+
+        If pipeline was already transformed, persists existing stage results.
+        However, `transform` has to be called again for subsequent stages to
+        respect caching changes.
+
+        Parameters
+        ----------
+        stages: iterable
+            Iterable of int, str or Stage.
+
+        """
+
+        stages = ensure_iterable(stages)
+
+        for stage in stages:
+            idx = self.pipeline._loc.get_index_location(stage)
+            self._store.add(idx)
+
+            transformer = self.pipeline._transformer
+            if transformer:
+                df = transformer.transformations[idx]
+                transformer.transformations[idx] = self.persist(df)
+
+    def disable(self, stages: List[TYPE_IDENTIFIER]) -> None:
+        """Disable pipeline caching for given stages. Stage can be identified
+        via index, identifier or stage itself.
+
+        Persisted results are released once they are not referenced anymore.
+        Hence, `transform` has to be called again to respect caching changes.
+
+        Parameters
+        ----------
+        stages: iterable
+            Iterable of int, str or Stage.
+
+        """
+
+        stages = ensure_iterable(stages)
+
+        for stage in stages:
+            idx = self.pipeline._loc.get_index_location(stage)
+
+            try:
+                self._store.remove(idx)
+            except KeyError:
+                raise ValueError("'{}' does not exist in cache and hence"
+                                 "cannot be disabled.".format(stage))
+
+    def clear(self) -> None:
+        """Remove all stage caches on pipeline level.
+
+        """
+
+        self._store.clear()
+
+    @staticmethod
+    def persist(df: DataFrame) -> DataFrame:
+        """Persist given stage dataframe.
+
+        """
+
+        return df.persist()
+
+    def is_enabled(self, idx: int) -> bool:
+        """Return if pipeline caching is enabled for stage at index location
+        `idx`.
+
+        """
+
+        return idx in self._store
+
+    @property
+    def enabled(self) -> List[Stage]:
+        """Return all stages with caching enabled on pipeline level
+        in correct order.
+
+        """
+
+        return [self.pipeline.stages[idx]
+                for idx in sorted(self._store)]
+
+
+class DaskPipelineProfiler(BasePipelineProfiler):
+    """Profiles and describes dask pipelines. Stage results are lazily
+    evaluated. Hence, profiling computes each stage result separately.
+
+    """
+
+    def _get_stage_profile(self, df_stage: DataFrame,
+                           idx: Optional[int] = None) -> StageProfile:
+        """Profile pipeline stage's dataframe and collect index, identifier,
+        total time to compute the number of rows, number of columns,
+        partitions and graph tasks and caching.
+
+        Parameters
+        ----------
+        df_stage: dask.dataframe.DataFrame
+            Dataframe representation of stage.
+        idx: integer, None, optional
+            If idx is given, resembles a valid pipeline stage. If not,
+            represents input dataframe.
+
+        Returns
+        -------
+        profile: StageProfile
+
+        """
+
+        stage_properties = self._get_stage_properties(df_stage, idx)
+
+        ts_start = pd.Timestamp.now()
+        rows = len(df_stage)
+        ts_end = pd.Timestamp.now()
+        total_time = (ts_end - ts_start).total_seconds()
+
+        return StageProfile(str(idx),
+                            stage_properties.name,
+                            total_time,
+                            rows,
+                            stage_properties.cols,
+                            stage_properties.cached,
+                            stage_properties.uid,
+                            df_stage.npartitions,
+                            len(df_stage.__dask_graph__()))
+
+    def _get_stage_description(self, df_stage: DataFrame,
+                               idx: Optional[int] = None) -> StageDescription:
+        """Describe pipeline stages and collect index, identifier, number of
+        columns, doc string, caching, number of partitions and graph tasks.
+        Sizes and row counts are not estimated because this requires
+        computation. No computation is triggered.
+
+        Parameters
+        ----------
+        df_stage: dask.dataframe.DataFrame
+            Dataframe representation of stage.
+        idx: integer, None, optional
+            If idx is given, resembles a valid pipeline stage. If not,
+            represents input dataframe.
+
+        Returns
+        -------
+        description: StageDescription
+
+        """
+
+        stage_properties = self._get_stage_properties(df_stage, idx)
+
+        if idx is not None:
+            doc_string = self.pipeline.stages[idx].__doc__
+        else:
+            doc_string = ""
+
+        return StageDescription(str(idx),
+                                stage_properties.name,
+                                doc_string,
+                                stage_properties.cols,
+                                stage_properties.cached,
+                                stage_properties.uid,
+                                df_stage.npartitions,
+                                len(df_stage.__dask_graph__()),
+                                None,
+                                None)
+
+
+class DaskPipeline(BasePipeline):
+    """Represents a pipeline of dask wranglers and native python functions
+    with the same stage identifiers, stage access and `profile`/`describe`
+    output as the pyspark pipeline (see `pywrangler.pyspark.pipeline`).
+
+    Stage results may be cached via `cache` which persists them with
+    `persist()` while transforming.
+
+    Parameters
+    ----------
+    stages: iterable
+        Contains the stages for the pipeline.
+    doc: str, optional
+        Provide optional doc string for the pipeline.
+
+    """
+
+    wrangler_class = DaskWrangler
+    profiler_class = DaskPipelineProfiler
+
+    def __init__(self, stages: List[TYPE_STAGE], doc: Optional[str] = None):
+
+        super().__init__(stages, doc)
+
+        self.cache = PipelineCacher(self)
+
+    def _finalize_stage(self, df: DataFrame, idx: int) -> DataFrame:
+        """Persist stage result if caching is enabled.
+
+        """
+
+        if self.cache.is_enabled(idx):
+            return self.cache.persist(df)
+
+        return df
+
+    def _is_cached(self, idx: Optional[int]) -> bool:
+        """Stage results are cached only if pipeline caching is enabled. The
+        input dataframe is never cached.
+
+        """
+
+        return idx is not None and self.cache.is_enabled(idx)
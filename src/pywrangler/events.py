@@ -0,0 +1,328 @@
+"""This module contains the event surface of pipelines and wranglers. Stage
+and wrangler executions emit events (e.g. start, end, plan metrics,
+materialization time and row counts) to all registered sinks. Sinks export
+events, e.g. to a JSON lines file or in the Prometheus text exposition
+format.
+
+Events are only created if at least one sink is registered. Otherwise,
+emitting events costs a single truthiness check.
+
+"""
+
+import contextlib
+import json
+import numbers
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+
+Event = NamedTuple("Event", [("name", str),
+                             ("timestamp", float),
+                             ("fields", Dict[str, Any])])
+
+# registered sinks, modified via `add_sink` and `remove_sink`
+_SINKS = []
+
+# event names emitted by pywrangler
+PIPELINE_START = "pipeline_start"
+PIPELINE_END = "pipeline_end"
+STAGE_START = "stage_start"
+STAGE_END = "stage_end"
+STAGE_PLAN = "stage_plan"
+STAGE_MATERIALIZATION = "stage_materialization"
+WRANGLER_START = "wrangler_start"
+WRANGLER_END = "wrangler_end"
+
+# low cardinality string fields exported as labels by `PrometheusSink`
+PROMETHEUS_LABELS = ("stage", "idx", "wrangler", "engine", "materialization")
+
+
+class BaseSink:
+    """Base class defining the interface for all event sinks.
+
+    Subclasses have to implement `emit` which receives each event. Sinks may
+    be called from multiple threads concurrently.
+
+    """
+
+    def emit(self, event: Event):
+        """Receive a single event.
+
+        Parameters
+        ----------
+        event: Event
+            Emitted event containing name, unix timestamp and fields.
+
+        """
+
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources held by the sink.
+
+        """
+
+        pass
+
+
+class JsonLinesSink(BaseSink):
+    """Append each event as a single JSON object to a file. The JSON object
+    contains the event name, the unix timestamp and all event fields.
+
+    Parameters
+    ----------
+    path: str
+        Path of the JSON lines file. Events are appended if the file exists.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    def emit(self, event: Event):
+        """Append given event as JSON line and flush the file.
+
+        """
+
+        record = OrderedDict([("event", event.name),
+                              ("timestamp", event.timestamp)])
+        record.update(event.fields)
+
+        line = json.dumps(record, default=str)
+
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        """Close the JSON lines file.
+
+        """
+
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusSink(BaseSink):
+    """Aggregate events into metrics and render them in the Prometheus text
+    exposition format.
+
+    Each event field named `duration` is aggregated into a summary named
+    `<prefix>_<event>_duration_seconds` (sum and count). All other numeric
+    fields are exported as gauges named `<prefix>_<event>_<field>` holding
+    the most recent value. String fields contained in `labels` are used as
+    labels while all other string fields are ignored. Fields with a new value
+    per run like pipeline or stage uids are excluded by default because each
+    distinct label value creates a new time series.
+
+    If a path is given, metrics are written to the file after each event
+    which allows to export metrics via the node exporter's textfile
+    collector. The file is replaced atomically.
+
+    Parameters
+    ----------
+    path: str, optional
+        Path of the exposition file.
+    prefix: str, optional
+        Prefix of all metric names.
+    labels: iterable, optional
+        Names of string fields used as labels. Defaults to
+        `PROMETHEUS_LABELS`.
+
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 prefix: str = "pywrangler",
+                 labels: Iterable[str] = PROMETHEUS_LABELS):
+        self.path = path
+        self.prefix = prefix
+        self.labels = frozenset(labels)
+
+        self._lock = threading.Lock()
+        self._summaries = OrderedDict()
+        self._gauges = OrderedDict()
+
+    def emit(self, event: Event):
+        """Aggregate numeric fields of given event into summaries and gauges
+        and rewrite the exposition file if a path is given.
+
+        """
+
+        labels = tuple(sorted((key, value)
+                              for key, value in event.fields.items()
+                              if key in self.labels and
+                              isinstance(value, str)))
+
+        with self._lock:
+            for key, value in event.fields.items():
+                if not isinstance(value, numbers.Number) or \
+                        isinstance(value, bool) or value != value:
+                    continue
+
+                if key == "duration":
+                    name = self._get_name(event.name, "duration_seconds")
+                    summary = self._summaries.setdefault(name, {})
+                    total, count = summary.get(labels, (0., 0))
+                    summary[labels] = (total + value, count + 1)
+                else:
+                    name = self._get_name(event.name, key)
+                    self._gauges.setdefault(name, {})[labels] = value
+
+            if self.path:
+                self._write()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Returns
+        -------
+        exposition: str
+
+        """
+
+        lines = []
+
+        for name, summary in self._summaries.items():
+            lines.append("# TYPE {} summary".format(name))
+            for labels, (total, count) in summary.items():
+                lines.append(self._format(name + "_sum", labels, total))
+                lines.append(self._format(name + "_count", labels, count))
+
+        for name, gauge in self._gauges.items():
+            lines.append("# TYPE {} gauge".format(name))
+            for labels, value in gauge.items():
+                lines.append(self._format(name, labels, value))
+
+        return "\n".join(lines) + "\n"
+
+    def _write(self):
+        """Write rendered metrics to a temporary file which atomically
+        replaces the exposition file.
+
+        """
+
+        tmp_path = "{}.tmp".format(self.path)
+        with open(tmp_path, "w") as file:
+            file.write(self.render())
+
+        os.replace(tmp_path, self.path)
+
+    def _get_name(self, event: str, field: str) -> str:
+        """Return metric name of given event and field while replacing
+        characters not allowed in metric names with underscores.
+
+        """
+
+        name = "{}_{}_{}".format(self.prefix, event, field)
+        return re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+
+    @staticmethod
+    def _format(name: str, labels: Tuple[Tuple[str, str]],
+                value: float) -> str:
+        """Return a single sample line consisting of metric name, escaped
+        label values and value.
+
+        """
+
+        if labels:
+            escaped = [(key, value.replace("\\", "\\\\")
+                        .replace("\n", "\\n")
+                        .replace('"', '\\"'))
+                       for key, value in labels]
+            formatted = ",".join('{}="{}"'.format(key, value)
+                                 for key, value in escaped)
+            name = "{}{{{}}}".format(name, formatted)
+
+        return "{} {}".format(name, repr(float(value)))
+
+
+def add_sink(sink: BaseSink):
+    """Register given sink to receive all subsequent events.
+
+    """
+
+    if sink not in _SINKS:
+        _SINKS.append(sink)
+
+
+def remove_sink(sink: BaseSink):
+    """Unregister given sink.
+
+    """
+
+    if sink not in _SINKS:
+        raise ValueError("Sink '{}' is not registered.".format(sink))
+
+    _SINKS.remove(sink)
+
+
+def get_sinks() -> List[BaseSink]:
+    """Return all registered sinks.
+
+    """
+
+    return list(_SINKS)
+
+
+@contextlib.contextmanager
+def use_sinks(*sinks: BaseSink) -> Iterator[None]:
+    """Register given sinks within the context only. Sinks are not closed
+    when leaving the context.
+
+    """
+
+    for sink in sinks:
+        add_sink(sink)
+
+    try:
+        yield
+    finally:
+        for sink in sinks:
+            if sink in _SINKS:
+                remove_sink(sink)
+
+
+def is_enabled() -> bool:
+    """Return if at least one sink is registered. Should be checked before
+    computing expensive event fields.
+
+    """
+
+    return bool(_SINKS)
+
+
+def emit(name: str, **fields):
+    """Emit event with given name and fields to all registered sinks. Does
+    nothing if no sink is registered.
+
+    Parameters
+    ----------
+    name: str
+        Name of the event.
+    fields: dict
+        Event fields. Numeric fields represent metrics while string fields
+        identify the source of the event (e.g. stage name and uid).
+
+    """
+
+    if not _SINKS:
+        return
+
+    event = Event(name, time.time(), fields)
+
+    for sink in list(_SINKS):
+        sink.emit(event)
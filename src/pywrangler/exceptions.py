@@ -11,3 +11,13 @@ class NotProfiledError(ValueError, AttributeError):
     exception handling
 
     """
+
+
+class PerformanceBudgetError(AssertionError):
+    """Exception class to raise if a wrangler exceeds its performance budget
+    or baseline.
+
+    This class inherits from AssertionError to be reported as a test failure
+    by test frameworks.
+
+    """
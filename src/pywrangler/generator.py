@@ -0,0 +1,224 @@
+"""This module contains the engine independent specification of synthetic
+marker data used as benchmark input for interval identifier wranglers.
+
+Every row is a pure function of its global row index and the seed. Hence,
+engines generate identical data independently per partition without
+passing data through the driver (see `pandas.generator`, `dask.generator`
+and `pyspark.generator`).
+
+The row index space is divided into slots of equal size. Each slot belongs
+to a single group and contains exactly one interval beginning at the first
+row of the slot followed by noise rows. Within each group, rows are ordered
+by the row index. The group of each slot is drawn with controllable skew,
+the interval length is drawn from a uniform or geometric distribution and
+start and end markers are duplicated with a given rate. Random numbers are
+derived from the slot index via the splitmix64 hash function which is
+implemented identically for all engines:
+
+    x = (slot * STREAMS + stream + 1) * GOLDEN_GAMMA + seed * SEED_STRIDE
+    z = (x ^ (x >> 30)) * MIX_1
+    z = (z ^ (z >> 27)) * MIX_2
+    u = ((z ^ (z >> 31)) >> 11) / 2 ** 53
+
+with all operations modulo 2 ** 64.
+
+"""
+
+import math
+from typing import Any, Dict, Tuple
+
+MARKER_DTYPES = ("int", "str", "category")
+INTERVAL_DISTRIBUTIONS = ("uniform", "geometric")
+
+# marker values of noise, start and end for each marker dtype
+MARKER_VALUES = {"int": (0, 1, 2),
+                 "str": ("noise", "start", "end"),
+                 "category": ("noise", "start", "end")}
+
+# random streams derived from the slot index
+STREAMS = 4
+STREAM_GROUP = 0
+STREAM_LENGTH = 1
+STREAM_DUPLICATE_START = 2
+STREAM_DUPLICATE_END = 3
+
+# splitmix64 constants
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+MIX_1 = 0xBF58476D1CE4E5B9
+MIX_2 = 0x94D049BB133111EB
+SEED_STRIDE = 0x632BE59BD9B4E019
+
+# minimum interval length for duplicated markers
+MIN_LENGTH_DUPLICATES = 4
+
+
+class BaseMarkerGenerator:
+    """Base class defining the specification of synthetic marker data for
+    all engines.
+
+    Subclasses have to implement `generate`. The resulting data contains an
+    order column (the global row index), a group column and a marker column.
+
+    Parameters
+    ----------
+    rows: int
+        Number of rows.
+    groups: int, optional
+        Number of groups.
+    group_skew: float, optional
+        Skew of group sizes. The group of each slot is computed as
+        `floor(groups * u ** (1 + group_skew))` with `u` being uniformly
+        distributed. Hence, 0 yields groups of equal expected size while
+        larger values concentrate rows in groups with low ids.
+    interval_length: tuple, optional
+        Minimum and maximum number of rows of intervals including start and
+        end markers.
+    interval_distribution: str, optional
+        Distribution of interval lengths. Either `uniform` or `geometric`.
+        The geometric distribution has its mean at the center of
+        `interval_length` and is truncated at the maximum length.
+    noise_ratio: float, optional
+        Approximate ratio of noise rows outside of intervals. The ratio is
+        at least one minus the ratio of the mean and the maximum interval
+        length because all slots have equal size.
+    duplicate_rate: float, optional
+        Probability of an additional start marker following the start marker
+        and, independently, of an additional end marker preceding the end
+        marker of each interval with at least 4 rows.
+    marker_dtype: str, optional
+        Data type of the marker column. One of `int`, `str` or `category`.
+    seed: int, optional
+        Seed of the random numbers.
+
+    """
+
+    order_column = "order"
+    groupby_column = "group"
+    marker_column = "marker"
+
+    def __init__(self, rows: int,
+                 groups: int = 1,
+                 group_skew: float = 0.,
+                 interval_length: Tuple[int, int] = (2, 10),
+                 interval_distribution: str = "uniform",
+                 noise_ratio: float = 0.5,
+                 duplicate_rate: float = 0.,
+                 marker_dtype: str = "int",
+                 seed: int = 0):
+
+        self.rows = rows
+        self.groups = groups
+        self.group_skew = group_skew
+        self.interval_length = tuple(interval_length)
+        self.interval_distribution = interval_distribution
+        self.noise_ratio = noise_ratio
+        self.duplicate_rate = duplicate_rate
+        self.marker_dtype = marker_dtype
+        self.seed = seed
+
+        self._validate()
+
+    def generate(self, *args, **kwargs):
+        """Generate marker data for the specific engine.
+
+        """
+
+        raise NotImplementedError
+
+    @property
+    def slot_size(self) -> int:
+        """Return the number of rows of each slot which contains one interval
+        followed by noise rows.
+
+        """
+
+        _, high = self.interval_length
+        mean = self.mean_interval_length
+        size = math.ceil(mean / (1 - self.noise_ratio))
+
+        return max(high, size)
+
+    @property
+    def mean_interval_length(self) -> float:
+        """Return the mean of the untruncated interval length distribution.
+
+        """
+
+        low, high = self.interval_length
+        return (low + high) / 2
+
+    @property
+    def geometric_probability(self) -> float:
+        """Return the success probability of the geometric distribution of
+        interval lengths in excess of the minimum length.
+
+        """
+
+        low, _ = self.interval_length
+        return 1 / (self.mean_interval_length - low + 1)
+
+    @property
+    def marker_values(self) -> Tuple[Any, Any, Any]:
+        """Return values of noise, start and end markers.
+
+        """
+
+        return MARKER_VALUES[self.marker_dtype]
+
+    @property
+    def wrangler_kwargs(self) -> Dict[str, Any]:
+        """Return parameters of interval identifier wranglers matching the
+        generated data.
+
+        """
+
+        _, start, end = self.marker_values
+
+        return dict(marker_column=self.marker_column,
+                    marker_start=start,
+                    marker_end=end,
+                    orderby_columns=self.order_column,
+                    groupby_columns=self.groupby_column)
+
+    def _validate(self):
+        """Check parameters and raise ValueError if invalid.
+
+        """
+
+        if self.rows < 0 or self.groups < 1:
+            raise ValueError("Parameter `rows` needs to be non negative and "
+                             "`groups` needs to be positive. '{}' and '{}' "
+                             "were given.".format(self.rows, self.groups))
+
+        if self.group_skew < 0:
+            raise ValueError("Parameter `group_skew` needs to be non "
+                             "negative. '{}' was given."
+                             .format(self.group_skew))
+
+        low, high = self.interval_length
+        if not 2 <= low <= high:
+            raise ValueError("Parameter `interval_length` needs to contain "
+                             "minimum and maximum length with a minimum of "
+                             "2. '{}' was given."
+                             .format(self.interval_length))
+
+        if self.interval_distribution not in INTERVAL_DISTRIBUTIONS:
+            raise ValueError("Parameter `interval_distribution` is invalid "
+                             "with: {}. Allowed arguments are: {}"
+                             .format(self.interval_distribution,
+                                     INTERVAL_DISTRIBUTIONS))
+
+        if not 0 <= self.noise_ratio < 1:
+            raise ValueError("Parameter `noise_ratio` needs to be between 0 "
+                             "(inclusive) and 1 (exclusive). '{}' was given."
+                             .format(self.noise_ratio))
+
+        if not 0 <= self.duplicate_rate <= 1:
+            raise ValueError("Parameter `duplicate_rate` needs to be between "
+                             "0 and 1. '{}' was given."
+                             .format(self.duplicate_rate))
+
+        if self.marker_dtype not in MARKER_DTYPES:
+            raise ValueError("Parameter `marker_dtype` is invalid with: {}. "
+                             "Allowed arguments are: {}"
+                             .format(self.marker_dtype, MARKER_DTYPES))
@@ -2,12 +2,18 @@
 
 """
 
-from typing import Union
+from typing import Iterable, Union
 
 import numpy as np
 import pandas as pd
 
-from pywrangler.benchmark import MemoryProfiler, TimeProfiler
+from pywrangler.benchmark import (
+    AllocationProfiler,
+    CallProfiler,
+    MemoryProfiler,
+    ScalingProfiler,
+    TimeProfiler
+)
 from pywrangler.pandas.base import PandasWrangler
 from pywrangler.util import sanitizer
 
@@ -23,6 +29,10 @@ class PandasTimeProfiler(TimeProfiler):
     repetitions: None, int, optional
         Number of repetitions. If `None`, `timeit.Timer.autorange` will
         determine a sensible default.
+    warmup: int, optional
+        Number of runs before measuring.
+    disable_gc: bool, optional
+        If True, the garbage collector is disabled during each measurement.
 
     Attributes
     ----------
@@ -52,9 +62,12 @@ class PandasTimeProfiler(TimeProfiler):
     """
 
     def __init__(self, wrangler: PandasWrangler,
-                 repetitions: Union[None, int] = None):
+                 repetitions: Union[None, int] = None,
+                 warmup: int = 0,
+                 disable_gc: bool = True):
         self._wrangler = wrangler
-        super().__init__(wrangler.fit_transform, repetitions)
+        super().__init__(wrangler.fit_transform, repetitions, warmup,
+                         disable_gc)
 
 
 class PandasMemoryProfiler(MemoryProfiler):
@@ -78,7 +91,11 @@ class PandasMemoryProfiler(MemoryProfiler):
         The number of measurements for memory profiling.
     interval: float, optional
         Defines interval duration between consecutive memory usage
-        measurements in seconds.
+        measurements in seconds. Only used in `sampling` mode.
+    mode: str, optional
+        Either `sampling` or `fork`. In `fork` mode, each repetition runs in
+        a forked child process and the output memory usage is computed from
+        the same run (see `MemoryProfiler`).
 
     Attributes
     ----------
@@ -117,10 +134,10 @@ class PandasMemoryProfiler(MemoryProfiler):
     """
 
     def __init__(self, wrangler: PandasWrangler, repetitions: int = 5,
-                 interval: float = 0.01):
+                 interval: float = 0.01, mode: str = "sampling"):
         self._wrangler = wrangler
 
-        super().__init__(wrangler.fit_transform, repetitions, interval)
+        super().__init__(wrangler.fit_transform, repetitions, interval, mode)
 
     def profile(self, *dfs: pd.DataFrame, **kwargs):
         """Profiles the actual memory usage given input dataframes `dfs`
@@ -131,6 +148,12 @@ class PandasMemoryProfiler(MemoryProfiler):
         # usage input
         self._usage_input = self._memory_usage_dfs(*dfs)
 
+        # usage output is computed by profiled runs in fork mode
+        if self.mode == "fork":
+            super().profile(*dfs, **kwargs)
+            self._usage_output = self.outputs[-1]
+            return self
+
         # usage output
         dfs_output = self._wrangler.fit_transform(*dfs)
         dfs_output = sanitizer.ensure_iterable(dfs_output)
@@ -174,6 +197,13 @@ class PandasMemoryProfiler(MemoryProfiler):
 
         return self.median / self.input
 
+    def _measure_output(self, result) -> int:
+        """Return memory usage of the output dataframes in bytes.
+
+        """
+
+        return self._memory_usage_dfs(*sanitizer.ensure_iterable(result))
+
     @staticmethod
     def _memory_usage_dfs(*dfs: pd.DataFrame) -> int:
         """Return memory usage in bytes for all given dataframes.
@@ -194,3 +224,197 @@ class PandasMemoryProfiler(MemoryProfiler):
                       for df in dfs]
 
         return int(np.sum(mem_usages))
+
+
+class PandasScalingProfiler(ScalingProfiler):
+    """Profile execution time and peak memory of a pandas wrangler
+    instance's `fit_transform` over a geometric series of input sizes and fit
+    complexity models to predict time and memory for arbitrary input sizes.
+
+    Input dataframes are created for each size via the `generate` callable
+    passed to `profile`, e.g. a `PandasMarkerGenerator` for interval
+    identifiers:
+
+    >>> profiler = PandasScalingProfiler(wrangler)
+    >>> profiler.profile(lambda n: PandasMarkerGenerator(n).generate())
+    >>> profiler.predict(10 ** 8)
+
+    Parameters
+    ----------
+    wrangler: pywrangler.wranglers.pandas.base.PandasWrangler
+        The wrangler instance to be profiled.
+    sizes: iterable, optional
+        Number of rows of each input. If not given, a geometric series is
+        derived from `start`, `factor` and `steps`.
+    start: int, optional
+        Number of rows of the smallest input.
+    factor: float, optional
+        Growth factor of the geometric series.
+    steps: int, optional
+        Number of sizes of the geometric series.
+    repetitions: None, int, optional
+        Number of timing repetitions per size following a single warmup
+        call.
+    track_memory: bool, optional
+        If True, peak memory is traced via `tracemalloc`.
+    threshold: float, optional
+        Behaviour is flagged superlinear if the estimated exponent of time
+        or memory exceeds 1 by more than `threshold`.
+
+    """
+
+    def __init__(self, wrangler: PandasWrangler,
+                 sizes: Union[None, Iterable[int]] = None,
+                 start: int = 1000,
+                 factor: float = 2,
+                 steps: int = 5,
+                 repetitions: Union[None, int] = 3,
+                 track_memory: bool = True,
+                 threshold: float = 0.25):
+        self._wrangler = wrangler
+
+        super().__init__(wrangler.fit_transform, sizes, start, factor, steps,
+                         repetitions, track_memory, threshold)
+
+
+class PandasAllocationProfiler(AllocationProfiler):
+    """Trace allocations of a pandas wrangler instance's `fit_transform` via
+    `tracemalloc` and attribute them to pywrangler modules and lines.
+
+    In addition to peak traced memory, total allocated bytes and top
+    allocation sites, both are standardized by the memory usage of the input
+    dataframes. `copies` estimates how many full copies of the input were
+    allocated in total. Hence, an additional reindexing of the input shows up
+    as an increase of `copies` even if it does not increase the peak.
+
+    Parameters
+    ----------
+    wrangler: pywrangler.wranglers.pandas.base.PandasWrangler
+        The wrangler instance to be profiled.
+    repetitions: int, optional
+        Number of repetitions.
+    top: int, optional
+        Number of allocation sites to report.
+    frames: int, optional
+        Number of frames stored per allocation to find pywrangler frames.
+    resolution: int, optional
+        Bytes by which traced memory needs to exceed the previous maximum to
+        take a new snapshot for attributing allocations close to the peak.
+
+    Attributes
+    ----------
+    measurements: list
+        Peak traced memory in bytes for each repetition.
+    total: float
+        Median of total allocated bytes.
+    sites: list
+        Top allocation sites of the last repetition.
+    input: int
+        Memory usage of input dataframes in bytes.
+    ratio: float
+        Peak traced memory in units of input memory usage.
+    copies: float
+        Total allocated bytes in units of input memory usage.
+
+    """
+
+    def __init__(self, wrangler: PandasWrangler, repetitions: int = 1,
+                 top: int = 10, frames: int = 25, resolution: int = 2 ** 20):
+        self._wrangler = wrangler
+
+        super().__init__(wrangler.fit_transform, repetitions, top, frames,
+                         resolution)
+
+    def profile(self, *dfs: pd.DataFrame, **kwargs):
+        """Trace allocations given input dataframes `dfs` which are passed to
+        `fit_transform`.
+
+        """
+
+        self._usage_input = PandasMemoryProfiler._memory_usage_dfs(*dfs)
+
+        super().profile(*dfs, **kwargs)
+
+        return self
+
+    @property
+    def input(self) -> int:
+        """Returns the memory usage of the input dataframes in bytes.
+
+        """
+
+        self._check_is_profiled(['_usage_input'])
+        return self._usage_input
+
+    @property
+    def ratio(self) -> float:
+        """Returns peak traced memory in units of input memory usage.
+
+        """
+
+        return self.median / self.input
+
+    @property
+    def copies(self) -> float:
+        """Returns total allocated bytes in units of input memory usage which
+        approximates the number of full copies of the input.
+
+        """
+
+        return self.total / self.input
+
+    def report(self):
+        """Print report consisting of peak memory statistics, total allocated
+        bytes, input relative metrics and top allocation sites.
+
+        """
+
+        print("Input: {}".format(self._pretty_formatter(self.input)))
+        print("Peak ratio: {:.2f}".format(self.ratio))
+        print("Copies: {:.2f}".format(self.copies))
+
+        super().report()
+
+
+class PandasCallProfiler(CallProfiler):
+    """Profile which functions dominate the execution time of a pandas
+    wrangler instance's `fit_transform` and export call stacks for flame
+    graphs.
+
+    In `deterministic` mode, every python and builtin function call is
+    traced. This reveals row wise loops, e.g. calls of `_is_start` in
+    `NaiveIterator`, and expensive pandas internals like
+    `groupby.transform` or `reindex`. `sampling` mode has low overhead and
+    is suited for large inputs.
+
+    Parameters
+    ----------
+    wrangler: pywrangler.wranglers.pandas.base.PandasWrangler
+        The wrangler instance to be profiled.
+    repetitions: int, optional
+        Number of repetitions.
+    mode: str, optional
+        Either `deterministic` or `sampling`.
+    interval: float, optional
+        Sampling interval in seconds. Only used in `sampling` mode.
+    top: int, optional
+        Number of functions to report.
+
+    Attributes
+    ----------
+    measurements: list
+        Wall time of each repetition in seconds.
+    stacks: dict
+        Average time in seconds by call stack.
+    functions: list
+        Statistics of each function ordered by cumulative time.
+
+    """
+
+    def __init__(self, wrangler: PandasWrangler, repetitions: int = 1,
+                 mode: str = "deterministic", interval: float = 0.001,
+                 top: int = 10):
+        self._wrangler = wrangler
+
+        super().__init__(wrangler.fit_transform, repetitions, mode, interval,
+                         top)
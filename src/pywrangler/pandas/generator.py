@@ -0,0 +1,188 @@
+"""This module contains the synthetic marker data generator for pandas.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+from pywrangler.generator import (
+    GOLDEN_GAMMA,
+    MIN_LENGTH_DUPLICATES,
+    MIX_1,
+    MIX_2,
+    SEED_STRIDE,
+    STREAM_DUPLICATE_END,
+    STREAM_DUPLICATE_START,
+    STREAM_GROUP,
+    STREAM_LENGTH,
+    STREAMS,
+    BaseMarkerGenerator
+)
+
+
+def uniform(slots: np.ndarray, stream: int, seed: int) -> np.ndarray:
+    """Derive uniformly distributed random numbers in [0, 1) from given slot
+    indices via the splitmix64 hash function (see `pywrangler.generator`).
+
+    Parameters
+    ----------
+    slots: np.ndarray
+        Slot indices.
+    stream: int
+        Random stream of the slot.
+    seed: int
+        Seed of the random numbers.
+
+    Returns
+    -------
+    uniform: np.ndarray
+
+    """
+
+    with np.errstate(over="ignore"):
+        x = slots.astype(np.uint64) * np.uint64(STREAMS) + \
+            np.uint64(stream + 1)
+        x = x * np.uint64(GOLDEN_GAMMA) + \
+            np.uint64(seed * SEED_STRIDE % 2 ** 64)
+        z = (x ^ (x >> np.uint64(30))) * np.uint64(MIX_1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX_2)
+        z = z ^ (z >> np.uint64(31))
+
+    return (z >> np.uint64(11)).astype(np.float64) * 2. ** -53
+
+
+class PandasMarkerGenerator(BaseMarkerGenerator):
+    """Generate synthetic marker data as pandas dataframe in a vectorized
+    fashion. Any range of rows can be generated independently via
+    `generate_range` which is used to generate dask partitions.
+
+    Parameters
+    ----------
+    rows: int
+        Number of rows.
+    groups: int, optional
+        Number of groups.
+    group_skew: float, optional
+        Skew of group sizes. 0 yields groups of equal expected size while
+        larger values concentrate rows in groups with low ids.
+    interval_length: tuple, optional
+        Minimum and maximum number of rows of intervals including start and
+        end markers.
+    interval_distribution: str, optional
+        Distribution of interval lengths. Either `uniform` or `geometric`.
+    noise_ratio: float, optional
+        Approximate ratio of noise rows outside of intervals.
+    duplicate_rate: float, optional
+        Probability of duplicated start and end markers per interval.
+    marker_dtype: str, optional
+        Data type of the marker column. One of `int`, `str` or `category`.
+    seed: int, optional
+        Seed of the random numbers.
+
+    """
+
+    def generate(self) -> pd.DataFrame:
+        """Generate all rows.
+
+        Returns
+        -------
+        df: pd.DataFrame
+            Contains order, group and marker columns.
+
+        """
+
+        return self.generate_range(0, self.rows)
+
+    def generate_range(self, start: int, stop: int) -> pd.DataFrame:
+        """Generate rows with global row index in [start, stop). The row
+        index is used as dataframe index and order column.
+
+        Parameters
+        ----------
+        start: int
+            First row index (inclusive).
+        stop: int
+            Last row index (exclusive).
+
+        Returns
+        -------
+        df: pd.DataFrame
+            Contains order, group and marker columns.
+
+        """
+
+        index = np.arange(start, stop, dtype=np.int64)
+        slots, offsets = np.divmod(index, self.slot_size)
+
+        groups = self._get_groups(slots)
+        codes = self._get_marker_codes(slots, offsets)
+
+        noise, start_value, end_value = self.marker_values
+        if self.marker_dtype == "category":
+            markers = pd.Categorical.from_codes(
+                codes, categories=[noise, start_value, end_value])
+        else:
+            markers = np.array([noise, start_value, end_value])[codes]
+
+        return pd.DataFrame({self.order_column: index,
+                             self.groupby_column: groups,
+                             self.marker_column: markers},
+                            index=index,
+                            columns=[self.order_column,
+                                     self.groupby_column,
+                                     self.marker_column])
+
+    def _get_groups(self, slots: np.ndarray) -> np.ndarray:
+        """Return group of each slot.
+
+        """
+
+        random = uniform(slots, STREAM_GROUP, self.seed)
+        groups = np.floor(self.groups * random ** (1 + self.group_skew))
+
+        return np.minimum(groups, self.groups - 1).astype(np.int64)
+
+    def _get_lengths(self, slots: np.ndarray) -> np.ndarray:
+        """Return interval length of each slot.
+
+        """
+
+        low, high = self.interval_length
+        random = uniform(slots, STREAM_LENGTH, self.seed)
+
+        if low == high:
+            return np.full(len(slots), low, dtype=np.int64)
+
+        if self.interval_distribution == "uniform":
+            lengths = low + np.floor(random * (high - low + 1))
+        else:
+            probability = self.geometric_probability
+            lengths = low + np.floor(np.log1p(-random) /
+                                     np.log1p(-probability))
+
+        return np.minimum(lengths, high).astype(np.int64)
+
+    def _get_marker_codes(self, slots: np.ndarray,
+                          offsets: np.ndarray) -> np.ndarray:
+        """Return marker codes with 0 for noise, 1 for start and 2 for end
+        markers.
+
+        """
+
+        lengths = self._get_lengths(slots)
+
+        duplicable = lengths >= MIN_LENGTH_DUPLICATES
+        random_start = uniform(slots, STREAM_DUPLICATE_START, self.seed)
+        random_end = uniform(slots, STREAM_DUPLICATE_END, self.seed)
+        duplicate_start = duplicable & (random_start < self.duplicate_rate)
+        duplicate_end = duplicable & (random_end < self.duplicate_rate)
+
+        is_start = (offsets == 0) | (duplicate_start & (offsets == 1))
+        is_end = (offsets == lengths - 1) | \
+            (duplicate_end & (offsets == lengths - 2))
+
+        codes = np.zeros(len(offsets), dtype=np.int8)
+        codes[is_start] = 1
+        codes[is_end] = 2
+
+        return codes
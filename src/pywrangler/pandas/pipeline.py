@@ -0,0 +1,275 @@
+"""This module adds extended pipeline functionality for pandas.
+
+"""
+
+from typing import List, NamedTuple, Optional, Set
+
+import pandas as pd
+
+from pywrangler.pandas.base import PandasWrangler
+from pywrangler.pipeline import (
+    TYPE_STAGE,
+    BasePipeline,
+    BasePipelineProfiler
+)
+
+StageProfile = NamedTuple("StageProfile", [("idx", str),
+                                           ("name", str),
+                                           ("total_time", float),
+                                           ("rows", int),
+                                           ("cols", int),
+                                           ("cached", bool),
+                                           ("uid", str),
+                                           ("memory", int),
+                                           ("memory_delta", int)])
+
+StageDescription = NamedTuple("StageDescription", [("idx", str),
+                                                   ("name", str),
+                                                   ("doc", str),
+                                                   ("cols", int),
+                                                   ("cached", bool),
+                                                   ("uid", str),
+                                                   ("estimated_size", int),
+                                                   ("estimated_rows", int)])
+
+
+class PipelinePruner:
+    """Composite for `PandasPipeline` that drops columns from stage results
+    which are neither read by any subsequent stage nor part of the final
+    result to reduce memory usage of intermediate stage results.
+
+    Columns read by stages are declared via `input_columns` of wranglers or
+    an `input_columns` attribute of python functions. If any subsequent stage
+    does not declare its input columns, no columns are dropped.
+
+    """
+
+    def __init__(self, pipeline: 'PandasPipeline',
+                 output_columns: Optional[List[str]] = None):
+        """
+
+        Parameters
+        ----------
+        pipeline: PandasPipeline
+            Parent pipeline object to be composite of.
+        output_columns: list, optional
+            Columns of the final result. If not given, pruning is disabled.
+
+        """
+
+        self.pipeline = pipeline
+        self.output_columns = output_columns
+
+    @property
+    def enabled(self) -> bool:
+        """Return if pruning is enabled.
+
+        """
+
+        return self.output_columns is not None
+
+    def get_required_columns(self, idx: int) -> Optional[Set[str]]:
+        """Return all columns required after stage at index location `idx`.
+
+        Returns
+        -------
+        required: set, None
+            Output columns and input columns of all subsequent stages. None,
+            if pruning is disabled or any subsequent stage does not declare
+            its input columns.
+
+        """
+
+        if not self.enabled:
+            return None
+
+        required = set(self.output_columns)
+        for stage in self.pipeline.stages[idx + 1:]:
+            input_columns = stage.input_columns
+            if input_columns is None:
+                return None
+
+            required.update(input_columns)
+
+        return required
+
+    def prune(self, df: pd.DataFrame, idx: int) -> pd.DataFrame:
+        """Drop all columns from the result of stage at index location `idx`
+        which are not required anymore.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Result of stage.
+        idx: int
+            Index location of stage.
+
+        Returns
+        -------
+        df_pruned: pd.DataFrame
+
+        """
+
+        required = self.get_required_columns(idx)
+        if required is None:
+            return df
+
+        columns = [column for column in df.columns if column not in required]
+        if not columns:
+            return df
+
+        return df.drop(columns=columns)
+
+
+class PandasPipelineProfiler(BasePipelineProfiler):
+    """Profiles and describes pandas pipelines. All stage results are in
+    memory. Hence, wall time of each stage is measured while transforming
+    and memory usage is computed exactly.
+
+    """
+
+    def _get_stage_profile(self, df_stage: pd.DataFrame,
+                           idx: Optional[int] = None) -> StageProfile:
+        """Profile pipeline stage's dataframe and collect index, identifier,
+        wall time, number of rows and columns, memory usage and the change
+        of memory usage compared to the predecessor.
+
+        Memory usage refers to `memory_usage(deep=True)` of the stage's
+        resulting dataframe. Hence, `memory_delta` is the difference of
+        memory usage between the stage's result and its predecessor's result
+        and not the memory consumed while executing the stage (e.g.
+        temporary copies). Use `PandasMemoryProfiler` or
+        `PandasAllocationProfiler` to measure the latter.
+
+        Parameters
+        ----------
+        df_stage: pd.DataFrame
+            Dataframe representation of stage.
+        idx: integer, None, optional
+            If idx is given, resembles a valid pipeline stage. If not,
+            represents input dataframe.
+
+        Returns
+        -------
+        profile: StageProfile
+
+        """
+
+        stage_properties = self._get_stage_properties(df_stage, idx)
+        transformer = self.pipeline._transformer
+
+        memory = self._get_memory_usage(df_stage)
+
+        if idx is None:
+            total_time = 0.
+            memory_delta = 0
+        else:
+            if idx == 0:
+                df_predecessor = transformer.input_df
+            else:
+                df_predecessor = transformer.transformations[idx - 1]
+
+            total_time = transformer.timings[idx]
+            memory_delta = memory - self._get_memory_usage(df_predecessor)
+
+        return StageProfile(str(idx),
+                            stage_properties.name,
+                            total_time,
+                            len(df_stage),
+                            stage_properties.cols,
+                            stage_properties.cached,
+                            stage_properties.uid,
+                            memory,
+                            memory_delta)
+
+    def _get_stage_description(self, df_stage: pd.DataFrame,
+                               idx: Optional[int] = None) -> StageDescription:
+        """Describe pipeline stages and collect index, identifier, number of
+        columns, doc string, caching, memory usage and number of rows.
+
+        Parameters
+        ----------
+        df_stage: pd.DataFrame
+            Dataframe representation of stage.
+        idx: integer, None, optional
+            If idx is given, resembles a valid pipeline stage. If not,
+            represents input dataframe.
+
+        Returns
+        -------
+        description: StageDescription
+
+        """
+
+        stage_properties = self._get_stage_properties(df_stage, idx)
+
+        if idx is not None:
+            doc_string = self.pipeline.stages[idx].__doc__
+        else:
+            doc_string = ""
+
+        return StageDescription(str(idx),
+                                stage_properties.name,
+                                doc_string,
+                                stage_properties.cols,
+                                stage_properties.cached,
+                                stage_properties.uid,
+                                self._get_memory_usage(df_stage),
+                                len(df_stage))
+
+    @staticmethod
+    def _get_memory_usage(df: pd.DataFrame) -> int:
+        """Return memory usage of given dataframe in bytes including index
+        and object values.
+
+        """
+
+        return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class PandasPipeline(BasePipeline):
+    """Represents a pipeline of pandas wranglers and native python functions
+    with the same stage identifiers, stage access and `profile`/`describe`
+    output as the pyspark pipeline (see `pywrangler.pyspark.pipeline`).
+
+    All stage results are kept in memory. The `profile` method reports wall
+    time of each stage and the change of memory usage between consecutive
+    stage results. Columns which are neither read by
+    subsequent stages nor part of the final result can be dropped after each
+    stage via `pruner` to save memory.
+
+    Parameters
+    ----------
+    stages: iterable
+        Contains the stages for the pipeline.
+    doc: str, optional
+        Provide optional doc string for the pipeline.
+    output_columns: list, optional
+        Columns of the final result. If given, enables pruning of columns
+        which are not required anymore.
+
+    """
+
+    wrangler_class = PandasWrangler
+    profiler_class = PandasPipelineProfiler
+
+    def __init__(self, stages: List[TYPE_STAGE], doc: Optional[str] = None,
+                 output_columns: Optional[List[str]] = None):
+
+        super().__init__(stages, doc)
+
+        self.pruner = PipelinePruner(self, output_columns)
+
+    def _finalize_stage(self, df: pd.DataFrame, idx: int) -> pd.DataFrame:
+        """Drop columns which are not required anymore.
+
+        """
+
+        return self.pruner.prune(df, idx)
+
+    def _is_cached(self, idx: Optional[int]) -> bool:
+        """All stage results are kept in memory.
+
+        """
+
+        return idx is not None
@@ -53,20 +53,28 @@ class _BaseIntervalIdentifier(PandasSingleNoFit, IntervalIdentifier):
         """
 
         # check input
-        self._validate_input(df)
+        with self._phase("validate"):
+            self._validate_input(df)
 
         # transform
-        df_ordered = util.sort_values(df, self.orderby_columns, self.ascending)
-        df_grouped = util.groupby(df_ordered, self.groupby_columns)
+        with self._phase("sort"):
+            df_ordered = util.sort_values(df, self.orderby_columns,
+                                          self.ascending)
 
-        df_result = df_grouped[self.marker_column] \
-            .transform(self._transform) \
-            .astype(int) \
-            .reindex(df.index) \
-            .to_frame(self.target_column_name)
+        with self._phase("groupby"):
+            df_grouped = util.groupby(df_ordered, self.groupby_columns)
+
+        with self._phase("transform"):
+            iids = df_grouped[self.marker_column].transform(self._transform)
+
+        with self._phase("reindex"):
+            df_result = iids.astype(int) \
+                .reindex(df.index) \
+                .to_frame(self.target_column_name)
 
         # check output
-        self._validate_output_shape(df, df_result)
+        with self._phase("validate_output"):
+            self._validate_output_shape(df, df_result)
 
         return df_result
 
@@ -0,0 +1,732 @@
+"""This module contains computation engine independent pipeline functionality
+which is shared by the pandas and dask pipelines. It resembles the pyspark
+pipeline (see `pywrangler.pyspark.pipeline`) regarding stage identifiers,
+stage access and the output of `profile` and `describe`.
+
+"""
+
+import copy
+import inspect
+import uuid
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union
+)
+
+import numpy as np
+import pandas as pd
+
+from pywrangler import events
+from pywrangler.base import BaseWrangler
+
+TYPE_STAGE = Union[BaseWrangler, Callable, 'Stage']
+TYPE_IDENTIFIER = Union[int, str, 'Stage', slice]
+
+StageProperties = NamedTuple("StageProperties", [("name", str),
+                                                 ("cols", int),
+                                                 ("cached", bool),
+                                                 ("uid", str)])
+
+ERR_TYPE_ACCESS = "Value has incorrect type '{}' (integer or string allowed)."
+
+
+class Stage:
+    """Wrap a wrangler or a native python function as a pipeline stage with
+    a unique identifier and accessible parameters. Keyword arguments of python
+    functions and configuration of wranglers are available via `get_params`
+    and `set_params`.
+
+    Unique identifiers are created in the same way as for pyspark
+    transformers: the stage's name followed by a random suffix.
+
+    Parameters
+    ----------
+    stage: BaseWrangler, callable
+        Wrangler instance or native python function. Functions expect the
+        first parameter to be positional representing the input dataframe.
+        Wranglers are copied to leave the original instance unchanged.
+
+    """
+
+    def __init__(self, stage: TYPE_STAGE):
+
+        if isinstance(stage, BaseWrangler):
+            self._wrangler = copy.deepcopy(stage)
+            self._func = None
+            self._params = self._wrangler.get_params()
+            self.name = stage.__class__.__name__
+
+        elif inspect.isfunction(stage):
+            signature = inspect.signature(stage)
+            params = signature.parameters.values()
+
+            self._wrangler = None
+            self._func = stage
+            self._params = {x.name: x.default for x in params
+                            if not x.default == inspect._empty}
+            self.name = stage.__name__
+
+        else:
+            raise ValueError(
+                "Stage needs to be a wrangler or a native python function. "
+                "However, '{}' was given.".format(type(stage)))
+
+        self.uid = "{}_{}".format(self.name, uuid.uuid4().hex[-12:])
+        self.__doc__ = stage.__doc__
+
+    @property
+    def wrangler(self) -> Optional[BaseWrangler]:
+        """Return wrapped wrangler instance or None for python functions.
+
+        """
+
+        return self._wrangler
+
+    @property
+    def input_columns(self) -> Optional[List[str]]:
+        """Return all columns read by the stage. Wranglers declare their input
+        columns via `input_columns`. Python functions may provide an
+        `input_columns` attribute. Returns None if unknown.
+
+        """
+
+        if self._wrangler is not None:
+            self._wrangler.set_params(**self._params)
+            return self._wrangler.input_columns
+
+        return getattr(self._func, "input_columns", None)
+
+    def get_params(self) -> Dict[str, Any]:
+        """Retrieve all stage parameters.
+
+        Returns
+        -------
+        param_dict: dictionary
+
+        """
+
+        return self._params.copy()
+
+    def set_params(self, **params) -> 'Stage':
+        """Set stage parameters.
+
+        Parameters
+        ----------
+        params: dict
+            Dictionary containing new values to be updated on stage. Keys
+            have to match parameter names of stage.
+
+        Returns
+        -------
+        self
+
+        """
+
+        for key in params:
+            if key not in self._params:
+                raise ValueError("Invalid parameter {} for stage {}. Check "
+                                 "the list of available parameters with "
+                                 "`stage.get_params().keys()`."
+                                 .format(key, self.uid))
+
+        self._params.update(params)
+
+        return self
+
+    def transform(self, df: Any) -> Any:
+        """Apply stage transformation with current parameters.
+
+        Pandas and dask wranglers return only their target columns. Hence,
+        the wrangler's result is joined onto the input dataframe to keep all
+        other columns available for subsequent stages, which resembles
+        pyspark wranglers adding columns via `withColumn`. Existing columns
+        with the same name are replaced.
+
+        Parameters
+        ----------
+        df: Any
+            Input dataframe.
+
+        Returns
+        -------
+        df: Any
+
+        """
+
+        if self._wrangler is not None:
+            self._wrangler.set_params(**self._params)
+            df_result = self._wrangler.transform(df)
+
+            columns = {column: df_result[column]
+                       for column in df_result.columns}
+            return df.assign(**columns)
+
+        return self._func(df, **self._params)
+
+    def __repr__(self):
+        return self.uid
+
+
+class PipelineLocator:
+    """Composite for pipelines that manages position and label based access
+    of pipeline stages and corresponding dataframe transformations.
+
+    Position based access is equivalent to index location lookup. Label based
+    access is equivalent to identifier lookup.
+
+    """
+
+    def __init__(self, pipeline: 'BasePipeline'):
+        """Pipeline locator keeps track of stage's identifier-idx mapping via
+        `self.identifiers`.
+
+        Parameters
+        ----------
+        pipeline: BasePipeline
+            Parent pipeline object to be composite of.
+
+        """
+
+        self.pipeline = pipeline
+
+        enumerated = enumerate(self.pipeline.stages)
+        self.identifiers = {stage.uid: idx for idx, stage in enumerated}
+
+    def search_validate_identifier(self, identifier: str) -> str:
+        """Search stages by given `identifier`. Matching is case
+        insensitive and substring equality suffices.
+
+        If none or more than one stage matches, raises error.
+
+        Parameters
+        ----------
+        identifier: str
+            Identifier to match against all stage identifiers.
+
+        Returns
+        -------
+        stage_identifier: str
+            Full identifier for selected stage.
+
+        """
+
+        stages = [x for x in self.identifiers.keys()
+                  if identifier.lower() in x.lower()]
+
+        if not stages:
+            raise ValueError(
+                "Stage with identifier `{identifier}` not found. "
+                "Possible identifiers are {options}."
+                .format(identifier=identifier,
+                        options=self.identifiers.keys()))
+
+        if len(stages) > 1:
+            raise ValueError(
+                "Identifier is ambiguous. More than one stage identified: {}"
+                .format(stages))
+
+        return stages[0]
+
+    def get_index_location(self, value: TYPE_IDENTIFIER) -> int:
+        """Return validated stage index location.
+
+        Parameters
+        ----------
+        value: int, str, Stage
+            If string is provided, checks for matching stage identifier. If
+            integer is provided, checks out of range error. If stage is
+            provided, checks if stage is part of pipeline.
+
+        Returns
+        -------
+        idx: int
+            Index location of selected stage.
+
+        """
+
+        if isinstance(value, str):
+            validated = self.search_validate_identifier(value)
+            return self.identifiers[validated]
+
+        elif isinstance(value, int):
+            stage_cnt = len(self.identifiers)
+            if value > stage_cnt:
+                raise IndexError(
+                    "Pipeline has only {} stages.".format(stage_cnt))
+            return value
+
+        elif isinstance(value, Stage):
+            if value not in self.pipeline.stages:
+                raise ValueError("Stage '{}' is not part of pipeline"
+                                 .format(value))
+            return self.pipeline.stages.index(value)
+
+        else:
+            raise ValueError(ERR_TYPE_ACCESS.format(type(value)))
+
+    def get_stage(self, value: TYPE_IDENTIFIER) -> Stage:
+        """Return pipeline stage for given index or stage identifier.
+
+        Parameters
+        ----------
+        value: int, str, Stage
+            Identifies stage via index location or identifier substring.
+
+        Returns
+        -------
+        stage: Stage
+
+        """
+
+        idx = self.get_index_location(value)
+        return self.pipeline.stages[idx]
+
+    def get_transformation(self, value: TYPE_IDENTIFIER) -> Any:
+        """Return pipeline stage's transformation for given index or
+        stage identifier.
+
+        Parameters
+        ----------
+        value: int, str
+            Identifies stage via index location or identifier substring.
+
+        Returns
+        -------
+        df: Any
+
+        """
+
+        transformer = self.pipeline._transformer
+
+        if not transformer:
+            raise ValueError("Dataframe representation of selected stage is "
+                             "not available yet. Please execute pipeline "
+                             "first via `transform`.")
+
+        idx = self.get_index_location(value)
+
+        return transformer.transformations[idx]
+
+
+class PipelineTransformer:
+    """Composite for pipelines which applies stage transformations in order
+    and keeps track of all intermediate stage results and their wall time.
+    Engine specific handling of stage results (e.g. caching or pruning) is
+    delegated to the pipeline's `_finalize_stage` method. Stage start and end
+    are emitted as events to registered sinks (see `pywrangler.events`).
+
+    """
+
+    def __init__(self, pipeline: 'BasePipeline'):
+        """
+
+        Parameters
+        ----------
+        pipeline: BasePipeline
+            Parent pipeline object to be composite of.
+
+        """
+
+        self.pipeline = pipeline
+        self.transformations = []
+        self.timings = []
+        self.input_df = None
+
+    def transform(self, df: Any) -> Any:
+        """Apply all stage transformations in order.
+
+        Parameters
+        ----------
+        df: Any
+            Input dataframe.
+
+        Returns
+        -------
+        df: Any
+            Result of the last stage.
+
+        """
+
+        self.input_df = df
+        self.transformations = []
+        self.timings = []
+
+        for idx, stage in enumerate(self.pipeline.stages):
+            fields = {"stage": stage.name, "uid": stage.uid, "idx": str(idx)}
+            events.emit(events.STAGE_START, **fields)
+
+            ts_start = pd.Timestamp.now()
+            df = stage.transform(df)
+            df = self.pipeline._finalize_stage(df, idx)
+            ts_end = pd.Timestamp.now()
+
+            total_time = (ts_end - ts_start).total_seconds()
+
+            if events.is_enabled():
+                if isinstance(df, pd.DataFrame):
+                    fields["rows"] = len(df)
+
+                events.emit(events.STAGE_END, duration=total_time, **fields)
+
+            self.transformations.append(df)
+            self.timings.append(total_time)
+
+        return df
+
+    def __iter__(self) -> Iterator:
+        """Allow transformer to be iterated to return all stage results.
+
+        """
+
+        return iter(self.transformations)
+
+    def __bool__(self) -> bool:
+        """Transformer is considered True once pipeline was executed.
+
+        """
+
+        return len(self.transformations) > 0
+
+
+class BasePipelineProfiler:
+    """Defines common methods to profile and describe pipelines of all
+    computation engines. Subclasses implement `_get_stage_profile` and
+    `_get_stage_description`.
+
+    """
+
+    # estimated size ratios between consecutive stages to flag volume changes
+    explosion_threshold = 2.0
+    shrinkage_threshold = 0.5
+
+    def __init__(self, pipeline: 'BasePipeline'):
+        """
+
+        Parameters
+        ----------
+        pipeline: BasePipeline
+            Pipeline object to be profiled.
+
+        """
+
+        self.pipeline = pipeline
+
+    def profile(self, df: Optional[Any] = None) -> pd.DataFrame:
+        """Profiles each pipeline stage and provides information about
+        execution time and stage dataframe shape.
+
+        Parameters
+        ----------
+        df: Any, optional
+            If provided, profiles pipeline on given dataframe. If not given,
+            uses already existing pipeline transformer object.
+
+        Returns
+        -------
+        profile: pd.DataFrame
+
+        """
+
+        return self._execute("profile", df)
+
+    def describe(self, df: Optional[Any] = None) -> pd.DataFrame:
+        """Describes each pipeline stage and provides information about
+        number of columns, docs and estimated sizes. In addition, flags data
+        explosion or shrinkage based on estimated sizes of consecutive
+        stages.
+
+        Parameters
+        ----------
+        df: Any, optional
+            If provided, describes pipeline on given dataframe. If not given,
+            uses already existing pipeline transformer object.
+
+        Returns
+        -------
+        description: pd.DataFrame
+
+        """
+
+        descriptions = self._execute("describe", df)
+
+        return self._add_volume_changes(descriptions)
+
+    def _add_volume_changes(self, descriptions: pd.DataFrame) -> pd.DataFrame:
+        """Add the ratio of estimated sizes between each stage and its
+        predecessor via `size_ratio`. Flag data explosion and shrinkage via
+        `volume_change` based on `explosion_threshold` and
+        `shrinkage_threshold`.
+
+        Parameters
+        ----------
+        descriptions: pd.DataFrame
+            Stage descriptions containing estimated sizes.
+
+        Returns
+        -------
+        descriptions: pd.DataFrame
+
+        """
+
+        sizes = descriptions["estimated_size"].astype(float)
+        ratios = sizes / sizes.shift(1)
+
+        conditions = [ratios >= self.explosion_threshold,
+                      ratios <= self.shrinkage_threshold]
+        choices = ["explosion", "shrinkage"]
+
+        descriptions["size_ratio"] = ratios
+        descriptions["volume_change"] = np.select(conditions, choices, "")
+
+        return descriptions
+
+    def _execute(self, method: str, df: Optional[Any] = None) -> pd.DataFrame:
+        """Generic function to either describe or profile given pipeline.
+
+        Parameters
+        ----------
+        method: str
+            Choose either `describe` or `profile`.
+        df: Any, optional
+            If provided, profiles pipeline on given dataframe. If not given,
+            uses already existing pipeline transformer object.
+
+        """
+
+        methods = {
+            "describe": self._get_stage_description,
+            "profile": self._get_stage_profile
+        }
+
+        caller = methods[method]
+
+        # ensure existing input dataframe
+        if df is None and not self.pipeline._transformer:
+            raise ValueError("Please provide input dataframe via `df` "
+                             "or run `transform` method first.")
+
+        if df is not None:
+            self.pipeline.transform(df)
+
+        transformer = self.pipeline._transformer
+
+        results = [caller(transformer.input_df)]
+        for idx, df_stage in enumerate(transformer):
+            results.append(caller(df_stage, idx))
+
+        results = [result._asdict() for result in results]
+        return pd.DataFrame(results)
+
+    def _get_stage_properties(self, df_stage: Any,
+                              idx: Optional[int] = None) -> StageProperties:
+        """Provides general stage properties like identifier, number of
+        columns and caching.
+
+        Parameters
+        ----------
+        df_stage: Any
+            Dataframe representation of stage.
+        idx: integer, None, optional
+            If idx is given, resembles a valid pipeline stage. If not,
+            represents input dataframe.
+
+        Returns
+        -------
+        stage_properties: StageProperties
+
+        """
+
+        if idx is None:
+            name = "Input dataframe"
+            uid = ""
+        else:
+            name = self.pipeline.stages[idx].name
+            uid = self.pipeline.stages[idx].uid
+
+        cols = len(df_stage.columns)
+        cached = self.pipeline._is_cached(idx)
+
+        return StageProperties(name, cols, cached, uid)
+
+    def _get_stage_profile(self, df_stage: Any,
+                           idx: Optional[int] = None) -> NamedTuple:
+        raise NotImplementedError
+
+    def _get_stage_description(self, df_stage: Any,
+                               idx: Optional[int] = None) -> NamedTuple:
+        raise NotImplementedError
+
+
+class BasePipeline:
+    """Defines the common interface of pandas and dask pipelines. Wranglers
+    and native python functions are wrapped as `Stage` instances with unique
+    identifiers.
+
+    The `describe` method gives a brief overview of the stages. The `profile`
+    method provides timings and shapes of each stage. Also, `__call__` is
+    implemented to conveniently access the resulting dataframe of each stage
+    while `__getitem__` allows to access the `Stage` instance of each stage.
+
+    Parameters
+    ----------
+    stages: iterable
+        Contains the stages for the pipeline. Stages may be wranglers of the
+        pipeline's computation engine, native python functions or `Stage`
+        instances.
+    doc: str, optional
+        Provide optional doc string for the pipeline.
+
+    """
+
+    wrangler_class = BaseWrangler
+    profiler_class = BasePipelineProfiler
+
+    def __init__(self, stages: List[TYPE_STAGE], doc: Optional[str] = None):
+
+        for stage in stages:
+            if isinstance(stage, BaseWrangler) and \
+                    not isinstance(stage, self.wrangler_class):
+                raise ValueError("Stage needs to be a `{}` or a native python "
+                                 "function. However, '{}' was given."
+                                 .format(self.wrangler_class.__name__,
+                                         type(stage)))
+
+        self.stages = [stage if isinstance(stage, Stage) else Stage(stage)
+                       for stage in stages]
+        self.doc = doc
+
+        # private
+        self._loc = PipelineLocator(self)
+        self._transformer = PipelineTransformer(self)
+
+    def transform(self, df: Any) -> Any:
+        """Apply stage's `transform` methods in order while storing
+        intermediate stage results.
+
+        Parameters
+        ----------
+        df: Any
+            The input dataframe to be transformed.
+
+        Returns
+        -------
+        df: Any
+            The final dataframe once all stage transformations have been
+            applied.
+
+        """
+
+        return self._transformer.transform(df)
+
+    def profile(self, df: Optional[Any] = None) -> pd.DataFrame:
+        """Executes each stage in order and collects information about
+        execution time and shape of the resulting dataframe.
+
+        Parameters
+        ----------
+        df: Any, optional
+            If provided, profiles pipeline on given dataframe. If not given,
+            uses already existing pipeline transformer object.
+
+        Returns
+        -------
+        profile: pd.DataFrame
+
+        """
+
+        return self.profiler_class(self).profile(df)
+
+    def describe(self, df: Optional[Any] = None) -> pd.DataFrame:
+        """Describes each stage in order and collects information about
+        number of columns, docs, caching and estimated sizes while flagging
+        data explosion and shrinkage between stages.
+
+        Parameters
+        ----------
+        df: Any, optional
+            If provided, describes pipeline on given dataframe. If not given,
+            uses already existing pipeline transformer object.
+
+        Returns
+        -------
+        description: pd.DataFrame
+
+        """
+
+        return self.profiler_class(self).describe(df)
+
+    def _finalize_stage(self, df: Any, idx: int) -> Any:
+        """Engine specific handling of stage result at index location `idx`.
+
+        """
+
+        return df
+
+    def _is_cached(self, idx: Optional[int]) -> bool:
+        """Return if stage result at index location `idx` is cached.
+
+        """
+
+        return False
+
+    def __getitem__(self, value: TYPE_IDENTIFIER) -> \
+            Union[Stage, 'BasePipeline']:
+        """Get stage by index location/label access or create a sliced copy of
+        the pipeline.
+
+        Parameters
+        ----------
+        value: str, int, slice
+            Integer for index location or string for label access of stages. If
+            slice is given, creates a sliced copy of the pipeline.
+
+        Returns
+        -------
+        stage: Stage
+
+        """
+
+        if isinstance(value, slice):
+            start = value.start or 0
+            stop = value.stop or len(self.stages)
+
+            idx_start = self._loc.get_index_location(start)
+            idx_end = self._loc.get_index_location(stop)
+
+            stages = self.stages[idx_start:idx_end + 1]
+            stages = [copy.deepcopy(stage) for stage in stages]
+
+            return self.__class__(stages, self.doc)
+
+        else:
+            return self._loc.get_stage(value)
+
+    def __call__(self, value: TYPE_IDENTIFIER) -> Any:
+        """Get stage's dataframe by index location or label access.
+
+        Parameters
+        ----------
+        value: str, int
+            Integer for index location or string for label access of stages.
+
+        Returns
+        -------
+        df: Any
+            The dataframe representation of the stage.
+
+        """
+
+        return self._loc.get_transformation(value)
+
+    def __repr__(self):
+        tpl = "{} (Stages: {}, Doc: {})"
+        return tpl.format(self.__class__.__name__, len(self.stages), self.doc)
+
+    def __str__(self):
+        return self.__repr__()
@@ -2,10 +2,16 @@
 
 """
 
+from typing import List, NamedTuple, Optional
+
 from pyspark.sql import DataFrame
 
 from pywrangler.base import BaseWrangler
 
+Partitioning = NamedTuple("Partitioning", [("partition_columns", List[str]),
+                                           ("orderby_columns", List[str]),
+                                           ("ascending", List[bool])])
+
 
 class PySparkWrangler(BaseWrangler):
     """Contains methods common to all pyspark based wranglers.
@@ -16,6 +22,18 @@ class PySparkWrangler(BaseWrangler):
     def computation_engine(self):
         return "pyspark"
 
+    @property
+    def partitioning(self) -> Optional[Partitioning]:
+        """Declare partition and order requirements of the wrangler's
+        transformation (e.g. of its window functions). Allows pipelines to
+        repartition and sort data only once for consecutive wranglers sharing
+        the same partition columns. Returns None if there are no
+        requirements.
+
+        """
+
+        return None
+
 
 class PySparkSingleNoFit(PySparkWrangler):
     """Mixin class defining `fit` and `fit_transform` for all wranglers with
@@ -4,14 +4,340 @@ TODO: implement PySparkMemoryProfiler
 
 """
 
+import json
+import time
+import uuid
 import warnings
-from typing import Callable, Iterable, Union
+from typing import Callable, Iterable, List, NamedTuple, Optional, Union
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
 
+from pyspark import SparkContext
 from pyspark.sql import DataFrame
+from pyspark.sql import functions as F
 
 from pywrangler.benchmark import TimeProfiler
 from pywrangler.pyspark.base import PySparkWrangler
 
+MATERIALIZATIONS = ("count", "noop", "hash")
+
+SparkJobMetrics = NamedTuple("SparkJobMetrics",
+                             [("jobs", int),
+                              ("stages", int),
+                              ("task_time", Optional[float]),
+                              ("shuffle_read_bytes", Optional[int]),
+                              ("shuffle_write_bytes", Optional[int]),
+                              ("memory_spill_bytes", Optional[int]),
+                              ("disk_spill_bytes", Optional[int]),
+                              ("input_records", Optional[int])])
+
+# mapping of job metric names to stage data fields of spark's REST API
+REST_STAGE_FIELDS = {"shuffle_read_bytes": "shuffleReadBytes",
+                     "shuffle_write_bytes": "shuffleWriteBytes",
+                     "memory_spill_bytes": "memoryBytesSpilled",
+                     "disk_spill_bytes": "diskBytesSpilled",
+                     "input_records": "inputRecords"}
+
+JOB_GROUP_PROPERTIES = ("spark.jobGroup.id",
+                        "spark.job.description",
+                        "spark.job.interruptOnCancel")
+
+
+def validate_materialization(materialization: str):
+    """Check that given materialization strategy is supported and raise error
+    if otherwise.
+
+    Parameters
+    ----------
+    materialization: str
+        Name of the materialization strategy.
+
+    """
+
+    if materialization not in MATERIALIZATIONS:
+        raise ValueError("Parameter `materialization` is invalid with: {}. "
+                         "Allowed arguments are: {}"
+                         .format(materialization, MATERIALIZATIONS))
+
+
+def materialize(df: DataFrame, materialization: str = "count") \
+        -> Optional[int]:
+    """Enforce computation of lazily evaluated pyspark dataframe via an
+    action defined by `materialization`.
+
+    Calling `count` allows catalyst to prune all columns which are not
+    required to compute the number of rows. Hence, expensive column
+    expressions (e.g. window functions) may not be computed at all. In
+    contrast, `noop` writes all rows and columns to spark's no-operation data
+    source (requires spark >= 3.0) and `hash` aggregates a hash value over
+    all columns. Both enforce the computation of all output columns.
+
+    Parameters
+    ----------
+    df: pyspark.sql.DataFrame
+        Dataframe to be materialized.
+    materialization: str, optional
+        Materialization strategy. One of `count`, `noop` or `hash`.
+
+    Returns
+    -------
+    rows: int, None
+        Number of rows of the materialized dataframe. Returns None for `noop`
+        because the number of rows is not available.
+
+    """
+
+    validate_materialization(materialization)
+
+    if materialization == "noop":
+        df.write.format("noop").mode("overwrite").save()
+        return None
+
+    if materialization == "hash" and df.columns:
+        hashed = F.hash(*[df[column] for column in df.columns])
+        result = df.select(hashed.alias("hash")) \
+            .agg(F.count(F.lit(1)), F.sum("hash")) \
+            .first()
+        return result[0]
+
+    return df.count()
+
+
+class SparkJobMetricsCollector:
+    """Collect spark job metrics for all actions which are executed within the
+    context of the collector.
+
+    Entering the context tags all subsequent spark jobs with a unique job
+    group. Leaving the context restores the previous job group. Metrics are
+    resolved lazily once `metrics` is accessed: spark's status tracker
+    identifies the jobs and stages of the job group while spark's monitoring
+    REST API provides the corresponding stage metrics. Because spark's status
+    store is updated asynchronously, resolving metrics waits until all jobs
+    and stages are finished or `timeout` is reached.
+
+    If the spark UI is disabled or its REST API is unreachable (e.g. blocked
+    by a proxy), only the number of jobs and stages are available while all
+    other metrics are None. An unreachable REST API is detected after a
+    single retry instead of waiting until `timeout` is reached.
+
+    Parameters
+    ----------
+    spark_context: pyspark.SparkContext, optional
+        Spark context which executes the jobs. If not given, the currently
+        active spark context is used.
+    timeout: float, optional
+        Maximum duration in seconds to wait for spark's status store to
+        register finished jobs and stages.
+
+    Examples
+    --------
+
+    >>> collector = SparkJobMetricsCollector()
+    >>> with collector:
+    >>>     df.count()
+    >>> collector.metrics.shuffle_write_bytes
+
+    """
+
+    poll_interval = 0.05
+
+    def __init__(self, spark_context: Optional[SparkContext] = None,
+                 timeout: float = 5):
+        self.spark_context = spark_context
+        self.timeout = timeout
+        self.job_group = "pywrangler_{}".format(uuid.uuid4().hex)
+
+        self._previous_properties = {}
+        self._metrics = None
+
+    def __enter__(self):
+        if self.spark_context is None:
+            self.spark_context = SparkContext.getOrCreate()
+
+        sc = self.spark_context
+        self._previous_properties = {key: sc.getLocalProperty(key)
+                                     for key in JOB_GROUP_PROPERTIES}
+
+        sc.setJobGroup(self.job_group, "pywrangler job metrics")
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for key, value in self._previous_properties.items():
+            self.spark_context.setLocalProperty(key, value)
+
+    @property
+    def metrics(self) -> SparkJobMetrics:
+        """Return the metrics of all spark jobs which were executed within the
+        context of the collector.
+
+        """
+
+        if self.spark_context is None:
+            raise ValueError("No spark jobs have been collected yet. Please "
+                             "use the collector as a context manager first.")
+
+        if self._metrics is None:
+            self._metrics = self._resolve_metrics()
+
+        return self._metrics
+
+    def _resolve_metrics(self) -> SparkJobMetrics:
+        """Identify jobs and stages of the job group and aggregate their
+        metrics.
+
+        Returns
+        -------
+        metrics: SparkJobMetrics
+
+        """
+
+        deadline = time.time() + self.timeout
+
+        job_infos = self._get_job_infos(deadline)
+        stage_ids = sorted({stage_id for job_info in job_infos
+                            for stage_id in job_info.stageIds})
+
+        base_url = self._get_rest_base_url()
+
+        if base_url is not None:
+            try:
+                attempts = [attempt
+                            for stage_id in stage_ids
+                            for attempt in self._get_stage_attempts(base_url,
+                                                                    stage_id,
+                                                                    deadline)
+                            if attempt.get("status") != "SKIPPED"]
+            except URLError:
+                # REST API is unreachable, e.g. blocked by a proxy
+                base_url = None
+
+        # without REST API, count stages which actually ran tasks
+        if base_url is None:
+            tracker = self.spark_context.statusTracker()
+            stage_infos = [tracker.getStageInfo(stage_id)
+                           for stage_id in stage_ids]
+            stages = sum([1 for info in stage_infos
+                          if info is not None and info.numCompletedTasks])
+
+            unavailable = {name: None for name in REST_STAGE_FIELDS}
+            return SparkJobMetrics(jobs=len(job_infos),
+                                   stages=stages,
+                                   task_time=None,
+                                   **unavailable)
+
+        stages = len({attempt["stageId"] for attempt in attempts})
+        task_time = sum([attempt.get("executorRunTime", 0)
+                         for attempt in attempts]) / 1000
+
+        aggregated = {name: sum([attempt.get(field, 0)
+                                 for attempt in attempts])
+                      for name, field in REST_STAGE_FIELDS.items()}
+
+        return SparkJobMetrics(jobs=len(job_infos),
+                               stages=stages,
+                               task_time=task_time,
+                               **aggregated)
+
+    def _get_job_infos(self, deadline: float) -> List:
+        """Retrieve job infos of the job group from spark's status tracker.
+        Waits until all jobs are finished or `deadline` is reached.
+
+        Parameters
+        ----------
+        deadline: float
+            Timestamp in seconds until which to wait.
+
+        Returns
+        -------
+        job_infos: list
+            List of `pyspark.status.SparkJobInfo`.
+
+        """
+
+        tracker = self.spark_context.statusTracker()
+        finished = {"SUCCEEDED", "FAILED"}
+
+        while True:
+            job_ids = tracker.getJobIdsForGroup(self.job_group)
+            job_infos = [tracker.getJobInfo(job_id) for job_id in job_ids]
+            job_infos = [info for info in job_infos if info is not None]
+
+            complete = all([info.status in finished for info in job_infos])
+            if (job_infos and complete) or time.time() > deadline:
+                return job_infos
+
+            time.sleep(self.poll_interval)
+
+    def _get_stage_attempts(self, base_url: str, stage_id: int,
+                            deadline: float) -> List[dict]:
+        """Retrieve all attempts of given stage from spark's REST API. Waits
+        until stage is not active or pending anymore or `deadline` is reached.
+
+        Parameters
+        ----------
+        base_url: str
+            Base url of the REST API for the current application.
+        stage_id: int
+            Identifier of the stage.
+        deadline: float
+            Timestamp in seconds until which to wait.
+
+        Returns
+        -------
+        attempts: list
+            List of stage data dictionaries.
+
+        Raises
+        ------
+        URLError
+            If the REST API is unreachable twice in a row.
+
+        """
+
+        url = "{}/stages/{}".format(base_url, stage_id)
+        unfinished = {"ACTIVE", "PENDING"}
+        retried = False
+
+        while True:
+            timeout = max(deadline - time.time(), self.poll_interval)
+
+            try:
+                with urlopen(url, timeout=timeout) as response:
+                    attempts = json.loads(response.read().decode("utf-8"))
+            except HTTPError:
+                # stage is not yet registered in spark's status store
+                attempts = []
+            except (URLError, OSError):
+                # unreachable endpoint does not recover, fail after one retry
+                if retried:
+                    raise URLError("Spark REST API is unreachable: {}"
+                                   .format(url))
+                retried = True
+                attempts = []
+
+            running = any([attempt.get("status") in unfinished
+                           for attempt in attempts])
+            if (attempts and not running) or time.time() > deadline:
+                return attempts
+
+            time.sleep(self.poll_interval)
+
+    def _get_rest_base_url(self) -> Optional[str]:
+        """Return the base url of spark's monitoring REST API for the current
+        application. Returns None if the spark UI is disabled.
+
+        """
+
+        sc = self.spark_context
+        ui_enabled = sc.getConf().get("spark.ui.enabled", "true")
+
+        if ui_enabled.lower() != "true" or not sc.uiWebUrl:
+            return None
+
+        return "{}/api/v1/applications/{}".format(sc.uiWebUrl,
+                                                  sc.applicationId)
+
 
 class PySparkBaseProfiler:
     """Define common methods for pyspark profiler.
@@ -19,8 +345,9 @@ class PySparkBaseProfiler:
     """
 
     def _wrap_fit_transform(self) -> Callable:
-        """Wrapper function to call `count()` on wrangler's `fit_transform`
-        to enforce computation on lazily evaluated pyspark dataframes.
+        """Wrapper function to materialize wrangler's `fit_transform` to
+        enforce computation on lazily evaluated pyspark dataframes. The
+        employed action is defined by `self.materialization`.
 
         Returns
         -------
@@ -30,7 +357,8 @@ class PySparkBaseProfiler:
         """
 
         def wrapped(*args, **kwargs):
-            return self.wrangler.fit_transform(*args, **kwargs).count()
+            df_result = self.wrangler.fit_transform(*args, **kwargs)
+            return materialize(df_result, self.materialization)
 
         return wrapped
 
@@ -90,6 +418,17 @@ class PySparkTimeProfiler(TimeProfiler, PySparkBaseProfiler):
         Spark dataframes may be cached before timing execution to ensure
         timing measurements only capture wrangler's `fit_transform`. By
         default, it is disabled.
+    materialization: str, optional
+        Defines the action which enforces computation of the result
+        dataframe. `count` (default) may allow catalyst to skip the
+        computation of columns which are not required to count rows. `noop`
+        and `hash` enforce the computation of all columns. See `materialize`
+        for more details.
+    warmup: int, optional
+        Number of runs before measuring, e.g. to warm up the JVM.
+    disable_gc: bool, optional
+        If True, the python garbage collector is disabled during each
+        measurement.
 
     Attributes
     ----------
@@ -105,6 +444,9 @@ class PySparkTimeProfiler(TimeProfiler, PySparkBaseProfiler):
         The standard deviation of measurements in seconds.
     runs: int
         The number of measurements.
+    job_metrics: list
+        Spark job metrics (number of jobs and stages, task time, shuffle
+        read/write, memory/disk spill and input records) for each measurement.
 
     Methods
     -------
@@ -112,7 +454,8 @@ class PySparkTimeProfiler(TimeProfiler, PySparkBaseProfiler):
         Contains the actual profiling implementation.
     report
         Print simple report consisting of best, median, worst, standard
-        deviation and the number of measurements.
+        deviation, the number of measurements and the materialization
+        strategy.
     profile_report
         Calls profile and report in sequence.
 
@@ -120,12 +463,20 @@ class PySparkTimeProfiler(TimeProfiler, PySparkBaseProfiler):
 
     def __init__(self, wrangler: PySparkWrangler,
                  repetitions: Union[None, int] = None,
-                 cache_input: bool = False):
+                 cache_input: bool = False,
+                 materialization: str = "count",
+                 warmup: int = 0,
+                 disable_gc: bool = True):
+        validate_materialization(materialization)
+
         self.wrangler = wrangler
         self.cache_input = cache_input
+        self.materialization = materialization
+
+        self._job_metrics_collectors = []
 
         func = self._wrap_fit_transform()
-        super().__init__(func, repetitions)
+        super().__init__(func, repetitions, warmup, disable_gc)
 
     def profile(self, *dfs: DataFrame, **kwargs):
         """Profiles timing given input dataframes `dfs` which are passed to
@@ -141,9 +492,49 @@ class PySparkTimeProfiler(TimeProfiler, PySparkBaseProfiler):
         if self.cache_input:
             self._cache_input(dfs)
 
+        self._job_metrics_collectors.clear()
         super().profile(*dfs, **kwargs)
 
         if self.cache_input:
             self._clear_cached_input(dfs)
 
+        self._job_metrics = [collector.metrics
+                             for collector in self._job_metrics_collectors]
+
         return self
+
+    @property
+    def job_metrics(self) -> List[SparkJobMetrics]:
+        """Return spark job metrics for each measurement.
+
+        """
+
+        self._check_is_profiled(["_job_metrics"])
+
+        return self._job_metrics
+
+    def report(self):
+        """Print simple report consisting of best, median, worst, standard
+        deviation, the number of measurements and the employed
+        materialization strategy.
+
+        """
+
+        super().report()
+        print("Materialization: {}".format(self.materialization))
+
+    def _measure(self, func: Callable):
+        """Return wall time and process CPU time of calling `func` while
+        collecting spark job metrics. Setting up the collector, which
+        requires calls to the JVM, is not part of the measured time.
+
+        """
+
+        collector = SparkJobMetricsCollector()
+
+        with collector:
+            measurement = super()._measure(func)
+
+        self._job_metrics_collectors.append(collector)
+
+        return measurement
@@ -0,0 +1,308 @@
+"""This module contains a local content addressed store which persists
+pyspark dataframes as parquet files to allow reuse of expensive results
+across spark sessions.
+
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import List, NamedTuple, Optional
+from urllib.parse import unquote, urlparse
+
+from pyspark.sql import DataFrame, SparkSession
+
+from pywrangler.pyspark.plan import get_plan_nodes
+
+CheckpointEntry = NamedTuple("CheckpointEntry", [("key", str),
+                                                 ("name", str),
+                                                 ("size", int),
+                                                 ("created", float),
+                                                 ("last_access", float)])
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.expanduser("~"), ".cache",
+                                      "pywrangler", "checkpoints")
+
+# leaf nodes which can not be identified across spark sessions
+SESSION_SCOPED_LEAVES = ("LogicalRDD",
+                         "LocalRelation",
+                         "ExternalRDD",
+                         "InMemoryRelation",
+                         "StreamingRelation",
+                         "StreamingRelationV2")
+
+DATA_DIR = "data"
+META_FILE = "meta.json"
+
+
+def get_persistent_fingerprint(df: DataFrame) -> str:
+    """Create fingerprint of given dataframe which remains stable across spark
+    sessions. Combines the canonicalized analyzed plan, the schema and all
+    input files including their size and modification time if available
+    locally.
+
+    Plans containing leaves which can not be identified across sessions
+    (e.g. dataframes created from local data or RDDs) are additionally
+    scoped to the current spark application. Accesses private members of
+    pyspark and may break in future releases.
+
+    Parameters
+    ----------
+    df: pyspark.sql.DataFrame
+        Dataframe to create the fingerprint for.
+
+    Returns
+    -------
+    fingerprint: str
+
+    """
+
+    plan = df._jdf.queryExecution().analyzed()
+
+    content = [plan.canonicalized().toString(), df.schema.json()]
+
+    for input_file in sorted(df._jdf.inputFiles()):
+        content.append(input_file)
+
+        path = _get_local_path(input_file)
+        if path and os.path.exists(path):
+            stat = os.stat(path)
+            content.append("{}:{}".format(stat.st_size, stat.st_mtime))
+
+    leaves = {name for name, children in get_plan_nodes(plan)
+              if not children}
+    if leaves.intersection(SESSION_SCOPED_LEAVES):
+        application_id = df.sql_ctx._sc.applicationId
+        content.extend([application_id, str(plan.semanticHash())])
+
+    content = "\n".join(content)
+
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def _get_local_path(uri: str) -> Optional[str]:
+    """Return local file system path for given uri or None if uri does not
+    refer to the local file system.
+
+    """
+
+    parsed = urlparse(uri)
+    if parsed.scheme in ("", "file"):
+        return unquote(parsed.path)
+
+
+class CheckpointStore:
+    """Local store which persists dataframes as parquet files. Entries are
+    addressed via keys which are supposed to be derived from the content
+    of the dataframe (e.g. fingerprints of plans and parameters).
+
+    Each entry is stored in a separate directory containing the parquet data
+    and a json file with meta information. If the total size of all entries
+    exceeds the maximum size, least recently accessed entries are evicted.
+
+    The store is located on the local file system of the driver. Hence, it
+    requires spark to run in local mode or the store to be located on a file
+    system shared with all executors.
+
+    Parameters
+    ----------
+    path: str, optional
+        Root directory of the store. Defaults to
+        `~/.cache/pywrangler/checkpoints`.
+    max_size: int, optional
+        Maximum total size of all entries in bytes. If not given, size is not
+        limited.
+
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 max_size: Optional[int] = None):
+
+        if max_size is not None and max_size < 0:
+            raise ValueError("Parameter `max_size` needs to be positive. "
+                             "'{}' was given.".format(max_size))
+
+        self.path = path or DEFAULT_CHECKPOINT_DIR
+        self.max_size = max_size
+
+    def __contains__(self, key: str) -> bool:
+        """Return if entry exists for given key. Entries are only complete
+        once their meta information is written.
+
+        """
+
+        return os.path.exists(self._get_meta_path(key))
+
+    def read(self, key: str, spark: SparkSession) -> DataFrame:
+        """Read entry for given key and update its last access time.
+
+        Parameters
+        ----------
+        key: str
+            Key of the entry.
+        spark: pyspark.sql.SparkSession
+            Spark session used to read the parquet data.
+
+        Returns
+        -------
+        df: pyspark.sql.DataFrame
+
+        """
+
+        if key not in self:
+            raise ValueError("Checkpoint '{}' does not exist.".format(key))
+
+        entry = self._read_entry(key)
+        self._write_entry(entry._replace(last_access=time.time()))
+
+        data_path = os.path.join(self.path, key, DATA_DIR)
+        return spark.read.parquet(data_path)
+
+    def write(self, df: DataFrame, key: str, name: str = "") -> DataFrame:
+        """Write given dataframe for given key while computing the dataframe.
+        Data is written into a temporary directory first to prevent incomplete
+        entries. Evicts least recently accessed entries if maximum size is
+        exceeded.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Dataframe to be stored.
+        key: str
+            Key of the entry.
+        name: str, optional
+            Descriptive name of the entry, e.g. stage name.
+
+        Returns
+        -------
+        df_stored: pyspark.sql.DataFrame
+            Dataframe read from the store.
+
+        """
+
+        os.makedirs(self.path, exist_ok=True)
+
+        tmp_path = os.path.join(self.path, ".tmp-{}".format(uuid.uuid4().hex))
+        df.write.parquet(os.path.join(tmp_path, DATA_DIR))
+
+        entry_path = os.path.join(self.path, key)
+        if os.path.exists(entry_path):
+            shutil.rmtree(entry_path)
+
+        os.rename(tmp_path, entry_path)
+
+        now = time.time()
+        size = self._get_directory_size(os.path.join(entry_path, DATA_DIR))
+        self._write_entry(CheckpointEntry(key, name, size, now, now))
+
+        self.evict(keep=[key])
+
+        return self.read(key, df.sql_ctx.sparkSession)
+
+    def invalidate(self, key: str) -> None:
+        """Remove entry for given key.
+
+        Parameters
+        ----------
+        key: str
+            Key of the entry.
+
+        """
+
+        if key not in self:
+            raise ValueError("Checkpoint '{}' does not exist and hence "
+                             "cannot be invalidated.".format(key))
+
+        shutil.rmtree(os.path.join(self.path, key))
+
+    def clear(self) -> None:
+        """Remove all entries of the store.
+
+        """
+
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+
+    def evict(self, keep: Optional[List[str]] = None) -> List[str]:
+        """Remove least recently accessed entries until total size does not
+        exceed maximum size.
+
+        Parameters
+        ----------
+        keep: list, optional
+            Keys of entries which must not be evicted.
+
+        Returns
+        -------
+        evicted: list
+            Keys of evicted entries.
+
+        """
+
+        if self.max_size is None:
+            return []
+
+        keep = set(keep or [])
+        entries = sorted(self.entries, key=lambda x: x.last_access)
+        size = sum([entry.size for entry in entries])
+
+        evicted = []
+        for entry in entries:
+            if size <= self.max_size:
+                break
+
+            if entry.key in keep:
+                continue
+
+            self.invalidate(entry.key)
+            size -= entry.size
+            evicted.append(entry.key)
+
+        return evicted
+
+    @property
+    def entries(self) -> List[CheckpointEntry]:
+        """Return all complete entries of the store.
+
+        """
+
+        if not os.path.exists(self.path):
+            return []
+
+        return [self._read_entry(key) for key in sorted(os.listdir(self.path))
+                if key in self]
+
+    @property
+    def size(self) -> int:
+        """Return total size of all entries in bytes.
+
+        """
+
+        return sum([entry.size for entry in self.entries])
+
+    def _get_meta_path(self, key: str) -> str:
+        return os.path.join(self.path, key, META_FILE)
+
+    def _read_entry(self, key: str) -> CheckpointEntry:
+        with open(self._get_meta_path(key)) as meta_file:
+            return CheckpointEntry(**json.load(meta_file))
+
+    def _write_entry(self, entry: CheckpointEntry) -> None:
+        with open(self._get_meta_path(entry.key), "w") as meta_file:
+            json.dump(entry._asdict(), meta_file)
+
+    @staticmethod
+    def _get_directory_size(path: str) -> int:
+        """Return total size of all files within given directory.
+
+        """
+
+        size = 0
+        for root, _, files in os.walk(path):
+            for file in files:
+                size += os.path.getsize(os.path.join(root, file))
+
+        return size
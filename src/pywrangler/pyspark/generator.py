@@ -0,0 +1,185 @@
+"""This module contains the synthetic marker data generator for pyspark.
+
+"""
+
+from typing import Optional
+
+from pyspark.sql import Column, DataFrame, SparkSession
+from pyspark.sql import functions as F
+
+from pywrangler.generator import (
+    GOLDEN_GAMMA,
+    MIN_LENGTH_DUPLICATES,
+    MIX_1,
+    MIX_2,
+    SEED_STRIDE,
+    STREAM_DUPLICATE_END,
+    STREAM_DUPLICATE_START,
+    STREAM_GROUP,
+    STREAM_LENGTH,
+    STREAMS,
+    BaseMarkerGenerator
+)
+
+
+def _to_long(value: int) -> Column:
+    """Return literal of given unsigned 64 bit integer with identical bits as
+    signed long.
+
+    """
+
+    value = value % 2 ** 64
+    if value >= 2 ** 63:
+        value -= 2 ** 64
+
+    return F.lit(value).cast("long")
+
+
+def uniform(slots: Column, stream: int, seed: int) -> Column:
+    """Derive uniformly distributed random numbers in [0, 1) from given slot
+    indices via the splitmix64 hash function (see `pywrangler.generator`).
+    Long arithmetic wraps around which is equivalent to unsigned arithmetic
+    modulo 2 ** 64.
+
+    Parameters
+    ----------
+    slots: pyspark.sql.Column
+        Slot indices.
+    stream: int
+        Random stream of the slot.
+    seed: int
+        Seed of the random numbers.
+
+    Returns
+    -------
+    uniform: pyspark.sql.Column
+
+    """
+
+    x = (slots * STREAMS + (stream + 1)) * _to_long(GOLDEN_GAMMA) + \
+        _to_long(seed * SEED_STRIDE)
+    z = x.bitwiseXOR(F.shiftRightUnsigned(x, 30)) * _to_long(MIX_1)
+    z = z.bitwiseXOR(F.shiftRightUnsigned(z, 27)) * _to_long(MIX_2)
+    z = z.bitwiseXOR(F.shiftRightUnsigned(z, 31))
+
+    return F.shiftRightUnsigned(z, 11).cast("double") * 2. ** -53
+
+
+class PySparkMarkerGenerator(BaseMarkerGenerator):
+    """Generate synthetic marker data as spark dataframe via `spark.range`.
+    All columns are computed by column expressions of the row index on the
+    executors. Data is identical to the pandas generator. Categorical markers
+    are represented as strings.
+
+    Parameters
+    ----------
+    rows: int
+        Number of rows.
+    groups: int, optional
+        Number of groups.
+    group_skew: float, optional
+        Skew of group sizes. 0 yields groups of equal expected size while
+        larger values concentrate rows in groups with low ids.
+    interval_length: tuple, optional
+        Minimum and maximum number of rows of intervals including start and
+        end markers.
+    interval_distribution: str, optional
+        Distribution of interval lengths. Either `uniform` or `geometric`.
+    noise_ratio: float, optional
+        Approximate ratio of noise rows outside of intervals.
+    duplicate_rate: float, optional
+        Probability of duplicated start and end markers per interval.
+    marker_dtype: str, optional
+        Data type of the marker column. One of `int`, `str` or `category`.
+    seed: int, optional
+        Seed of the random numbers.
+
+    """
+
+    def generate(self, spark: Optional[SparkSession] = None,
+                 num_partitions: Optional[int] = None) -> DataFrame:
+        """Generate all rows.
+
+        Parameters
+        ----------
+        spark: pyspark.sql.SparkSession, optional
+            Spark session. If not given, the active session is used or a new
+            one is created.
+        num_partitions: int, optional
+            Number of partitions. By default, spark's default parallelism
+            is used.
+
+        Returns
+        -------
+        df: pyspark.sql.DataFrame
+            Contains order, group and marker columns.
+
+        """
+
+        if spark is None:
+            spark = SparkSession.builder.getOrCreate()
+
+        df = spark.range(0, self.rows, numPartitions=num_partitions)
+
+        index = F.col("id")
+        offsets = index % self.slot_size
+        slots = ((index - offsets) / self.slot_size).cast("long")
+
+        noise, start, end = self.marker_values
+        codes = self._get_marker_codes(slots, offsets)
+        markers = F.when(codes == 1, F.lit(start)) \
+            .when(codes == 2, F.lit(end)) \
+            .otherwise(F.lit(noise))
+
+        return df.select(index.alias(self.order_column),
+                         self._get_groups(slots).alias(self.groupby_column),
+                         markers.alias(self.marker_column))
+
+    def _get_groups(self, slots: Column) -> Column:
+        """Return group of each slot.
+
+        """
+
+        random = uniform(slots, STREAM_GROUP, self.seed)
+        groups = F.floor(self.groups * F.pow(random, 1. + self.group_skew))
+
+        return F.least(groups, F.lit(self.groups - 1)).cast("long")
+
+    def _get_lengths(self, slots: Column) -> Column:
+        """Return interval length of each slot.
+
+        """
+
+        low, high = self.interval_length
+        random = uniform(slots, STREAM_LENGTH, self.seed)
+
+        if low == high:
+            return F.lit(low).cast("long")
+
+        if self.interval_distribution == "uniform":
+            lengths = low + F.floor(random * (high - low + 1))
+        else:
+            denominator = F.log1p(F.lit(-self.geometric_probability))
+            lengths = low + F.floor(F.log1p(-random) / denominator)
+
+        return F.least(lengths, F.lit(high)).cast("long")
+
+    def _get_marker_codes(self, slots: Column, offsets: Column) -> Column:
+        """Return marker codes with 0 for noise, 1 for start and 2 for end
+        markers.
+
+        """
+
+        lengths = self._get_lengths(slots)
+
+        duplicable = lengths >= MIN_LENGTH_DUPLICATES
+        random_start = uniform(slots, STREAM_DUPLICATE_START, self.seed)
+        random_end = uniform(slots, STREAM_DUPLICATE_END, self.seed)
+        duplicate_start = duplicable & (random_start < self.duplicate_rate)
+        duplicate_end = duplicable & (random_end < self.duplicate_rate)
+
+        is_start = (offsets == 0) | (duplicate_start & (offsets == 1))
+        is_end = (offsets == lengths - 1) | \
+            (duplicate_end & (offsets == lengths - 2))
+
+        return F.when(is_end, 2).when(is_start, 1).otherwise(0)
@@ -3,9 +3,14 @@
 """
 
 import copy
+import hashlib
 import inspect
-import re
+import itertools
+import timeit
+import warnings
+from collections import Counter, defaultdict
 from collections.abc import KeysView
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     Any,
     Callable,
@@ -20,16 +25,37 @@ from typing import (
 
 import numpy as np
 import pandas as pd
+from pyspark import StorageLevel
 from pyspark.ml import PipelineModel, Transformer
 from pyspark.ml.param.shared import Param, Params
 from pyspark.sql import DataFrame
 
-from pywrangler.pyspark.base import PySparkWrangler
+from pywrangler import events
+from pywrangler.pyspark import util
+from pywrangler.pyspark.base import Partitioning, PySparkWrangler
+from pywrangler.pyspark.benchmark import (
+    SparkJobMetricsCollector,
+    materialize,
+    validate_materialization
+)
+from pywrangler.pyspark.checkpoint import (
+    CheckpointStore,
+    get_persistent_fingerprint
+)
+from pywrangler.pyspark.plan import (
+    analyze_plan,
+    collapse_projections,
+    count_codegen_stages,
+    estimate_statistics,
+    measure_planning
+)
 from pywrangler.util.sanitizer import ensure_iterable
+from pywrangler.util.stats import extrapolate
 
 TYPE_STAGE = Union[PySparkWrangler, Transformer, Callable]
 TYPE_IDENTIFIER = Union[int, str, Transformer, slice]
 TYPE_PARAM_DICT = Dict[str, Union[Callable, Param]]
+TYPE_BRANCH_STAGE = Tuple[TYPE_STAGE, Optional[TYPE_IDENTIFIER]]
 
 StageProperties = NamedTuple("StageProperties", [("name", str),
                                                  ("cols", int),
@@ -41,10 +67,24 @@ StageProfile = NamedTuple("StageProfile", [("idx", str),
                                            ("name", str),
                                            ("total_time", float),
                                            ("rows", int),
+                                           ("materialization", str),
                                            ("cols", int),
                                            ("stage_count", int),
                                            ("cached", bool),
-                                           ("uid", str)])
+                                           ("uid", str),
+                                           ("jobs", int),
+                                           ("stages", int),
+                                           ("task_time", float),
+                                           ("shuffle_read_bytes", int),
+                                           ("shuffle_write_bytes", int),
+                                           ("memory_spill_bytes", int),
+                                           ("disk_spill_bytes", int),
+                                           ("input_records", int),
+                                           ("analysis_time", float),
+                                           ("optimization_time", float),
+                                           ("planning_time", float),
+                                           ("logical_nodes", int),
+                                           ("physical_nodes", int)])
 
 StageDescription = NamedTuple("StageDescription", [("idx", str),
                                                    ("name", str),
@@ -52,10 +92,57 @@ StageDescription = NamedTuple("StageDescription", [("idx", str),
                                                    ("cols", int),
                                                    ("stage_count", int),
                                                    ("cached", bool),
-                                                   ("uid", str)])
+                                                   ("uid", str),
+                                                   ("exchanges", int),
+                                                   ("broadcast_exchanges",
+                                                    int),
+                                                   ("sorts", int),
+                                                   ("windows", int),
+                                                   ("cached_scans", int),
+                                                   ("reused_exchanges", int),
+                                                   ("logical_depth", int),
+                                                   ("physical_depth", int),
+                                                   ("estimated_size", int),
+                                                   ("estimated_rows", int),
+                                                   ("analysis_time", float),
+                                                   ("optimization_time",
+                                                    float),
+                                                   ("planning_time", float),
+                                                   ("logical_nodes", int),
+                                                   ("physical_nodes", int)])
+
+SampledStageProfile = NamedTuple("SampledStageProfile",
+                                 [("idx", str),
+                                  ("name", str),
+                                  ("total_time", float),
+                                  ("total_time_lower", float),
+                                  ("total_time_upper", float),
+                                  ("rows", float),
+                                  ("rows_lower", float),
+                                  ("rows_upper", float),
+                                  ("materialization", str),
+                                  ("samples", int),
+                                  ("uid", str)])
+
+CacheRecommendation = NamedTuple("CacheRecommendation",
+                                 [("idx", int),
+                                  ("name", str),
+                                  ("cost", int),
+                                  ("reuses", int),
+                                  ("estimated_size", int),
+                                  ("benefit", int),
+                                  ("cached", bool),
+                                  ("recommended", bool),
+                                  ("storage_level", str),
+                                  ("evict", bool)])
 
 ERR_TYPE_ACCESS = "Value has incorrect type '{}' (integer or string allowed)."
 
+STORAGE_LEVELS = {"MEMORY_AND_DISK": StorageLevel.MEMORY_AND_DISK,
+                  "DISK_ONLY": StorageLevel.DISK_ONLY}
+
+EVICTION_POLICIES = ("lru", "cost")
+
 
 class StageTransformerConverter:
     """Wrap arbitrary pipeline stage object and allow conversion to a valid
@@ -283,11 +370,16 @@ class PipelineLocator:
     Position based access is equivalent to index location lookup. Label based
     access is equivalent to identifier lookup.
 
+    Lookups of stage's dataframe representations are counted to indicate
+    reuse of stage results.
+
     """
 
     def __init__(self, pipeline: 'Pipeline'):
         """Pipeline locator keeps track of stage's identifier-idx mapping via
-        `self.identifiers`.
+        `self.identifiers`. The number of dataframe lookups per stage index is
+        stored in `self.lookups` while the order of the most recent lookups is
+        stored in `self.last_lookups`.
 
         Parameters
         ----------
@@ -301,6 +393,10 @@ class PipelineLocator:
         enumerated = enumerate(self.pipeline.stages)
         self.identifiers = {stage.uid: idx for idx, stage in enumerated}
 
+        self.lookups = Counter()
+        self.last_lookups = {}
+        self._lookup_clock = itertools.count()
+
     def map_identifier_to_index(self, identifier: str) -> int:
         """Find corresponding index location for given identifier. Identifier
         does not need to be an exact match. Case insensitive, partial match
@@ -413,7 +509,8 @@ class PipelineLocator:
         idx = self.get_index_location(value)
         return self.pipeline.stages[idx]
 
-    def get_transformation(self, value: TYPE_IDENTIFIER) -> DataFrame:
+    def get_transformation(self, value: TYPE_IDENTIFIER,
+                           track: bool = True) -> DataFrame:
         """Return pipeline stage's transformation for given index or
         stage identifier.
 
@@ -421,6 +518,9 @@ class PipelineLocator:
         ----------
         value: int, str
             Identifies stage via index location or identifier substring.
+        track: bool, optional
+            If True, lookup is counted as reuse of the stage's result. Should
+            be disabled for pipeline internal access.
 
         Returns
         -------
@@ -436,6 +536,11 @@ class PipelineLocator:
                              "first via `transform`.")
 
         idx = self.get_index_location(value)
+
+        if track:
+            self.lookups[idx] += 1
+            self.last_lookups[idx] = next(self._lookup_clock)
+
         return transformer.transformations[idx]
 
 
@@ -466,8 +571,10 @@ class PipelineCacher:
 
         self.pipeline = pipeline
         self._store = set()
+        self._storage_levels = {}
 
-    def enable(self, stages: List[TYPE_IDENTIFIER]) -> None:
+    def enable(self, stages: List[TYPE_IDENTIFIER],
+               storage_level: Optional[StorageLevel] = None) -> None:
         """Enable pipeline caching for given stages. Stage can be identified
         via index, identifier or stage itself.
 
@@ -480,6 +587,9 @@ class PipelineCacher:
         ----------
         stages: iterable
             Iterable of int, str or Transformer.
+        storage_level: pyspark.StorageLevel, optional
+            Storage level used to persist the stages. If not given, uses
+            dataframe's default storage level via `cache`.
 
         """
 
@@ -488,9 +598,11 @@ class PipelineCacher:
         for stage in stages:
             idx = self.pipeline._loc.get_index_location(stage)
             self._store.add(idx)
+            self._storage_levels[idx] = storage_level
 
             if self.pipeline._transformer:
-                self.pipeline(idx).cache()
+                df = self.pipeline._loc.get_transformation(idx, track=False)
+                self.persist(df, idx)
 
     def disable(self, stages: List[TYPE_IDENTIFIER]) -> None:
         """Disable pipeline caching for given stages. Stage can be identified
@@ -515,12 +627,14 @@ class PipelineCacher:
 
             try:
                 self._store.remove(idx)
+                self._storage_levels.pop(idx, None)
             except KeyError:
                 raise ValueError("'{}' does not exist in cache and hence"
                                  "cannot be disabled.".format(stage))
 
             if self.pipeline._transformer:
-                self.pipeline(idx).unpersist(blocking=True)
+                df = self.pipeline._loc.get_transformation(idx, track=False)
+                df.unpersist(blocking=True)
 
     def clear(self) -> None:
         """Remove all stage caches on pipeline level.
@@ -532,9 +646,43 @@ class PipelineCacher:
 
         if self.pipeline._transformer:
             for idx in self._store:
-                self.pipeline(idx).unpersist(blocking=True)
+                df = self.pipeline._loc.get_transformation(idx, track=False)
+                df.unpersist(blocking=True)
 
         self._store.clear()
+        self._storage_levels.clear()
+
+    def persist(self, df: DataFrame, idx: int) -> DataFrame:
+        """Persist given stage dataframe with the storage level defined for
+        the stage at index location `idx`.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Dataframe representation of the stage.
+        idx: int
+            Index location of the stage.
+
+        Returns
+        -------
+        df: pyspark.sql.DataFrame
+
+        """
+
+        storage_level = self._storage_levels.get(idx)
+
+        if storage_level is None:
+            return df.cache()
+        else:
+            return df.persist(storage_level)
+
+    def is_enabled(self, idx: int) -> bool:
+        """Return if pipeline caching is enabled for stage at index location
+        `idx`.
+
+        """
+
+        return idx in self._store
 
     @property
     def enabled(self) -> List[Transformer]:
@@ -547,344 +695,1477 @@ class PipelineCacher:
                 for idx in sorted(self._store)]
 
 
-class PipelineTransformer:
-    """Composite for `Pipeline` that manages the actual dataframe
-    transformation performed by all stages in sequence for given input
-    dataframe while incorporating pipeline caching.
+class PipelineCacheAdvisor:
+    """Composite for `Pipeline` that recommends and optionally applies
+    pipeline caching for stages.
+
+    A stage is worth caching if its result is costly to recompute and if it
+    is reused. The cost of a stage is approximated by the number of shuffles
+    (exchanges) and windows in its physical plan which includes all uncached
+    upstream stages. Reuse is given by the number of dataframe lookups of the
+    stage via `pipeline(idx)`. The benefit of caching a stage is the product
+    of cost and reuses.
+
+    Recommended stages are persisted with `MEMORY_AND_DISK` as long as their
+    estimated size fits into the memory budget. If the memory budget is
+    exceeded, stages cached by the advisor are evicted according to the
+    eviction policy. The `lru` policy evicts least recently looked up stages
+    first. The `cost` policy evicts stages with the lowest benefit per byte
+    first but only if their benefit per byte is lower than the candidate's.
+    If eviction is not possible, stages are persisted with `DISK_ONLY`.
+
+    Stages cached manually via `PipelineCacher` are never evicted and do not
+    count towards the memory budget.
 
     """
 
-    def __init__(self, pipeline: 'Pipeline'):
-        """Pipeline transformer keeps track of all stages dataframe
-        transformations via `self.transformation`. In addition, the input
-        dataframe is referenced via `self.input_df`.
+    def __init__(self, pipeline: 'Pipeline',
+                 memory_budget: Optional[int] = None,
+                 policy: str = "lru",
+                 min_reuses: int = 1,
+                 auto: bool = False):
+        """Cache advisor keeps track of stages cached by the advisor via
+        `self._managed`.
 
         Parameters
         ----------
         pipeline: Pipeline
             Parent pipeline object to be composite of.
+        memory_budget: int, optional
+            Memory budget in bytes for stages persisted in memory. If not
+            given, memory is considered to be unlimited.
+        policy: str, optional
+            Eviction policy if memory budget is exceeded. Either `lru` or
+            `cost`.
+        min_reuses: int, optional
+            Minimum number of reuses for a stage to be worth caching.
+        auto: bool, optional
+            If True, recommendations are applied automatically on each
+            `transform` of the pipeline.
 
         """
 
-        self.pipeline = pipeline
-        self.transformations = []
-        self.input_df = None
+        if policy not in EVICTION_POLICIES:
+            raise ValueError("Parameter `policy` is invalid with: {}. "
+                             "Allowed arguments are: {}"
+                             .format(policy, EVICTION_POLICIES))
 
-    def transform(self, df: DataFrame) -> DataFrame:
-        """Performs dataframe transformation for given input dataframe while
-        respecting pipeline caches.
+        self.pipeline = pipeline
+        self.memory_budget = memory_budget
+        self.policy = policy
+        self.min_reuses = min_reuses
+        self.auto = auto
 
-        Previous transformations are overridden and hence will be lost.
+        self._managed = {}
 
-        Parameters
-        ----------
-        df: pyspark.sql.DataFrame
-            Input dataframe to apply transformations to.
+    def recommend(self) -> pd.DataFrame:
+        """Recommend pipeline caching for stages without applying it. Does not
+        run any actions.
 
         Returns
         -------
-        df_result: pyspark.sql.DataFrame
-            Resulting dataframe after all transformations have been applied.
+        recommendations: pd.DataFrame
+            Contains cost, reuses, estimated size and benefit for each stage.
+            In addition, indicates if caching is recommended with which storage
+            level and if a stage cached by the advisor should be evicted.
 
         """
 
-        self.transformations.clear()
-        self.input_df = df
-
-        cache_enabled = self.pipeline.cache.enabled
-
-        for stage in self.pipeline.stages:
-            df = stage.transform(df)
-
-            if stage in cache_enabled:
-                df.cache()
+        recommendations, _ = self._plan()
+        recommendations = [rec._asdict() for rec in recommendations]
 
-            self.transformations.append(df)
-
-        return df
-
-    def __iter__(self) -> Iterator:
-        """Allow transformer to be iterable. Simply returns an iterator of
-        `transformations`.
+        return pd.DataFrame(recommendations)
 
-        """
+    def apply(self) -> List[int]:
+        """Apply recommended pipeline caching and evict stages if the memory
+        budget is exceeded.
 
-        return iter(self.transformations)
+        Like `PipelineCacher`, `transform` has to be called again for the
+        execution plan of the pipeline's result dataframe to respect caching
+        changes. This is done automatically if `auto` is enabled.
 
-    def __bool__(self) -> bool:
-        """Return if transformation was already run.
+        Returns
+        -------
+        changed: list
+            Index locations of stages with changed caching.
 
         """
 
-        return len(self.transformations) > 0
-
+        recommendations, evictions = self._plan()
+        cache = self.pipeline.cache
 
-class PipelineProfiler:
-    """Represents a profile of a given pipeline. Executes each stage in order
-    and collects information about execution time, execution plan stage, shape
-    of the resulting dataframe and caching.
+        for idx in evictions:
+            cache.disable(idx)
+            del self._managed[idx]
 
-    """
+        enabled = []
+        for rec in recommendations:
+            if rec.recommended and not rec.cached:
+                cache.enable(rec.idx, STORAGE_LEVELS[rec.storage_level])
+                self._managed[rec.idx] = rec
+                enabled.append(rec.idx)
 
-    regex_stage = re.compile(r"\*\((\d+)\) ")
+        return sorted(evictions + enabled)
 
-    def __init__(self, pipeline: 'Pipeline'):
-        """Keeps track of all profiles stages via `self.profiles`.
+    def _plan(self) -> Tuple[List[CacheRecommendation], List[int]]:
+        """Create recommendations for all stages and identify stages to be
+        evicted.
 
-        Parameters
-        ----------
-        pipeline: Pipeline
-            Pipeline object to be profiled.
+        Returns
+        -------
+        plan: tuple
+            List of recommendations and list of index locations to be evicted.
 
         """
 
-        self.pipeline = pipeline
-
-    def profile(self, df: Optional[DataFrame] = None) -> pd.DataFrame:
-        """Profiles each pipeline stage and provides information about
-        execution time, execution plan stage and stage dataframe shape.
+        transformer = self.pipeline._transformer
+        if not transformer:
+            raise ValueError("Cache recommendations are not available yet. "
+                             "Please execute pipeline first via "
+                             "`transform`.")
+
+        # forget stages which were disabled outside of the advisor
+        self._managed = {idx: rec for idx, rec in self._managed.items()
+                         if self.pipeline.cache.is_enabled(idx)}
+
+        stats = [self._get_stage_stats(idx, df_stage)
+                 for idx, df_stage in enumerate(transformer)]
+
+        # only stages cached in memory by the advisor may be evicted
+        in_memory = {stat["idx"]: stat for stat in stats
+                     if stat["idx"] in self._managed and
+                     self._managed[stat["idx"]].storage_level ==
+                     "MEMORY_AND_DISK"}
+        used = sum([self._get_size(stat) for stat in in_memory.values()])
+
+        candidates = [stat for stat in stats
+                      if stat["benefit"] and not stat["cached"]]
+        candidates.sort(key=lambda x: x["benefit"], reverse=True)
+
+        evictions = []
+        levels = {}
+
+        for candidate in candidates:
+            victims = self._select_victims(in_memory, used, candidate)
+
+            if victims is None:
+                levels[candidate["idx"]] = "DISK_ONLY"
+                continue
+
+            for victim in victims:
+                used -= self._get_size(in_memory.pop(victim))
+                evictions.append(victim)
+
+            levels[candidate["idx"]] = "MEMORY_AND_DISK"
+            used += self._get_size(candidate)
+
+        recommendations = []
+        for stat in stats:
+            idx = stat["idx"]
+            evict = idx in evictions
+            kept = idx in self._managed and not evict
+
+            if idx in levels:
+                storage_level = levels[idx]
+            elif kept:
+                storage_level = self._managed[idx].storage_level
+            else:
+                storage_level = None
+
+            recommendations.append(CacheRecommendation(
+                storage_level=storage_level,
+                evict=evict,
+                recommended=idx in levels or kept,
+                **stat))
+
+        return recommendations, sorted(evictions)
+
+    def _get_stage_stats(self, idx: int, df_stage: DataFrame) -> dict:
+        """Compute cost, reuses, estimated size and benefit for given stage.
+        Stages cached by the advisor keep their cost and size from the time
+        they were cached because their execution plan is replaced by the
+        cache.
 
         Parameters
         ----------
-        df: pyspark.sql.DataFrame, optional
-            If provided, profiles pipeline on given dataframe. If not given,
-            uses already existing pipeline transformer object.
+        idx: int
+            Index location of the stage.
+        df_stage: pyspark.sql.DataFrame
+            Dataframe representation of the stage.
 
         Returns
         -------
-        profile: pd.DataFrame
+        stats: dict
 
         """
 
-        return self._execute("profile", df)
+        reuses = self.pipeline._loc.lookups[idx]
+        cached = self.pipeline.cache.is_enabled(idx)
 
-    def describe(self, df: Optional[DataFrame] = None) -> pd.DataFrame:
-        """Describes each pipeline stage and provides information about
-        execution plan stage, number of columns and docs.
+        if idx in self._managed:
+            managed = self._managed[idx]
+            cost = managed.cost
+            size = managed.estimated_size
+        else:
+            analysis = analyze_plan(df_stage)
+            cost = analysis.exchanges + analysis.windows
+            size = estimate_statistics(df_stage).estimated_size
 
-        Parameters
-        ----------
-        df: pyspark.sql.DataFrame, optional
-            If provided, profiles pipeline on given dataframe. If not given,
-            uses already existing pipeline transformer object.
+        if reuses >= self.min_reuses:
+            benefit = cost * reuses
+        else:
+            benefit = 0
 
-        Returns
-        -------
-        description: pd.DataFrame
+        return dict(idx=idx,
+                    name=self.pipeline.stages[idx].__class__.__name__,
+                    cost=cost,
+                    reuses=reuses,
+                    estimated_size=size,
+                    benefit=benefit,
+                    cached=cached)
+
+    @staticmethod
+    def _get_size(stat: dict) -> int:
+        """Return estimated size of given stage statistics in bytes.
+
+        Spark may not know the size of a stage (e.g. for RDD based inputs).
+        Such stages are only persisted in memory without memory budget
+        because they never fit into a budget. Since no budget is accounted
+        for in this case, unknown sizes are counted as 0 bytes.
 
         """
 
-        return self._execute("describe", df)
+        return stat["estimated_size"] or 0
 
-    def _execute(self, method: str,
-                 df: Optional[DataFrame] = None) -> pd.DataFrame:
-        """Generic function to either describe or profile given pipeline.
-        Describing the pipeline does not run any actions. In contrast,
-        profiling will actually call actions and may take some time.
+    def _select_victims(self, in_memory: Dict[int, dict], used: int,
+                        candidate: dict) -> Optional[List[int]]:
+        """Select stages to be evicted from memory for given candidate stage
+        to fit into the memory budget according to the eviction policy.
 
         Parameters
         ----------
-        method: str
-            Choose either `describe` or `profile`.
-        df: pyspark.sql.DataFrame, optional
-            If provided, profiles pipeline on given dataframe. If not given,
-            uses already existing pipeline transformer object.
+        in_memory: dict
+            Statistics of stages persisted in memory by the advisor.
+        used: int
+            Memory currently used by stages persisted in memory.
+        candidate: dict
+            Statistics of the candidate stage.
+
+        Returns
+        -------
+        victims: list, None
+            Index locations of stages to be evicted. Returns None if the
+            candidate does not fit into the memory budget.
 
         """
 
-        methods = {
-            "describe": self._get_stage_description,
-            "profile": self._get_stage_profile
-        }
+        if self.memory_budget is None:
+            return []
 
-        caller = methods[method]
+        size = candidate["estimated_size"]
+        if size is None or size > self.memory_budget:
+            return None
 
-        # ensure existing input dataframe
-        if df is None and not self.pipeline._transformer:
-            raise ValueError("Please provide input dataframe via `df` "
-                             "or run `transform` method first.")
+        def benefit_per_byte(stat):
+            return stat["benefit"] / max(stat["estimated_size"] or 1, 1)
 
-        if df is not None:
-            transformer = PipelineTransformer(self.pipeline)
-            transformer.transform(df)
+        if self.policy == "lru":
+            last_lookups = self.pipeline._loc.last_lookups
+            ordered = sorted(in_memory,
+                             key=lambda idx: last_lookups.get(idx, -1))
         else:
-            transformer = self.pipeline._transformer
-
-        # reset profiler
-        results = []
-
-        # initial profile of input dataframe
-        start_profile = caller(transformer.input_df)
-        results.append(start_profile)
-
-        # subsequent stage profiles
-        for idx, df_stage in enumerate(transformer):
-            results.append(caller(df_stage, idx))
+            threshold = benefit_per_byte(candidate)
+            ordered = sorted(in_memory,
+                             key=lambda idx: benefit_per_byte(in_memory[idx]))
+            ordered = [idx for idx in ordered
+                       if benefit_per_byte(in_memory[idx]) < threshold]
+
+        free = self.memory_budget - used
+        victims = []
+        for idx in ordered:
+            if free >= size:
+                break
+
+            victims.append(idx)
+            free += self._get_size(in_memory[idx])
+
+        if free < size:
+            return None
+
+        return victims
+
+
+class PipelineFuser:
+    """Composite for `Pipeline` that handles fusion of consecutive stages
+    which only add, replace or remove columns via projections like
+    `withColumn`, `select` or `drop`.
+
+    Each `withColumn` call adds another projection on top of the logical plan
+    which needs to be analyzed entirely by catalyst for every subsequent
+    call. For long chains of such stages, analysis time grows quickly and may
+    exceed execution time. When enabled, projections of consecutive
+    projection only stages are collapsed into a single projection right
+    after each stage transformation.
+
+    Dataframe representations of all stages remain available via
+    `pipeline(idx)` and `profile`. Stages with pipeline caching enabled and
+    stages explicitly kept via `keep` represent fusion boundaries. Their
+    logical plan is not fused into subsequent stages and hence remains part
+    of the downstream plans, e.g. to reuse manually persisted intermediate
+    results.
 
-        results = [result._asdict() for result in results]
-        return pd.DataFrame(results)
+    """
 
-    def _get_stage_properties(self,
-                              df_stage: DataFrame,
-                              idx: Optional[int] = None) -> StageProperties:
-        """Provides general stage properties like identifier, stage execution
-        count, number of columns and caching.
+    def __init__(self, pipeline: 'Pipeline', enabled: bool = False):
+        """Pipeline fuser keeps track of stages which represent fusion
+        boundaries via `self._store`.
 
         Parameters
         ----------
-        df_stage: pyspark.sql.DataFrame
-            Dataframe representation of stage.
-        idx: integer, None, optional
-            If idx is given, resembles a valid pipeline stage. If not,
-            represents input dataframe.
-
-        Returns
-        -------
-        stage_properties: StageProperties
+        pipeline: Pipeline
+            Parent pipeline object to be composite of.
+        enabled: bool, optional
+            If True, stage fusion is applied during `transform`.
 
         """
 
-        if idx is None:
-            name = "Input dataframe"
-            uid = ""
-        else:
-            name = self.pipeline.stages[idx].__class__.__name__
-            uid = self.pipeline.stages[idx].uid
-
-        execution_stage_count = self._get_execution_stage_count(df_stage)
-        cols = len(df_stage.columns)
-        cached = df_stage.is_cached
+        self.pipeline = pipeline
+        self.enabled = enabled
+        self._store = set()
 
-        return StageProperties(name, cols, execution_stage_count, cached, uid)
+    def keep(self, stages: List[TYPE_IDENTIFIER]) -> None:
+        """Keep given stages as fusion boundaries. Stage can be identified
+        via index, identifier or stage itself.
 
-    def _get_stage_profile(self,
-                           df_stage: DataFrame,
-                           idx: Optional[int] = None) -> StageProfile:
-        """Profile pipeline stage's dataframe and collect index, identifier,
-        total time, number of rows and columns, execution plan stage and
-        dataframe caching.
+        `transform` has to be called again for the pipeline's dataframe
+        representations to respect boundary changes.
 
         Parameters
         ----------
-        df_stage: pyspark.sql.DataFrame
-            Dataframe representation of stage.
-        idx: integer, None, optional
-            If idx is given, resembles a valid pipeline stage. If not,
-            represents input dataframe.
-
-        Returns
-        -------
-        profile: StageProfile
+        stages: iterable
+            Iterable of int, str or Transformer.
 
         """
 
-        stage_properties = self._get_stage_properties(df_stage, idx)
-        rows, total_time = self._get_rows_and_execution_time(df_stage)
+        stages = ensure_iterable(stages)
 
-        return StageProfile(str(idx),
-                            stage_properties.name,
-                            total_time,
-                            rows,
-                            stage_properties.cols,
-                            stage_properties.stage_count,
-                            stage_properties.cached,
-                            stage_properties.uid)
+        for stage in stages:
+            idx = self.pipeline._loc.get_index_location(stage)
+            self._store.add(idx)
 
-    def _get_stage_description(self,
-                               df_stage: DataFrame,
-                               idx: Optional[int] = None) -> StageDescription:
-        """Describe pipeline stages and collect index, identifier,
-        number of columns, stage execution count, doc string and caching.
+    def release(self, stages: List[TYPE_IDENTIFIER]) -> None:
+        """Release given stages from fusion boundaries. Stage can be
+        identified via index, identifier or stage itself.
 
         Parameters
         ----------
-        df_stage: pyspark.sql.DataFrame
-            Dataframe representation of stage.
-        idx: integer, None, optional
-            If idx is given, resembles a valid pipeline stage. If not,
-            represents input dataframe.
-
-        Returns
-        -------
-        description: StageDescription
+        stages: iterable
+            Iterable of int, str or Transformer.
 
         """
 
-        stage_properties = self._get_stage_properties(df_stage, idx)
-
-        if idx is not None:
-            doc_string = self.pipeline.stages[idx].__doc__
-        else:
-            doc_string = ""
+        stages = ensure_iterable(stages)
 
-        return StageDescription(str(idx),
-                                stage_properties.name,
-                                doc_string,
-                                stage_properties.cols,
-                                stage_properties.stage_count,
-                                stage_properties.cached,
-                                stage_properties.uid)
+        for stage in stages:
+            idx = self.pipeline._loc.get_index_location(stage)
 
-    def _get_execution_stage_count(self, df: DataFrame) -> int:
-        """Extract execution plan stage from `explain` string. All maximum
-        execution plan stages are summed up to account for resets due to
-        caching.
+            try:
+                self._store.remove(idx)
+            except KeyError:
+                raise ValueError("'{}' is not a fusion boundary and hence "
+                                 "cannot be released.".format(stage))
 
-        Accesses private member of pyspark dataframe and may break in future
-        releases. However, as of yet, there is no other way to access the
-        execution plan stage.
+    def fuse(self, df: DataFrame, base: DataFrame,
+             idx: int) -> Tuple[DataFrame, DataFrame]:
+        """Collapse projections of given stage dataframe with projections of
+        preceding projection only stages up to the base dataframe.
 
         Parameters
         ----------
         df: pyspark.sql.DataFrame
-            Pyspark dataframe for which the current execution plan stage will
-            be extracted.
+            Dataframe representation of the stage.
+        base: pyspark.sql.DataFrame
+            Dataframe representation of the most recent fusion boundary or
+            non projection only stage.
+        idx: int
+            Index location of the stage.
 
         Returns
         -------
-        stage_count: int
+        fused: tuple
+            Fused stage dataframe and base dataframe for the subsequent stage.
 
         """
 
-        # get explain string
-        explain = df._jdf.queryExecution().simpleString()
-        stages = self.regex_stage.findall(explain)
+        fused = collapse_projections(df, base)
 
-        # convert to numpy array
-        integers = map(int, stages)
-        array = np.array(list(integers))
+        if fused is not None:
+            df = fused
 
-        # remove all stages with larger successor
-        shift = np.hstack((0, array[:-1]))
-        decreases = array - shift
-        mask = decreases > 0
+        if fused is None or self.is_boundary(idx):
+            base = df
 
-        result = np.sum(array[mask])
+        return df, base
 
-        # sum up all local maxima
-        return int(result)
+    def is_boundary(self, idx: int) -> bool:
+        """Return if stage at index location `idx` represents a fusion
+        boundary.
 
-    @staticmethod
-    def _get_rows_and_execution_time(df: DataFrame) -> Tuple[int, float]:
-        """Profiles dataframe while calling `count` action and return execution
-        time, execution plan stage and number of rows.
+        """
 
-        Parameters
-        ----------
-        df: pyspark.sql.DataFrame
-            Pyspark dataframe to be profiled.
+        return idx in self._store or self.pipeline.cache.is_enabled(idx)
 
-        Returns
-        -------
-        profile: dict
-            Profile results containing `total_time`, `rows`, `cols` and
-            `stage`.
+    @property
+    def boundaries(self) -> List[Transformer]:
+        """Return all stages which are explicitly kept as fusion boundaries
+        in correct order.
+
+        """
+
+        return [self.pipeline.stages[idx]
+                for idx in sorted(self._store)]
+
+
+class PipelineCheckpointer:
+    """Composite for `Pipeline` that handles persistent stage checkpoints on
+    disk. In contrast to pipeline caching, checkpoints survive the spark
+    session and are reused by later sessions.
+
+    Stage results are written as parquet files into a local content
+    addressed store (see `pywrangler.pyspark.checkpoint.CheckpointStore`).
+    Entries are keyed by a hash of the stage names and parameters of all
+    stages up to and including the checkpointed stage combined with a
+    persistent fingerprint of the input dataframe (see
+    `pywrangler.pyspark.checkpoint.get_persistent_fingerprint`). If an entry
+    exists, the stored result is read instead of being recomputed. Changes of
+    the stage implementation are not detected and require explicit
+    invalidation via `invalidate`.
+
+    Checkpoints are written during `transform` which hence computes all
+    checkpointed stages that do not exist in the store yet.
+
+    """
+
+    def __init__(self, pipeline: 'Pipeline',
+                 store: Optional[CheckpointStore] = None):
+        """Pipeline checkpointer keeps track of stages for which
+        checkpointing is enabled via `self._store` and of the checkpoint keys
+        of the most recent transformation via `self.keys`.
+
+        Parameters
+        ----------
+        pipeline: Pipeline
+            Parent pipeline object to be composite of.
+        store: CheckpointStore, optional
+            Store used to persist checkpoints. If not given, uses the default
+            store location without size limit.
+
+        """
+
+        self.pipeline = pipeline
+        self.store = store or CheckpointStore()
+        self.keys = {}
+        self._store = set()
+
+    def enable(self, stages: List[TYPE_IDENTIFIER]) -> None:
+        """Enable checkpointing for given stages. Stage can be identified
+        via index, identifier or stage itself.
+
+        `transform` has to be called again for the pipeline's dataframe
+        representations to respect checkpointing changes.
+
+        Parameters
+        ----------
+        stages: iterable
+            Iterable of int, str or Transformer.
+
+        """
+
+        stages = ensure_iterable(stages)
+
+        for stage in stages:
+            idx = self.pipeline._loc.get_index_location(stage)
+            self._store.add(idx)
+
+    def disable(self, stages: List[TYPE_IDENTIFIER]) -> None:
+        """Disable checkpointing for given stages. Stage can be identified
+        via index, identifier or stage itself. Existing checkpoints remain in
+        the store.
+
+        Parameters
+        ----------
+        stages: iterable
+            Iterable of int, str or Transformer.
+
+        """
+
+        stages = ensure_iterable(stages)
+
+        for stage in stages:
+            idx = self.pipeline._loc.get_index_location(stage)
+
+            try:
+                self._store.remove(idx)
+            except KeyError:
+                raise ValueError("'{}' is not checkpointed and hence "
+                                 "cannot be disabled.".format(stage))
+
+    def invalidate(self, stages: List[TYPE_IDENTIFIER]) -> None:
+        """Remove existing checkpoints of given stages from the store for the
+        most recent transformation. Stage can be identified via index,
+        identifier or stage itself.
+
+        `transform` has to be called again to recompute the stages.
+
+        Parameters
+        ----------
+        stages: iterable
+            Iterable of int, str or Transformer.
+
+        """
+
+        stages = ensure_iterable(stages)
+
+        for stage in stages:
+            idx = self.pipeline._loc.get_index_location(stage)
+
+            if idx not in self.keys:
+                raise ValueError("Checkpoint of '{}' is not available. "
+                                 "Please enable checkpointing and execute "
+                                 "pipeline first via `transform`."
+                                 .format(stage))
+
+            if self.keys[idx] in self.store:
+                self.store.invalidate(self.keys[idx])
+
+    def checkpoint(self, df: DataFrame, idx: int, key: str) -> DataFrame:
+        """Read checkpoint of given stage if existent. Otherwise, write
+        stage's dataframe to the store.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Dataframe representation of the stage.
+        idx: int
+            Index location of the stage.
+        key: str
+            Checkpoint key of the stage.
+
+        Returns
+        -------
+        df_checkpoint: pyspark.sql.DataFrame
+            Dataframe read from the store.
+
+        """
+
+        self.keys[idx] = key
+
+        if key in self.store:
+            return self.store.read(key, df.sql_ctx.sparkSession)
+
+        name = self.pipeline.stages[idx].__class__.__name__
+        return self.store.write(df, key, name)
+
+    @staticmethod
+    def get_key(upstream: str, stage: Transformer) -> str:
+        """Create checkpoint key of given stage based on the key of its
+        upstream dataframe, the stage's name and its parameters. In contrast
+        to stage fingerprints, the stage's uid is not considered because it
+        changes across sessions.
+
+        Parameters
+        ----------
+        upstream: str
+            Checkpoint key of the upstream dataframe.
+        stage: pyspark.ml.Transformer
+            Pipeline stage.
+
+        Returns
+        -------
+        key: str
+
+        """
+
+        params = sorted((param.name, repr(value)) for param, value
+                        in stage.extractParamMap().items())
+
+        content = repr((upstream, stage.__class__.__name__, params))
+
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def is_enabled(self, idx: int) -> bool:
+        """Return if checkpointing is enabled for stage at index location
+        `idx`.
+
+        """
+
+        return idx in self._store
+
+    @property
+    def enabled(self) -> List[Transformer]:
+        """Return all stages with checkpointing enabled in correct order.
+
+        """
+
+        return [self.pipeline.stages[idx]
+                for idx in sorted(self._store)]
+
+
+class PipelineShufflePlanner:
+    """Composite for `Pipeline` that plans shuffles for stages which declare
+    partition and order requirements (see `PySparkWrangler.partitioning`).
+
+    Consecutive wranglers partitioned by the same columns may still cause
+    spark to insert a separate exchange for each stage, e.g. if partition
+    columns differ slightly or window functions depend on each other. When
+    enabled, the input of the first stage with requirements is repartitioned
+    once by the partition columns common to all stages with requirements and
+    sorted within partitions according to the first stage's requirements.
+    Hash partitioning on common columns satisfies all downstream stages
+    partitioned by the same or more columns. `verify` confirms that no
+    further exchanges are introduced by stages with requirements.
+
+    """
+
+    def __init__(self, pipeline: 'Pipeline', enabled: bool = False,
+                 num_partitions: Optional[int] = None):
+        """
+
+        Parameters
+        ----------
+        pipeline: Pipeline
+            Parent pipeline object to be composite of.
+        enabled: bool, optional
+            If True, shuffle planning is applied during `transform`.
+        num_partitions: int, optional
+            Number of partitions of the explicit repartition. If not given,
+            uses spark's default number of shuffle partitions.
+
+        """
+
+        self.pipeline = pipeline
+        self.enabled = enabled
+        self.num_partitions = num_partitions
+
+    def get_partitioning(self, idx: int) -> Optional[Partitioning]:
+        """Return declared partition requirements of stage at index location
+        `idx` if stage resembles a pyspark wrangler with requirements.
+
+        """
+
+        stage = self.pipeline.stages[idx]
+        wrangler = getattr(stage, "_wrangler", None)
+
+        if not isinstance(wrangler, PySparkWrangler):
+            return None
+
+        # ensure current stage parameters are respected
+        wrangler.set_params(**stage.getParams())
+        return wrangler.partitioning
+
+    def plan(self) -> Optional[Tuple[int, Partitioning]]:
+        """Determine the first stage with partition requirements and the
+        partitioning to be applied to its input.
+
+        Returns
+        -------
+        plan: tuple, None
+            Index location of the first stage with requirements and the
+            partitioning with common partition columns and the first stage's
+            sort order. Returns None if no stage declares requirements or if
+            no partition columns are shared.
+
+        """
+
+        requirements = [(idx, self.get_partitioning(idx))
+                        for idx in range(len(self.pipeline.stages))]
+        requirements = [(idx, partitioning)
+                        for idx, partitioning in requirements
+                        if partitioning and partitioning.partition_columns]
+
+        if not requirements:
+            return None
+
+        idx_first, first = requirements[0]
+        common = [column for column in first.partition_columns
+                  if all([column in partitioning.partition_columns
+                          for _, partitioning in requirements])]
+
+        if not common:
+            return None
+
+        return idx_first, first._replace(partition_columns=common)
+
+    def prepare(self, df: DataFrame, partitioning: Partitioning,
+                sort_columns: List[str]) -> DataFrame:
+        """Repartition given dataframe by the partition columns and sort
+        within partitions by given sort columns followed by orderby columns.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Input dataframe of the first stage with requirements.
+        partitioning: Partitioning
+            Planned partitioning.
+        sort_columns: list
+            Leading columns to be sorted in ascending order (e.g. partition
+            columns of the first stage with requirements).
+
+        Returns
+        -------
+        df_prepared: pyspark.sql.DataFrame
+
+        """
+
+        columns = partitioning.partition_columns
+        if self.num_partitions:
+            df = df.repartition(self.num_partitions, *columns)
+        else:
+            df = df.repartition(*columns)
+
+        ascending = [True] * len(sort_columns) + partitioning.ascending
+        orderby = util.prepare_orderby(sort_columns +
+                                       partitioning.orderby_columns,
+                                       ascending)
+
+        return df.sortWithinPartitions(*orderby)
+
+    def verify(self) -> List[int]:
+        """Analyze physical plans of the most recent transformation and
+        identify stages with partition requirements which introduce
+        additional exchanges compared to their parent stage. A single
+        exchange is expected for the first stage with requirements.
+
+        Returns
+        -------
+        stages: list
+            Index locations of stages introducing additional exchanges.
+
+        """
+
+        transformer = self.pipeline._transformer
+        if not transformer:
+            raise ValueError("Shuffle plan can not be verified yet. Please "
+                             "execute pipeline first via `transform`.")
+
+        def get_exchanges(idx):
+            if idx is None:
+                df = transformer.input_df
+            else:
+                df = transformer.transformations[idx]
+
+            return analyze_plan(df).exchanges
+
+        additional = []
+        expected = 1
+        for idx in range(len(self.pipeline.stages)):
+            partitioning = self.get_partitioning(idx)
+            if not partitioning or not partitioning.partition_columns:
+                continue
+
+            exchanges = get_exchanges(idx)
+            exchanges -= get_exchanges(self.pipeline.parents[idx])
+
+            if exchanges > expected:
+                additional.append(idx)
+
+            expected = 0
+
+        return additional
+
+
+class PipelineTransformer:
+    """Composite for `Pipeline` that manages the actual dataframe
+    transformation performed by all stages in sequence for given input
+    dataframe while incorporating pipeline caching.
+
+    Each stage's result is identified by a fingerprint which combines the
+    semantic hash of the input dataframe's plan with the uid and parameters
+    of all stages up to and including the stage. If memoization is enabled
+    for the pipeline, stage dataframes of previous transformations are reused
+    as long as the fingerprints of all preceding stages and their pipeline
+    caching and fusion properties remain unchanged. Hence, changing
+    parameters of the last stages only rebuilds the last stages.
+
+    """
+
+    def __init__(self, pipeline: 'Pipeline', checkpointing: bool = True):
+        """Pipeline transformer keeps track of all stages dataframe
+        transformations via `self.transformation` and of their fingerprints
+        via `self.fingerprints`. In addition, the input dataframe is
+        referenced via `self.input_df`. Memoized stage dataframes of the
+        previous transformation are stored in `self._memo`.
+
+        Parameters
+        ----------
+        pipeline: Pipeline
+            Parent pipeline object to be composite of.
+        checkpointing: bool, optional
+            If False, checkpoints are neither read nor written and the
+            checkpoint keys of the pipeline remain unchanged. This is used
+            for auxiliary transformations like profiling on other input
+            dataframes.
+
+        """
+
+        self.pipeline = pipeline
+        self.checkpointing = checkpointing
+        self.transformations = []
+        self.fingerprints = []
+        self.input_df = None
+
+        self._memo = {}
+
+    def transform(self, df: DataFrame) -> DataFrame:
+        """Performs dataframe transformation for given input dataframe while
+        respecting pipeline caches.
+
+        Previous transformations are overridden and hence will be lost unless
+        memoization is enabled and they can be reused.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Input dataframe to apply transformations to.
+
+        Returns
+        -------
+        df_result: pyspark.sql.DataFrame
+            Resulting dataframe after all transformations have been applied.
+
+        """
+
+        emitting = events.is_enabled()
+        if emitting:
+            start = timeit.default_timer()
+            events.emit(events.PIPELINE_START, pipeline=self.pipeline.uid,
+                        stages=len(self.pipeline.stages))
+
+        df_result = self._transform(df)
+
+        # automatic caching requires dataframes to be recreated on changes
+        advisor = self.pipeline.cache_advisor
+        if self is self.pipeline._transformer and advisor.auto:
+            if advisor.apply():
+                df_result = self._transform(df)
+
+        if emitting:
+            events.emit(events.PIPELINE_END, pipeline=self.pipeline.uid,
+                        stages=len(self.pipeline.stages),
+                        duration=timeit.default_timer() - start)
+
+        return df_result
+
+    def _transform(self, df: DataFrame) -> DataFrame:
+        """Apply all stages in sequence to the dataframe of their parent stage
+        or the input dataframe while respecting pipeline caches.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Input dataframe to apply transformations to.
+
+        Returns
+        -------
+        df_result: pyspark.sql.DataFrame
+
+        """
+
+        self.transformations.clear()
+        self.fingerprints.clear()
+        self.input_df = df
+
+        fusion = self.pipeline.fusion
+        checkpoint = self.pipeline.checkpoint
+        checkpointing = self.checkpointing and checkpoint.enabled
+
+        planner = self.pipeline.shuffle_planner
+        shuffle_plan = planner.plan() if planner.enabled else None
+
+        memo = self._memo if self.pipeline.memoize else {}
+        self._memo = {}
+
+        # properties of the input dataframe: dataframe, fusion base,
+        # fingerprint, checkpoint key, caching state and reuse
+        root = (df, df, self._get_input_fingerprint(df),
+                get_persistent_fingerprint(df) if checkpointing else None,
+                None, True)
+
+        bases = []
+        checkpoint_keys = []
+        reused = []
+
+        emitting = events.is_enabled()
+
+        for idx, stage in enumerate(self.pipeline.stages):
+            parent = self.pipeline.parents[idx]
+
+            if emitting:
+                start = timeit.default_timer()
+                events.emit(events.STAGE_START,
+                            **self.pipeline._get_event_fields(idx))
+
+            if parent is None:
+                df, base, fingerprint, checkpoint_key, state, reuse = root
+            else:
+                df = self.transformations[parent]
+                base = bases[parent]
+                fingerprint = self.fingerprints[parent]
+                checkpoint_key = checkpoint_keys[parent]
+                state = self._get_stage_state(parent)
+                reuse = reused[parent]
+
+            if shuffle_plan and shuffle_plan[0] == idx:
+                partitioning = shuffle_plan[1]
+            else:
+                partitioning = None
+
+            fingerprint = self._get_stage_fingerprint(fingerprint, idx)
+            key = (fingerprint, state, checkpoint.is_enabled(idx),
+                   repr(partitioning))
+
+            if checkpointing:
+                checkpoint_key = checkpoint.get_key(checkpoint_key, stage)
+
+            # reuse requires all preceding stages to be reused, too
+            reuse = reuse and key in memo
+
+            if reuse:
+                df, base = memo[key]
+
+            else:
+                if partitioning:
+                    sort_columns = planner.get_partitioning(idx) \
+                        .partition_columns
+                    df = planner.prepare(df, partitioning, sort_columns)
+
+                df = stage.transform(df)
+
+                if fusion.enabled:
+                    df, base = fusion.fuse(df, base, idx)
+
+                if checkpointing and checkpoint.is_enabled(idx):
+                    df = checkpoint.checkpoint(df, idx, checkpoint_key)
+                    base = df
+
+                if self.pipeline.cache.is_enabled(idx):
+                    self.pipeline.cache.persist(df, idx)
+
+            if self.pipeline.memoize:
+                self._memo[key] = (df, base)
+
+            if emitting:
+                fields = self.pipeline._get_event_fields(idx)
+                events.emit(events.STAGE_END,
+                            duration=timeit.default_timer() - start,
+                            reused=int(reuse),
+                            **fields)
+                events.emit(events.STAGE_PLAN,
+                            **analyze_plan(df)._asdict(),
+                            **fields)
+
+            self.transformations.append(df)
+            self.fingerprints.append(fingerprint)
+            bases.append(base)
+            checkpoint_keys.append(checkpoint_key)
+            reused.append(reuse)
+
+        return df
+
+    @staticmethod
+    def _get_input_fingerprint(df: DataFrame) -> str:
+        """Create fingerprint of input dataframe based on the semantic hash
+        of its analyzed plan. Semantically equal plans share the same
+        fingerprint.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Input dataframe.
+
+        Returns
+        -------
+        fingerprint: str
+
+        """
+
+        plan = df._jdf.queryExecution().analyzed()
+        return str(plan.semanticHash())
+
+    def _get_stage_fingerprint(self, upstream: str, idx: int) -> str:
+        """Create fingerprint of stage at index location `idx` based on the
+        fingerprint of its upstream dataframe, the stage's uid and its
+        parameters.
+
+        Parameters
+        ----------
+        upstream: str
+            Fingerprint of the upstream dataframe.
+        idx: int
+            Index location of the stage.
+
+        Returns
+        -------
+        fingerprint: str
+
+        """
+
+        stage = self.pipeline.stages[idx]
+        params = sorted((param.name, repr(value)) for param, value
+                        in stage.extractParamMap().items())
+
+        content = repr((upstream, stage.uid, params))
+
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def _get_stage_state(self, idx: int) -> tuple:
+        """Return pipeline caching, fusion and checkpointing properties of
+        stage at index location `idx` which affect plans of subsequent stages.
+
+        """
+
+        cache = self.pipeline.cache
+        fusion = self.pipeline.fusion
+
+        return (cache.is_enabled(idx),
+                repr(cache._storage_levels.get(idx)),
+                fusion.enabled,
+                fusion.is_boundary(idx),
+                self.pipeline.checkpoint.is_enabled(idx))
+
+    def __iter__(self) -> Iterator:
+        """Allow transformer to be iterable. Simply returns an iterator of
+        `transformations`.
+
+        """
+
+        return iter(self.transformations)
+
+    def __bool__(self) -> bool:
+        """Return if transformation was already run.
+
+        """
+
+        return len(self.transformations) > 0
+
+
+class PipelineProfiler:
+    """Represents a profile of a given pipeline. Executes each stage in order
+    and collects information about execution time, execution plan stage, shape
+    of the resulting dataframe and caching.
+
+    """
+
+    # estimated size ratios between consecutive stages to flag volume changes
+    explosion_threshold = 2.0
+    shrinkage_threshold = 0.5
+
+    def __init__(self, pipeline: 'Pipeline', materialization: str = "count"):
+        """Keeps track of all profiles stages via `self.profiles`.
+
+        Parameters
+        ----------
+        pipeline: Pipeline
+            Pipeline object to be profiled.
+        materialization: str, optional
+            Defines the action which enforces computation of each stage's
+            dataframe while profiling. See
+            `pywrangler.pyspark.benchmark.materialize` for more details.
+
+        """
+
+        validate_materialization(materialization)
+
+        self.pipeline = pipeline
+        self.materialization = materialization
+
+    def profile(self, df: Optional[DataFrame] = None) -> pd.DataFrame:
+        """Profiles each pipeline stage and provides information about
+        execution time, execution plan stage and stage dataframe shape.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame, optional
+            If provided, profiles pipeline on given dataframe. If not given,
+            uses already existing pipeline transformer object.
+
+        Returns
+        -------
+        profile: pd.DataFrame
+
+        """
+
+        return self._execute("profile", df)
+
+    def profile_sampled(self, df: Optional[DataFrame],
+                        fractions: List[float],
+                        groupby_columns: Optional[List[str]] = None,
+                        seed: int = 0,
+                        confidence: float = 0.95) -> pd.DataFrame:
+        """Profiles each pipeline stage on deterministic samples of the input
+        dataframe and extrapolates execution time and number of rows to the
+        full input.
+
+        Samples contain whole groups (see
+        `pywrangler.pyspark.util.sample_groups`) because stage results like
+        interval ids depend on complete group sequences. If no groupby
+        columns are given, the partition columns shared by all stages with
+        partition requirements are used (see `PipelineShufflePlanner`).
+
+        For each sample, the effective fraction is given by the ratio of
+        sampled to total input rows. Execution times are extrapolated via a
+        linear model accounting for fixed costs while row counts are assumed
+        to be proportional to the effective fraction. Confidence bands
+        require at least three fractions for execution times and two
+        fractions for row counts. Otherwise, bounds are NaN.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame, None
+            Input dataframe. If None, uses the input dataframe of the most
+            recent transformation.
+        fractions: list
+            Fractions of groups to be sampled.
+        groupby_columns: list, optional
+            Columns identifying groups.
+        seed: int, optional
+            Seed of the sampling hash function.
+        confidence: float, optional
+            Confidence level of the bands.
+
+        Returns
+        -------
+        profile: pd.DataFrame
+
+        """
+
+        if df is None:
+            if not self.pipeline._transformer:
+                raise ValueError("Please provide input dataframe via `df` "
+                                 "or run `transform` method first.")
+            df = self.pipeline._transformer.input_df
+
+        fractions = sorted(set(ensure_iterable(fractions)))
+
+        if groupby_columns is None:
+            plan = self.pipeline.shuffle_planner.plan()
+            groupby_columns = plan[1].partition_columns if plan else []
+
+        total_rows = df.count()
+        if not total_rows:
+            raise ValueError("Input dataframe is empty and can not be "
+                             "sampled.")
+
+        effective_fractions = []
+        profiles = []
+        for fraction in fractions:
+            df_sample = util.sample_groups(df, fraction, groupby_columns, seed)
+
+            sample_rows = df_sample.count()
+            if not sample_rows:
+                continue
+
+            effective_fractions.append(sample_rows / total_rows)
+            profiles.append(self._execute("profile", df_sample))
+
+        if not profiles:
+            raise ValueError("All samples are empty. Please increase "
+                             "sample fractions.")
+
+        results = []
+        for idx, row in profiles[-1].iterrows():
+            times = [profile.loc[idx, "total_time"] for profile in profiles]
+            time = extrapolate(effective_fractions, times,
+                               confidence=confidence)
+
+            rows = [profile.loc[idx, "rows"] for profile in profiles]
+            if any([pd.isnull(x) for x in rows]):
+                rows = (np.nan, np.nan, np.nan)
+            else:
+                rows = extrapolate(effective_fractions, rows,
+                                   confidence=confidence, intercept=False)
+
+            results.append(SampledStageProfile(row["idx"],
+                                               row["name"],
+                                               *time,
+                                               *rows,
+                                               self.materialization,
+                                               len(profiles),
+                                               row["uid"]))
+
+        results = [result._asdict() for result in results]
+        return pd.DataFrame(results)
+
+    def describe(self, df: Optional[DataFrame] = None) -> pd.DataFrame:
+        """Describes each pipeline stage and provides information about
+        execution plan stage, number of columns and docs. In addition, flags
+        data explosion or shrinkage based on the optimizer's size estimates
+        of consecutive stages.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame, optional
+            If provided, profiles pipeline on given dataframe. If not given,
+            uses already existing pipeline transformer object.
+
+        Returns
+        -------
+        description: pd.DataFrame
+
+        """
+
+        descriptions = self._execute("describe", df)
+
+        return self._add_volume_changes(descriptions)
+
+    def _add_volume_changes(self, descriptions: pd.DataFrame) -> pd.DataFrame:
+        """Add the ratio of estimated sizes between each stage and its
+        predecessor (parent stage or input dataframe) via `size_ratio`. Flag
+        data explosion and shrinkage via `volume_change` based on
+        `explosion_threshold` and `shrinkage_threshold`.
+
+        Parameters
+        ----------
+        descriptions: pd.DataFrame
+            Stage descriptions containing estimated sizes.
+
+        Returns
+        -------
+        descriptions: pd.DataFrame
+
+        """
+
+        sizes = descriptions["estimated_size"].astype(float)
+
+        # first row represents input dataframe
+        predecessors = [np.nan] + [0 if parent is None else parent + 1
+                                   for parent in self.pipeline.parents]
+        sizes_predecessor = sizes.reindex(predecessors).values
+        ratios = sizes / sizes_predecessor
+
+        conditions = [ratios >= self.explosion_threshold,
+                      ratios <= self.shrinkage_threshold]
+        choices = ["explosion", "shrinkage"]
+
+        descriptions["size_ratio"] = ratios
+        descriptions["volume_change"] = np.select(conditions, choices, "")
+
+        return descriptions
+
+    def _execute(self, method: str,
+                 df: Optional[DataFrame] = None) -> pd.DataFrame:
+        """Generic function to either describe or profile given pipeline.
+        Describing the pipeline does not run any actions. In contrast,
+        profiling will actually call actions and may take some time.
+
+        Parameters
+        ----------
+        method: str
+            Choose either `describe` or `profile`.
+        df: pyspark.sql.DataFrame, optional
+            If provided, profiles pipeline on given dataframe. If not given,
+            uses already existing pipeline transformer object.
+
+        """
+
+        methods = {
+            "describe": self._get_stage_description,
+            "profile": self._get_stage_profile
+        }
+
+        caller = methods[method]
+
+        # ensure existing input dataframe
+        if df is None and not self.pipeline._transformer:
+            raise ValueError("Please provide input dataframe via `df` "
+                             "or run `transform` method first.")
+
+        # auxiliary transformations must not touch pipeline checkpoints
+        if df is not None:
+            transformer = PipelineTransformer(self.pipeline,
+                                              checkpointing=False)
+            transformer.transform(df)
+        else:
+            transformer = self.pipeline._transformer
+
+        # reset profiler
+        results = []
+
+        # initial profile of input dataframe
+        start_profile = caller(transformer.input_df)
+        results.append(start_profile)
+
+        # subsequent stage profiles
+        for idx, df_stage in enumerate(transformer):
+            results.append(caller(df_stage, idx))
+
+        results = [result._asdict() for result in results]
+        return pd.DataFrame(results)
+
+    def _get_stage_properties(self,
+                              df_stage: DataFrame,
+                              idx: Optional[int] = None) -> StageProperties:
+        """Provides general stage properties like identifier, stage execution
+        count, number of columns and caching.
+
+        Parameters
+        ----------
+        df_stage: pyspark.sql.DataFrame
+            Dataframe representation of stage.
+        idx: integer, None, optional
+            If idx is given, resembles a valid pipeline stage. If not,
+            represents input dataframe.
+
+        Returns
+        -------
+        stage_properties: StageProperties
+
+        """
+
+        if idx is None:
+            name = "Input dataframe"
+            uid = ""
+        else:
+            name = self.pipeline.stages[idx].__class__.__name__
+            uid = self.pipeline.stages[idx].uid
+
+        execution_stage_count = self._get_execution_stage_count(df_stage)
+        cols = len(df_stage.columns)
+        cached = df_stage.is_cached
+
+        return StageProperties(name, cols, execution_stage_count, cached, uid)
+
+    def _get_stage_profile(self,
+                           df_stage: DataFrame,
+                           idx: Optional[int] = None) -> StageProfile:
+        """Profile pipeline stage's dataframe and collect index, identifier,
+        total time, number of rows and columns, execution plan stage,
+        dataframe caching, spark job metrics and planning metrics (see
+        `pywrangler.pyspark.plan.measure_planning`).
+
+        Parameters
+        ----------
+        df_stage: pyspark.sql.DataFrame
+            Dataframe representation of stage.
+        idx: integer, None, optional
+            If idx is given, resembles a valid pipeline stage. If not,
+            represents input dataframe.
+
+        Returns
+        -------
+        profile: StageProfile
+
+        """
+
+        stage_properties = self._get_stage_properties(df_stage, idx)
+        planning_metrics = measure_planning(df_stage)
+
+        collector = SparkJobMetricsCollector()
+        with collector:
+            rows, total_time = self._get_rows_and_execution_time(df_stage)
+
+        events.emit(events.STAGE_MATERIALIZATION,
+                    duration=total_time,
+                    rows=rows,
+                    materialization=self.materialization,
+                    **self.pipeline._get_event_fields(idx))
+
+        return StageProfile(str(idx),
+                            stage_properties.name,
+                            total_time,
+                            rows,
+                            self.materialization,
+                            stage_properties.cols,
+                            stage_properties.stage_count,
+                            stage_properties.cached,
+                            stage_properties.uid,
+                            *collector.metrics,
+                            *planning_metrics)
+
+    def _get_stage_description(self,
+                               df_stage: DataFrame,
+                               idx: Optional[int] = None) -> StageDescription:
+        """Describe pipeline stages and collect index, identifier,
+        number of columns, stage execution count, doc string, caching,
+        execution plan analysis (see `pywrangler.pyspark.plan.analyze_plan`)
+        and planning metrics (see `pywrangler.pyspark.plan.measure_planning`).
+
+        Parameters
+        ----------
+        df_stage: pyspark.sql.DataFrame
+            Dataframe representation of stage.
+        idx: integer, None, optional
+            If idx is given, resembles a valid pipeline stage. If not,
+            represents input dataframe.
+
+        Returns
+        -------
+        description: StageDescription
+
+        """
+
+        stage_properties = self._get_stage_properties(df_stage, idx)
+
+        if idx is not None:
+            doc_string = self.pipeline.stages[idx].__doc__
+        else:
+            doc_string = ""
+
+        return StageDescription(str(idx),
+                                stage_properties.name,
+                                doc_string,
+                                stage_properties.cols,
+                                stage_properties.stage_count,
+                                stage_properties.cached,
+                                stage_properties.uid,
+                                *analyze_plan(df_stage),
+                                *estimate_statistics(df_stage),
+                                *measure_planning(df_stage))
+
+    def _get_execution_stage_count(self, df: DataFrame) -> int:
+        """Count whole stage code generation stages of the physical
+        execution plan including stages of cached data (see
+        `pywrangler.pyspark.plan.count_codegen_stages`).
+
+        Accesses private member of pyspark dataframe and may break in future
+        releases.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Pyspark dataframe for which the execution plan stages will be
+            counted.
+
+        Returns
+        -------
+        stage_count: int
+
+        """
+
+        return count_codegen_stages(df._jdf.queryExecution().executedPlan())
+
+    def _get_rows_and_execution_time(self, df: DataFrame) \
+            -> Tuple[Optional[int], float]:
+        """Profiles dataframe while materializing it with the action defined
+        by `self.materialization` and return number of rows and execution
+        time.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame
+            Pyspark dataframe to be profiled.
+
+        Returns
+        -------
+        profile: tuple
+            Number of rows (None if not available for given materialization)
+            and total time in seconds.
 
         """
 
         # total time and count
         ts_start = pd.Timestamp.now()
-        rows = df.count()
+        rows = materialize(df, self.materialization)
         ts_end = pd.Timestamp.now()
         total_time = (ts_end - ts_start).total_seconds()
 
@@ -907,6 +2188,21 @@ class Pipeline(PipelineModel):
     representation of each stage while `__getitem__` allows to access the
     `Transformer` instance of each stage.
 
+    Pipeline caching can be enabled manually via `cache` or recommended and
+    applied by `cache_advisor` based on plan cost, stage reuse and estimated
+    size.
+
+    Consecutive stages which only add or replace columns may be fused into
+    a single projection via `fusion` to reduce catalyst analysis time of long
+    pipelines. Memoization allows to reuse stage dataframes of unchanged
+    pipeline prefixes across `transform` calls. Stage results may be
+    persisted on disk via `checkpoint` to be reused across spark sessions.
+    Wranglers sharing partition requirements may be repartitioned once via
+    `shuffle_planner`.
+
+    Transformations, plan metrics and materializations of stages emit events
+    to registered sinks (see `pywrangler.events`).
+
     Each pipeline instance may be provided with an explicit documentation
     string.
 
@@ -916,10 +2212,20 @@ class Pipeline(PipelineModel):
         Contains the stages for the pipleline.
     doc: str, optional
         Provide optional doc string for the pipeline.
+    fuse: bool, optional
+        If True, enables fusion of consecutive projection only stages.
+    memoize: bool, optional
+        If True, reuses stage dataframes of the previous transformation for
+        unchanged prefixes of the pipeline.
+    plan_shuffles: bool, optional
+        If True, repartitions and sorts data once for stages with declared
+        partition requirements.
 
     """
 
-    def __init__(self, stages: List, doc: Optional[str] = None):
+    def __init__(self, stages: List, doc: Optional[str] = None,
+                 fuse: bool = False, memoize: bool = False,
+                 plan_shuffles: bool = False):
         """Instantiate pipeline. Validate/convert stage input.
 
         """
@@ -931,22 +2237,59 @@ class Pipeline(PipelineModel):
 
         # public
         self.cache = PipelineCacher(self)
+        self.cache_advisor = PipelineCacheAdvisor(self)
+        self.fusion = PipelineFuser(self, fuse)
+        self.memoize = memoize
+        self.checkpoint = PipelineCheckpointer(self)
+        self.shuffle_planner = PipelineShufflePlanner(self, plan_shuffles)
         self.doc = doc
 
+        # index locations of parent stages, None refers to input dataframe
+        self.parents = [None] + list(range(len(self.stages) - 1))
+
         # private
         self._loc = PipelineLocator(self)
         self._transformer = PipelineTransformer(self)
 
-    def profile(self, df: Optional[DataFrame] = None) -> pd.DataFrame:
+    def profile(self, df: Optional[DataFrame] = None,
+                materialization: str = "count",
+                sample: Union[None, float, List[float]] = None,
+                groupby_columns: Optional[List[str]] = None,
+                seed: int = 0,
+                confidence: float = 0.95) -> pd.DataFrame:
         """Executes each stage in order and collects information about
         execution time, execution plan stage, shape of the resulting dataframe
-        and caching.
+        and caching. In addition, spark job metrics of each stage's action
+        are provided (number of jobs and stages, task time, shuffle
+        read/write, memory/disk spill and input records) as well as driver
+        side catalyst analysis, optimization and planning time and plan node
+        counts.
 
         Parameters
         ----------
         df: pyspark.sql.DataFrame, optional
             If provided, profiles pipeline on given dataframe. If not given,
             uses already existing pipeline transformer object.
+        materialization: str, optional
+            Defines the action which enforces computation of each stage.
+            `count` (default) may skip the computation of columns which are
+            not required to count rows. `noop` and `hash` enforce the
+            computation of all columns. The employed strategy is reported in
+            the `materialization` column.
+        sample: float, list, optional
+            If given, profiles the pipeline on deterministic samples of whole
+            groups with given fractions instead of the full input. Execution
+            time and number of rows of each stage are extrapolated to the
+            full input including confidence bands (see
+            `PipelineProfiler.profile_sampled`). Spark job and planning
+            metrics are not reported.
+        groupby_columns: list, optional
+            Columns identifying groups for sampling. If not given, uses the
+            partition columns shared by stages with partition requirements.
+        seed: int, optional
+            Seed for sampling.
+        confidence: float, optional
+            Confidence level of extrapolation bands.
 
         Returns
         -------
@@ -954,11 +2297,24 @@ class Pipeline(PipelineModel):
 
         """
 
-        return PipelineProfiler(self).profile(df)
+        profiler = PipelineProfiler(self, materialization)
+
+        if sample is None:
+            return profiler.profile(df)
+
+        return profiler.profile_sampled(df, sample, groupby_columns, seed,
+                                        confidence)
 
     def describe(self, df: Optional[DataFrame] = None) -> pd.DataFrame:
         """Describes each stage in order and collects information about
-        execution plan stage, number of columns and caching.
+        execution plan stage, number of columns and caching. In addition,
+        the optimized logical and physical plans are analyzed to provide the
+        number of shuffles (exchanges), broadcast exchanges, sorts, windows,
+        cached scans, reused exchanges and plan depths. Also, the
+        optimizer's size and row count estimates are reported while data
+        explosion and shrinkage between stages is flagged. Catalyst analysis,
+        optimization and planning time and plan node counts reveal plan
+        complexity. No actions are run.
 
         Parameters
         ----------
@@ -993,6 +2349,22 @@ class Pipeline(PipelineModel):
 
         return self._transformer.transform(df)
 
+    def _get_event_fields(self, idx: Optional[int]) -> Dict[str, str]:
+        """Return fields identifying the pipeline and the stage at index
+        location `idx` for emitted events. None refers to the input
+        dataframe.
+
+        """
+
+        if idx is None:
+            name, uid = "Input dataframe", ""
+        else:
+            name = self.stages[idx].__class__.__name__
+            uid = self.stages[idx].uid
+
+        return {"pipeline": self.uid, "stage": name, "uid": uid,
+                "idx": str(idx)}
+
     def __getitem__(self, value: TYPE_IDENTIFIER) -> \
             Union[Transformer, 'Pipeline']:
         """Get stage by index location/label access or create a sliced copy of
@@ -1054,3 +2426,248 @@ class Pipeline(PipelineModel):
 
     def __str__(self):
         return self.__repr__()
+
+
+class BranchingPipeline(Pipeline):
+    """Represents a pipeline whose stages form a directed acyclic graph
+    instead of a linear sequence. Each stage declares its parent stage whose
+    resulting dataframe it transforms. Stages without parent transform the
+    input dataframe. This allows to compute several independent outputs
+    (branches) from shared intermediate results.
+
+    Shared stages with more than one child are cached automatically via
+    pipeline caching unless disabled. Actions of independent branches can be
+    executed concurrently via `execute` while each branch submits its jobs
+    into a separate spark scheduler pool. Pools are only respected by spark
+    if the FAIR scheduler is enabled via `spark.scheduler.mode=FAIR`.
+    Otherwise, concurrent jobs are scheduled FIFO.
+
+    Scheduler pools are thread local properties which can only be assigned
+    reliably from concurrent python threads in py4j's pinned thread mode
+    (`PYSPARK_PIN_THREAD=true`, requires spark >= 3.0). Without it, python
+    threads do not map to dedicated JVM threads. Hence, branches are still
+    executed concurrently but pools are not assigned and a warning is
+    emitted.
+
+    All features of `Pipeline` like profiling, describing, caching and
+    stage access apply. Stages are processed in the given order which needs
+    to list parents before their children.
+
+    Parameters
+    ----------
+    stages: iterable
+        Contains tuples of stage and parent identifier. The parent identifier
+        may be an index location, an identifier substring or a stage. A stage
+        may be given as the original object (e.g. function or wrangler)
+        contained in `stages` or as the converted pipeline stage. If parent
+        is None, the stage transforms the input dataframe.
+    doc: str, optional
+        Provide optional doc string for the pipeline.
+    cache_shared: bool, optional
+        If True, enables pipeline caching for stages with multiple children.
+    kwargs: dict, optional
+        Further keyword arguments passed to `Pipeline`.
+
+    """
+
+    pool_prefix = "pywrangler"
+
+    def __init__(self, stages: List[TYPE_BRANCH_STAGE],
+                 doc: Optional[str] = None,
+                 cache_shared: bool = True,
+                 **kwargs):
+
+        originals = [stage for stage, _ in stages]
+        super().__init__(originals, doc, **kwargs)
+
+        self.parents = [self._get_parent_location(idx, parent, originals)
+                        for idx, (_, parent) in enumerate(stages)]
+
+        if cache_shared and self.shared:
+            self.cache.enable(self.shared)
+
+    def _get_parent_location(self, idx: int,
+                             parent: Optional[TYPE_IDENTIFIER],
+                             originals: List) -> Optional[int]:
+        """Resolve parent identifier of stage at index location `idx` and
+        ensure that parents precede their children. Parents given as
+        original stage objects are resolved via their first position in
+        `originals` because stages are converted on initialization.
+
+        """
+
+        if parent is None:
+            return None
+
+        matches = [pos for pos, original in enumerate(originals)
+                   if original is parent]
+
+        if matches and not isinstance(parent, (int, str)):
+            idx_parent = matches[0]
+        else:
+            idx_parent = self._loc.get_index_location(parent)
+        if idx_parent >= idx:
+            raise ValueError("Parent '{}' of stage at index {} needs to "
+                             "precede the stage.".format(parent, idx))
+
+        return idx_parent
+
+    @property
+    def children(self) -> Dict[int, List[int]]:
+        """Return index locations of child stages for each stage.
+
+        """
+
+        children = defaultdict(list)
+        for idx, parent in enumerate(self.parents):
+            if parent is not None:
+                children[parent].append(idx)
+
+        return {idx: children[idx] for idx in range(len(self.stages))}
+
+    @property
+    def leaves(self) -> List[int]:
+        """Return index locations of stages without children representing
+        the outputs of all branches.
+
+        """
+
+        return [idx for idx, children in self.children.items()
+                if not children]
+
+    @property
+    def shared(self) -> List[int]:
+        """Return index locations of stages with more than one child.
+
+        """
+
+        return [idx for idx, children in self.children.items()
+                if len(children) > 1]
+
+    def execute(self, df: Optional[DataFrame] = None,
+                stages: Optional[List[TYPE_IDENTIFIER]] = None,
+                materialization: str = "count",
+                max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Execute actions for given stages concurrently from a thread pool.
+        In pinned thread mode, each stage's jobs are submitted into its own
+        spark scheduler pool named by `pool_prefix` and the stage's index
+        location (see `BranchingPipeline`). Cached shared
+        stages which are ancestors of given stages are computed beforehand
+        to prevent concurrent branches from computing them redundantly.
+
+        Parameters
+        ----------
+        df: pyspark.sql.DataFrame, optional
+            If provided, transforms pipeline on given dataframe first. If not
+            given, uses already existing pipeline transformer object.
+        stages: iterable, optional
+            Stages to be executed. Defaults to all leaves.
+        materialization: str, optional
+            Defines the action which enforces computation of each stage (see
+            `pywrangler.pyspark.benchmark.materialize`).
+        max_workers: int, optional
+            Maximum number of concurrent actions. Defaults to number of
+            stages.
+
+        Returns
+        -------
+        results: dict
+            Result of each stage's action keyed by the stage's uid.
+
+        """
+
+        validate_materialization(materialization)
+
+        if df is not None:
+            self.transform(df)
+        elif not self._transformer:
+            raise ValueError("Please provide input dataframe via `df` "
+                             "or run `transform` method first.")
+
+        if stages is None:
+            indices = self.leaves
+        else:
+            indices = [self._loc.get_index_location(stage)
+                       for stage in ensure_iterable(stages)]
+
+        if not indices:
+            return {}
+
+        # compute cached shared ancestors first
+        for idx in self._get_shared_ancestors(indices):
+            if self.cache.is_enabled(idx):
+                df_shared = self._loc.get_transformation(idx, track=False)
+                materialize(df_shared, "count")
+
+        spark_context = self._transformer.input_df.sql_ctx._sc
+        use_pools = util.is_pinned_thread_mode(spark_context)
+
+        if not use_pools and len(indices) > 1:
+            warnings.warn("Scheduler pools of concurrent branches can only be "
+                          "assigned in pinned thread mode. Set environment "
+                          "variable `PYSPARK_PIN_THREAD=true` before starting "
+                          "spark to enable it.", RuntimeWarning)
+
+        def run(idx):
+            if use_pools:
+                previous = spark_context.getLocalProperty(
+                    "spark.scheduler.pool")
+                pool = "{}_{}".format(self.pool_prefix, idx)
+                spark_context.setLocalProperty("spark.scheduler.pool", pool)
+
+            try:
+                df_stage = self._loc.get_transformation(idx, track=False)
+
+                start = timeit.default_timer()
+                result = materialize(df_stage, materialization)
+
+                events.emit(events.STAGE_MATERIALIZATION,
+                            duration=timeit.default_timer() - start,
+                            rows=result,
+                            materialization=materialization,
+                            **self._get_event_fields(idx))
+
+                return result
+            finally:
+                if use_pools:
+                    spark_context.setLocalProperty("spark.scheduler.pool",
+                                                   previous)
+
+        with ThreadPoolExecutor(max_workers or len(indices)) as executor:
+            futures = {self.stages[idx].uid: executor.submit(run, idx)
+                       for idx in indices}
+
+        return {uid: future.result() for uid, future in futures.items()}
+
+    def _get_shared_ancestors(self, indices: List[int]) -> List[int]:
+        """Return shared stages which are ancestors of given stages in order.
+
+        """
+
+        shared = set(self.shared)
+        ancestors = set()
+
+        for idx in indices:
+            parent = self.parents[idx]
+            while parent is not None:
+                ancestors.add(parent)
+                parent = self.parents[parent]
+
+        return sorted(ancestors.intersection(shared))
+
+    def __getitem__(self, value: TYPE_IDENTIFIER) -> Transformer:
+        """Get stage by index location/label access. Slicing is not supported
+        because sliced stages may lose their parents.
+
+        """
+
+        if isinstance(value, slice):
+            raise ValueError("Slicing is not supported for branching "
+                             "pipelines.")
+
+        return self._loc.get_stage(value)
+
+    def __repr__(self):
+        tpl = "BranchingPipeline (Stages: {}, Branches: {}, Uid: {}, Doc: {})"
+        return tpl.format(len(self.stages), len(self.leaves), self.uid,
+                          self.doc)
@@ -0,0 +1,371 @@
+"""This module contains utility to analyze the optimized logical and the
+physical execution plan of pyspark dataframes without running any actions.
+In addition, it allows to measure driver side planning time and to simplify
+logical plans by collapsing consecutive projections.
+
+"""
+
+import json
+import timeit
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from pyspark.sql import DataFrame
+
+TYPE_PLAN_NODES = List[Tuple[str, int]]
+
+PlanAnalysis = NamedTuple("PlanAnalysis", [("exchanges", int),
+                                           ("broadcast_exchanges", int),
+                                           ("sorts", int),
+                                           ("windows", int),
+                                           ("cached_scans", int),
+                                           ("reused_exchanges", int),
+                                           ("logical_depth", int),
+                                           ("physical_depth", int)])
+
+PlanStatistics = NamedTuple("PlanStatistics",
+                            [("estimated_size", Optional[int]),
+                             ("estimated_rows", Optional[int])])
+
+PlanningMetrics = NamedTuple("PlanningMetrics", [("analysis_time", float),
+                                                 ("optimization_time", float),
+                                                 ("planning_time", float),
+                                                 ("logical_nodes", int),
+                                                 ("physical_nodes", int)])
+
+# lazily evaluated plans of a query execution in order of planning phases
+PLANNING_PHASES = ("analyzed", "optimizedPlan", "executedPlan")
+
+# spark's default size estimate for plans without statistics (Long.MaxValue)
+UNKNOWN_SIZE = 2 ** 63 - 1
+
+# mapping of analysis fields to class names of physical operators
+PHYSICAL_OPERATORS = {"exchanges": ("ShuffleExchangeExec", "ShuffleExchange"),
+                      "broadcast_exchanges": ("BroadcastExchangeExec",
+                                              "BroadcastExchange"),
+                      "sorts": ("SortExec",),
+                      "windows": ("WindowExec",),
+                      "cached_scans": ("InMemoryTableScanExec",),
+                      "reused_exchanges": ("ReusedExchangeExec",
+                                           "ReusedExchange")}
+
+# physical operators which only wrap other operators for code generation
+CODEGEN_WRAPPERS = ("WholeStageCodegenExec",
+                    "InputAdapter",
+                    "ColumnarToRowExec")
+
+
+def get_plan_nodes(plan) -> TYPE_PLAN_NODES:
+    """Convert given JVM plan tree into a flat list of nodes in pre-order
+    while each node is represented by its class name and its number of
+    children.
+
+    Uses the plan's JSON representation which requires only a single call to
+    the JVM regardless of the size of the plan. Accesses private members of
+    pyspark and may break in future releases.
+
+    Parameters
+    ----------
+    plan: py4j.java_gateway.JavaObject
+        Logical or physical JVM plan.
+
+    Returns
+    -------
+    nodes: list
+        List of tuples containing class name and number of children.
+
+    """
+
+    nodes = json.loads(_unwrap_adaptive_plan(plan).toJSON())
+
+    return [(node["class"].split(".")[-1], node["num-children"])
+            for node in nodes]
+
+
+def get_plan_depth(nodes: TYPE_PLAN_NODES,
+                   ignore: Iterable[str] = ()) -> int:
+    """Compute the maximum depth of the plan tree which is given as a flat
+    list of nodes in pre-order.
+
+    Parameters
+    ----------
+    nodes: list
+        List of tuples containing class name and number of children in
+        pre-order.
+    ignore: iterable, optional
+        Class names of nodes which do not add to the depth.
+
+    Returns
+    -------
+    depth: int
+
+    """
+
+    ignore = set(ignore)
+
+    max_depth = 0
+    parents = []  # stack of parent depth and remaining number of children
+
+    for name, children in nodes:
+        depth = parents[-1][0] if parents else 0
+        if name not in ignore:
+            depth += 1
+
+        max_depth = max(max_depth, depth)
+
+        # remove parent once its last child is encountered
+        if parents:
+            parents[-1][1] -= 1
+            if parents[-1][1] == 0:
+                parents.pop()
+
+        if children:
+            parents.append([depth, children])
+
+    return max_depth
+
+
+def count_plan_nodes(nodes: TYPE_PLAN_NODES, names: Iterable[str]) -> int:
+    """Count all nodes with given class names.
+
+    Parameters
+    ----------
+    nodes: list
+        List of tuples containing class name and number of children.
+    names: iterable
+        Class names of nodes to be counted.
+
+    Returns
+    -------
+    count: int
+
+    """
+
+    names = set(names)
+
+    return sum([1 for name, _ in nodes if name in names])
+
+
+def count_codegen_stages(plan) -> int:
+    """Count whole stage code generation stages of given physical plan.
+    Stages of cached data are included because they are part of the
+    execution plan's lineage even if they are not recomputed.
+
+    Accesses private members of pyspark and may break in future releases.
+
+    Parameters
+    ----------
+    plan: py4j.java_gateway.JavaObject
+        Physical JVM plan.
+
+    Returns
+    -------
+    count: int
+
+    """
+
+    plan = _unwrap_adaptive_plan(plan)
+    nodes = get_plan_nodes(plan)
+
+    count = count_plan_nodes(nodes, ("WholeStageCodegenExec",))
+
+    if not count_plan_nodes(nodes, ("InMemoryTableScanExec",)):
+        return count
+
+    # in-memory table scans are leaves referencing the cached physical plan
+    leaves = plan.collectLeaves()
+    for idx in range(leaves.size()):
+        leaf = leaves.apply(idx)
+        if leaf.getClass().getSimpleName() == "InMemoryTableScanExec":
+            count += count_codegen_stages(leaf.relation().cachedPlan())
+
+    return count
+
+
+def analyze_plan(df: DataFrame) -> PlanAnalysis:
+    """Analyze the optimized logical and physical plan of given dataframe.
+    Counts costly physical operators like shuffles (exchanges), broadcast
+    exchanges, sorts and windows. In addition, counts reuse of cached
+    subtrees via in-memory table scans and reused exchanges and computes the
+    depth of both plans. Code generation wrappers are not considered for the
+    physical plan's depth.
+
+    Only creates the plans and does not run any actions.
+
+    Parameters
+    ----------
+    df: pyspark.sql.DataFrame
+        Dataframe to be analyzed.
+
+    Returns
+    -------
+    analysis: PlanAnalysis
+
+    """
+
+    query_execution = df._jdf.queryExecution()
+
+    logical = get_plan_nodes(query_execution.optimizedPlan())
+    physical = get_plan_nodes(query_execution.executedPlan())
+
+    counts = {field: count_plan_nodes(physical, names)
+              for field, names in PHYSICAL_OPERATORS.items()}
+
+    return PlanAnalysis(logical_depth=get_plan_depth(logical),
+                        physical_depth=get_plan_depth(physical,
+                                                      CODEGEN_WRAPPERS),
+                        **counts)
+
+
+def estimate_statistics(df: DataFrame) -> PlanStatistics:
+    """Retrieve the optimizer's size and row count estimates of given
+    dataframe from the statistics of its optimized logical plan. If cost
+    based optimization is enabled and table statistics are available, row
+    count estimates are provided, too.
+
+    Only creates the optimized plan and does not run any actions.
+
+    Parameters
+    ----------
+    df: pyspark.sql.DataFrame
+        Dataframe to be estimated.
+
+    Returns
+    -------
+    statistics: PlanStatistics
+        Estimated size in bytes and estimated number of rows. Estimates are
+        None if not available.
+
+    """
+
+    stats = df._jdf.queryExecution().optimizedPlan().stats()
+
+    # big integers may be returned as JVM objects
+    size = int(str(stats.sizeInBytes()))
+    if size >= UNKNOWN_SIZE:
+        size = None
+
+    row_count = stats.rowCount()
+    if row_count.isDefined():
+        rows = int(str(row_count.get()))
+    else:
+        rows = None
+
+    return PlanStatistics(size, rows)
+
+
+def measure_planning(df: DataFrame) -> PlanningMetrics:
+    """Measure the driver side time required by catalyst to analyze, optimize
+    and physically plan given dataframe. In addition, counts the nodes of the
+    analyzed logical plan and the physical plan to reveal plan complexity.
+
+    The dataframe's logical plan is planned from scratch via a new query
+    execution while subtrees which were already analyzed are not analyzed
+    again. Hence, analysis time reflects the cost of creating the dataframe
+    on top of its inputs. Timings include the overhead of a single py4j call
+    per phase. Does not run any actions.
+
+    Parameters
+    ----------
+    df: pyspark.sql.DataFrame
+        Dataframe to be measured.
+
+    Returns
+    -------
+    metrics: PlanningMetrics
+        Analysis, optimization and planning time in seconds and number of
+        logical and physical plan nodes.
+
+    """
+
+    session_state = df.sql_ctx.sparkSession._jsparkSession.sessionState()
+    logical = df._jdf.queryExecution().logical()
+    query_execution = session_state.executePlan(logical)
+
+    timings = []
+    for phase in PLANNING_PHASES:
+        start = timeit.default_timer()
+        getattr(query_execution, phase)()
+        timings.append(timeit.default_timer() - start)
+
+    logical_nodes = get_plan_nodes(query_execution.analyzed())
+    physical_nodes = get_plan_nodes(query_execution.executedPlan())
+
+    return PlanningMetrics(*timings,
+                           logical_nodes=len(logical_nodes),
+                           physical_nodes=len(physical_nodes))
+
+
+def collapse_projections(df: DataFrame,
+                         base: DataFrame) -> Optional[DataFrame]:
+    """Collapse all consecutive projections (e.g. `select`, `withColumn` or
+    `drop`) on top of given base dataframe into a single projection. This
+    prevents the analyzed plan from growing with each `withColumn` call which
+    slows down catalyst analysis considerably for long chains.
+
+    The base dataframe's plan remains unchanged. Therefore, cached base
+    dataframes are still being used. Projections containing non
+    deterministic expressions are not collapsed. Accesses private members of
+    pyspark and may break in future releases.
+
+    Parameters
+    ----------
+    df: pyspark.sql.DataFrame
+        Dataframe consisting of projections only on top of `base`.
+    base: pyspark.sql.DataFrame
+        Dataframe which remains unchanged.
+
+    Returns
+    -------
+    collapsed: pyspark.sql.DataFrame, None
+        Dataframe equivalent to `df` with collapsed projections. Returns None
+        if `df` contains other operations than projections on top of `base`
+        or if `df` is `base`.
+
+    """
+
+    plan = df._jdf.queryExecution().analyzed()
+    base_plan = base._jdf.queryExecution().analyzed()
+
+    projections = []
+    node = plan
+    while node.nodeName() == "Project":
+        projections.append(node)
+        node = node.child()
+        if node.equals(base_plan):
+            break
+    else:
+        return None
+
+    jvm = df.sql_ctx._sc._jvm
+    catalyst = jvm.org.apache.spark.sql.catalyst
+    to_seq = jvm.PythonUtils.toSeq
+
+    # replace base plan with empty leaf to leave base plan untouched
+    output = base_plan.output()
+    child = catalyst.plans.logical.LocalRelation(output, output.take(0), False)
+
+    for projection in reversed(projections):
+        child = projection.withNewChildren(to_seq([child]))
+
+    collapsed = catalyst.optimizer.CollapseProject.apply(child)
+    if collapsed.nodeName() != "Project" or \
+            collapsed.child().nodeName() != "LocalRelation":
+        return None
+
+    collapsed = collapsed.withNewChildren(to_seq([base_plan]))
+    session = df.sql_ctx.sparkSession._jsparkSession
+    jdf = jvm.org.apache.spark.sql.Dataset.ofRows(session, collapsed)
+
+    return DataFrame(jdf, df.sql_ctx)
+
+
+def _unwrap_adaptive_plan(plan):
+    """Return the actual physical plan if given plan is wrapped by adaptive
+    query execution.
+
+    """
+
+    if plan.nodeName() == "AdaptiveSparkPlan":
+        return plan.executedPlan()
+
+    return plan
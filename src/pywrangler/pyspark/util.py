@@ -5,6 +5,7 @@ pyspark wranglers.
 
 from typing import Union, Optional, List
 
+from pyspark import SparkContext
 from pyspark.sql import DataFrame
 from pyspark.sql import functions as F
 from pyspark.sql.column import Column
@@ -102,6 +103,53 @@ def prepare_orderby(orderby_columns: TYPE_PYSPARK_COLUMNS,
             for column, sort_ascending in zipped]
 
 
+# number of hash buckets used for deterministic sampling
+SAMPLE_BUCKETS = 10000
+
+
+def sample_groups(df: DataFrame, fraction: float,
+                  groupby_columns: TYPE_COLUMNS = None,
+                  seed: int = 0) -> DataFrame:
+    """Deterministically sample whole groups of given dataframe. Groups are
+    assigned to hash buckets based on their groupby column values and the
+    seed. All rows of a group are either contained in the sample or not.
+    Hence, computations depending on complete groups (e.g. window functions)
+    remain valid on the sample. In contrast to `DataFrame.sample`, the
+    sample does not depend on the partitioning of the dataframe and smaller
+    fractions always yield subsets of larger fractions.
+
+    If no groupby columns are given, rows are sampled based on all column
+    values.
+
+    Parameters
+    ----------
+    df: pyspark.sql.DataFrame
+        Dataframe to be sampled.
+    fraction: float
+        Expected fraction of groups to be sampled between 0 and 1.
+    groupby_columns: str, Iterable[str], optional
+        Columns identifying groups.
+    seed: int, optional
+        Seed of the hash function.
+
+    Returns
+    -------
+    df_sample: pyspark.sql.DataFrame
+
+    """
+
+    if not 0 < fraction <= 1:
+        raise ValueError("Parameter `fraction` needs to be between 0 "
+                         "(exclusive) and 1 (inclusive). '{}' was given."
+                         .format(fraction))
+
+    columns = ensure_iterable(groupby_columns) or df.columns
+    hashed = F.hash(F.lit(seed), *[F.col(column) for column in columns])
+    bucket = (hashed % SAMPLE_BUCKETS + SAMPLE_BUCKETS) % SAMPLE_BUCKETS
+
+    return df.where(bucket < round(fraction * SAMPLE_BUCKETS))
+
+
 class ColumnCacher:
     """Pyspark column expression cacher which enables storing of intermediate
     column expressions. PySpark column expressions can be stacked/chained. For
@@ -202,3 +250,29 @@ class ColumnCacher:
             self.df = self.df.drop(*self.columns.values())
 
         return self.df
+
+
+def is_pinned_thread_mode(spark_context: SparkContext) -> bool:
+    """Check whether py4j's pinned thread mode is enabled, which is the case
+    if the environment variable `PYSPARK_PIN_THREAD` was set to true before
+    the JVM gateway was launched (requires spark >= 3.0).
+
+    Only in pinned thread mode, each python thread maps to a dedicated JVM
+    thread. Otherwise, thread local spark properties like scheduler pools
+    or job groups set from concurrent python threads may be applied to the
+    wrong thread.
+
+    Parameters
+    ----------
+    spark_context: pyspark.SparkContext
+        Spark context whose JVM gateway is checked.
+
+    Returns
+    -------
+    pinned: bool
+
+    """
+
+    gateway = getattr(spark_context, "_gateway", None)
+
+    return type(gateway).__name__ == "ClientServer"
@@ -7,7 +7,7 @@ from pyspark.sql import functions as F
 from pyspark.sql import Column
 
 from pywrangler.pyspark import util
-from pywrangler.pyspark.base import PySparkSingleNoFit
+from pywrangler.pyspark.base import Partitioning, PySparkSingleNoFit
 from pywrangler.wranglers import IntervalIdentifier
 
 
@@ -55,6 +55,17 @@ class VectorizedCumSum(PySparkSingleNoFit, IntervalIdentifier):
                              "dataframes have no implicit order unlike pandas "
                              "dataframes.")
 
+    @property
+    def partitioning(self) -> Partitioning:
+        """All window functions are partitioned by groupby columns and ordered
+        by orderby columns.
+
+        """
+
+        return Partitioning(list(self.groupby_columns or []),
+                            list(self.orderby_columns or []),
+                            list(self.ascending or []))
+
     def _boolify_marker(self, marker_column, start=True) -> Column:
         """Helper function to create an integer casted boolean column
         expression of start/end marker.
@@ -434,27 +445,32 @@ class VectorizedCumSum(PySparkSingleNoFit, IntervalIdentifier):
         """
 
         # check input
-        self._validate_input(df)
+        with self._phase("validate"):
+            self._validate_input(df)
 
         # cacher
         cc = util.ColumnCacher(df, True)
 
         # get preprocessed marker col
-        marker_col = self._preprocess_marker_column()
+        with self._phase("marker"):
+            marker_col = self._preprocess_marker_column()
 
         # early exit for identical start/end markers
         if self._identical_start_end_markers:
-            iids = self._generate_iids_identical(marker_col)
-            return df.withColumn(self.target_column_name, iids)
+            with self._phase("iids"):
+                iids = self._generate_iids_identical(marker_col)
+                return df.withColumn(self.target_column_name, iids)
 
         # raw iids
-        iids_raw = self._generate_raw_iids(marker_col)
+        with self._phase("raw_iids"):
+            iids_raw = self._generate_raw_iids(marker_col)
 
-        return self._compute_valid_renumerated_iids(marker_col,
-                                                    iids_raw,
-                                                    cc,
-                                                    True,
-                                                    False)
+        with self._phase("valid_iids"):
+            return self._compute_valid_renumerated_iids(marker_col,
+                                                        iids_raw,
+                                                        cc,
+                                                        True,
+                                                        False)
 
 
 class VectorizedCumSumAdjusted(VectorizedCumSum):
@@ -490,13 +506,15 @@ class VectorizedCumSumAdjusted(VectorizedCumSum):
             return super().transform(df)
 
         # check input
-        self._validate_input(df)
+        with self._phase("validate"):
+            self._validate_input(df)
 
-        if start_first & end_first:
-            return self._first_start_first_end(df)
+        with self._phase("iids"):
+            if start_first & end_first:
+                return self._first_start_first_end(df)
 
-        else:
-            return self._last_start_last_end(df)
+            else:
+                return self._last_start_last_end(df)
 
     def _generate_raw_iids_special(self, start_first: bool,
                                    add_negate_shift_col: bool,
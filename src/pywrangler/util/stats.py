@@ -0,0 +1,472 @@
+"""This module contains lightweight statistical helper functions used for
+profiling and benchmarking without requiring scipy.
+
+"""
+
+import functools
+import math
+from typing import Callable, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+Extrapolation = NamedTuple("Extrapolation", [("estimate", float),
+                                             ("lower", float),
+                                             ("upper", float)])
+
+ConfidenceInterval = NamedTuple("ConfidenceInterval", [("estimate", float),
+                                                       ("lower", float),
+                                                       ("upper", float)])
+
+TTest = NamedTuple("TTest", [("statistic", float),
+                             ("dof", float),
+                             ("p_value", float)])
+
+UTest = NamedTuple("UTest", [("statistic", float),
+                             ("p_value", float)])
+
+# coefficients of the rational approximations of the normal quantile function
+# (Acklam) with a relative error below 1.15e-9
+_NORMAL_A = (-3.969683028665376e+01, 2.209460984245205e+02,
+             -2.759285104469687e+02, 1.383577518672690e+02,
+             -3.066479806614716e+01, 2.506628277459239e+00)
+_NORMAL_B = (-5.447609879822406e+01, 1.615858368580409e+02,
+             -1.556989798598866e+02, 6.680131188771972e+01,
+             -1.328068155288572e+01)
+_NORMAL_C = (-7.784894002430293e-03, -3.223964580411365e-01,
+             -2.400758277161838e+00, -2.549732539343734e+00,
+             4.374664141464968e+00, 2.938163982698783e+00)
+_NORMAL_D = (7.784695709041462e-03, 3.224671290700398e-01,
+             2.445134137142996e+00, 3.754408661907416e+00)
+
+# newton iterations refining the approximated t quantile
+NEWTON_ITERATIONS = 3
+
+# maximum combined sample size for exact p-values of the Mann-Whitney U test
+EXACT_U_MAX_SIZE = 40
+
+
+def _validate_probability(p: float):
+    if not 0 < p < 1:
+        raise ValueError("Probability needs to be between 0 and 1 "
+                         "(exclusive). '{}' was given.".format(p))
+
+
+def _validate_dof(dof: int) -> int:
+    if dof < 1 or int(dof) != dof:
+        raise ValueError("Degrees of freedom need to be a positive integer. "
+                         "'{}' was given.".format(dof))
+
+    return int(dof)
+
+
+def normal_ppf(p: float) -> float:
+    """Compute the quantile function (inverse cumulative distribution
+    function) of the standard normal distribution.
+
+    Parameters
+    ----------
+    p: float
+        Probability between 0 and 1 (exclusive).
+
+    Returns
+    -------
+    quantile: float
+
+    """
+
+    _validate_probability(p)
+
+    a, b, c, d = _NORMAL_A, _NORMAL_B, _NORMAL_C, _NORMAL_D
+    p_low = 0.02425
+
+    if p < p_low:
+        q = math.sqrt(-2 * math.log(p))
+        return (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) *
+                q + c[5]) / ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) *
+                             q + 1)
+
+    if p > 1 - p_low:
+        return -normal_ppf(1 - p)
+
+    q = p - 0.5
+    r = q * q
+    return (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r +
+            a[5]) * q / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r +
+                          b[4]) * r + 1)
+
+
+def t_cdf(x: float, dof: int) -> float:
+    """Compute the cumulative distribution function of the student t
+    distribution for integer degrees of freedom via the closed form finite
+    series (Abramowitz and Stegun 26.7.3 and 26.7.4).
+
+    Parameters
+    ----------
+    x: float
+        Value to evaluate.
+    dof: int
+        Degrees of freedom.
+
+    Returns
+    -------
+    probability: float
+
+    """
+
+    dof = _validate_dof(dof)
+
+    theta = math.atan(x / math.sqrt(dof))
+    sin, cos = math.sin(theta), math.cos(theta)
+
+    if dof % 2:
+        term = cos
+        series = cos if dof > 1 else 0
+        for k in range(3, dof - 1, 2):
+            term *= cos ** 2 * (k - 1) / k
+            series += term
+        area = 2 / math.pi * (theta + sin * series)
+
+    else:
+        term = series = 1
+        for k in range(2, dof - 1, 2):
+            term *= cos ** 2 * (k - 1) / k
+            series += term
+        area = sin * series
+
+    return (1 + area) / 2
+
+
+def t_pdf(x: float, dof: int) -> float:
+    """Compute the probability density function of the student t
+    distribution.
+
+    """
+
+    dof = _validate_dof(dof)
+
+    log_norm = (math.lgamma((dof + 1) / 2) - math.lgamma(dof / 2) -
+                math.log(dof * math.pi) / 2)
+    return math.exp(log_norm - (dof + 1) / 2 * math.log1p(x ** 2 / dof))
+
+
+def t_ppf(p: float, dof: int) -> float:
+    """Compute the quantile function of the student t distribution. Exact
+    for 1 and 2 degrees of freedom. For more degrees of freedom, the
+    Cornish-Fisher expansion around the normal quantile is refined via
+    Newton's method on `t_cdf`.
+
+    Parameters
+    ----------
+    p: float
+        Probability between 0 and 1 (exclusive).
+    dof: int
+        Degrees of freedom.
+
+    Returns
+    -------
+    quantile: float
+
+    """
+
+    _validate_probability(p)
+    dof = _validate_dof(dof)
+
+    if dof == 1:
+        return math.tan(math.pi * (p - 0.5))
+
+    if dof == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+    z = normal_ppf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 -
+          945 * z) / 92160
+
+    x = z + g1 / dof + g2 / dof ** 2 + g3 / dof ** 3 + g4 / dof ** 4
+
+    for _ in range(NEWTON_ITERATIONS):
+        x -= (t_cdf(x, dof) - p) / t_pdf(x, dof)
+
+    return x
+
+
+def extrapolate(x: Sequence[float], y: Sequence[float], target: float = 1.,
+                confidence: float = 0.95,
+                intercept: bool = True) -> Extrapolation:
+    """Fit a linear model of `y` over `x` via least squares and predict the
+    mean response at `target` including a confidence band.
+
+    With intercept, the model accounts for fixed costs independent of `x`
+    and requires at least three distinct observations for a confidence band.
+    Without intercept, `y` is assumed to be proportional to `x` and at least
+    two observations are required for a confidence band. Otherwise, bounds
+    are NaN. If `x` does not vary, the model falls back to proportionality.
+
+    Parameters
+    ----------
+    x: sequence
+        Observed values of the independent variable, e.g. sample fractions.
+    y: sequence
+        Observed values of the dependent variable, e.g. execution times.
+    target: float, optional
+        Value of the independent variable to predict for.
+    confidence: float, optional
+        Confidence level of the band.
+    intercept: bool, optional
+        If False, `y` is assumed to be proportional to `x`.
+
+    Returns
+    -------
+    extrapolation: Extrapolation
+        Estimate with lower and upper bound of the confidence band.
+
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+
+    if n == 0 or n != len(y):
+        raise ValueError("Parameters `x` and `y` need to be non empty and of "
+                         "equal length.")
+
+    x_mean = x.mean()
+    sxx = np.sum((x - x_mean) ** 2)
+
+    if intercept and sxx > 0:
+        slope = np.sum((x - x_mean) * (y - y.mean())) / sxx
+        offset = y.mean() - slope * x_mean
+        estimate = offset + slope * target
+        residuals = y - (offset + slope * x)
+        dof = n - 2
+        leverage = 1 / n + (target - x_mean) ** 2 / sxx
+
+    else:
+        slope = np.sum(x * y) / np.sum(x ** 2)
+        estimate = slope * target
+        residuals = y - slope * x
+        dof = n - 1
+        leverage = target ** 2 / np.sum(x ** 2)
+
+    if dof < 1:
+        return Extrapolation(float(estimate), np.nan, np.nan)
+
+    std = math.sqrt(np.sum(residuals ** 2) / dof)
+    margin = t_ppf(0.5 + confidence / 2, dof) * std * math.sqrt(leverage)
+
+    return Extrapolation(float(estimate),
+                         float(estimate - margin),
+                         float(estimate + margin))
+
+
+def bootstrap(values: Sequence[float], statistic: Callable = np.median,
+              confidence: float = 0.95, resamples: int = 1000,
+              seed: int = 0) -> ConfidenceInterval:
+    """Compute the percentile bootstrap confidence interval of given
+    statistic.
+
+    Parameters
+    ----------
+    values: sequence
+        Observed values.
+    statistic: callable, optional
+        Computes the statistic of interest from an array of values.
+    confidence: float, optional
+        Confidence level of the interval.
+    resamples: int, optional
+        Number of bootstrap resamples.
+    seed: int, optional
+        Seed of the random number generator.
+
+    Returns
+    -------
+    interval: ConfidenceInterval
+        Statistic of observed values with lower and upper bound.
+
+    """
+
+    values = np.asarray(values, dtype=float)
+
+    if len(values) == 0:
+        raise ValueError("Parameter `values` needs to be non empty.")
+
+    _validate_probability(confidence)
+
+    random = np.random.RandomState(seed)
+    samples = random.choice(values, size=(resamples, len(values)))
+    estimates = np.apply_along_axis(statistic, 1, samples)
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.percentile(estimates, [100 * alpha, 100 * (1 - alpha)])
+
+    return ConfidenceInterval(float(statistic(values)), float(lower),
+                              float(upper))
+
+
+def welch_t_test(a: Sequence[float], b: Sequence[float]) -> TTest:
+    """Perform Welch's two sided t-test for the difference of the means of
+    two samples with possibly unequal variances. The Welch-Satterthwaite
+    degrees of freedom are rounded down to compute the p-value which is
+    conservative.
+
+    Parameters
+    ----------
+    a: sequence
+        Values of the first sample.
+    b: sequence
+        Values of the second sample.
+
+    Returns
+    -------
+    test: TTest
+        Contains t statistic, degrees of freedom and p-value. The p-value is
+        NaN if any sample contains less than two values or both samples have
+        zero variance.
+
+    """
+
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+
+    if len(a) < 2 or len(b) < 2:
+        return TTest(np.nan, np.nan, np.nan)
+
+    var_a = a.var(ddof=1) / len(a)
+    var_b = b.var(ddof=1) / len(b)
+    var = var_a + var_b
+    difference = a.mean() - b.mean()
+
+    if var == 0:
+        if difference == 0:
+            return TTest(np.nan, np.nan, np.nan)
+
+        return TTest(math.copysign(np.inf, difference), np.nan, 0.)
+
+    statistic = difference / math.sqrt(var)
+    dof = var ** 2 / (var_a ** 2 / (len(a) - 1) + var_b ** 2 / (len(b) - 1))
+
+    p_value = 2 * (1 - t_cdf(abs(statistic), max(1, int(dof))))
+
+    return TTest(float(statistic), float(dof), float(min(1., p_value)))
+
+
+def mann_whitney_u_test(a: Sequence[float], b: Sequence[float]) -> UTest:
+    """Perform the two sided Mann-Whitney U test whether values of one
+    sample tend to be larger than values of the other sample. In contrast to
+    the t-test, it is rank based and hence robust against outliers which
+    makes it suitable to test differences of medians of benchmark
+    measurements.
+
+    The p-value is exact for samples without ties and a combined size of at
+    most `EXACT_U_MAX_SIZE`. Otherwise, the normal approximation with tie
+    and continuity correction is used.
+
+    Parameters
+    ----------
+    a: sequence
+        Values of the first sample.
+    b: sequence
+        Values of the second sample.
+
+    Returns
+    -------
+    test: UTest
+        Contains the U statistic of the first sample and the p-value. The
+        p-value is NaN if any sample is empty or all values are identical.
+
+    """
+
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n_a, n_b = len(a), len(b)
+
+    if n_a == 0 or n_b == 0:
+        return UTest(np.nan, np.nan)
+
+    # count pairs with larger value of first sample while ties count half
+    greater = (a[:, None] > b[None, :]).sum()
+    equal = (a[:, None] == b[None, :]).sum()
+    statistic = float(greater + 0.5 * equal)
+
+    values = np.concatenate([a, b])
+    _, tie_counts = np.unique(values, return_counts=True)
+    has_ties = (tie_counts > 1).any()
+
+    if not has_ties and n_a + n_b <= EXACT_U_MAX_SIZE:
+        counts = _get_u_distribution(n_a, n_b)
+        total = sum(counts)
+        u = int(statistic)
+
+        lower = sum(counts[:u + 1]) / total
+        upper = sum(counts[u:]) / total
+        p_value = min(1., 2 * min(lower, upper))
+
+        return UTest(statistic, float(p_value))
+
+    n = n_a + n_b
+    ties = float((tie_counts ** 3 - tie_counts).sum())
+    var = n_a * n_b / 12 * ((n + 1) - ties / (n * (n - 1)))
+
+    if var == 0:
+        return UTest(statistic, np.nan)
+
+    mean = n_a * n_b / 2
+    deviation = max(0., abs(statistic - mean) - 0.5)
+    p_value = math.erfc(deviation / math.sqrt(var) / math.sqrt(2))
+
+    return UTest(statistic, float(min(1., p_value)))
+
+
+def get_min_u_p_value(n_a: int, n_b: int) -> float:
+    """Return the smallest two sided p-value of the exact Mann-Whitney U
+    test for given sample sizes which is attained if all values of one
+    sample are smaller than all values of the other sample. Samples too
+    small to fall below a significance level can never show a significant
+    difference.
+
+    Parameters
+    ----------
+    n_a: int
+        Size of the first sample.
+    n_b: int
+        Size of the second sample.
+
+    Returns
+    -------
+    p_value: float
+        NaN if any sample is empty.
+
+    """
+
+    if n_a == 0 or n_b == 0:
+        return np.nan
+
+    # only 2 out of `n_a + n_b` choose `n_a` orderings are most extreme
+    orderings = 1
+    for i in range(1, n_a + 1):
+        orderings = orderings * (n_b + i) // i
+
+    return min(1., 2 / orderings)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_u_distribution(n_a: int, n_b: int) -> Tuple[int, ...]:
+    """Return the number of orderings of two samples without ties for each
+    value of the U statistic via recursion on the largest value.
+
+    """
+
+    if n_a == 0 or n_b == 0:
+        return (1,)
+
+    # largest value belongs to first sample which adds `n_b` to U
+    first = (0,) * n_b + _get_u_distribution(n_a - 1, n_b)
+    second = _get_u_distribution(n_a, n_b - 1)
+
+    size = n_a * n_b + 1
+    first = first + (0,) * (size - len(first))
+    second = second + (0,) * (size - len(second))
+
+    return tuple(x + y for x, y in zip(first, second))
@@ -0,0 +1,349 @@
+"""This module contains performance budget assertions for pandas wranglers
+to be used in test suites.
+
+A budget limits the median execution time of `fit_transform` and/or the
+memory usage ratio of `PandasMemoryProfiler` via absolute limits and/or a
+baseline stored in a JSON file with a relative tolerance:
+
+>>> budget = PerformanceBudget(time=0.5, ratio=4)
+>>> budget.check(wrangler, df)
+
+Budgets may decorate functions returning a wrangler and its input
+dataframes:
+
+>>> @PerformanceBudget(baselines="baselines.json", tolerance=0.2)
+>>> def test_interval_identifier():
+>>>     return wrangler, [df]
+
+This module is also a pytest plugin providing the `performance_budget`
+fixture along with the command line options `--performance-baselines` and
+`--update-baselines`. Enable it via `-p pywrangler.util.testing.budget` or
+`pytest_plugins` in the root `conftest.py`:
+
+>>> def test_interval_identifier(performance_budget):
+>>>     performance_budget(wrangler, df, time=0.5)
+
+"""
+
+import functools
+import json
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from pywrangler.exceptions import PerformanceBudgetError
+
+try:
+    import pytest
+except ImportError:  # pragma: no cover
+    pytest = None
+
+BudgetResult = NamedTuple("BudgetResult", [("name", str),
+                                           ("metric", str),
+                                           ("value", float),
+                                           ("limit", float),
+                                           ("baseline", Optional[float]),
+                                           ("passed", bool)])
+
+METRICS = ("time", "ratio")
+
+# minimal absolute margin above baselines per metric which prevents zero
+# limits for vanishing baselines (seconds for time, input memory for ratio)
+MIN_MARGINS = {"time": 1e-4, "ratio": 0.01}
+
+
+class BaselineStore:
+    """Persist baseline values of metrics per budget name in a JSON file.
+
+    Parameters
+    ----------
+    path: str
+        Path of the JSON file. It is created on first update.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict[str, Dict[str, float]]:
+        """Return all baselines by budget name and metric.
+
+        """
+
+        if not os.path.exists(self.path):
+            return {}
+
+        with open(self.path) as file:
+            return json.load(file)
+
+    def get(self, name: str) -> Dict[str, float]:
+        """Return baselines of given budget name by metric.
+
+        """
+
+        return self.load().get(name, {})
+
+    def update(self, name: str, values: Dict[str, float]):
+        """Set baselines of given budget name. Metrics not contained in
+        `values` are kept.
+
+        """
+
+        baselines = self.load()
+        baselines.setdefault(name, {}).update(values)
+
+        with open(self.path, "w") as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+
+
+class PerformanceBudget:
+    """Assert that a pandas wrangler's `fit_transform` stays within absolute
+    limits and/or does not exceed stored baselines by more than a relative
+    tolerance.
+
+    Time refers to the median execution time of `PandasTimeProfiler` in
+    seconds. Ratio refers to `PandasMemoryProfiler.ratio` which is the
+    memory increase during `fit_transform` in units of input memory usage.
+    Only metrics with an absolute limit or a baseline file are profiled.
+
+    Missing baselines are recorded instead of being checked. Existing
+    baselines are overwritten with the current values if `update` is True.
+
+    Parameters
+    ----------
+    name: str, optional
+        Name of the budget used as key of baselines. Defaults to the name of
+        the decorated function if used as decorator.
+    time: float, optional
+        Absolute limit of the median execution time in seconds.
+    ratio: float, optional
+        Absolute limit of the memory usage ratio.
+    baselines: str, BaselineStore, optional
+        Path of the baseline JSON file or a baseline store.
+    tolerance: float, optional
+        Allowed relative increase above baselines. The increase refers to the
+        absolute baseline value and is at least `MIN_MARGINS` of the metric
+        to support baselines of zero or below (e.g. a negative ratio).
+    update: bool, optional
+        If True, baselines are updated instead of being checked.
+    metrics: iterable, optional
+        Metrics which are compared to baselines.
+    repetitions: int, optional
+        Number of repetitions of each profiler.
+    warmup: int, optional
+        Number of warmup calls of the time profiler.
+    memory_mode: str, optional
+        Mode of `PandasMemoryProfiler`. By default, `fork` is used if
+        available.
+
+    """
+
+    def __init__(self, name: Optional[str] = None,
+                 time: Optional[float] = None,
+                 ratio: Optional[float] = None,
+                 baselines=None,
+                 tolerance: float = 0.2,
+                 update: bool = False,
+                 metrics: Sequence[str] = METRICS,
+                 repetitions: int = 5,
+                 warmup: int = 1,
+                 memory_mode: Optional[str] = None):
+
+        for metric in metrics:
+            if metric not in METRICS:
+                raise ValueError("Metric '{}' is not supported. Allowed "
+                                 "metrics are: {}".format(metric, METRICS))
+
+        if isinstance(baselines, str):
+            baselines = BaselineStore(baselines)
+
+        if memory_mode is None:
+            memory_mode = "fork" if hasattr(os, "fork") else "sampling"
+
+        self.name = name
+        self.limits = OrderedDict([("time", time), ("ratio", ratio)])
+        self.baselines = baselines
+        self.tolerance = tolerance
+        self.update = update
+        self.metrics = metrics
+        self.repetitions = repetitions
+        self.warmup = warmup
+        self.memory_mode = memory_mode
+
+    def check(self, wrangler, *dfs, name: Optional[str] = None) \
+            -> List[BudgetResult]:
+        """Profile given wrangler with given input dataframes and raise
+        `PerformanceBudgetError` if any limit or baseline is exceeded.
+
+        Parameters
+        ----------
+        wrangler: pywrangler.pandas.base.PandasWrangler
+            Wrangler to be profiled.
+        dfs: pd.DataFrame
+            Input dataframes passed to `fit_transform`.
+        name: str, optional
+            Name of the budget. Overrides the name given on initialization.
+
+        Returns
+        -------
+        results: list
+            Contains a `BudgetResult` for each checked limit and baseline.
+
+        """
+
+        name = name or self.name
+
+        if self.baselines is not None and name is None:
+            raise ValueError("A name is required to compare against "
+                             "baselines.")
+
+        values = self._profile(wrangler, dfs)
+
+        if self.baselines is not None:
+            baselines = self.baselines.get(name)
+        else:
+            baselines = {}
+
+        results = []
+        recorded = {}
+
+        for metric, value in values.items():
+            limit = self.limits[metric]
+            if limit is not None:
+                results.append(BudgetResult(name, metric, value, limit, None,
+                                            value <= limit))
+
+            if self.baselines is None or metric not in self.metrics:
+                continue
+
+            baseline = baselines.get(metric)
+            if baseline is None or self.update:
+                recorded[metric] = value
+                continue
+
+            limit = self._get_baseline_limit(metric, baseline)
+            results.append(BudgetResult(name, metric, value, limit, baseline,
+                                        value <= limit))
+
+        if recorded:
+            self.baselines.update(name, recorded)
+
+        failed = [result for result in results if not result.passed]
+        if failed:
+            raise PerformanceBudgetError(self._format_failures(failed))
+
+        return results
+
+    def __call__(self, func: Callable) -> Callable:
+        """Decorate a function returning a wrangler and its input dataframes
+        to check the budget when the function is called.
+
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            wrangler, dfs = func(*args, **kwargs)
+            self.check(wrangler, *dfs, name=self.name or func.__name__)
+
+        return wrapper
+
+    def _get_baseline_limit(self, metric: str, baseline: float) -> float:
+        """Return limit of given metric derived from its baseline.
+
+        """
+
+        margin = max(abs(baseline) * self.tolerance, MIN_MARGINS[metric])
+        return baseline + margin
+
+    def _profile(self, wrangler, dfs) -> Dict[str, float]:
+        """Return values of all metrics which have a limit or are compared to
+        baselines.
+
+        """
+
+        from pywrangler.pandas.benchmark import (
+            PandasMemoryProfiler,
+            PandasTimeProfiler
+        )
+
+        values = OrderedDict()
+
+        if self._is_required("time"):
+            profiler = PandasTimeProfiler(wrangler, self.repetitions,
+                                          warmup=self.warmup)
+            values["time"] = float(profiler.profile(*dfs).median)
+
+        if self._is_required("ratio"):
+            profiler = PandasMemoryProfiler(wrangler, self.repetitions,
+                                            mode=self.memory_mode)
+            values["ratio"] = float(profiler.profile(*dfs).ratio)
+
+        return values
+
+    def _is_required(self, metric: str) -> bool:
+        """Return True if given metric has a limit or is compared to
+        baselines.
+
+        """
+
+        has_baseline = self.baselines is not None and metric in self.metrics
+        return self.limits[metric] is not None or has_baseline
+
+    @staticmethod
+    def _format_failures(failed: List[BudgetResult]) -> str:
+        """Return error message describing all exceeded limits.
+
+        """
+
+        lines = []
+        for result in failed:
+            if result.baseline is None:
+                reference = "absolute limit"
+            else:
+                reference = "baseline {:.4g} plus tolerance".format(
+                    result.baseline)
+
+            lines.append("'{}' exceeds {} budget: {:.4g} > {:.4g} ({})"
+                         .format(result.name, result.metric, result.value,
+                                 result.limit, reference))
+
+        return "\n".join(lines)
+
+
+def pytest_addoption(parser):
+    """Add command line options for baselines of performance budgets.
+
+    """
+
+    group = parser.getgroup("pywrangler")
+    group.addoption("--performance-baselines", default=None,
+                    help="Path of the JSON file containing performance "
+                         "baselines. Baselines are neither recorded nor "
+                         "checked if not given.")
+    group.addoption("--update-baselines", action="store_true",
+                    help="Update performance baselines instead of checking "
+                         "them.")
+
+
+if pytest is not None:
+
+    @pytest.fixture
+    def performance_budget(request):
+        """Return a function checking the performance budget of a wrangler.
+        The budget's name defaults to the test's node id and baselines are
+        taken from the `--performance-baselines` file. Without this option,
+        only absolute limits are checked.
+
+        """
+
+        path = request.config.getoption("performance_baselines")
+        update = request.config.getoption("update_baselines")
+
+        def check(wrangler, *dfs, name=None, **kwargs):
+            kwargs.setdefault("baselines", path)
+            kwargs.setdefault("update", update)
+
+            budget = PerformanceBudget(name or request.node.nodeid, **kwargs)
+            return budget.check(wrangler, *dfs)
+
+        return check
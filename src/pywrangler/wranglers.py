@@ -2,7 +2,7 @@
 and corresponding descriptions.
 
 """
-from typing import Any
+from typing import Any, List
 
 from pywrangler.base import BaseWrangler
 from pywrangler.util import sanitizer
@@ -139,3 +139,9 @@ class IntervalIdentifier(BaseWrangler):
     @property
     def preserves_sample_size(self) -> bool:
         return True
+
+    @property
+    def input_columns(self) -> List[str]:
+        return ([self.marker_column] +
+                list(self.orderby_columns or []) +
+                list(self.groupby_columns or []))
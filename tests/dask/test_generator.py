@@ -0,0 +1,31 @@
+"""This module contains tests for the dask marker data generator.
+
+isort:skip_file
+"""
+
+import pytest
+import pandas as pd
+
+pytestmark = pytest.mark.dask  # noqa: E402
+dask = pytest.importorskip("dask")  # noqa: E402
+
+from pywrangler.dask.generator import DaskMarkerGenerator
+from pywrangler.pandas.generator import PandasMarkerGenerator
+
+
+@pytest.mark.parametrize("marker_dtype", ["int", "category"])
+def test_generate(marker_dtype):
+    kwargs = dict(rows=1000, groups=4, group_skew=1, duplicate_rate=0.3,
+                  marker_dtype=marker_dtype, seed=5)
+
+    df = DaskMarkerGenerator(**kwargs).generate(npartitions=3)
+
+    assert df.npartitions == 3
+    assert df.known_divisions
+    pd.testing.assert_frame_equal(df.compute(),
+                                  PandasMarkerGenerator(**kwargs).generate())
+
+
+def test_generate_invalid_partitions():
+    with pytest.raises(ValueError):
+        DaskMarkerGenerator(10).generate(npartitions=11)
@@ -0,0 +1,114 @@
+"""This module contains tests for the dask pipeline.
+
+isort:skip_file
+"""
+
+import pytest
+import pandas as pd
+
+pytestmark = pytest.mark.dask  # noqa: E402
+dask = pytest.importorskip("dask")  # noqa: E402
+
+from dask import dataframe as dd
+
+from pywrangler.dask.base import DaskSingleNoFit
+from pywrangler.dask.pipeline import DaskPipeline
+from pywrangler.util.testing.util import concretize_abstract_wrangler
+
+
+@pytest.fixture
+def pipe():
+    """Create example pipeline
+
+    """
+
+    def add_1(df, a=2):
+        return df.assign(add1=df["value"] + a)
+
+    def add_2(df, b=4):
+        return df.assign(add2=df["add1"] + b)
+
+    return DaskPipeline([add_1, add_2])
+
+
+@pytest.fixture
+def df_input():
+    pdf = pd.DataFrame({"value": range(10)})
+    return dd.from_pandas(pdf, npartitions=2)
+
+
+def test_dask_pipeline(pipe, df_input):
+    df_result = pipe.transform(df_input)
+
+    assert df_result.compute()["add2"].tolist() == list(range(6, 16))
+    assert pipe("add_1").columns.tolist() == ["value", "add1"]
+
+
+def test_dask_pipeline_chained_wranglers(df_input):
+    """Test that wrangler results containing only target columns are joined
+    onto the stage's input.
+
+    """
+
+    class DoubleWrangler(DaskSingleNoFit):
+        def __init__(self, column, target):
+            self.column = column
+            self.target = target
+
+        def transform(self, df):
+            return (df[self.column] * 2).to_frame(self.target)
+
+    first = concretize_abstract_wrangler(DoubleWrangler)("value", "double")
+    second = concretize_abstract_wrangler(DoubleWrangler)("double", "quad")
+
+    pipe = DaskPipeline([first, second])
+    df_result = pipe.transform(df_input).compute()
+
+    assert df_result.columns.tolist() == ["value", "double", "quad"]
+    assert df_result["quad"].tolist() == [x * 4 for x in range(10)]
+
+
+def test_dask_pipeline_cache(pipe, df_input):
+    pipe.cache.enable("add_1")
+    assert pipe.cache.enabled == [pipe[0]]
+
+    pipe.transform(df_input)
+
+    # persisted collections consist of a single task per partition
+    assert len(pipe(0).__dask_graph__()) == 2
+    assert len(pipe(1).__dask_graph__()) > 2
+
+    pipe.cache.enable(1)
+    assert len(pipe(1).__dask_graph__()) == 2
+
+    pipe.cache.disable([0, 1])
+    assert pipe.cache.enabled == []
+
+    with pytest.raises(ValueError):
+        pipe.cache.disable(0)
+
+    pipe.cache.enable(0)
+    pipe.cache.clear()
+    assert pipe.cache.enabled == []
+
+
+def test_dask_pipeline_profile(pipe, df_input):
+    pipe.cache.enable(0)
+    df_profile = pipe.profile(df_input)
+
+    assert df_profile["name"].tolist() == ["Input dataframe", "add_1",
+                                           "add_2"]
+    assert df_profile["rows"].tolist() == [10, 10, 10]
+    assert df_profile["cols"].tolist() == [1, 2, 3]
+    assert df_profile["cached"].tolist() == [False, True, False]
+    assert df_profile["partitions"].tolist() == [2, 2, 2]
+
+
+def test_dask_pipeline_describe(pipe, df_input):
+    df_description = pipe.describe(df_input)
+
+    assert df_description["uid"].tolist()[1:] == [stage.uid
+                                                  for stage in pipe.stages]
+    assert df_description["tasks"].is_monotonic_increasing
+    assert df_description["estimated_size"].isnull().all()
+    assert (df_description["volume_change"] == "").all()
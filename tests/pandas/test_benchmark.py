@@ -2,6 +2,7 @@
 
 """
 
+import os
 import time
 
 import pytest
@@ -12,9 +13,17 @@ import pandas as pd
 from pywrangler.benchmark import allocate_memory
 from pywrangler.pandas.base import PandasSingleNoFit
 from pywrangler.pandas.benchmark import (
+    PandasAllocationProfiler,
+    PandasCallProfiler,
     PandasMemoryProfiler,
+    PandasScalingProfiler,
     PandasTimeProfiler
 )
+from pywrangler.pandas.generator import PandasMarkerGenerator
+from pywrangler.pandas.wranglers.interval_identifier import (
+    NaiveIterator,
+    VectorizedCumSum
+)
 from pywrangler.util.testing.util import concretize_abstract_wrangler
 
 pytestmark = pytest.mark.pandas
@@ -98,6 +107,31 @@ def test_pandas_memory_profiler_usage_input_output(test_wrangler):
     assert memory_profiler.output == test_df_output
 
 
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_pandas_memory_profiler_fork(test_wrangler):
+    """Test that output memory usage is computed from the profiled runs in
+    forked child processes.
+
+    """
+
+    df_input = pd.DataFrame(np.random.rand(1000))
+    df_output = pd.DataFrame(np.random.rand(10000))
+
+    test_df_output = df_output.memory_usage(index=True, deep=True).sum()
+
+    wrangler = test_wrangler(size=30)
+    memory_profiler = PandasMemoryProfiler(wrangler, 2, mode="fork")
+    memory_profiler.profile(df_input)
+
+    assert memory_profiler.median > 29 * MIB
+    assert memory_profiler.output == memory_profiler.outputs[-1]
+
+    wrangler = test_wrangler(result=df_output)
+    memory_profiler = PandasMemoryProfiler(wrangler, 1, mode="fork")
+
+    assert memory_profiler.profile(df_input).output == test_df_output
+
+
 @pytest.mark.xfail(reason="Succeeds locally but sometimes fails remotely due "
                           "to non deterministic memory management.")
 def test_pandas_memory_profiler_ratio(test_wrangler):
@@ -124,3 +158,64 @@ def test_pandas_time_profiler_best(test_wrangler):
     time_profiler = PandasTimeProfiler(wrangler, 1).profile(pd.DataFrame())
 
     assert time_profiler.best >= sleep
+
+
+def test_pandas_scaling_profiler():
+    """Test that peak memory of interval identification scales linearly.
+
+    """
+
+    generator = PandasMarkerGenerator(0, groups=10)
+    wrangler = VectorizedCumSum(**generator.wrangler_kwargs)
+
+    def generate(rows):
+        return PandasMarkerGenerator(rows, groups=10).generate()
+
+    profiler = PandasScalingProfiler(wrangler, start=10000, steps=3,
+                                     repetitions=1)
+    profiler.profile(generate)
+
+    assert profiler.memory_model.name == "linear"
+    assert profiler.memory_exponent == pytest.approx(1, abs=0.1)
+
+
+def test_pandas_allocation_profiler(capsys):
+    """Test that allocations of interval identification are attributed to
+    pywrangler modules and are standardized by input memory usage.
+
+    """
+
+    generator = PandasMarkerGenerator(100000, groups=10)
+    wrangler = VectorizedCumSum(**generator.wrangler_kwargs)
+    df = generator.generate()
+
+    profiler = PandasAllocationProfiler(wrangler, top=5).profile(df)
+    profiler.report()
+
+    module = "pywrangler.pandas.wranglers.interval_identifier"
+    assert profiler.input == PandasMemoryProfiler._memory_usage_dfs(df)
+    assert profiler.sites[0].module == module
+    assert profiler.copies >= profiler.ratio > 1
+    assert "Copies" in capsys.readouterr().out
+
+
+def test_pandas_call_profiler():
+    """Test that row wise marker checks of the naive iterator are counted
+    and contained in collapsed stacks.
+
+    """
+
+    generator = PandasMarkerGenerator(5000, groups=10)
+    wrangler = NaiveIterator(**generator.wrangler_kwargs)
+    df = generator.generate()
+
+    profiler = PandasCallProfiler(wrangler).profile(df)
+
+    module = "pywrangler.pandas.wranglers.interval_identifier"
+    functions = {x.function: x for x in profiler.functions}
+    top = [x.function for x in profiler.get_top(5, sort="own")]
+
+    assert functions["{}:_is_start".format(module)].calls == 5000
+    assert "{}:_is_start".format(module) in top
+    assert "pandas.core.groupby.generic:transform" in functions
+    assert "{}:_is_start".format(module) in profiler.to_collapsed()
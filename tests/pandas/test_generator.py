@@ -0,0 +1,103 @@
+"""This module contains tests for the pandas marker data generator.
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pywrangler.pandas.generator import PandasMarkerGenerator, uniform
+from pywrangler.pandas.wranglers.interval_identifier import VectorizedCumSum
+
+pytestmark = pytest.mark.pandas
+
+
+def test_uniform():
+    random = uniform(np.arange(100000), 0, 0)
+
+    assert 0 <= random.min() and random.max() < 1
+    assert random.mean() == pytest.approx(0.5, abs=0.01)
+    assert not np.array_equal(random, uniform(np.arange(100000), 1, 0))
+    assert not np.array_equal(random, uniform(np.arange(100000), 0, 1))
+
+
+def test_generate():
+    generator = PandasMarkerGenerator(1000, groups=5, seed=3)
+    df = generator.generate()
+
+    assert df.columns.tolist() == ["order", "group", "marker"]
+    assert df["order"].tolist() == list(range(1000))
+    assert df.index.tolist() == list(range(1000))
+    assert set(df["group"]) == set(range(5))
+    pd.testing.assert_frame_equal(df, generator.generate())
+
+
+def test_generate_range():
+    generator = PandasMarkerGenerator(1000, groups=5, duplicate_rate=0.5)
+
+    df = generator.generate()
+    df_parts = pd.concat([generator.generate_range(0, 333),
+                          generator.generate_range(333, 1000)])
+
+    pd.testing.assert_frame_equal(df, df_parts)
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "geometric"])
+def test_interval_lengths(distribution):
+    generator = PandasMarkerGenerator(10000, groups=3, interval_length=(3, 6),
+                                      interval_distribution=distribution,
+                                      noise_ratio=0.2)
+    df = generator.generate()
+
+    # each slot starts with a start marker followed by an end marker
+    slots = df["order"] // generator.slot_size
+    starts = df.groupby(slots)["marker"].apply(lambda x: x.eq(1).idxmax())
+    ends = df.groupby(slots)["marker"].apply(lambda x: x.eq(2).idxmax())
+    lengths = ends - starts + 1
+
+    assert (starts == slots.unique() * generator.slot_size).all()
+    assert lengths.between(3, 6).all()
+    assert set(lengths) == {3, 4, 5, 6}
+
+    # all rows of a slot belong to the same group
+    assert df.groupby(slots)["group"].nunique().eq(1).all()
+
+
+def test_group_skew():
+    uniform_groups = PandasMarkerGenerator(10000, groups=10).generate()
+    skewed_groups = PandasMarkerGenerator(10000, groups=10,
+                                          group_skew=2).generate()
+
+    uniform_max = uniform_groups["group"].value_counts(normalize=True).max()
+    skewed_max = skewed_groups["group"].value_counts(normalize=True).max()
+
+    assert uniform_max < 0.15
+    assert skewed_max > 0.3
+
+
+def test_duplicate_rate():
+    def count_markers(duplicate_rate):
+        generator = PandasMarkerGenerator(10000, interval_length=(4, 4),
+                                          noise_ratio=0.5,
+                                          duplicate_rate=duplicate_rate)
+        return generator.generate()["marker"].value_counts()
+
+    assert count_markers(0)[1] == 1250
+    assert count_markers(1)[1] == 2500
+    assert count_markers(1)[2] == 2500
+    assert 1250 < count_markers(0.5)[1] < 2500
+
+
+@pytest.mark.parametrize("marker_dtype", ["int", "str", "category"])
+def test_marker_dtype(marker_dtype):
+    generator = PandasMarkerGenerator(100, groups=2, duplicate_rate=0.5,
+                                      marker_dtype=marker_dtype)
+    df = generator.generate()
+
+    assert set(df["marker"]) == set(generator.marker_values)
+    if marker_dtype == "category":
+        assert df["marker"].dtype.name == "category"
+
+    # generated data is valid wrangler input
+    wrangler = VectorizedCumSum(**generator.wrangler_kwargs)
+    assert wrangler.transform(df)["iids"].max() > 0
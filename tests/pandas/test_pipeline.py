@@ -0,0 +1,199 @@
+"""This module contains tests for the pandas pipeline.
+
+"""
+
+import pytest
+
+import pandas as pd
+
+from pywrangler.pandas.base import PandasSingleNoFit
+from pywrangler.pandas.pipeline import PandasPipeline
+from pywrangler.util.testing.util import concretize_abstract_wrangler
+
+pytestmark = pytest.mark.pandas
+
+
+@pytest.fixture
+def pipe():
+    """Create example pipeline
+
+    """
+
+    def add_1(df, a=2):
+        """Add doc"""
+        return df.assign(add1=df["value"] + a)
+
+    def explode(df):
+        return pd.concat([df, df, df], ignore_index=True)
+
+    def add_2(df, b=4):
+        return df.assign(add2=df["add1"] + b)
+
+    add_2.input_columns = ["add1"]
+
+    return PandasPipeline([add_1, explode, add_2])
+
+
+@pytest.fixture
+def df_input():
+    return pd.DataFrame({"value": range(10), "other": ["a"] * 10})
+
+
+def test_pandas_pipeline(pipe, df_input):
+    df_result = pipe.transform(df_input)
+
+    assert df_result["add2"].tolist() == list(range(6, 16)) * 3
+    assert pipe("add_1")["add1"].tolist() == list(range(2, 12))
+    assert pipe["explode"] is pipe[1]
+
+    class DummyWrangler(PandasSingleNoFit):
+        def transform(self, df):
+            return df
+
+    wrangler = concretize_abstract_wrangler(DummyWrangler)()
+    assert len(PandasPipeline([wrangler]).stages) == 1
+
+
+def test_pandas_pipeline_invalid_wrangler():
+    from pywrangler.dask.base import DaskSingleNoFit
+
+    wrangler = concretize_abstract_wrangler(DaskSingleNoFit)()
+
+    with pytest.raises(ValueError):
+        PandasPipeline([wrangler])
+
+
+def test_pandas_pipeline_profile(pipe, df_input):
+    with pytest.raises(ValueError):
+        pipe.profile()
+
+    df_profile = pipe.profile(df_input)
+
+    assert df_profile["idx"].tolist() == ["None", "0", "1", "2"]
+    assert df_profile["name"].tolist() == ["Input dataframe", "add_1",
+                                           "explode", "add_2"]
+    assert df_profile["uid"].tolist()[1:] == [stage.uid
+                                              for stage in pipe.stages]
+    assert df_profile["rows"].tolist() == [10, 10, 30, 30]
+    assert df_profile["cols"].tolist() == [2, 3, 3, 4]
+    assert (df_profile["total_time"] >= 0).all()
+
+    memory = df_profile["memory"]
+    assert memory[0] == df_input.memory_usage(deep=True).sum()
+    assert df_profile["memory_delta"].tolist() == [0] + \
+        (memory.diff()[1:]).astype(int).tolist()
+    assert df_profile.loc[2, "memory_delta"] > 0
+
+
+def test_pandas_pipeline_describe(pipe, df_input):
+    df_description = pipe.describe(df_input)
+
+    assert df_description["doc"].tolist()[:2] == ["", "Add doc"]
+    assert df_description["estimated_rows"].tolist() == [10, 10, 30, 30]
+    assert df_description["cached"].tolist() == [False, True, True, True]
+    assert df_description.loc[2, "volume_change"] == "explosion"
+    assert df_description.loc[2, "size_ratio"] == pytest.approx(3, rel=0.1)
+
+
+def test_pandas_pipeline_pruner(df_input):
+    def add_1(df, a=2):
+        return df.assign(add1=df["value"] + a)
+
+    def add_2(df, b=4):
+        return df.assign(add2=df["add1"] + b)
+
+    add_2.input_columns = ["add1"]
+
+    pipe = PandasPipeline([add_1, add_2], output_columns=["add2"])
+    df_result = pipe.transform(df_input)
+
+    assert pipe.pruner.get_required_columns(0) == {"add1", "add2"}
+    assert pipe("add_1").columns.tolist() == ["add1"]
+    assert df_result.columns.tolist() == ["add2"]
+    assert df_result["add2"].tolist() == list(range(6, 16))
+
+    # test no pruning if input columns are unknown
+    del add_2.input_columns
+    pipe = PandasPipeline([add_1, add_2], output_columns=["add2"])
+    pipe.transform(df_input)
+
+    assert pipe.pruner.get_required_columns(0) is None
+    assert pipe("add_1").columns.tolist() == ["value", "other", "add1"]
+
+    # test disabled pruning
+    pipe = PandasPipeline([add_1, add_2])
+    assert pipe.transform(df_input).shape == (10, 4)
+
+
+def test_pandas_pipeline_pruner_wrangler(df_input):
+    from pywrangler.pandas.wranglers.interval_identifier import \
+        NaiveIterator
+
+    df = df_input.assign(marker=[1, 0, 2] * 3 + [0],
+                         order=range(10))
+
+    wrangler = NaiveIterator(marker_column="marker",
+                             marker_start=1,
+                             marker_end=2,
+                             orderby_columns="order")
+
+    def add_1(df, a=2):
+        return df.assign(add1=df["value"] + a)
+
+    pipe = PandasPipeline([add_1, wrangler], output_columns=["iids"])
+    df_result = pipe.transform(df)
+
+    assert pipe("add_1").columns.tolist() == ["marker", "order"]
+    assert df_result.columns.tolist() == ["iids"]
+
+
+def test_pandas_pipeline_chained_wranglers(df_input):
+    """Test that wrangler results are joined onto the stage's input such
+    that subsequent wranglers have access to all columns.
+
+    """
+
+    from pywrangler.pandas.wranglers.interval_identifier import \
+        NaiveIterator, VectorizedCumSum
+
+    df = df_input.assign(marker=[1, 0, 2] * 3 + [0],
+                         order=range(10))
+
+    kwargs = dict(marker_column="marker", marker_start=1, marker_end=2,
+                  orderby_columns="order")
+
+    first = NaiveIterator(target_column_name="iids_naive", **kwargs)
+    second = VectorizedCumSum(target_column_name="iids_cumsum", **kwargs)
+
+    pipe = PandasPipeline([first, second])
+    df_result = pipe.transform(df)
+
+    assert df_result.columns.tolist() == ["value", "other", "marker",
+                                          "order", "iids_naive",
+                                          "iids_cumsum"]
+    assert df_result["iids_naive"].tolist() == \
+        df_result["iids_cumsum"].tolist()
+    assert pipe(0).columns.tolist() == df_result.columns.tolist()[:-1]
+
+
+def test_pandas_pipeline_events(pipe, df_input):
+    from pywrangler import events
+
+    class ListSink(events.BaseSink):
+        def __init__(self):
+            self.events = []
+
+        def emit(self, event):
+            self.events.append(event)
+
+    sink = ListSink()
+    with events.use_sinks(sink):
+        pipe.transform(df_input)
+
+    ends = [event.fields for event in sink.events
+            if event.name == events.STAGE_END]
+
+    assert len(sink.events) == 6
+    assert [fields["uid"] for fields in ends] == [stage.uid
+                                                  for stage in pipe.stages]
+    assert [fields["rows"] for fields in ends] == [10, 30, 30]
@@ -9,6 +9,7 @@ from tests.test_data.interval_identifier import (
     ResultTypeValidIids,
     CollectionNoOrderGroupBy)
 
+from pywrangler.base import record_phases
 from pywrangler.pandas.wranglers.interval_identifier import (
     NaiveIterator,
     VectorizedCumSum
@@ -198,3 +199,26 @@ def test_no_order_groupby(testcase, missing_order_group_by, wrangler):
     kwargs = dict(merge_input=True,
                   force_dtypes={"marker": testcase_instance.marker_dtype})
     testcase_instance.test(wrangler_instance.transform, **kwargs)
+
+
+@pytest.mark.parametrize(**WRANGLER_KWARGS)
+def test_phase_timings(wrangler):
+    """Test that all phases of the transformation are recorded.
+
+    Parameters
+    ----------
+    wrangler: pywrangler.wrangler_instance.interfaces.IntervalIdentifier
+        Refers to the actual wrangler_instance begin tested. See `WRANGLER`.
+
+    """
+
+    testcase_instance = ResultTypeRawIids("pandas")
+    wrangler_instance = wrangler(**testcase_instance.test_kwargs)
+    df_input = testcase_instance.input.to_pandas()
+
+    with record_phases():
+        wrangler_instance.transform(df_input)
+
+    phases = [timing.phase for timing in wrangler_instance.phase_timings]
+    assert phases == ["validate", "sort", "groupby", "transform", "reindex",
+                      "validate_output"]
@@ -17,3 +17,9 @@ def test_spark_base_wrangler_engine():
     wrangler = concretize_abstract_wrangler(PySparkWrangler)()
 
     assert wrangler.computation_engine == "pyspark"
+
+
+def test_spark_base_wrangler_partitioning():
+    wrangler = concretize_abstract_wrangler(PySparkWrangler)()
+
+    assert wrangler.partitioning is None
@@ -14,7 +14,7 @@ pyspark = pytest.importorskip("pyspark")  # noqa: E402
 
 from pywrangler.pyspark.base import PySparkSingleNoFit
 from pywrangler.pyspark.benchmark import PySparkTimeProfiler, \
-    PySparkBaseProfiler
+    PySparkBaseProfiler, SparkJobMetricsCollector, materialize
 
 SLEEP = 0.0001
 
@@ -68,3 +68,93 @@ def test_spark_base_profiler_cache_input(spark):
 
     PySparkBaseProfiler._clear_cached_input([df])
     assert df.is_cached is False
+
+
+@pytest.mark.parametrize("materialization", ["count", "hash"])
+def test_materialize_rows(spark, materialization):
+    df = spark.range(10).toDF("col")
+
+    assert materialize(df, materialization) == 10
+
+
+def test_materialize_noop(spark):
+    df = spark.range(10).toDF("col")
+
+    assert materialize(df, "noop") is None
+
+
+def test_materialize_invalid(spark):
+    df = spark.range(10).toDF("col")
+
+    with pytest.raises(ValueError):
+        materialize(df, "invalid")
+
+
+def test_spark_time_profiler_materialization(spark, wrangler_sleeps):
+    df_input = spark.range(10).toDF("col")
+
+    time_profiler = PySparkTimeProfiler(wrangler_sleeps(), 1,
+                                        materialization="hash")
+
+    assert time_profiler.materialization == "hash"
+    assert time_profiler.profile(df_input).best >= SLEEP
+
+    with pytest.raises(ValueError):
+        PySparkTimeProfiler(wrangler_sleeps(), 1, materialization="invalid")
+
+
+def test_spark_job_metrics_collector(spark):
+    df = spark.range(0, 100, 1, 4).toDF("col")
+    df_grouped = df.groupBy((df["col"] % 5).alias("key")).count()
+
+    collector = SparkJobMetricsCollector(spark.sparkContext)
+
+    with pytest.raises(ValueError):
+        SparkJobMetricsCollector().metrics
+
+    with collector:
+        assert spark.sparkContext.getLocalProperty("spark.jobGroup.id") == \
+            collector.job_group
+        df_grouped.collect()
+
+    assert spark.sparkContext.getLocalProperty("spark.jobGroup.id") is None
+
+    metrics = collector.metrics
+    assert metrics.jobs >= 1
+    assert metrics.stages >= 2
+    assert metrics.shuffle_write_bytes > 0
+    assert metrics.shuffle_read_bytes > 0
+    assert metrics.input_records >= 100
+    assert metrics.task_time >= 0
+
+
+def test_spark_job_metrics_collector_unreachable(spark, monkeypatch):
+    """Test that an unreachable REST API does not wait until timeout but
+    returns metrics of the status tracker only.
+
+    """
+
+    collector = SparkJobMetricsCollector(spark.sparkContext, timeout=30)
+    monkeypatch.setattr(collector, "_get_rest_base_url",
+                        lambda: "http://127.0.0.1:9/api/v1")
+
+    with collector:
+        spark.range(0, 100, 1, 4).count()
+
+    start = time.time()
+    metrics = collector.metrics
+
+    assert time.time() - start < 10
+    assert metrics.jobs >= 1
+    assert metrics.stages >= 1
+    assert metrics.task_time is None
+
+
+def test_spark_time_profiler_job_metrics(spark, wrangler_sleeps):
+    df_input = spark.range(10).toDF("col")
+
+    time_profiler = PySparkTimeProfiler(wrangler_sleeps(), 2)
+    time_profiler.profile(df_input)
+
+    assert len(time_profiler.job_metrics) == time_profiler.runs
+    assert all([metrics.jobs >= 1 for metrics in time_profiler.job_metrics])
@@ -0,0 +1,29 @@
+"""This module contains tests for the benchmark suite with pyspark
+implementations.
+
+isort:skip_file
+"""
+
+import pytest
+
+pytestmark = pytest.mark.pyspark  # noqa: E402
+pyspark = pytest.importorskip("pyspark")  # noqa: E402
+
+from pywrangler import benchmark_suite
+
+
+def test_suite_pyspark(spark):
+    implementations = ["pandas.VectorizedCumSum",
+                       "pyspark.VectorizedCumSum",
+                       "pyspark.VectorizedCumSumAdjusted"]
+
+    suite = benchmark_suite.IntervalIdentifierBenchmarkSuite(
+        sizes=[100], groups=[3], implementations=implementations,
+        marker_uses=[(False, True)], repetitions=1,
+        spark=spark, materialization="count")
+
+    results = suite.run().results
+
+    assert len(results) == 9
+    assert {result.engine for result in results} == {"pandas", "pyspark"}
+    assert all([result.agrees for result in results])
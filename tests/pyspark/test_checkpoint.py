@@ -0,0 +1,104 @@
+"""This module contains tests for the pyspark checkpoint store.
+
+isort:skip_file
+"""
+
+import os
+
+import pytest
+
+pytestmark = pytest.mark.pyspark  # noqa: E402
+pyspark = pytest.importorskip("pyspark")  # noqa: E402
+
+from pyspark.sql import functions as F
+
+from pywrangler.pyspark.checkpoint import (
+    CheckpointStore,
+    get_persistent_fingerprint
+)
+
+
+def test_get_persistent_fingerprint(spark, tmp_path):
+    df = spark.range(10).toDF("value")
+
+    fingerprint = get_persistent_fingerprint(df)
+
+    assert fingerprint == get_persistent_fingerprint(
+        spark.range(10).toDF("value"))
+    assert fingerprint != get_persistent_fingerprint(
+        spark.range(11).toDF("value"))
+    assert fingerprint != get_persistent_fingerprint(
+        df.withColumn("add", F.lit(1)))
+
+    # test file based inputs
+    path = str(tmp_path / "input")
+    df.write.parquet(path)
+    fingerprint_file = get_persistent_fingerprint(spark.read.parquet(path))
+
+    assert fingerprint_file == get_persistent_fingerprint(
+        spark.read.parquet(path))
+
+    df.union(df).write.mode("overwrite").parquet(path)
+    assert fingerprint_file != get_persistent_fingerprint(
+        spark.read.parquet(path))
+
+
+def test_checkpoint_store(spark, tmp_path):
+    store = CheckpointStore(str(tmp_path / "store"))
+    df = spark.range(10).toDF("value")
+
+    # test empty store
+    assert store.entries == []
+    assert store.size == 0
+    assert "key" not in store
+
+    with pytest.raises(ValueError):
+        store.read("key", spark)
+
+    with pytest.raises(ValueError):
+        store.invalidate("key")
+
+    with pytest.raises(ValueError):
+        CheckpointStore(max_size=-1)
+
+    df_stored = store.write(df, "key", "name")
+
+    assert "key" in store
+    assert sorted(df_stored.collect()) == sorted(df.collect())
+    assert store.entries[0].name == "name"
+    assert store.size == store.entries[0].size > 0
+
+    # test no temporary directories remain
+    assert os.listdir(store.path) == ["key"]
+
+    # test reading updates last access
+    last_access = store.entries[0].last_access
+    store.read("key", spark)
+    assert store.entries[0].last_access > last_access
+
+    store.invalidate("key")
+    assert "key" not in store
+
+    store.write(df, "key")
+    store.clear()
+    assert store.entries == []
+
+
+def test_checkpoint_store_eviction(spark, tmp_path):
+    store = CheckpointStore(str(tmp_path / "store"))
+    df = spark.range(10).toDF("value")
+
+    store.write(df, "first")
+    store.write(df, "second")
+    store.read("first", spark)
+
+    # least recently accessed entry is evicted
+    store.max_size = store.entries[0].size * 2
+    store.write(df, "third")
+
+    assert [entry.key for entry in store.entries] == ["first", "third"]
+
+    # new entry is kept even if exceeding maximum size
+    store.max_size = 1
+    store.write(df, "fourth")
+    assert [entry.key for entry in store.entries] == ["fourth"]
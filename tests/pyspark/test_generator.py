@@ -0,0 +1,33 @@
+"""This module contains tests for the pyspark marker data generator.
+
+isort:skip_file
+"""
+
+import pytest
+import pandas as pd
+
+pytestmark = pytest.mark.pyspark  # noqa: E402
+pyspark = pytest.importorskip("pyspark")  # noqa: E402
+
+from pywrangler.pandas.generator import PandasMarkerGenerator
+from pywrangler.pyspark.generator import PySparkMarkerGenerator
+
+
+@pytest.mark.parametrize("kwargs", [dict(marker_dtype="int"),
+                                    dict(marker_dtype="str", seed=2 ** 40),
+                                    dict(interval_distribution="geometric",
+                                         interval_length=(2, 20))])
+def test_generate(spark, kwargs):
+    params = dict(rows=2000, groups=7, group_skew=0.5, duplicate_rate=0.3)
+    params.update(kwargs)
+
+    df = PySparkMarkerGenerator(**params).generate(spark, num_partitions=3)
+
+    assert df.rdd.getNumPartitions() == 3
+
+    df_result = df.toPandas()
+    df_expected = PandasMarkerGenerator(**params).generate() \
+        .reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(df_result, df_expected,
+                                  check_dtype=False)
@@ -13,6 +13,8 @@ pyspark = pytest.importorskip("pyspark")  # noqa: E402
 from pyspark.sql import functions as F
 from pywrangler.pyspark import pipeline
 from pywrangler.pyspark.pipeline import StageTransformerConverter
+from pywrangler.pyspark.plan import estimate_statistics
+from pywrangler.pyspark.checkpoint import CheckpointStore
 from pywrangler.pyspark.base import PySparkSingleNoFit
 from pyspark.ml.param.shared import Param
 from pyspark.ml import Transformer
@@ -251,6 +253,435 @@ def test_pipeline_cacher(spark, pipe):
     assert pipe("add_2").is_cached is False
 
 
+def test_pipeline_locator_lookups(spark, pipe):
+    """Test counting of dataframe lookups per stage.
+
+    """
+
+    df_input = spark.range(10).toDF("value")
+    pipe.transform(df_input)
+
+    pipe("add_1")
+    pipe("add_2")
+    pipe("add_1")
+    pipe._loc.get_transformation("add_2", track=False)
+
+    assert pipe._loc.lookups == {0: 2, 1: 1}
+    assert pipe._loc.last_lookups[0] > pipe._loc.last_lookups[1]
+
+
+def test_pipeline_cacher_storage_level(spark, pipe):
+    """Test pipeline caching with explicit storage level.
+
+    """
+
+    df_input = spark.range(10).toDF("value")
+
+    pipe.cache.enable("add_1", pyspark.StorageLevel.DISK_ONLY)
+    pipe.cache.enable("add_2")
+    pipe.transform(df_input)
+
+    assert pipe("add_1").storageLevel.useMemory is False
+    assert pipe("add_1").storageLevel.useDisk is True
+    assert pipe("add_2").storageLevel.useMemory is True
+
+    pipe.cache.clear()
+    assert pipe("add_1").is_cached is False
+
+
+@pytest.fixture
+def pipe_window():
+    """Create example pipeline with costly window stage.
+
+    """
+
+    from pyspark.sql import Window
+
+    def add_1(df):
+        return df.withColumn("group", F.col("value") % 3)
+
+    def window(df):
+        window = Window.partitionBy("group").orderBy("value")
+        return df.withColumn("lag", F.lag("value").over(window))
+
+    def add_2(df):
+        return df.withColumn("add2", F.col("value") + 2)
+
+    return pipeline.Pipeline([add_1, window, add_2])
+
+
+@pytest.fixture
+def clear_cache(spark):
+    """Remove cached dataframes of previous tests because spark reuses cached
+    data for identical plans which affects plan cost.
+
+    """
+
+    spark.catalog.clearCache()
+
+
+def test_pipeline_cache_advisor(spark, pipe_window, clear_cache):
+    """Test cache recommendations based on plan cost and stage reuse.
+
+    """
+
+    pipe = pipe_window
+    df_input = spark.range(0, 100, 1, 4).toDF("value")
+
+    # test missing transformation
+    with pytest.raises(ValueError):
+        pipe.cache_advisor.recommend()
+
+    # test invalid eviction policy
+    with pytest.raises(ValueError):
+        pipeline.PipelineCacheAdvisor(pipe, policy="invalid")
+
+    pipe.transform(df_input)
+    pipe("window")
+    pipe("add_2")
+    pipe("add_2")
+
+    df_recs = pipe.cache_advisor.recommend()
+
+    assert df_recs["cost"].tolist() == [0, 2, 2]
+    assert df_recs["reuses"].tolist() == [0, 1, 2]
+    assert df_recs["benefit"].tolist() == [0, 2, 4]
+    assert df_recs["recommended"].tolist() == [False, True, True]
+    assert df_recs.loc[2, "storage_level"] == "MEMORY_AND_DISK"
+
+    # recommendation only does not change caching
+    assert pipe.cache.enabled == []
+
+    assert pipe.cache_advisor.apply() == [1, 2]
+    assert pipe.cache.enabled == [pipe["window"], pipe["add_2"]]
+
+    # cached stages are not changed again
+    assert pipe.cache_advisor.apply() == []
+
+
+def test_pipeline_cache_advisor_budget(spark, pipe_window, clear_cache):
+    """Test storage level and eviction if memory budget is exceeded.
+
+    """
+
+    pipe = pipe_window
+    df_input = spark.range(0, 100, 1, 4).toDF("value")
+
+    pipe.transform(df_input)
+    pipe("window")
+    pipe("add_2")
+    pipe("add_2")
+
+    # stages do not fit into memory
+    advisor = pipeline.PipelineCacheAdvisor(pipe, memory_budget=1)
+    df_recs = advisor.recommend()
+
+    assert df_recs["storage_level"].tolist() == [None, "DISK_ONLY",
+                                                 "DISK_ONLY"]
+
+    # only a single stage fits into memory
+    size = df_recs.loc[2, "estimated_size"]
+    advisor = pipeline.PipelineCacheAdvisor(pipe, memory_budget=size)
+    df_recs = advisor.recommend()
+
+    assert df_recs["storage_level"].tolist() == [None, "DISK_ONLY",
+                                                 "MEMORY_AND_DISK"]
+
+
+def test_pipeline_cache_advisor_eviction(spark, pipe_window, clear_cache):
+    """Test eviction policies if memory budget is exceeded.
+
+    """
+
+    pipe = pipe_window
+    df_input = spark.range(0, 100, 1, 4).toDF("value")
+
+    pipe.transform(df_input)
+    pipe("add_2")
+    pipe("add_2")
+
+    size = estimate_statistics(pipe("add_2")).estimated_size
+    lru = pipeline.PipelineCacheAdvisor(pipe, memory_budget=size)
+    cost = pipeline.PipelineCacheAdvisor(pipe, memory_budget=size,
+                                         policy="cost")
+
+    assert lru.apply() == [2]
+    cost._managed = lru._managed.copy()
+
+    # window stage is smaller but has less benefit per byte
+    pipe("window")
+    df_lru = lru.recommend()
+    df_cost = cost.recommend()
+
+    assert df_lru["evict"].tolist() == [False, False, True]
+    assert df_lru["storage_level"].tolist() == [None, "MEMORY_AND_DISK",
+                                                None]
+    assert df_cost["evict"].tolist() == [False, False, False]
+    assert df_cost["storage_level"].tolist() == [None, "DISK_ONLY",
+                                                 "MEMORY_AND_DISK"]
+
+    assert lru.apply() == [1, 2]
+    assert pipe.cache.enabled == [pipe["window"]]
+
+
+def test_pipeline_cache_advisor_unknown_size(spark, pipe_window,
+                                             clear_cache):
+    """Test that stages with unknown size cached in memory do not break
+    subsequent recommendations.
+
+    """
+
+    pipe = pipe_window
+    rdd = spark.sparkContext.parallelize([(x,) for x in range(100)], 4)
+    df_input = spark.createDataFrame(rdd, schema="value long")
+
+    pipe.transform(df_input)
+    pipe("window")
+    pipe("add_2")
+    pipe("add_2")
+
+    df_recs = pipe.cache_advisor.recommend()
+    assert df_recs["estimated_size"].isnull().all()
+
+    assert pipe.cache_advisor.apply() == [1, 2]
+    df_recs = pipe.cache_advisor.recommend()
+    assert df_recs["storage_level"].tolist() == [None, "MEMORY_AND_DISK",
+                                                 "MEMORY_AND_DISK"]
+
+    pipe.cache_advisor.auto = True
+    pipe.transform(df_input)
+    assert pipe.cache.enabled == [pipe["window"], pipe["add_2"]]
+
+
+def test_pipeline_cache_advisor_auto(spark, pipe_window, clear_cache):
+    """Test automatic caching during pipeline transformation.
+
+    """
+
+    pipe = pipe_window
+    df_input = spark.range(0, 100, 1, 4).toDF("value")
+
+    pipe.transform(df_input)
+    assert pipe.cache.enabled == []
+
+    pipe("window")
+    pipe.cache_advisor.auto = True
+    df_result = pipe.transform(df_input)
+
+    assert pipe.cache.enabled == [pipe["window"]]
+    assert pipe("window").is_cached is True
+    assert df_result is pipe._transformer.transformations[-1]
+    assert pipe.describe().loc[3, "cached_scans"] == 1
+
+
+def test_pipeline_fuser(spark):
+    """Test fusion of consecutive projection only stages.
+
+    """
+
+    df_input = spark.range(10).toDF("value")
+
+    def add_1(df):
+        return df.withColumn("add1", F.col("value") + 1)
+
+    def add_2(df):
+        return df.withColumn("add2", F.col("add1") + 1) \
+            .withColumn("add3", F.col("add2") + 1)
+
+    def distinct(df):
+        return df.distinct()
+
+    def add_4(df):
+        return df.withColumn("add4", F.col("add3") + 1)
+
+    def get_plan(df):
+        return df._jdf.queryExecution().analyzed()
+
+    stages = [add_1, add_2, distinct, add_1, add_4]
+    df_expected = pipeline.Pipeline(stages).transform(df_input)
+
+    pipe = pipeline.Pipeline(stages, fuse=True)
+    df_result = pipe.transform(df_input)
+
+    assert df_result.columns == df_expected.columns
+    assert sorted(df_result.collect()) == sorted(df_expected.collect())
+
+    # projections of first two stages are fused into single projection
+    assert get_plan(pipe(1)).child().equals(get_plan(df_input))
+    assert pipe(1).columns == ["value", "add1", "add2", "add3"]
+
+    # non projection only stage remains unchanged
+    assert get_plan(pipe(2)).child().equals(get_plan(pipe(1)))
+
+    # subsequent stages are fused up to non projection only stage
+    assert get_plan(pipe(4)).child().equals(get_plan(pipe(2)))
+
+    # test explicit fusion boundary
+    pipe.fusion.keep(0)
+    assert pipe.fusion.boundaries == [pipe[0]]
+    pipe.transform(df_input)
+    assert get_plan(pipe(1)).child().equals(get_plan(pipe(0)))
+
+    pipe.fusion.release(0)
+    assert pipe.fusion.boundaries == []
+
+    with pytest.raises(ValueError):
+        pipe.fusion.release(0)
+
+    # test cached stages are fusion boundaries
+    pipe.cache.enable(0)
+    pipe.transform(df_input)
+    assert pipe.describe().loc[2, "cached_scans"] == 1
+    pipe.cache.clear()
+
+
+def test_pipeline_transformer_memoization(spark):
+    """Test reuse of unchanged pipeline prefixes via memoization.
+
+    """
+
+    df_input = spark.range(10).toDF("value")
+
+    def add_1(df, a=2):
+        return df.withColumn("add1", F.col("value") + a)
+
+    def add_2(df, b=4):
+        return df.withColumn("add2", F.col("value") + b)
+
+    # test disabled memoization
+    pipe = pipeline.Pipeline([add_1, add_2])
+    pipe.transform(df_input)
+    df_add_1 = pipe(0)
+    pipe.transform(df_input)
+    assert pipe(0) is not df_add_1
+
+    pipe = pipeline.Pipeline([add_1, add_2], memoize=True)
+    pipe.transform(df_input)
+    df_add_1, df_add_2 = pipe._transformer.transformations
+    fingerprints = list(pipe._transformer.fingerprints)
+
+    # unchanged pipeline is entirely reused
+    assert pipe.transform(df_input) is df_add_2
+
+    # semantically equal input is reused
+    pipe.transform(spark.range(10).toDF("value"))
+    assert pipe(0) is df_add_1
+
+    # changed parameters of last stage only rebuild last stage
+    pipe[1].setb(5)
+    df_result = pipe.transform(df_input)
+
+    assert pipe(0) is df_add_1
+    assert df_result is not df_add_2
+    assert pipe._transformer.fingerprints[0] == fingerprints[0]
+    assert pipe._transformer.fingerprints[1] != fingerprints[1]
+    assert df_result.select("add2").first()[0] == 5
+
+    # changed caching of first stage rebuilds subsequent stages only
+    pipe.cache.enable(0)
+    df_cached = pipe.transform(df_input)
+
+    assert pipe(0) is df_add_1
+    assert df_cached is not df_result
+    assert pipe.describe().loc[2, "cached_scans"] == 1
+    pipe.cache.clear()
+
+    # changed input rebuilds all stages
+    pipe.transform(spark.range(5).toDF("value"))
+    assert pipe(0) is not df_add_1
+
+
+def test_pipeline_checkpointer(spark, tmp_path):
+    """Test persistent stage checkpoints and their reuse.
+
+    """
+
+    df_input = spark.range(10).toDF("value")
+    store = CheckpointStore(str(tmp_path))
+
+    def add_1(df, a=2):
+        return df.withColumn("add1", F.col("value") + a)
+
+    def add_2(df, b=4):
+        return df.withColumn("add2", F.col("value") + b)
+
+    def create_pipeline():
+        pipe = pipeline.Pipeline([add_1, add_2])
+        pipe.checkpoint.store = store
+        pipe.checkpoint.enable("add_1")
+        return pipe
+
+    # test invalidation before transform
+    pipe = create_pipeline()
+    with pytest.raises(ValueError):
+        pipe.checkpoint.invalidate("add_1")
+
+    df_result = pipe.transform(df_input)
+    key = pipe.checkpoint.keys[0]
+
+    assert pipe.checkpoint.enabled == [pipe["add_1"]]
+    assert [entry.key for entry in store.entries] == [key]
+    assert store.entries[0].name == "add_1"
+    assert pipe(0)._jdf.queryExecution().analyzed().nodeName() == \
+        "LogicalRelation"
+    assert sorted(df_result.collect()) == sorted(
+        df_input.withColumn("add1", F.col("value") + 2)
+                .withColumn("add2", F.col("value") + 4)
+                .collect())
+
+    # new pipeline instance reuses existing checkpoint
+    pipe = create_pipeline()
+    pipe.transform(df_input)
+    assert pipe.checkpoint.keys[0] == key
+    assert len(store.entries) == 1
+
+    # changed parameters create new checkpoint
+    pipe[0].seta(3)
+    pipe.transform(df_input)
+    assert pipe.checkpoint.keys[0] != key
+    assert pipe(0).select("add1").first()[0] == 3
+    assert len(store.entries) == 2
+
+    pipe.checkpoint.invalidate("add_1")
+    assert len(store.entries) == 1
+
+    pipe.checkpoint.disable("add_1")
+    assert pipe.checkpoint.enabled == []
+
+    with pytest.raises(ValueError):
+        pipe.checkpoint.disable("add_1")
+
+
+def test_pipeline_checkpointer_profiler(spark, tmp_path):
+    """Test that describing and profiling other input dataframes neither
+    writes checkpoints nor changes checkpoint keys.
+
+    """
+
+    df_input = spark.range(10).toDF("value")
+    store = CheckpointStore(str(tmp_path))
+
+    def add_1(df):
+        return df.withColumn("add1", F.col("value") + 1)
+
+    pipe = pipeline.Pipeline([add_1])
+    pipe.checkpoint.store = store
+    pipe.checkpoint.enable("add_1")
+
+    pipe.transform(df_input)
+    keys = dict(pipe.checkpoint.keys)
+    entries = [entry.key for entry in store.entries]
+
+    pipe.describe(spark.range(20).toDF("value"))
+    pipe.profile(spark.range(30).toDF("value"), sample=[0.5, 1.0])
+
+    assert [entry.key for entry in store.entries] == entries
+    assert pipe.checkpoint.keys == keys
+
+    pipe.checkpoint.invalidate("add_1")
+    assert store.entries == []
+
+
 def test_pipeline_transformer(spark, pipe):
     """Test correct pipeline transformation.
 
@@ -325,6 +756,124 @@ def test_pipeline_profiler(spark):
     assert df_profiles.loc[4, "stage_count"] == 4
 
 
+def test_pipeline_profiler_materialization(spark, pipe):
+    """Test pipeline profiler with different materialization strategies.
+
+    """
+
+    df_input = spark.range(10).toDF("value")
+
+    df_profiles = pipe.profile(df_input, materialization="hash")
+    assert (df_profiles["materialization"] == "hash").all()
+    assert df_profiles.loc[2, "rows"] == 10
+
+    df_profiles = pipe.profile(df_input)
+    assert (df_profiles["materialization"] == "count").all()
+
+
+def test_pipeline_profiler_job_metrics(spark):
+    """Test spark job metrics of pipeline profiler.
+
+    """
+
+    df_input = spark.range(0, 10, 1, 4).toDF("value")
+
+    def groupby(df):
+        return df.groupBy((F.col("value") % 2).alias("key")).count()
+
+    pipe = pipeline.Pipeline(stages=[groupby])
+    df_profiles = pipe.profile(df_input)
+
+    metric_columns = ["jobs", "stages", "task_time", "shuffle_read_bytes",
+                      "shuffle_write_bytes", "memory_spill_bytes",
+                      "disk_spill_bytes", "input_records"]
+
+    assert all([column in df_profiles.columns for column in metric_columns])
+    assert (df_profiles["jobs"] >= 1).all()
+    assert df_profiles.loc[1, "shuffle_write_bytes"] > 0
+
+    with pytest.raises(ValueError):
+        pipe.profile(df_input, materialization="invalid")
+
+
+def test_pipeline_profiler_sampled(spark):
+    from pywrangler.pyspark.base import Partitioning
+
+    df_input = spark.range(0, 2000, 1, 4) \
+        .withColumn("group", F.col("id") % 40)
+
+    class CountWrangler(PySparkSingleNoFit):
+        @property
+        def partitioning(self):
+            return Partitioning(["group"], ["id"], [True])
+
+        def transform(self, df):
+            return df.groupBy("group").count()
+
+    def explode(df):
+        return df.crossJoin(df.select(F.col("id").alias("other"))
+                            .limit(3))
+
+    stages = [explode, concretize_abstract_wrangler(CountWrangler)()]
+    pipe = pipeline.Pipeline(stages)
+
+    with pytest.raises(ValueError):
+        pipe.profile(sample=0.5)
+
+    df_profile = pipe.profile(df_input, sample=[0.3, 0.5, 0.7])
+
+    assert df_profile["idx"].tolist() == ["None", "0", "1"]
+    assert df_profile["samples"].tolist() == [3, 3, 3]
+
+    # whole groups are sampled and hence group counts are exact
+    rows = df_profile["rows"]
+    assert rows.tolist() == pytest.approx([2000, 6000, 40], rel=0.01)
+    assert (df_profile["rows_lower"] <= rows + 1e-6).all()
+    assert (df_profile["rows_upper"] >= rows - 1e-6).all()
+    assert (df_profile["total_time_lower"] <=
+            df_profile["total_time"]).all()
+
+    # test missing confidence bands with single fraction
+    df_profile = pipe.profile(df_input, sample=0.5,
+                              groupby_columns=["group"])
+    assert df_profile["rows_lower"].isnull().all()
+    assert df_profile["total_time_upper"].isnull().all()
+
+
+def test_pipeline_events(spark, pipe):
+    from pywrangler import events
+
+    class ListSink(events.BaseSink):
+        def __init__(self):
+            self.events = []
+
+        def emit(self, event):
+            self.events.append(event)
+
+    df_input = spark.range(10).toDF("value")
+
+    sink = ListSink()
+    with events.use_sinks(sink):
+        pipe.transform(df_input)
+        pipe.profile()
+
+    names = [event.name for event in sink.events]
+    assert names[:2] == [events.PIPELINE_START, events.STAGE_START]
+    assert names.count(events.STAGE_END) == 2
+    assert names.count(events.STAGE_PLAN) == 2
+    assert names.count(events.STAGE_MATERIALIZATION) == 3
+
+    plan = [event.fields for event in sink.events
+            if event.name == events.STAGE_PLAN][-1]
+    assert plan["uid"] == pipe.stages[1].uid
+    assert plan["exchanges"] == 0
+
+    materialization = sink.events[-1].fields
+    assert materialization["rows"] == 10
+    assert materialization["materialization"] == "count"
+    assert materialization["pipeline"] == pipe.uid
+
+
 def test_pipeline_describer(spark):
     """Test pipeline describer.
 
@@ -362,6 +911,231 @@ def test_pipeline_describer(spark):
     assert df_descriptions.loc[4, "cached"] == False # noqa E712
 
 
+def test_pipeline_describer_plan_analysis(spark):
+    """Test execution plan analysis of pipeline describer.
+
+    """
+
+    df_input = spark.range(0, 10, 1, 4).toDF("value")
+
+    def add_order(df):
+        return df.withColumn("order", F.col("value") + 5)
+
+    def sort(df):
+        return df.orderBy("order")
+
+    pipe = pipeline.Pipeline(stages=[add_order, sort])
+    df_descriptions = pipe.describe(df_input)
+
+    assert df_descriptions["exchanges"].tolist() == [0, 0, 1]
+    assert df_descriptions["sorts"].tolist() == [0, 0, 1]
+    assert df_descriptions["windows"].tolist() == [0, 0, 0]
+    assert df_descriptions.loc[2, "physical_depth"] > \
+        df_descriptions.loc[1, "physical_depth"]
+
+
+def test_pipeline_describer_planning_metrics(spark, pipe):
+    """Test planning metrics of pipeline describer and profiler.
+
+    """
+
+    df_input = spark.range(10).toDF("value")
+
+    df_descriptions = pipe.describe(df_input)
+    df_profiles = pipe.profile(df_input)
+
+    for df in (df_descriptions, df_profiles):
+        assert df["logical_nodes"].tolist() == [2, 3, 4]
+        assert (df["analysis_time"] >= 0).all()
+        assert (df["optimization_time"] >= 0).all()
+        assert (df["planning_time"] >= 0).all()
+        assert (df["physical_nodes"] > 0).all()
+
+
+def test_pipeline_describer_volume_changes(spark):
+    """Test size estimates and volume change flags of pipeline describer.
+
+    """
+
+    df_input = spark.range(0, 100, 1, 4).toDF("value")
+
+    def explode(df):
+        return df.crossJoin(df.select(F.col("value").alias("other")))
+
+    def shrink(df):
+        return df.select("value")
+
+    def add(df):
+        return df.withColumn("add", F.col("value"))
+
+    pipe = pipeline.Pipeline(stages=[explode, shrink, add])
+    df_descriptions = pipe.describe(df_input)
+
+    assert df_descriptions.loc[0, "estimated_size"] == 800
+    assert df_descriptions["volume_change"].tolist() == ["", "explosion",
+                                                         "shrinkage", ""]
+    assert df_descriptions.loc[2, "size_ratio"] == 0.5
+
+
+def test_branching_pipeline(spark):
+    """Test branching pipeline with shared stage and concurrent execution.
+
+    """
+
+    df_input = spark.range(0, 10, 1, 4).toDF("value")
+
+    def shared(df):
+        return df.withColumn("shared", F.col("value") * 2)
+
+    def branch_a(df):
+        return df.filter(F.col("shared") > 10)
+
+    def branch_b(df):
+        return df.crossJoin(df.select(F.col("value").alias("other")))
+
+    def branch_c(df):
+        return df.withColumn("c", F.lit(1))
+
+    # test parent needs to precede child
+    with pytest.raises(ValueError):
+        pipeline.BranchingPipeline([(shared, 1), (branch_a, None)])
+
+    # test parents given as original stage objects
+    pipe = pipeline.BranchingPipeline([(shared, None),
+                                       (branch_a, shared),
+                                       (branch_b, shared),
+                                       (branch_c, branch_b)],
+                                      cache_shared=False)
+    assert pipe.parents == [None, 0, 0, 2]
+
+    pipe = pipeline.BranchingPipeline([(shared, None),
+                                       (branch_a, "shared"),
+                                       (branch_b, 0),
+                                       (branch_c, "branch_b")])
+
+    assert pipe.parents == [None, 0, 0, 2]
+    assert pipe.children == {0: [1, 2], 1: [], 2: [3], 3: []}
+    assert pipe.leaves == [1, 3]
+    assert pipe.shared == [0]
+    assert pipe.cache.enabled == [pipe["shared"]]
+
+    with pytest.raises(ValueError):
+        pipe[0:2]
+
+    with pytest.raises(ValueError):
+        pipe.execute()
+
+    results = pipe.execute(df_input)
+
+    assert results == {pipe[1].uid: 4, pipe[3].uid: 100}
+    assert pipe.execute(stages=[]) == {}
+    assert pipe("shared").is_cached is True
+    assert pipe("branch_a").columns == ["value", "shared"]
+    assert pipe("branch_c").columns == ["value", "shared", "other", "c"]
+
+    # test explicit stages and materialization
+    results = pipe.execute(stages=["branch_b"], materialization="noop")
+    assert results == {pipe[2].uid: None}
+
+    # test size ratios refer to parent stages
+    df_descriptions = pipe.describe()
+    sizes = df_descriptions["estimated_size"]
+    assert df_descriptions.loc[3, "size_ratio"] == sizes[3] / sizes[1]
+    assert df_descriptions.loc[3, "volume_change"] == "explosion"
+
+    pipe.cache.clear()
+
+
+def test_branching_pipeline_pools(spark, monkeypatch):
+    """Test that scheduler pools are assigned only in pinned thread mode.
+
+    """
+
+    def branch(df):
+        return df
+
+    df_input = spark.range(10).toDF("value")
+    pipe = pipeline.BranchingPipeline([(branch, None), (branch, None)])
+    pipe.transform(df_input)
+
+    with pytest.warns(RuntimeWarning, match="pinned thread mode"):
+        pipe.execute()
+
+    monkeypatch.setattr(pipeline.util, "is_pinned_thread_mode",
+                        lambda sc: True)
+    pipe.execute(stages=[0])
+
+    # previous pool is restored
+    pool = spark.sparkContext.getLocalProperty("spark.scheduler.pool")
+    assert pool is None
+
+
+def test_pipeline_shuffle_planner(spark):
+    """Test that dependent window stages with shared partition columns only
+    require a single exchange if shuffle planning is enabled.
+
+    """
+
+    from pyspark.sql import Window
+    from pywrangler.pyspark.base import Partitioning
+
+    df_input = spark.range(0, 100, 1, 4).toDF("o") \
+        .withColumn("g", F.col("o") % 3) \
+        .withColumn("x", F.col("o") % 2)
+
+    class CumSumGroupX(PySparkSingleNoFit):
+        def __init__(self, orderby_columns="o"):
+            self.orderby_columns = orderby_columns
+
+        @property
+        def partitioning(self):
+            return Partitioning(["g", "x"], [self.orderby_columns], [True])
+
+        def transform(self, df):
+            window = Window.partitionBy("g", "x") \
+                .orderBy(self.orderby_columns)
+            return df.withColumn("a", F.sum("o").over(window))
+
+    class CumSumGroup(PySparkSingleNoFit):
+        @property
+        def partitioning(self):
+            return Partitioning(["g"], ["o"], [True])
+
+        def transform(self, df):
+            window = Window.partitionBy("g").orderBy("o")
+            return df.withColumn("b", F.sum("a").over(window))
+
+    stages = [concretize_abstract_wrangler(CumSumGroupX)(),
+              concretize_abstract_wrangler(CumSumGroup)()]
+
+    pipe = pipeline.Pipeline(stages)
+    pipe_planned = pipeline.Pipeline(stages, plan_shuffles=True)
+
+    # test planned partitioning
+    idx, partitioning = pipe_planned.shuffle_planner.plan()
+    assert idx == 0
+    assert partitioning == Partitioning(["g"], ["o"], [True])
+
+    with pytest.raises(ValueError):
+        pipe_planned.shuffle_planner.verify()
+
+    df_result = pipe.transform(df_input)
+    df_planned = pipe_planned.transform(df_input)
+
+    # test reduced number of exchanges
+    assert pipe.describe()["exchanges"].tolist() == [0, 1, 2]
+    assert pipe_planned.describe()["exchanges"].tolist() == [0, 1, 1]
+    assert pipe.shuffle_planner.verify() == [1]
+    assert pipe_planned.shuffle_planner.verify() == []
+
+    # test identical results
+    columns = ["o", "g", "x", "a", "b"]
+    pdf_result = df_result.toPandas().sort_values("o").reset_index(drop=True)
+    pdf_planned = df_planned.toPandas().sort_values("o")\
+        .reset_index(drop=True)
+    assert pdf_result[columns].equals(pdf_planned[columns])
+
+
 def test_full_pipeline(spark):
     """Create two stages from PySparkWrangler and native function and check
     against correct end result of pipeline.
@@ -0,0 +1,158 @@
+"""This module contains tests for the pyspark execution plan utility.
+
+isort:skip_file
+"""
+
+import pytest
+
+pytestmark = pytest.mark.pyspark  # noqa: E402
+pyspark = pytest.importorskip("pyspark")  # noqa: E402
+
+from pyspark.sql import Window
+from pyspark.sql import functions as F
+
+from pywrangler.pyspark.plan import (
+    analyze_plan,
+    collapse_projections,
+    count_codegen_stages,
+    count_plan_nodes,
+    estimate_statistics,
+    get_plan_depth,
+    measure_planning
+)
+
+
+def test_get_plan_depth():
+    nodes = [("Root", 2),
+             ("Wrapper", 1),
+             ("Child", 1),
+             ("Leaf", 0),
+             ("Leaf", 0)]
+
+    assert get_plan_depth(nodes) == 4
+    assert get_plan_depth(nodes, ignore=["Wrapper"]) == 3
+    assert get_plan_depth([("Leaf", 0)]) == 1
+    assert get_plan_depth([]) == 0
+
+
+def test_count_plan_nodes():
+    nodes = [("SortExec", 1), ("WindowExec", 1), ("SortExec", 0)]
+
+    assert count_plan_nodes(nodes, ["SortExec"]) == 2
+    assert count_plan_nodes(nodes, ["SortExec", "WindowExec"]) == 3
+    assert count_plan_nodes(nodes, ["Missing"]) == 0
+
+
+def test_analyze_plan_window(spark):
+    df = spark.range(0, 10, 1, 4).toDF("value")
+    window = Window.partitionBy(F.col("value") % 2).orderBy("value")
+    df_window = df.withColumn("sum", F.sum("value").over(window))
+
+    analysis = analyze_plan(df_window)
+
+    assert analysis.exchanges == 1
+    assert analysis.sorts == 1
+    assert analysis.windows == 1
+    assert analysis.cached_scans == 0
+    assert analysis.physical_depth > analysis.exchanges
+    assert analysis.logical_depth >= 2
+
+    assert analyze_plan(df).exchanges == 0
+
+
+def test_analyze_plan_cache_broadcast(spark):
+    df = spark.range(0, 10, 1, 4).toDF("value").repartition(2).cache()
+    df_joined = df.join(F.broadcast(spark.range(5).toDF("value")), "value")
+
+    analysis = analyze_plan(df_joined)
+
+    assert analysis.cached_scans == 1
+    assert analysis.broadcast_exchanges == 1
+    assert analysis.exchanges == 0
+
+    df.unpersist()
+
+
+def test_analyze_plan_reused_exchange(spark):
+    df = spark.range(0, 10, 1, 4).toDF("value").repartition(3)
+    df_union = df.union(df)
+
+    analysis = analyze_plan(df_union)
+
+    assert analysis.exchanges == 1
+    assert analysis.reused_exchanges == 1
+
+
+def test_count_codegen_stages(spark):
+    df = spark.range(0, 10, 1, 4).toDF("value")
+    df_grouped = df.groupBy((df["value"] % 2).alias("key")).count()
+
+    def count(df_count):
+        plan = df_count._jdf.queryExecution().executedPlan()
+        return count_codegen_stages(plan)
+
+    assert count(df) == 1
+    assert count(df_grouped) == 2
+
+    # stages of cached plans are included
+    df_cached = df_grouped.cache()
+    df_cached.count()
+    assert count(df_cached.groupBy("count").count()) == 4
+
+    df_cached.unpersist()
+
+
+def test_estimate_statistics(spark):
+    df = spark.range(0, 1000, 1, 4).toDF("value")
+
+    statistics = estimate_statistics(df)
+    assert statistics.estimated_size == 8000
+    assert statistics.estimated_rows is None
+
+    df_cross = df.crossJoin(df)
+    assert estimate_statistics(df_cross).estimated_size == 8000 ** 2
+
+
+def test_measure_planning(spark):
+    df = spark.range(0, 10, 1, 4).toDF("value")
+    df_chain = df
+    for idx in range(20):
+        df_chain = df_chain.withColumn(str(idx), F.col("value") + idx)
+
+    metrics = measure_planning(df)
+    metrics_chain = measure_planning(df_chain)
+
+    assert metrics.analysis_time >= 0
+    assert metrics.optimization_time >= 0
+    assert metrics.planning_time >= 0
+
+    # range and project
+    assert metrics.logical_nodes == 2
+    assert metrics_chain.logical_nodes == 22
+
+    # projections are collapsed in physical plan
+    assert metrics_chain.physical_nodes == metrics.physical_nodes
+
+
+def test_collapse_projections(spark):
+    base = spark.range(10).toDF("value").select("value")
+    df = base.withColumn("add1", F.col("value") + 1) \
+        .withColumn("add2", F.col("add1") + 1) \
+        .drop("add1")
+
+    collapsed = collapse_projections(df, base)
+    plan = collapsed._jdf.queryExecution().analyzed()
+
+    assert plan.nodeName() == "Project"
+    assert plan.child().equals(base._jdf.queryExecution().analyzed())
+    assert collapsed.columns == df.columns
+    assert collapsed.collect() == df.collect()
+
+    # test non projection only and identity
+    assert collapse_projections(df.distinct(), base) is None
+    assert collapse_projections(base, base) is None
+
+    # test non deterministic expressions are not collapsed
+    df_rand = base.withColumn("rand", F.rand()) \
+        .withColumn("rand2", F.col("rand") + 1)
+    assert collapse_projections(df_rand, base) is None
@@ -62,6 +62,34 @@ def test_prepare_orderby(spark):
         util.prepare_orderby(columns, [True, False, True])
 
 
+def test_sample_groups(spark):
+    df = spark.range(0, 1000, 1, 4).withColumn("group", F.col("id") % 50)
+
+    df_sample = util.sample_groups(df, 0.5, "group")
+    pdf_sample = df_sample.toPandas()
+
+    # test whole groups are sampled
+    sizes = pdf_sample.groupby("group").size()
+    assert (sizes == 20).all()
+    assert 0 < len(sizes) < 50
+
+    # test determinism independent of partitioning and subset property
+    df_repartitioned = df.repartition(7)
+    pdf_repartitioned = util.sample_groups(df_repartitioned, 0.5, "group")\
+        .toPandas()
+    assert set(pdf_repartitioned["id"]) == set(pdf_sample["id"])
+
+    pdf_smaller = util.sample_groups(df, 0.25, "group").toPandas()
+    assert set(pdf_smaller["id"]).issubset(pdf_sample["id"])
+
+    # test row sampling without groups and full fraction
+    assert 0 < util.sample_groups(df, 0.5).count() < 1000
+    assert util.sample_groups(df, 1).count() == 1000
+
+    with pytest.raises(ValueError):
+        util.sample_groups(df, 0)
+
+
 def test_column_cacher(spark):
 
     data = {"col1": [1, 2], "col2": [3, 4]}
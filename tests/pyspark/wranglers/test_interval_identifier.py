@@ -221,3 +221,28 @@ def test_no_order_groupby(testcase, wrangler):
 
     # pass wrangler to test case
     testcase_instance.test(wrangler_instance.transform)
+
+
+@pytest.mark.parametrize(**WRANGLER_KWARGS)
+def test_partitioning(wrangler):
+    """Tests declared partition requirements of window functions.
+
+    Parameters
+    ----------
+    wrangler: pywrangler.wrangler_instance.interfaces.IntervalIdentifier
+        Refers to the actual wrangler_instance begin tested. See `WRANGLER`.
+
+    """
+
+    wrangler_instance = wrangler(marker_column="marker",
+                                 marker_start=1,
+                                 marker_end=2,
+                                 orderby_columns=["order"],
+                                 groupby_columns=["group"],
+                                 ascending=[False])
+
+    partitioning = wrangler_instance.partitioning
+
+    assert partitioning.partition_columns == ["group"]
+    assert partitioning.orderby_columns == ["order"]
+    assert partitioning.ascending == [False]
@@ -80,3 +80,67 @@ def test_base_wrangler_set_params(dummy_wrangler):
 def test_base_wrangler_set_params_exception(dummy_wrangler):
     with pytest.raises(ValueError):
         dummy_wrangler.set_params(not_exist=0)
+
+
+@pytest.fixture
+def phased_wrangler():
+    """Create wrangler with two phases where the first phase occurs twice.
+
+    """
+
+    class PhasedWrangler(base.BaseWrangler):
+        @property
+        def preserves_sample_size(self):
+            return True
+
+        @property
+        def computation_engine(self):
+            return "DummyEngine"
+
+        def transform(self, values):
+            with self._phase("first"):
+                values = list(values)
+
+            with self._phase("second"):
+                doubled = [value * 2 for value in values]
+
+            with self._phase("first"):
+                return doubled
+
+    return concretize_abstract_wrangler(PhasedWrangler)()
+
+
+def test_base_wrangler_phase_timings_disabled(phased_wrangler):
+    assert phased_wrangler.transform(range(3)) == [0, 2, 4]
+    assert phased_wrangler.phase_timings is None
+
+
+def test_base_wrangler_phase_timings(phased_wrangler):
+    with base.record_phases():
+        phased_wrangler.transform(range(3))
+
+    timings = phased_wrangler.phase_timings
+    assert [timing.phase for timing in timings] == ["first", "second"]
+    assert timings["first"].calls == 2
+    assert timings["second"].calls == 1
+    assert timings["first"].allocated_bytes is None
+    assert timings.wall_time >= timings["first"].wall_time >= 0
+    assert timings.cpu_time >= 0
+
+    df = timings.to_frame()
+    assert df.columns.tolist() == list(base.PhaseTiming._fields)
+    assert df["phase"].tolist() == ["first", "second"]
+
+    # timings of most recent call only
+    with base.record_phases():
+        phased_wrangler.transform(range(3))
+
+    assert phased_wrangler.phase_timings["first"].calls == 2
+
+
+def test_base_wrangler_phase_timings_memory(phased_wrangler):
+    with base.record_phases(track_memory=True):
+        phased_wrangler.transform(range(10000))
+
+    timings = phased_wrangler.phase_timings
+    assert timings["second"].allocated_bytes > 0
@@ -2,16 +2,27 @@
 
 """
 
+import gc
+import math
+import os
 import sys
 import time
+import tracemalloc
 
 import pytest
 
 from pywrangler.benchmark import (
+    AllocationProfiler,
     BaseProfiler,
+    CallProfiler,
     MemoryProfiler,
+    ScalingModel,
+    ScalingProfiler,
     TimeProfiler,
-    allocate_memory
+    allocate_memory,
+    estimate_exponent,
+    fit_scaling_model,
+    trace_peak_memory
 )
 from pywrangler.exceptions import NotProfiledError
 
@@ -184,6 +195,33 @@ def test_memory_profiler_increase():
     assert MemoryProfiler(increase).profile().median > 29 * MIB
 
 
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_memory_profiler_fork():
+    def increase():
+        memory_holder = allocate_memory(30)
+        return memory_holder
+
+    memory_profiler = MemoryProfiler(increase, 3, mode="fork").profile()
+
+    assert memory_profiler.runs == 3
+    assert 29 * MIB < memory_profiler.median < 35 * MIB
+    assert memory_profiler.outputs == [None, None, None]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_memory_profiler_fork_error():
+    def fail():
+        raise ZeroDivisionError
+
+    with pytest.raises(RuntimeError, match="ZeroDivisionError"):
+        MemoryProfiler(fail, 1, mode="fork").profile()
+
+
+def test_memory_profiler_invalid_mode(func_no_effect):
+    with pytest.raises(ValueError):
+        MemoryProfiler(func_no_effect, mode="invalid")
+
+
 def test_time_profiler_return_self(func_no_effect):
     time_profiler = TimeProfiler(func_no_effect, 1)
     assert time_profiler.profile() is time_profiler
@@ -218,3 +256,317 @@ def test_time_profiler_best():
     time_profiler = TimeProfiler(dummy, repetitions=1).profile()
 
     assert time_profiler.best >= sleep
+
+
+def test_time_profiler_pretty_formatter():
+    assert TimeProfiler._pretty_formatter(0.5) == "500.0 ms"
+
+
+def test_time_profiler_warmup():
+    calls = []
+
+    time_profiler = TimeProfiler(lambda: calls.append(1), repetitions=3,
+                                 warmup=2).profile()
+
+    assert len(calls) == 5
+    assert time_profiler.runs == 3
+
+
+def test_time_profiler_cpu_time():
+    sleep = 0.01
+
+    time_profiler = TimeProfiler(lambda: time.sleep(sleep), 3).profile()
+
+    assert len(time_profiler.cpu_measurements) == 3
+    assert time_profiler.cpu_median < time_profiler.median
+    assert time_profiler.median >= sleep
+
+
+@pytest.mark.parametrize("disable_gc", [True, False])
+def test_time_profiler_disable_gc(disable_gc):
+    states = []
+
+    TimeProfiler(lambda: states.append(gc.isenabled()), 2,
+                 disable_gc=disable_gc).profile()
+
+    assert states == [not disable_gc] * 2
+    assert gc.isenabled()
+
+
+def test_base_profiler_statistics(func_no_effect):
+    time_profiler = TimeProfiler(func_no_effect)
+    time_profiler._measurements = list(range(1, 101)) + [1000]
+
+    assert time_profiler.p5 == 6
+    assert time_profiler.p95 == 96
+    assert time_profiler.percentile(50) == time_profiler.median
+    assert time_profiler.outliers == [1000]
+
+    interval = time_profiler.confidence_interval()
+    assert interval.lower <= time_profiler.median <= interval.upper
+
+
+def test_base_profiler_compare(func_no_effect, capsys):
+    fast = TimeProfiler(func_no_effect)
+    fast._measurements = [1.0, 1.1, 0.9, 1.0, 1.05]
+
+    slow = TimeProfiler(func_no_effect)
+    slow._measurements = [2.0, 2.1, 1.9, 2.2, 2.05]
+
+    comparison = slow.compare(fast)
+    assert comparison.difference == pytest.approx(1.05)
+    assert comparison.ratio == pytest.approx(2.05)
+    assert comparison.significant
+
+    assert not fast.compare(fast).significant
+
+    slow.report_comparison(fast)
+    assert "2.05x" in capsys.readouterr().out
+
+    # single outliers shift the mean but not the median
+    outlier = TimeProfiler(func_no_effect)
+    outlier._measurements = [1.0, 1.1, 0.9, 1.0, 50.0]
+    assert not outlier.compare(fast).significant
+
+
+def test_base_profiler_compare_zero(func_no_effect):
+    zero = TimeProfiler(func_no_effect)
+    zero._measurements = [0, 0, 0]
+
+    positive = TimeProfiler(func_no_effect)
+    positive._measurements = [10, 10, 12]
+
+    assert positive.compare(zero).ratio == math.inf
+    assert math.isnan(zero.compare(zero).ratio)
+    assert zero.compare(positive).ratio == 0
+
+
+def test_time_profiler_report(func_no_effect, capsys):
+    TimeProfiler(func_no_effect, 5).profile_report()
+
+    output = capsys.readouterr().out
+    assert "p95" in output
+    assert "CPU time" in output
+    assert "95% CI" in output
+
+
+def test_trace_peak_memory():
+    peak = trace_peak_memory(allocate_memory, 5)
+
+    assert 5 * MIB <= peak < 6 * MIB
+
+
+def test_trace_peak_memory_tracing():
+    """Test that peak memory is approximated while tracemalloc is already
+    tracing even if its peak cannot be reset.
+
+    """
+
+    tracemalloc.start()
+    try:
+        allocate_memory(10)
+        peak = trace_peak_memory(allocate_memory, 5)
+    finally:
+        tracemalloc.stop()
+
+    assert 5 * MIB <= peak < 6 * MIB
+
+
+def test_allocation_profiler(capsys):
+    """Test that repeatedly allocated and freed memory increases the total
+    allocated bytes but not the peak.
+
+    """
+
+    def func():
+        for _ in range(3):
+            allocate_memory(2)
+
+    profiler = AllocationProfiler(func, repetitions=2, top=3).profile()
+    profiler.report()
+
+    assert profiler.runs == 2
+    assert 2 * MIB <= profiler.median < 3 * MIB
+    assert 6 * MIB <= profiler.total < 7 * MIB
+    assert len(profiler.sites) <= 3
+    assert profiler.sites[0].size > MIB
+    assert "Total allocated" in capsys.readouterr().out
+
+
+def test_allocation_profiler_tracing():
+    tracemalloc.start()
+    try:
+        with pytest.raises(RuntimeError):
+            AllocationProfiler(allocate_memory).profile(1)
+    finally:
+        tracemalloc.stop()
+
+
+def _inner(seconds):
+    time.sleep(seconds)
+
+
+def _outer(seconds):
+    _inner(seconds)
+    time.sleep(seconds)
+
+
+def test_call_profiler(capsys, tmpdir):
+    """Test that own time excludes callees, cumulative time includes callees
+    and builtin calls are traced.
+
+    """
+
+    profiler = CallProfiler(_outer, repetitions=2, top=3).profile(0.02)
+    profiler.report()
+
+    functions = {x.function: x for x in profiler.functions}
+    outer = functions["tests.test_benchmark:_outer"]
+    inner = functions["tests.test_benchmark:_inner"]
+    sleep = functions["time:sleep"]
+
+    assert profiler.runs == 2
+    assert outer.calls == inner.calls == 1
+    assert sleep.calls == 2
+    assert outer.cumulative_time == pytest.approx(0.04, rel=0.5)
+    assert inner.cumulative_time == pytest.approx(0.02, rel=0.5)
+    assert outer.own_time < 0.005
+    assert profiler.get_top(1, sort="own")[0].function == "time:sleep"
+    assert profiler.get_top()[0] == outer
+
+    collapsed = profiler.to_collapsed(str(tmpdir.join("stacks.txt")))
+    stack = "tests.test_benchmark:_outer;tests.test_benchmark:_inner;" \
+            "time:sleep"
+    assert stack in collapsed
+    assert all(line.rsplit(" ", 1)[1].isdigit()
+               for line in collapsed.splitlines())
+    assert tmpdir.join("stacks.txt").read() == collapsed
+
+    output = capsys.readouterr().out
+    assert "Top functions by cumulative time" in output
+    assert "Top functions by own time" in output
+
+
+def test_call_profiler_sampling():
+    profiler = CallProfiler(_outer, mode="sampling", interval=0.001)
+    profiler.profile(0.05)
+
+    functions = {x.function: x for x in profiler.functions}
+    outer = functions["tests.test_benchmark:_outer"]
+    inner = functions["tests.test_benchmark:_inner"]
+
+    assert outer.cumulative_time == pytest.approx(0.1, rel=0.5)
+    assert inner.cumulative_time == pytest.approx(0.05, rel=0.5)
+    assert "time:sleep" not in functions
+
+
+def test_call_profiler_invalid():
+    with pytest.raises(ValueError):
+        CallProfiler(_outer, mode="statistical")
+
+    profiler = CallProfiler(_outer).profile(0)
+    with pytest.raises(ValueError):
+        profiler.get_top(sort="calls")
+
+    with pytest.raises(NotProfiledError):
+        CallProfiler(_outer).stacks
+
+
+@pytest.mark.parametrize("name, func", [("linear", lambda n: 3 * n + 10),
+                                        ("nlogn", lambda n: n * math.log2(n)),
+                                        ("quadratic", lambda n: n ** 2 + 5)])
+def test_fit_scaling_model(name, func):
+    rows = [100, 200, 400, 800, 1600]
+    values = [func(n) for n in rows]
+
+    models = {model: fit_scaling_model(model, rows, values)
+              for model in ("linear", "nlogn", "quadratic")}
+
+    assert models[name].r_squared == pytest.approx(1)
+    assert max(models.values(), key=lambda x: x.r_squared).name == name
+
+    with pytest.raises(ValueError):
+        fit_scaling_model("cubic", rows, values)
+
+
+def test_estimate_exponent():
+    rows = [100, 200, 400, 800, 1600]
+
+    assert estimate_exponent(rows, [n ** 2 for n in rows]) == pytest.approx(2)
+    assert estimate_exponent(rows, [n + 1000 for n in rows]) < 1
+
+
+def test_scaling_profiler_sizes():
+    profiler = ScalingProfiler(len, start=10, factor=3, steps=4)
+    assert profiler._get_sizes() == [10, 30, 90, 270]
+
+    with pytest.raises(ValueError):
+        ScalingProfiler(len, sizes=[10, 10, 20])
+
+
+def test_scaling_profiler_linear():
+    """Test fitted models, exponents and predictions on synthetic linear
+    measurements.
+
+    """
+
+    sizes = [1000, 2000, 4000, 8000, 16000]
+    times = [0.01 + 1e-6 * n for n in sizes]
+    memory = [8 * n for n in sizes]
+
+    profiler = ScalingProfiler(len, sizes=sizes)
+    profiler._fit(sizes, times, memory)
+
+    assert profiler.runs == 5
+    assert profiler.time_model.name == "linear"
+    assert profiler.memory_model.name == "linear"
+    assert profiler.memory_exponent == pytest.approx(1, abs=0.01)
+    assert not profiler.is_superlinear
+
+    prediction = profiler.predict(32000)
+    assert prediction.rows == 32000
+    assert prediction.time == pytest.approx(0.01 + 1e-6 * 32000)
+    assert prediction.memory == pytest.approx(8 * 32000)
+
+
+def test_scaling_profiler_quadratic(capsys):
+    sizes = [1000, 2000, 4000, 8000]
+    times = [1e-8 * n ** 2 for n in sizes]
+
+    profiler = ScalingProfiler(len, sizes=sizes, track_memory=False)
+    profiler._fit(sizes, times, None)
+    profiler.report()
+
+    assert profiler.is_superlinear
+    assert profiler.time_model.name == "quadratic"
+    assert profiler.time_exponent == pytest.approx(2)
+    assert profiler.predict(10 ** 5).memory is None
+    assert "Superlinear: True" in capsys.readouterr().out
+
+
+def test_scaling_profiler_profile():
+    """Smoke test of profiling actual function calls.
+
+    """
+
+    def func(values):
+        return [value + 1 for value in values]
+
+    profiler = ScalingProfiler(func, start=1000, steps=3, repetitions=1)
+    profiler.profile(lambda n: list(range(n)))
+
+    assert profiler.sizes is None
+    assert profiler._get_profiled_sizes() == [1000, 2000, 4000]
+    assert len(profiler.measurements) == 3
+    assert all([value > 0 for value in profiler.memory])
+    assert profiler.predict(8000).memory > profiler.memory[-1]
+
+
+def test_scaling_profiler_ignores_decreasing_models():
+    increasing = ScalingModel("linear", 0.1, 1e-6, 0.8)
+    decreasing = ScalingModel("quadratic", 0.2, -1e-12, 0.9)
+    models = {model.name: model for model in (increasing, decreasing)}
+
+    assert ScalingProfiler._get_best_model(models) == increasing
+    assert ScalingProfiler._get_best_model({"quadratic": decreasing}) == \
+        decreasing
@@ -0,0 +1,186 @@
+"""This module contains tests for the benchmark result history.
+
+"""
+
+import json
+import multiprocessing
+import subprocess
+
+import pandas as pd
+import pytest
+
+import pywrangler
+from pywrangler import benchmark_history
+from pywrangler.benchmark import BaseProfiler, MemoryProfiler
+
+
+class StaticProfiler(BaseProfiler):
+    def __init__(self, measurements, less_is_better=True):
+        self._measurements = measurements
+        self._less_is_better = less_is_better
+
+    @property
+    def less_is_better(self):
+        return self._less_is_better
+
+
+@pytest.fixture()
+def history(tmpdir):
+    history = benchmark_history.ResultHistory(str(tmpdir.join("h.jsonl")))
+
+    baseline = {"slower": StaticProfiler([1.0, 1.1, 0.9, 1.0]),
+                "faster": StaticProfiler([1.0, 1.1, 0.9, 1.0]),
+                "same": StaticProfiler([1.0, 1.1, 0.9, 1.0]),
+                "throughput": StaticProfiler([5, 6, 5, 6], False),
+                "removed": StaticProfiler([1.0, 1.1, 0.9, 1.0])}
+
+    candidate = {"slower": StaticProfiler([2.0, 2.1, 1.9, 2.0]),
+                 "faster": StaticProfiler([0.5, 0.6, 0.4, 0.5]),
+                 "same": StaticProfiler([1.1, 1.0, 0.9, 1.0]),
+                 "throughput": StaticProfiler([2, 3, 2, 3], False),
+                 "added": StaticProfiler([1.0, 1.1, 0.9, 1.0])}
+
+    history.record(baseline, dataset={"rows": 10}, run="baseline")
+    history.record(candidate, dataset={"rows": 10}, run="candidate")
+
+    return history
+
+
+def test_get_environment():
+    environment = benchmark_history.get_environment()
+
+    assert environment["pandas"] == pd.__version__
+    assert environment["cpu_count"] == multiprocessing.cpu_count()
+    assert environment["pywrangler"] == pywrangler.__version__
+    assert "python" in environment
+
+
+def test_get_git_revision(tmpdir, monkeypatch):
+    """Test that a package which is not tracked by an enclosing repository,
+    e.g. within a virtual environment, has no revision.
+
+    """
+
+    def git(*args):
+        command = ["git", "-c", "user.name=test", "-c", "user.email=test"]
+        subprocess.run(command + list(args), cwd=str(tmpdir), check=True,
+                       stdout=subprocess.DEVNULL)
+
+    git("init")
+    git("commit", "--allow-empty", "-m", "initial")
+
+    package = tmpdir.mkdir("venv").mkdir("pywrangler")
+    package.join("__init__.py").write("")
+    monkeypatch.setattr(benchmark_history, "PACKAGE_DIR", str(package))
+
+    assert benchmark_history.get_git_revision() is None
+
+    git("add", "venv")
+    git("commit", "-m", "track package")
+
+    revision = benchmark_history.get_git_revision()
+    assert len(revision) == 40
+
+
+def test_get_unit():
+    assert benchmark_history.get_unit(MemoryProfiler(print)) == "bytes"
+    assert benchmark_history.get_unit(StaticProfiler([1])) == "seconds"
+
+
+def test_history_record(history):
+    runs = history.runs()
+
+    assert [run.run for run in runs] == ["baseline", "candidate"]
+    assert runs[0].dataset == {"rows": 10}
+    assert runs[0].results["slower"]["measurements"] == [1.0, 1.1, 0.9, 1.0]
+    assert runs[0].results["throughput"]["less_is_better"] is False
+    assert runs[0].environment["pandas"] == pd.__version__
+
+    with open(history.path) as file:
+        assert len([json.loads(line) for line in file]) == 2
+
+
+def test_history_get_run(history):
+    version = history.runs()[0].environment["pywrangler"]
+
+    assert history.get_run("latest").run == "candidate"
+    assert history.get_run("baseline").run == "baseline"
+    assert history.get_run(version).run == "candidate"
+
+    with pytest.raises(ValueError):
+        history.get_run("not_exists")
+
+
+def test_history_empty(tmpdir):
+    history = benchmark_history.ResultHistory(str(tmpdir.join("h.jsonl")))
+
+    assert history.runs() == []
+
+    with pytest.raises(ValueError):
+        history.get_run("latest")
+
+
+def test_history_compare(history):
+    comparisons = history.compare("baseline", "candidate")
+    status = {comparison.name: comparison.status
+              for comparison in comparisons}
+
+    assert status == {"slower": "regression",
+                      "faster": "improvement",
+                      "same": "unchanged",
+                      "throughput": "regression"}
+
+    slower = [x for x in comparisons if x.name == "slower"][0]
+    assert slower.ratio == pytest.approx(2)
+    assert slower.p_value < 0.05
+
+
+def test_history_compare_threshold(history):
+    comparisons = history.compare("baseline", "candidate", threshold=1.5)
+
+    assert all([x.status == "unchanged" for x in comparisons])
+
+
+def test_history_compare_zero_baseline(tmpdir):
+    history = benchmark_history.ResultHistory(str(tmpdir.join("h.jsonl")))
+
+    history.record({"memory": StaticProfiler([0, 0, 0, 0, 0]),
+                    "zero": StaticProfiler([0, 0, 0, 0])}, run="baseline")
+    history.record({"memory": StaticProfiler([10, 10, 12, 11, 10]),
+                    "zero": StaticProfiler([0, 0, 0, 0])}, run="candidate")
+
+    comparisons = {comparison.name: comparison
+                   for comparison in history.compare("baseline")}
+
+    assert comparisons["memory"].ratio == float("inf")
+    assert comparisons["memory"].status == "regression"
+    assert comparisons["zero"].status == "unchanged"
+
+
+def test_history_compare_insufficient_samples(tmpdir):
+    history = benchmark_history.ResultHistory(str(tmpdir.join("h.jsonl")))
+
+    history.record({"slower": StaticProfiler([1, 2, 3])}, run="baseline")
+    history.record({"slower": StaticProfiler([10, 11, 12])}, run="candidate")
+
+    comparison = history.compare("baseline")[0]
+    assert comparison.ratio == pytest.approx(5.5)
+    assert comparison.status == "insufficient samples"
+
+    assert history.compare("baseline", alpha=0.2)[0].status == "regression"
+    assert "insufficient samples" in history.summary_comparison("baseline")
+
+
+def test_main(history, capsys):
+    benchmark_history.main([history.path])
+    output = capsys.readouterr().out
+    assert "baseline" in output and "candidate" in output
+
+    benchmark_history.main([history.path, "baseline"])
+    output = capsys.readouterr().out
+    assert "regression" in output
+    assert "1 of 4 benchmarks unchanged" in output
+
+    with pytest.raises(SystemExit):
+        benchmark_history.main([history.path, "baseline", "candidate",
+                                "--fail-on-regression"])
@@ -0,0 +1,118 @@
+"""This module contains tests for the subprocess benchmark runner.
+
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from pywrangler import benchmark_runner
+from pywrangler.benchmark_history import ResultHistory
+from pywrangler.exceptions import NotProfiledError
+from pywrangler.pandas.generator import PandasMarkerGenerator
+
+pytestmark = pytest.mark.pandas
+
+WRANGLER = "pywrangler.pandas.wranglers.interval_identifier.VectorizedCumSum"
+DATASET = {"rows": 1000, "groups": 5}
+
+
+@pytest.fixture()
+def runner(tmpdir):
+    return benchmark_runner.SubprocessRunner(cache_dir=str(tmpdir))
+
+
+def test_get_case():
+    case = benchmark_runner.get_case("name", WRANGLER, DATASET)
+
+    assert case.profiler == "time"
+    assert case.kwargs == {}
+
+    with pytest.raises(ValueError):
+        benchmark_runner.get_case("name", WRANGLER, DATASET, profiler="cpu")
+
+
+def test_get_dataset_path(tmpdir):
+    path = benchmark_runner.get_dataset_path(DATASET, str(tmpdir))
+    modified = os.path.getmtime(path)
+
+    assert benchmark_runner.get_dataset_path(DATASET, str(tmpdir)) == path
+    assert os.path.getmtime(path) == modified
+
+    df = pd.read_pickle(path)
+    pd.testing.assert_frame_equal(df, PandasMarkerGenerator(**DATASET)
+                                  .generate())
+
+
+def test_runner_not_run(runner):
+    with pytest.raises(NotProfiledError):
+        runner.results
+
+
+def test_runner_run(runner):
+    cases = [benchmark_runner.get_case("time", WRANGLER, DATASET,
+                                       repetitions=3),
+             benchmark_runner.get_case("allocation", WRANGLER, DATASET,
+                                       profiler="allocation",
+                                       repetitions=1)]
+
+    results = runner.run(cases).results
+    time, allocation = results
+
+    assert len(time.measurements) == 3
+    assert time.unit == "seconds"
+    assert allocation.unit == "bytes"
+    assert allocation.median > 0
+    assert time.environment["pid"] != os.getpid()
+    assert set(time.environment["threads"].values()) == {"1"}
+
+    df = runner.to_frame()
+    assert df["name"].tolist() == ["time", "allocation"]
+
+
+def test_runner_dataset_path(runner, tmpdir):
+    path = str(tmpdir.join("data.pkl"))
+    generator = PandasMarkerGenerator(**DATASET)
+    generator.generate().to_pickle(path)
+
+    case = benchmark_runner.get_case("path", WRANGLER, path,
+                                     kwargs=generator.wrangler_kwargs,
+                                     repetitions=1)
+
+    assert len(runner.run_case(case).measurements) == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"),
+                    reason="requires CPU affinity")
+def test_runner_cpus(tmpdir):
+    cpu = min(os.sched_getaffinity(0))
+    runner = benchmark_runner.SubprocessRunner(cpus=[cpu],
+                                               cache_dir=str(tmpdir))
+
+    case = benchmark_runner.get_case("time", WRANGLER, DATASET,
+                                     repetitions=1)
+
+    assert runner.run_case(case).environment["cpus"] == [cpu]
+
+    with pytest.raises(ValueError):
+        benchmark_runner.SubprocessRunner(cpus=[-1])
+
+
+def test_runner_failure(runner):
+    case = benchmark_runner.get_case("fails", "pywrangler.NotExists",
+                                     DATASET)
+
+    with pytest.raises(RuntimeError, match="NotExists"):
+        runner.run_case(case)
+
+
+def test_runner_history(runner, tmpdir):
+    case = benchmark_runner.get_case("memory", WRANGLER, DATASET,
+                                     profiler="allocation", repetitions=1)
+    result = runner.run_case(case)
+
+    history = ResultHistory(str(tmpdir.join("history.jsonl")))
+    history.record({result.name: result}, dataset=DATASET)
+
+    assert history.get_run("latest").results["memory"]["unit"] == "bytes"
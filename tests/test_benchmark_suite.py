@@ -0,0 +1,130 @@
+"""This module contains tests for the interval identifier benchmark suite.
+
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from pywrangler import benchmark_suite
+from pywrangler.benchmark_history import ResultHistory
+from pywrangler.exceptions import NotProfiledError
+
+pytestmark = pytest.mark.pandas
+
+
+@pytest.fixture(scope="module")
+def suite():
+    suite = benchmark_suite.IntervalIdentifierBenchmarkSuite(
+        sizes=[200], groups=[1, 5], repetitions=1)
+
+    return suite.run()
+
+
+def test_get_implementations():
+    assert benchmark_suite.get_implementations(["pandas"]) == \
+        ["pandas.NaiveIterator", "pandas.VectorizedCumSum"]
+    assert len(benchmark_suite.get_implementations()) == 4
+
+    with pytest.raises(ValueError):
+        benchmark_suite.get_implementations(["not_exists"])
+
+
+def test_generate_data():
+    df = benchmark_suite.generate_data(100, 3, seed=1)
+
+    assert df.shape == (100, 3)
+    assert df["group"].between(0, 2).all()
+    assert set(df["marker"]) == {0, 1, 2}
+    pd.testing.assert_frame_equal(df,
+                                  benchmark_suite.generate_data(100, 3, 1))
+
+
+def test_normalize_result():
+    df = pd.DataFrame({"group": [0, 0, 1, 0, 1],
+                       "order": [0, 1, 2, 3, 4]})
+
+    iids_a = pd.Series([5, 5, 1, 7, 1])
+    iids_b = pd.Series([0, 0, 2, 3, 2])
+
+    normalized_a = benchmark_suite.normalize_result(df, iids_a, "raw")
+    normalized_b = benchmark_suite.normalize_result(df, iids_b, "raw")
+
+    assert normalized_a.tolist() == normalized_b.tolist() == [1, 1, 3, 2, 3]
+
+    valid = benchmark_suite.normalize_result(df, iids_b, "valid")
+    assert valid.tolist() == [0, 0, 3, 2, 3]
+
+    enumerated = benchmark_suite.normalize_result(df, iids_a, "enumerated")
+    assert enumerated.tolist() == [5, 5, 1, 7, 1]
+
+
+def test_suite_not_run():
+    suite = benchmark_suite.IntervalIdentifierBenchmarkSuite()
+
+    with pytest.raises(NotProfiledError):
+        suite.results
+
+
+def test_suite_invalid_implementation():
+    with pytest.raises(ValueError):
+        benchmark_suite.IntervalIdentifierBenchmarkSuite(
+            implementations=["pandas.NotExists"])
+
+
+def test_suite_results(suite):
+    # 2 implementations x 4 marker uses x 3 result types x 2 group counts
+    assert len(suite.results) == 48
+    assert all([result.agrees for result in suite.results])
+    assert min([result.ratio for result in suite.results]) == 1
+
+    df = suite.to_frame()
+    assert df.columns.tolist() == list(benchmark_suite.BenchmarkResult._fields)
+
+
+def test_suite_output(suite, tmpdir):
+    path = str(tmpdir.join("results.json"))
+    suite.to_json(path)
+
+    with open(path) as file:
+        output = json.load(file)
+
+    assert output["environment"]["pandas"] == pd.__version__
+    assert output["parameters"]["sizes"] == [200]
+    assert len(output["results"]) == 48
+
+    summary = suite.summary()
+    assert "pandas.NaiveIterator" in summary
+    assert "agrees" in summary
+
+
+def test_main(tmpdir, capsys):
+    path = str(tmpdir.join("results.json"))
+
+    benchmark_suite.main(["--sizes", "50", "--groups", "2", "--repetitions",
+                          "1", "--result-types", "valid", "--output", path])
+
+    assert "pandas.VectorizedCumSum" in capsys.readouterr().out
+
+    with open(path) as file:
+        assert len(json.load(file)["results"]) == 8
+
+
+def test_main_history(tmpdir, capsys):
+    path = str(tmpdir.join("history.jsonl"))
+    args = ["--sizes", "50", "--groups", "2", "--repetitions", "2",
+            "--result-types", "valid", "--history", path]
+
+    benchmark_suite.main(args)
+    benchmark_suite.main(args)
+
+    assert "Recorded run" in capsys.readouterr().out
+
+    history = ResultHistory(path)
+    runs = history.runs()
+
+    assert len(runs) == 2
+    assert len(runs[0].results) == 8
+    assert runs[0].dataset["sizes"] == [50]
+    assert len(history.compare(runs[0].run, runs[1].run)) == 8
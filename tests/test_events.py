@@ -0,0 +1,132 @@
+"""This module contains tests for pipeline and wrangler events.
+
+"""
+
+import json
+
+import pytest
+
+import pandas as pd
+
+from pywrangler import events
+from pywrangler.pandas.base import PandasSingleNoFit
+from pywrangler.util.testing.util import concretize_abstract_wrangler
+
+
+class ListSink(events.BaseSink):
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+@pytest.fixture
+def dummy_wrangler():
+    class DummyWrangler(PandasSingleNoFit):
+        def transform(self, df):
+            return df.iloc[:2]
+
+    return concretize_abstract_wrangler(DummyWrangler)()
+
+
+def test_emit_without_sinks():
+    assert events.is_enabled() is False
+    events.emit("test", value=1)
+
+
+def test_use_sinks():
+    sink = ListSink()
+
+    with events.use_sinks(sink):
+        assert events.get_sinks() == [sink]
+        events.emit("test", value=1, label="a")
+
+    assert events.get_sinks() == []
+    assert len(sink.events) == 1
+    assert sink.events[0].name == "test"
+    assert sink.events[0].fields == {"value": 1, "label": "a"}
+
+    with pytest.raises(ValueError):
+        events.remove_sink(sink)
+
+
+def test_wrangler_events(dummy_wrangler):
+    sink = ListSink()
+    df = pd.DataFrame({"a": range(5)})
+
+    with events.use_sinks(sink):
+        dummy_wrangler.fit_transform(df)
+
+    # nested transform calls via `super` emit events only once
+    names = [event.name for event in sink.events]
+    assert names == [events.WRANGLER_START, events.WRANGLER_END]
+
+    fields = sink.events[1].fields
+    assert fields["wrangler"] == "DummyWrangler"
+    assert fields["engine"] == "pandas"
+    assert fields["rows"] == 2
+    assert fields["duration"] >= 0
+
+    # test no events without sinks
+    dummy_wrangler.transform(df)
+    assert len(sink.events) == 2
+
+
+def test_json_lines_sink(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+
+    sink = events.JsonLinesSink(path)
+    with events.use_sinks(sink):
+        events.emit("stage_end", stage="a", duration=0.5)
+        events.emit("stage_end", stage="b", duration=1.5)
+    sink.close()
+
+    with open(path) as file:
+        records = [json.loads(line) for line in file]
+
+    assert [record["event"] for record in records] == ["stage_end"] * 2
+    assert records[1]["stage"] == "b"
+    assert records[1]["duration"] == 1.5
+    assert "timestamp" in records[0]
+
+
+def test_prometheus_sink(tmp_path):
+    path = str(tmp_path / "metrics.prom")
+
+    sink = events.PrometheusSink(path)
+    with events.use_sinks(sink):
+        events.emit("stage_end", stage="a", duration=0.5, rows=10)
+        events.emit("stage_end", stage="a", duration=1.5, rows=20,
+                    cached=True, missing=None)
+        events.emit("stage_end", stage='b"', duration=1.0)
+
+    expected = ('# TYPE pywrangler_stage_end_duration_seconds summary\n'
+                'pywrangler_stage_end_duration_seconds_sum{stage="a"} 2.0\n'
+                'pywrangler_stage_end_duration_seconds_count{stage="a"} 2.0\n'
+                'pywrangler_stage_end_duration_seconds_sum{stage="b\\""} 1.0\n'
+                'pywrangler_stage_end_duration_seconds_count{stage="b\\""} '
+                '1.0\n'
+                '# TYPE pywrangler_stage_end_rows gauge\n'
+                'pywrangler_stage_end_rows{stage="a"} 20.0\n')
+
+    assert sink.render() == expected
+
+    with open(path) as file:
+        assert file.read() == expected
+
+
+def test_prometheus_sink_labels():
+    sink = events.PrometheusSink()
+    with events.use_sinks(sink):
+        events.emit("stage_end", stage="a", idx="0", uid="Stage_4f2a",
+                    pipeline="Pipeline_9c1b", duration=1.0)
+
+    assert sink.render().splitlines()[1] == \
+        'pywrangler_stage_end_duration_seconds_sum{idx="0",stage="a"} 1.0'
+
+    sink = events.PrometheusSink(labels=["uid"])
+    with events.use_sinks(sink):
+        events.emit("stage_end", stage="a", uid="Stage_4f2a", duration=1.0)
+
+    assert 'sum{uid="Stage_4f2a"}' in sink.render()
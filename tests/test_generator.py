@@ -0,0 +1,42 @@
+"""This module contains tests for the synthetic marker data specification.
+
+"""
+
+import pytest
+
+from pywrangler.generator import BaseMarkerGenerator
+
+
+@pytest.mark.parametrize("kwargs", [dict(rows=-1),
+                                    dict(groups=0),
+                                    dict(group_skew=-1),
+                                    dict(interval_length=(1, 3)),
+                                    dict(interval_length=(4, 3)),
+                                    dict(interval_distribution="normal"),
+                                    dict(noise_ratio=1),
+                                    dict(duplicate_rate=1.5),
+                                    dict(marker_dtype="float")])
+def test_base_marker_generator_invalid(kwargs):
+    params = dict(rows=10)
+    params.update(kwargs)
+
+    with pytest.raises(ValueError):
+        BaseMarkerGenerator(**params)
+
+
+def test_base_marker_generator_properties():
+    generator = BaseMarkerGenerator(10, interval_length=(2, 10),
+                                    noise_ratio=0.5, marker_dtype="str")
+
+    assert generator.mean_interval_length == 6
+    assert generator.slot_size == 12
+    assert generator.geometric_probability == 0.2
+    assert generator.marker_values == ("noise", "start", "end")
+    assert generator.wrangler_kwargs["marker_start"] == "start"
+    assert generator.wrangler_kwargs["orderby_columns"] == "order"
+
+    # slot size is at least the maximum interval length
+    assert BaseMarkerGenerator(10, noise_ratio=0).slot_size == 10
+
+    with pytest.raises(NotImplementedError):
+        generator.generate()
@@ -0,0 +1,100 @@
+"""This module contains tests for the engine independent pipeline.
+
+"""
+
+import pytest
+
+import pandas as pd
+
+from pywrangler import pipeline
+from pywrangler.pandas.base import PandasSingleNoFit
+from pywrangler.util.testing.util import concretize_abstract_wrangler
+
+
+@pytest.fixture
+def dummy_wrangler():
+    class DummyWrangler(PandasSingleNoFit):
+        """Dummy doc"""
+
+        def __init__(self, column="value"):
+            self.column = column
+
+        def transform(self, df):
+            return df.assign(dummy=df[self.column] * 2)
+
+    return concretize_abstract_wrangler(DummyWrangler)()
+
+
+def test_stage_wrangler(dummy_wrangler):
+    stage = pipeline.Stage(dummy_wrangler)
+
+    assert stage.name == "DummyWrangler"
+    assert stage.uid.startswith("DummyWrangler_")
+    assert stage.__doc__ == "Dummy doc"
+    assert stage.get_params() == {"column": "value"}
+    assert stage.wrangler is not dummy_wrangler
+    assert stage.input_columns is None
+
+    df = pd.DataFrame({"value": [1, 2], "other": [3, 4]})
+    stage.set_params(column="other")
+    assert stage.transform(df)["dummy"].tolist() == [6, 8]
+
+    # test original wrangler remains unchanged
+    assert dummy_wrangler.column == "value"
+
+    with pytest.raises(ValueError):
+        stage.set_params(invalid=1)
+
+
+def test_stage_function():
+    def add(df, a=2):
+        """Add doc"""
+        return df + a
+
+    add.input_columns = ["value"]
+    stage = pipeline.Stage(add)
+
+    assert stage.name == "add"
+    assert stage.__doc__ == "Add doc"
+    assert stage.get_params() == {"a": 2}
+    assert stage.input_columns == ["value"]
+    assert stage.transform(1) == 3
+    assert stage.set_params(a=3).transform(1) == 4
+
+    # test unique identifiers
+    assert stage.uid != pipeline.Stage(add).uid
+
+    with pytest.raises(ValueError):
+        pipeline.Stage("invalid")
+
+
+def test_base_pipeline_locator(dummy_wrangler):
+    def add(df, a=2):
+        return df.assign(add=df["value"] + a)
+
+    pipe = pipeline.BasePipeline([dummy_wrangler, add])
+
+    assert pipe[0] is pipe["dummy"]
+    assert pipe[pipe[1]] is pipe[1]
+
+    with pytest.raises(ValueError):
+        pipe("add")
+
+    with pytest.raises(ValueError):
+        pipe["invalid"]
+
+    with pytest.raises(ValueError):
+        pipe[1.0]
+
+    df = pd.DataFrame({"value": [1, 2]})
+    df_result = pipe.transform(df)
+
+    assert pipe("add") is df_result
+    assert pipe(0).columns.tolist() == ["value", "dummy"]
+    assert len(pipe._transformer.timings) == 2
+
+    # test sliced copy keeps identifiers
+    sliced = pipe[1:]
+    assert isinstance(sliced, pipeline.BasePipeline)
+    assert [stage.uid for stage in sliced.stages] == [pipe[1].uid]
+    assert sliced.stages[0] is not pipe[1]
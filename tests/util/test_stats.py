@@ -0,0 +1,158 @@
+"""This module contains tests for statistical helper functions.
+
+"""
+
+import numpy as np
+import pytest
+
+from pywrangler.util import stats
+
+
+@pytest.mark.parametrize("p, expected", [(0.5, 0),
+                                         (0.975, 1.959964),
+                                         (0.01, -2.326348),
+                                         (0.999, 3.090232)])
+def test_normal_ppf(p, expected):
+    assert stats.normal_ppf(p) == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize("dof, expected", [(1, 12.706205),
+                                           (2, 4.302653),
+                                           (3, 3.182446),
+                                           (5, 2.570582),
+                                           (10, 2.228139),
+                                           (30, 2.042272),
+                                           (1000, 1.962339)])
+def test_t_ppf(dof, expected):
+    assert stats.t_ppf(0.975, dof) == pytest.approx(expected, abs=1e-5)
+    assert stats.t_cdf(expected, dof) == pytest.approx(0.975, abs=1e-6)
+
+
+@pytest.mark.parametrize("dof", [1, 2, 7, 8])
+def test_t_cdf_symmetry(dof):
+    assert stats.t_cdf(0, dof) == pytest.approx(0.5)
+    assert stats.t_cdf(-1.5, dof) == pytest.approx(1 - stats.t_cdf(1.5, dof))
+
+
+def test_ppf_raises():
+    with pytest.raises(ValueError):
+        stats.normal_ppf(1)
+
+    with pytest.raises(ValueError):
+        stats.t_ppf(0.5, 0)
+
+    with pytest.raises(ValueError):
+        stats.t_cdf(0.5, 1.5)
+
+
+def test_extrapolate_intercept():
+    x = [0.1, 0.2, 0.3]
+    y = [2.1, 3.1, 4.1]
+
+    result = stats.extrapolate(x, y)
+
+    assert result.estimate == pytest.approx(11.1)
+    assert result.lower == pytest.approx(11.1)
+    assert result.upper == pytest.approx(11.1)
+
+    # test noisy observations
+    result = stats.extrapolate(x, [2.0, 3.3, 4.0])
+    assert result.lower < result.estimate < result.upper
+
+    # test missing confidence band
+    result = stats.extrapolate([0.1, 0.2], [2, 3])
+    assert result.estimate == pytest.approx(11)
+    assert np.isnan(result.lower) and np.isnan(result.upper)
+
+
+def test_extrapolate_proportional():
+    result = stats.extrapolate([0.1], [10], intercept=False)
+    assert result.estimate == pytest.approx(100)
+    assert np.isnan(result.lower)
+
+    result = stats.extrapolate([0.1, 0.2], [10, 22], intercept=False)
+    assert result.lower < result.estimate < result.upper
+
+    # test fallback to proportional model without variation
+    result = stats.extrapolate([0.5, 0.5], [10, 12])
+    assert result.estimate == pytest.approx(22)
+
+    with pytest.raises(ValueError):
+        stats.extrapolate([], [])
+
+
+def test_bootstrap():
+    values = np.arange(100)
+    interval = stats.bootstrap(values, np.median, confidence=0.9)
+
+    assert interval.estimate == 49.5
+    assert interval.lower < 49.5 < interval.upper
+    assert interval == stats.bootstrap(values, np.median, confidence=0.9)
+
+    wider = stats.bootstrap(values, np.median, confidence=0.99)
+    assert wider.lower <= interval.lower and wider.upper >= interval.upper
+
+    constant = stats.bootstrap([1, 1, 1], np.mean)
+    assert constant == (1, 1, 1)
+
+    with pytest.raises(ValueError):
+        stats.bootstrap([], np.mean)
+
+
+def test_welch_t_test():
+    a = [10.1, 10.3, 9.8, 10.0, 10.4]
+    b = [10.9, 11.2, 10.8, 11.5, 11.0, 11.1]
+
+    test = stats.welch_t_test(a, b)
+
+    assert test.statistic == pytest.approx(-6.5429, abs=1e-3)
+    assert test.dof == pytest.approx(8.764, abs=1e-2)
+    assert test.p_value < 0.001
+    assert stats.welch_t_test(a, a).p_value == pytest.approx(1)
+
+
+def test_welch_t_test_degenerate():
+    assert np.isnan(stats.welch_t_test([1], [1, 2]).p_value)
+    assert np.isnan(stats.welch_t_test([1, 1], [1, 1]).p_value)
+    assert stats.welch_t_test([1, 1], [2, 2]).p_value == 0
+
+
+def test_mann_whitney_u_test():
+    a = [10.1, 10.3, 9.8, 10.0, 10.4]
+    b = [10.9, 11.2, 10.8, 11.5, 11.0, 11.1]
+
+    # exact p-value equals 2 orderings out of 11 choose 5
+    test = stats.mann_whitney_u_test(a, b)
+    assert test.statistic == 0
+    assert test.p_value == pytest.approx(2 / 462)
+
+    interleaved = stats.mann_whitney_u_test([1, 3, 5, 7], [2, 4, 6, 8])
+    assert interleaved.statistic == 6
+    assert interleaved.p_value == pytest.approx(0.685714, abs=1e-6)
+
+    # robust against outliers
+    assert stats.mann_whitney_u_test([1, 2, 3, 100], [1.5, 2.5, 3.5, 4.5]) \
+        .p_value > 0.5
+
+
+def test_mann_whitney_u_test_ties():
+    test = stats.mann_whitney_u_test([1.0, 1.1, 0.9, 1.0],
+                                     [2.0, 2.1, 1.9, 2.0])
+
+    assert test.statistic == 0
+    assert test.p_value == pytest.approx(0.0284, abs=1e-3)
+    assert stats.mann_whitney_u_test([1, 2, 2], [1, 2, 2]).p_value == 1
+
+
+def test_mann_whitney_u_test_degenerate():
+    assert np.isnan(stats.mann_whitney_u_test([], [1, 2]).p_value)
+    assert np.isnan(stats.mann_whitney_u_test([1, 1], [1, 1]).p_value)
+
+
+def test_get_min_u_p_value():
+    assert stats.get_min_u_p_value(3, 3) == pytest.approx(0.1)
+    assert stats.get_min_u_p_value(3, 3) == \
+        stats.mann_whitney_u_test([10, 11, 12], [1, 2, 3]).p_value
+    assert stats.get_min_u_p_value(5, 5) == pytest.approx(2 / 252)
+    assert stats.get_min_u_p_value(1, 1) == 1
+    assert np.isnan(stats.get_min_u_p_value(0, 3))
@@ -0,0 +1,183 @@
+"""This module contains tests for performance budget assertions.
+
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from pywrangler.benchmark import allocate_memory
+from pywrangler.exceptions import PerformanceBudgetError
+from pywrangler.pandas.base import PandasSingleNoFit
+from pywrangler.util.testing.budget import BaselineStore, PerformanceBudget
+from pywrangler.util.testing.util import concretize_abstract_wrangler
+
+pytest_plugins = "pytester"
+
+pytestmark = pytest.mark.pandas
+
+MIB = 2 ** 20
+
+
+@pytest.fixture
+def wrangler():
+    """Return wrangler allocating 10 MiB during `transform`.
+
+    """
+
+    class DummyWrangler(PandasSingleNoFit):
+        def transform(self, df):
+            return pd.DataFrame(allocate_memory(10))
+
+    return concretize_abstract_wrangler(DummyWrangler)()
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"col": range(1000)})
+
+
+def test_baseline_store(tmpdir):
+    store = BaselineStore(str(tmpdir.join("baselines.json")))
+
+    assert store.get("name") == {}
+
+    store.update("name", {"time": 1.})
+    store.update("name", {"ratio": 2.})
+
+    assert store.get("name") == {"time": 1., "ratio": 2.}
+
+
+def test_budget_invalid_metric():
+    with pytest.raises(ValueError):
+        PerformanceBudget(metrics=["cpu"])
+
+
+def test_budget_absolute_time(wrangler, df):
+    budget = PerformanceBudget(time=60, repetitions=2)
+    results = budget.check(wrangler, df)
+
+    assert [result.metric for result in results] == ["time"]
+    assert results[0].passed
+
+    budget = PerformanceBudget(name="tight", time=1e-9, repetitions=2)
+    with pytest.raises(PerformanceBudgetError, match="'tight' exceeds time"):
+        budget.check(wrangler, df)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_budget_absolute_ratio(wrangler, df):
+    budget = PerformanceBudget(ratio=1, repetitions=1)
+
+    with pytest.raises(AssertionError, match="ratio"):
+        budget.check(wrangler, df)
+
+
+def test_budget_baselines(wrangler, df, tmpdir):
+    path = str(tmpdir.join("baselines.json"))
+    kwargs = dict(baselines=path, metrics=["time"], repetitions=2)
+
+    # missing baselines are recorded
+    assert PerformanceBudget("job", **kwargs).check(wrangler, df) == []
+    recorded = BaselineStore(path).get("job")["time"]
+
+    # within tolerance of recorded baseline
+    BaselineStore(path).update("job", {"time": 60.})
+    results = PerformanceBudget("job", **kwargs).check(wrangler, df)
+    assert results[0].baseline == 60.
+    assert results[0].limit == pytest.approx(72.)
+
+    # exceeding baseline
+    BaselineStore(path).update("job", {"time": recorded / 1000})
+    with pytest.raises(PerformanceBudgetError, match="baseline"):
+        PerformanceBudget("job", **kwargs).check(wrangler, df)
+
+    # updating baseline
+    PerformanceBudget("job", update=True, **kwargs).check(wrangler, df)
+    assert BaselineStore(path).get("job")["time"] > recorded / 1000
+
+
+def test_budget_baseline_limit():
+    budget = PerformanceBudget(tolerance=0.2)
+
+    assert budget._get_baseline_limit("ratio", 2.) == pytest.approx(2.4)
+    assert budget._get_baseline_limit("ratio", -2.) == pytest.approx(-1.6)
+    assert budget._get_baseline_limit("ratio", 0.) == pytest.approx(0.01)
+    assert budget._get_baseline_limit("time", 0.) == pytest.approx(1e-4)
+
+
+def test_budget_baselines_require_name(wrangler, df, tmpdir):
+    budget = PerformanceBudget(baselines=str(tmpdir.join("baselines.json")))
+
+    with pytest.raises(ValueError):
+        budget.check(wrangler, df)
+
+
+def test_budget_decorator(wrangler, df, tmpdir):
+    path = str(tmpdir.join("baselines.json"))
+
+    @PerformanceBudget(baselines=path, metrics=["time"], repetitions=1)
+    def job():
+        return wrangler, [df]
+
+    job()
+
+    with open(path) as file:
+        assert list(json.load(file)) == ["job"]
+
+
+def test_budget_fixture(testdir):
+    testdir.makepyfile("""
+        import pandas as pd
+        from pywrangler.pandas.wranglers.interval_identifier import (
+            VectorizedCumSum)
+
+        def test_job(performance_budget):
+            df = pd.DataFrame({"marker": [0, 1, 2], "order": [1, 2, 3]})
+            wrangler = VectorizedCumSum(marker_column="marker",
+                                        marker_start=1, marker_end=2,
+                                        orderby_columns="order")
+
+            performance_budget(wrangler, df, time=60, metrics=["time"],
+                               repetitions=1)
+    """)
+
+    path = str(testdir.tmpdir.join("baselines.json"))
+    args = ["-p", "pywrangler.util.testing.budget",
+            "--performance-baselines", path]
+
+    testdir.runpytest(*args).assert_outcomes(passed=1)
+    name = list(BaselineStore(path).load())[0]
+    assert name.endswith("test_job")
+
+    BaselineStore(path).update(name, {"time": 1e-12})
+    testdir.runpytest(*args).assert_outcomes(failed=1)
+
+    testdir.runpytest("--update-baselines", *args).assert_outcomes(passed=1)
+    assert BaselineStore(path).get(name)["time"] > 1e-12
+
+
+def test_budget_fixture_without_baselines(testdir):
+    testdir.makepyfile("""
+        import pandas as pd
+        from pywrangler.pandas.wranglers.interval_identifier import (
+            VectorizedCumSum)
+
+        def test_job(performance_budget):
+            df = pd.DataFrame({"marker": [0, 1, 2], "order": [1, 2, 3]})
+            wrangler = VectorizedCumSum(marker_column="marker",
+                                        marker_start=1, marker_end=2,
+                                        orderby_columns="order")
+
+            results = performance_budget(wrangler, df, time=60,
+                                         repetitions=1)
+            assert [result.metric for result in results] == ["time"]
+    """)
+
+    args = ["-p", "pywrangler.util.testing.budget"]
+    testdir.runpytest(*args).assert_outcomes(passed=1)
+
+    assert [path.basename for path in testdir.tmpdir.listdir()
+            if path.ext == ".json"] == []